@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+
+from database import run_as_leader
+
+# The leader role the benchmark processes compete for. Not the day change one, so it's safe next to a running bot.
+BENCHMARK_ROLE = "benchmark_leader"
+
+# How many processes compete for leadership by default.
+DEFAULT_PROCESSES = 3
+
+# How many times the leader is killed (and a standby has to take over) by default.
+DEFAULT_FAILOVERS = 3
+
+# How long to wait for a standby to take over before giving up.
+FAILOVER_TIMEOUT_SECONDS = 30.0
+
+
+async def _compete():
+    """Compete for the benchmark role, and announce on stdout whenever this process becomes the leader."""
+
+    async def lead():
+        print(f"LEADER {os.getpid()}", flush=True)
+        await asyncio.Event().wait()
+
+    await run_as_leader(BENCHMARK_ROLE, lead)
+
+
+async def _spawn() -> asyncio.subprocess.Process:
+    return await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.leader_failover", "--compete", stdout=asyncio.subprocess.PIPE
+    )
+
+
+async def _next_leader(processes: list[asyncio.subprocess.Process]) -> asyncio.subprocess.Process:
+    """Wait for one of the processes to announce it became the leader."""
+
+    reads = {asyncio.create_task(process.stdout.readline()): process for process in processes}  # type: ignore
+    try:
+        while reads:
+            done, _ = await asyncio.wait(reads, return_when=asyncio.FIRST_COMPLETED)
+            for read in done:
+                process = reads.pop(read)
+                if read.result().startswith(b"LEADER"):
+                    return process
+                if read.result():
+                    reads[asyncio.create_task(process.stdout.readline())] = process  # type: ignore
+        raise RuntimeError("Every process exited without becoming the leader.")
+    finally:
+        for read in reads:
+            read.cancel()
+
+
+async def benchmark(processes: int, failovers: int) -> list[float]:
+    """
+    Start several processes competing for leadership against the configured database, then repeatedly kill the
+    leader and time how long a standby takes to take over. Needs a running Postgres.
+
+    Parameters
+    ----------
+    processes: int
+        How many processes compete for leadership.
+
+    failovers: int
+        How many times to kill the leader.
+
+    Returns
+    -------
+    list[float]
+        How long each failover took, in seconds.
+    """
+
+    running = [await _spawn() for _ in range(processes)]
+    times: list[float] = []
+    try:
+        leader = await asyncio.wait_for(_next_leader(running), FAILOVER_TIMEOUT_SECONDS)
+        for _ in range(failovers):
+            # a hard kill, so the leader gets no chance to release the lock itself
+            leader.send_signal(signal.SIGKILL)
+            await leader.wait()
+            running.remove(leader)
+            running.append(await _spawn())
+
+            start = time.perf_counter()
+            leader = await asyncio.wait_for(_next_leader(running), FAILOVER_TIMEOUT_SECONDS)
+            times.append(time.perf_counter() - start)
+            print(f"Process {leader.pid} took over after {times[-1]:.2f}s")
+    finally:
+        for process in running:
+            if process.returncode is None:
+                process.terminate()
+                await process.wait()
+
+    return times
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Time how long leadership takes to fail over between processes.")
+    parser.add_argument("--processes", type=int, default=DEFAULT_PROCESSES, help="how many processes compete")
+    parser.add_argument("--failovers", type=int, default=DEFAULT_FAILOVERS, help="how many times to kill the leader")
+    parser.add_argument("--compete", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compete:
+        await _compete()
+        return
+
+    times = await benchmark(args.processes, args.failovers)
+    print(f"{len(times)} failovers, slowest {max(times):.2f}s, mean {sum(times) / len(times):.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, text
+
+from database import list_pooches_for_kennel
+from database.models import KennelPooch, Pooch as PoochORM
+from database.session import session_scope
+from game.model import Pooch, row_to_pooch, to_pooch
+
+# The owner the benchmark kennel is seeded under. Far outside the range of real Discord IDs, so it never collides.
+BENCHMARK_OWNER_DISCORD_ID = 1
+
+# How many pooches the benchmark kennel is seeded with. The results are reported per 1,000 pooches either way.
+DEFAULT_POOCHES = 1_000
+
+# How many timed runs of each read path to take the median of.
+DEFAULT_RUNS = 50
+
+
+async def _seed(pooches: int) -> int:
+    """Seed a kennel with the given number of pooches, and return its ID."""
+
+    async with session_scope() as session:
+        await session.execute(
+            text("INSERT INTO owners (discord_id) VALUES (:owner) ON CONFLICT DO NOTHING"),
+            {"owner": BENCHMARK_OWNER_DISCORD_ID},
+        )
+        kennel_id = (
+            await session.execute(
+                text(
+                    "INSERT INTO kennels (owner_discord_id, name, pooch_limit) "
+                    "VALUES (:owner, 'Benchmark Kennel', :pooches) RETURNING id"
+                ),
+                {"owner": BENCHMARK_OWNER_DISCORD_ID, "pooches": pooches},
+            )
+        ).scalar_one()
+        await session.execute(
+            text(
+                "WITH seeded AS ("
+                "INSERT INTO pooches "
+                "(name, sex, birth_day, health_loss_start_day, cooldown_ready_day, owner_discord_id) "
+                "SELECT 'Benchmark Pooch ' || p, (ARRAY['female', 'male']::sex[])[1 + p % 2], 0, 5, 0, :owner "
+                "FROM generate_series(1, :pooches) p RETURNING id) "
+                "INSERT INTO kennel_pooches (pooch_id, kennel_id) SELECT id, :kennel FROM seeded"
+            ),
+            {"owner": BENCHMARK_OWNER_DISCORD_ID, "pooches": pooches, "kennel": kennel_id},
+        )
+
+    return kennel_id
+
+
+async def _clean_up(kennel_id: int):
+    async with session_scope() as session:
+        await session.execute(
+            text("DELETE FROM pooches WHERE id IN (SELECT pooch_id FROM kennel_pooches WHERE kennel_id = :kennel)"),
+            {"kennel": kennel_id},
+        )
+        await session.execute(
+            text("DELETE FROM owners WHERE discord_id = :owner"), {"owner": BENCHMARK_OWNER_DISCORD_ID}
+        )
+
+
+async def _orm_read_path(kennel_id: int) -> list[Pooch]:
+    """Read a kennel's pooches the way the game did before it had projections: whole ORM objects, then `to_pooch`."""
+
+    async with session_scope() as session:
+        query = (
+            select(PoochORM)
+            .join(KennelPooch, KennelPooch.pooch_id == PoochORM.id)
+            .where(KennelPooch.kennel_id == kennel_id)
+            .order_by(PoochORM.created_at.asc(), PoochORM.id.asc())
+        )
+        response = await session.execute(query)
+
+    return [to_pooch(pooch) for pooch in response.scalars().all()]
+
+
+async def _projection_read_path(kennel_id: int) -> list[Pooch]:
+    """Read a kennel's pooches the way the game does now: just the needed columns, then `row_to_pooch`."""
+
+    return [row_to_pooch(row) for row in await list_pooches_for_kennel(kennel_id)]
+
+
+async def _measure(read: Callable[[int], Awaitable[list[Pooch]]], kennel_id: int, runs: int) -> tuple[float, int, int]:
+    """
+    Measure a read path.
+    Returns its median latency in seconds, and the peak bytes allocated and the bytes kept (by the result) while it ran.
+    """
+
+    # warm up the connection pool and compiled statement cache, so neither is measured
+    await read(kennel_id)
+
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await read(kennel_id)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = await read(kennel_id)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return statistics.median(latencies), peak - before, after - before
+
+
+async def benchmark(pooches: int, runs: int) -> dict[str, tuple[float, int, int]]:
+    """
+    Compare reading a kennel's pooches through the ORM to reading them through the projection read path.
+
+    Parameters
+    ----------
+    pooches: int
+        How many pooches to seed the benchmark kennel with.
+
+    runs: int
+        How many timed runs of each read path to take the median of.
+
+    Returns
+    -------
+    dict[str, tuple[float, int, int]]
+        For each read path, its median latency in seconds and its peak and kept allocations in bytes,
+        all per 1,000 pooches.
+    """
+
+    kennel_id = await _seed(pooches)
+    try:
+        results = {
+            "orm": await _measure(_orm_read_path, kennel_id, runs),
+            "projection": await _measure(_projection_read_path, kennel_id, runs),
+        }
+    finally:
+        await _clean_up(kennel_id)
+
+    scale = 1000 / pooches
+    return {
+        name: (latency * scale, int(peak * scale), int(kept * scale)) for name, (latency, peak, kept) in results.items()
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ORM and projection read paths for a kennel's pooches.")
+    parser.add_argument("--pooches", type=int, default=DEFAULT_POOCHES, help="how many pooches to seed the kennel with")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="how many timed runs to take the median of")
+    args = parser.parse_args()
+
+    results = await benchmark(args.pooches, args.runs)
+    print("per 1,000 pooches   median latency   peak allocated   kept")
+    for name, (latency, peak, kept) in results.items():
+        print(f"{name:<19} {latency * 1000:>11.2f} ms {peak / 1024:>13.0f} KiB {kept / 1024:>6.0f} KiB")
+
+    orm_latency, orm_peak, _ = results["orm"]
+    projection_latency, projection_peak, _ = results["projection"]
+    print(
+        f"projection: {orm_latency / projection_latency:.1f}x faster, {orm_peak / projection_peak:.1f}x less allocated"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,52 +1,100 @@
 import os
 import asyncio
+import socket
+import time
 from bot.commands.get_money import register_get_money_command
+from bot.commands.cache_stats import register_cache_stats_command
+from bot.commands.profile_tick import register_profile_tick_command
 import discord
-from discord import app_commands
 from dotenv import load_dotenv
 
 from logger import get_logger
+from metrics import DEFAULT_HOST, DEFAULT_PORT, start_metrics_server
+from profiling import configure_from_env as configure_profiling
+from tracing import configure_from_env as configure_tracing
 
-from game import get_or_create_server
+from game import get_mutation_effects, listen_for_invalidations
+from .commands.history import register_history_command
 from .commands.home import register_home_command
 from .commands.set_event_channel import register_set_event_channel_command
-from .day_change_loop import day_change_runner
+from .commands.set_day_schedule import register_set_day_schedule_command
+from .command_sync import STARTUP_SECONDS, sync_guilds
+from .day_change_loop import DEFAULT_JITTER_SECONDS, day_change_worker, lead_day_change_runner
+from .discord_tracing import trace_discord_requests
+from .interaction_metrics import MetricsCommandTree
 
 logger = get_logger("bot/app")
 
-GUILDS = [discord.Object(id=1267910656838078474)]
-
 
 def run():
+    started = time.perf_counter()
     load_dotenv()
     token = os.getenv("DISCORD_TOKEN")
     stage = os.getenv("STAGE", "dev").lower()
     tz = os.getenv("TZ", "America/New_York")
+    jitter_seconds = float(os.getenv("DAY_CHANGE_JITTER_SECONDS", DEFAULT_JITTER_SECONDS))
+    metrics_host = os.getenv("METRICS_HOST", DEFAULT_HOST)
+    metrics_port = int(os.getenv("METRICS_PORT", DEFAULT_PORT))  # 0 turns the metrics endpoint off
+    configure_profiling()
+    configure_tracing()
+    trace_discord_requests()
 
     intents = discord.Intents.default()
     intents.message_content = True
 
     bot = discord.Client(intents=intents)
-    tree = app_commands.CommandTree(bot)
+    tree = MetricsCommandTree(bot)
 
     register_home_command(tree)
+    register_history_command(tree)
     register_set_event_channel_command(tree)
+    register_set_day_schedule_command(tree)
 
     # dev only commands
     if stage == "dev":
         register_get_money_command(tree)
+        register_cache_stats_command(tree)
+        register_profile_tick_command(tree)
 
     @bot.event
     async def on_ready():
-        for guild in GUILDS:
-            # tree.copy_global_to(guild=guild)
-            await tree.sync(guild=guild)
-            server = await get_or_create_server(guild.id)
-            logger.info(f"Initialized Server with ID '{server.discord_id}'.")
-        logger.info(f"Bot ready as {bot.user} ({stage})")
+        report = await sync_guilds(tree, bot.guilds)
+        ready_seconds = time.perf_counter() - started
+        STARTUP_SECONDS.labels("bootstrap").set(report.bootstrap_seconds)
+        STARTUP_SECONDS.labels("command_sync").set(report.sync_seconds)
+        STARTUP_SECONDS.labels("ready").set(ready_seconds)
+        logger.info(
+            f"Bot ready as {bot.user} ({stage}) after {ready_seconds:.1f}s. "
+            f"Initialized {report.servers} servers in {report.bootstrap_seconds:.2f}s, "
+            f"then synced commands to {report.synced} ({report.skipped} already up to date, {report.failed} failed) "
+            f"in {report.sync_seconds:.2f}s."
+        )
+
+        # compile the mutation effects up front, so invalid mutation options are reported on startup
+        effects = await get_mutation_effects()
+        logger.info(f"Compiled the effects of {len(effects.by_id)} mutations.")
+
+        if metrics_port and not hasattr(bot, "_metrics_server"):
+            bot._metrics_server = await start_metrics_server(metrics_host, metrics_port)  # type: ignore
+
+        if not hasattr(bot, "_invalidation_task"):
+            bot._invalidation_task = asyncio.create_task(listen_for_invalidations())  # type: ignore
+
+        if not hasattr(bot, "_day_change_worker_task"):
+            # every process runs queued server day changes, whichever one is the leader queueing them
+            worker_id = f"{socket.gethostname()}:{os.getpid()}"
+            bot._day_change_worker_task = asyncio.create_task(day_change_worker(worker_id))  # type: ignore
 
         if not hasattr(bot, "_day_change_task"):
-            bot._day_change_task = asyncio.create_task(day_change_runner(bot, stage=stage, tz=tz))  # type: ignore
+            # every process (or shard) starts this, but only the day change leader runs day changes
+            bot._day_change_task = asyncio.create_task(
+                lead_day_change_runner(bot, stage=stage, tz=tz, jitter_seconds=jitter_seconds)
+            )  # type: ignore
+
+    @bot.event
+    async def on_guild_join(guild: discord.Guild):
+        report = await sync_guilds(tree, [guild])
+        logger.info(f"Joined server with ID '{guild.id}'. Synced commands: {report.synced > 0}.")
 
     if not token:
         raise RuntimeError("DISCORD_TOKEN not set")
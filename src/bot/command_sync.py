@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Sequence
+
+import discord
+from discord import app_commands
+
+from game import get_or_create_servers, set_command_tree_hash
+from logger import get_logger
+from metrics import counter, gauge
+
+logger = get_logger("bot/command_sync")
+
+# The most servers whose slash commands are synced at once. discord.py waits out rate limits itself,
+# so this only bounds how many sync requests are in flight (and waiting on the same limits) at a time.
+SYNC_CONCURRENCY = 8  # TODO
+
+STARTUP_SECONDS = gauge("pimpy_startup_seconds", "How long each phase of the last startup took.", ("phase",))
+COMMAND_SYNCS = counter(
+    "pimpy_command_syncs_total",
+    "Servers whose slash commands were synced, skipped (unchanged) or failed.",
+    ("outcome",),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class GuildSyncReport:
+    """What happened while bootstrapping servers and syncing their slash commands, and how long it took."""
+
+    servers: int
+    synced: int
+    skipped: int
+    failed: int
+    bootstrap_seconds: float
+    sync_seconds: float
+
+
+def command_tree_hash(tree: app_commands.CommandTree, guild: discord.abc.Snowflake) -> str:
+    """
+    Hash the slash commands the command tree would sync to a server, so servers that already have them are skipped.
+    The global commands are only included once they're copied to the server (see `sync_guilds`).
+
+    Parameters
+    ----------
+    tree: app_commands.CommandTree
+        The command tree to hash.
+
+    guild: discord.abc.Snowflake
+        The server to hash the commands for.
+
+    Returns
+    -------
+    str
+        The hash, the same for as long as the commands (and everything about them sent to Discord) stay the same.
+    """
+
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+        key=lambda command: (command.get("type", 1), command["name"]),
+    )
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+async def sync_guilds(tree: app_commands.CommandTree, guilds: Sequence[discord.abc.Snowflake]) -> GuildSyncReport:
+    """
+    Make sure every given server exists (in one bulk write), then copy the global slash commands to every server and
+    sync them to the servers whose last synced commands don't match the command tree, a few at a time.
+
+    Parameters
+    ----------
+    tree: app_commands.CommandTree
+        The command tree to sync.
+
+    guilds: Sequence[discord.abc.Snowflake]
+        The servers to bootstrap and sync (like every server the bot is in).
+
+    Returns
+    -------
+    GuildSyncReport
+        How many servers were synced, skipped and failed, and how long it took.
+    """
+
+    start = time.perf_counter()
+    servers = await get_or_create_servers([guild.id for guild in guilds])
+    synced_hashes = {server.discord_id: server.command_tree_hash for server in servers}
+    bootstrapped = time.perf_counter()
+
+    semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+    synced_by_hash: dict[str, list[int]] = {}
+    failed: list[int] = []
+
+    async def sync(guild: discord.abc.Snowflake, tree_hash: str):
+        async with semaphore:
+            try:
+                await tree.sync(guild=guild)
+            except discord.HTTPException:
+                logger.exception(f"Couldn't sync the commands of server with ID '{guild.id}'")
+                failed.append(guild.id)
+                return
+        synced_by_hash.setdefault(tree_hash, []).append(guild.id)
+
+    syncs = []
+    for guild in guilds:
+        # the commands are all registered globally, so each server gets its own copy to hash and sync
+        tree.copy_global_to(guild=guild)
+        tree_hash = command_tree_hash(tree, guild)
+        if synced_hashes.get(guild.id) != tree_hash:
+            syncs.append(sync(guild, tree_hash))
+    await asyncio.gather(*syncs)
+
+    # servers that failed to sync keep their old hash, so they're tried again next startup
+    for tree_hash, server_discord_ids in synced_by_hash.items():
+        await set_command_tree_hash(server_discord_ids, tree_hash)
+    done = time.perf_counter()
+
+    report = GuildSyncReport(
+        servers=len(servers),
+        synced=sum(len(server_discord_ids) for server_discord_ids in synced_by_hash.values()),
+        skipped=len(guilds) - len(syncs),
+        failed=len(failed),
+        bootstrap_seconds=bootstrapped - start,
+        sync_seconds=done - bootstrapped,
+    )
+    COMMAND_SYNCS.labels("synced").inc(report.synced)
+    COMMAND_SYNCS.labels("skipped").inc(report.skipped)
+    COMMAND_SYNCS.labels("failed").inc(report.failed)
+    return report
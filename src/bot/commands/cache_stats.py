@@ -0,0 +1,14 @@
+from discord import app_commands, Interaction
+
+from game import cache_stats
+
+
+def register_cache_stats_command(tree: app_commands.CommandTree):
+    @tree.command(name="cache_stats", description="(DEV) Show the game cache hit/miss/eviction counters")
+    async def show_cache_stats(interaction: Interaction):
+        lines = [
+            f"`{table}`: {stats.size}/{stats.max_entries} entries, {stats.hits} hits, {stats.misses} misses "
+            f"({stats.hit_rate:.0%}), {stats.evictions} evictions"
+            for table, stats in cache_stats().items()
+        ]
+        await interaction.response.send_message("\n".join(lines), ephemeral=True)
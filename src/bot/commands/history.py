@@ -0,0 +1,17 @@
+from discord import app_commands, Interaction
+
+from ..ui.history import HistoryPageSource
+from ..ui.components.paginator import PaginatorView
+
+
+def register_history_command(tree: app_commands.CommandTree):
+    @tree.command(name="history", description="See everything that's happened in this server")
+    async def history(interaction: Interaction):
+        if interaction.guild_id is None:
+            await interaction.response.send_message("This command must be used in a server.", ephemeral=True)
+            return
+
+        source = HistoryPageSource(server_discord_id=int(interaction.guild_id))
+        view = PaginatorView(source, owner_discord_id=interaction.user.id)
+        await interaction.response.send_message(content="Server history:", view=view, ephemeral=False)
+        await view.start(interaction)
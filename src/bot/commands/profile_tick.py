@@ -0,0 +1,13 @@
+from discord import app_commands, Interaction
+
+from game import profile_next_day_change
+
+
+def register_profile_tick_command(tree: app_commands.CommandTree):
+    @tree.command(name="profile_tick", description="(DEV) Profile the next day change")
+    async def profile_tick(interaction: Interaction):
+        profile_next_day_change()
+        await interaction.response.send_message(
+            "⏱️ The next day change will be profiled. Its profile will be saved next to the bot's other profiles.",
+            ephemeral=True,
+        )
@@ -0,0 +1,30 @@
+from discord import app_commands, Interaction
+
+from game import set_day_schedule
+from game.exceptions.invalid_day_schedule import InvalidDaySchedule
+
+
+def register_set_day_schedule_command(tree: app_commands.CommandTree):
+    @tree.command(name="set_day_schedule", description="Set the timezone and time of day the server's day changes at")
+    @app_commands.describe(
+        timezone="The server's timezone, like Europe/Berlin or America/New_York",
+        hour="The hour (0-23) the day changes at, in that timezone",
+        minute="The minute (0-59) the day changes at",
+    )
+    async def day_schedule(
+        interaction: Interaction,
+        timezone: str,
+        hour: app_commands.Range[int, 0, 23] = 0,
+        minute: app_commands.Range[int, 0, 59] = 0,
+    ):
+        if interaction.guild_id is None:
+            await interaction.response.send_message("This command must be used in a server.", ephemeral=True)
+            return
+        try:
+            await set_day_schedule(int(interaction.guild_id), timezone, hour * 60 + minute)
+        except InvalidDaySchedule as error:
+            await interaction.response.send_message(f"❌ {error.reason}", ephemeral=True)
+            return
+        await interaction.response.send_message(
+            f"✅ The day will change at {hour:02}:{minute:02} ({timezone}) in this server.", ephemeral=False
+        )
@@ -1,19 +1,52 @@
 import asyncio
-from datetime import datetime, time, timedelta
-from zoneinfo import ZoneInfo
+import random
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional
 
 import discord
 
-from game import get_event_channel, run_day_change
+from game import (
+    deliver_queued_server_day_changes,
+    enqueue_server_day_changes,
+    get_event_channel,
+    get_next_day_change,
+    get_world_day_schedule,
+    lead_day_changes,
+    list_all_servers,
+    requeue_stale_server_day_changes,
+    run_day_change,
+    run_queued_server_day_change,
+    run_world_day_change,
+)
 from logger import get_logger
 from .ui.day_change_status import make_status_view
 
-if discord.TYPE_CHECKING:
-    from game.model import DayChangeSummary
+if TYPE_CHECKING:
+    from game.model import DayChangeSummary, Server
 
 
 logger = get_logger("bot/day_change_loop")
 
+# Servers whose day changes are scheduled within this many seconds of each other are planned together.
+# The schedule is rebuilt between buckets, so new servers and changed day schedules are picked up.
+BUCKET_SECONDS = 60  # TODO
+
+# By default, each server's day change is pushed back by up to this long (by the same amount every day),
+# so the servers that share a day boundary don't all change day at the same moment.
+DEFAULT_JITTER_SECONDS = 300  # TODO
+
+# The longest the scheduler sleeps before rebuilding the schedule, while nothing is due.
+REPLAN_SECONDS = 300  # TODO
+
+# How long a day change worker waits before looking at the queue again while it's empty.
+WORK_POLL_SECONDS = 1.0  # TODO
+
+# How often the day change leader looks for finished server day changes whose summaries haven't been posted yet.
+DELIVERY_POLL_SECONDS = 5.0  # TODO
+
+# How often the day change leader gives back the server day changes of workers that stopped responding.
+REQUEUE_SECONDS = 60.0  # TODO
+
 
 async def post_day_change_summaries(bot: discord.Client, summaries: dict[int, DayChangeSummary]):
     for server_discord_id, summary in summaries.items():
@@ -32,45 +65,175 @@ async def post_day_change_summaries(bot: discord.Client, summaries: dict[int, Da
                 )
                 continue
 
+        title = f"🌙 Day {summary.day}"
         if not summary.births and not summary.deaths:
-            await channel.send(embed=discord.Embed(title="🌙 Day Change", description="Nothing to report."))
+            await channel.send(embed=discord.Embed(title=title, description="Nothing to report."))
             continue
 
         desc = f"Births: **{len(summary.births)}**\nDeaths: **{len(summary.deaths)}**"
         view = make_status_view(
             server=summary.server,
-            pooches=summary.mentioned_pooches,
-            title="🌙 Day Change",
+            pooch_ids=[pooch.id for pooch in summary.mentioned_pooches],
+            title=title,
             description=desc,
         )
 
-        message = await channel.send(embed=discord.Embed(title="🌙 Day Change", description=desc), view=view)
+        message = await channel.send(embed=discord.Embed(title=title, description=desc), view=view)
 
         await view._source.load()  # type: ignore
-        view._page = 0  # type: ignore
-        content, embed = await view._source.render(view, 0)  # type: ignore
+        content, embed = await view.draw()
         await message.edit(content=content, embed=embed, view=view)
 
 
-async def day_change_runner(bot: discord.Client, *, stage: str, tz: str = "America/New_York"):
-    zone = ZoneInfo(tz)
+def _jitter(server_discord_id: int, jitter_seconds: float) -> float:
+    # seeded by the server, so its day change moves by the same amount every day
+    return random.Random(server_discord_id).uniform(0, jitter_seconds) if jitter_seconds > 0 else 0.0
+
+
+async def _sleep_until(when: datetime):
+    await asyncio.sleep(max((when - datetime.now(timezone.utc)).total_seconds(), 0.0))
+
+
+async def day_change_worker(worker_id: str):
+    """
+    Run queued server day changes as they come in, forever. Every process runs a worker, so the servers of a big
+    world change day across all of them instead of only in the day change leader.
+    """
+
+    logger.info(f"Starting day change worker '{worker_id}'...")
+    while True:
+        try:
+            ran = await run_queued_server_day_change(worker_id)
+        except Exception:
+            logger.exception(f"A queued server day change failed in worker '{worker_id}'")
+            ran = True
+        if not ran:
+            await asyncio.sleep(WORK_POLL_SECONDS)
+
+
+class DayChangeScheduler:
+    """
+    Changes the world day at midnight in the world timezone, and each server's own day at its local day boundary
+    (plus its jitter), so the day change is spread out over many small ticks instead of one big one.
+    Server day changes are queued for the day change workers of every process to run, and their summaries are posted
+    as they finish. Which summaries were posted is kept with the queue, so a new leader posts the ones the last one
+    didn't get to.
+    """
+
+    def __init__(self, bot: discord.Client, *, world_timezone: str, jitter_seconds: float):
+        self.bot = bot
+        self.world_timezone = world_timezone
+        self.jitter_seconds = jitter_seconds
+        # the scheduled time of the last day change each server ran (or the time to catch up from, when it was first
+        # seen), to schedule its next one after
+        self._last_scheduled: dict[int, datetime] = {}
+
+    def _next_server_change(
+        self, server: Server, now: datetime, world_day: int, world_day_started: Optional[datetime]
+    ) -> datetime:
+        jitter = _jitter(server.discord_id, self.jitter_seconds)
+        last = self._last_scheduled.get(server.discord_id)
+        if last is None:
+            # a server seen for the first time that hasn't changed day for the current world day yet (like when the
+            # leader changed as its boundary passed) counts from when the world day started, so a boundary it missed
+            # runs right away instead of the next day. Any other server counts from now.
+            caught_up = server.last_day_change_day is not None and server.last_day_change_day >= world_day
+            last = now if caught_up or world_day_started is None else min(world_day_started, now)
+            self._last_scheduled[server.discord_id] = last
+        boundary = get_next_day_change(server.timezone, server.day_boundary_minute, last - timedelta(seconds=jitter))
+        return boundary + timedelta(seconds=jitter)
+
+    async def _deliver(self):
+        """Post the summaries of the queued server day changes as they finish, forever."""
+
+        async def post(summaries: dict[int, DayChangeSummary]):
+            await post_day_change_summaries(self.bot, summaries)
 
-    async def run_once():
-        logger.info("Changing day...")
-        summaries = await run_day_change()
-        await post_day_change_summaries(bot, summaries)
+        while True:
+            try:
+                await deliver_queued_server_day_changes(post)
+            except Exception:
+                logger.exception("Couldn't post the summaries of the finished server day changes")
+            await asyncio.sleep(DELIVERY_POLL_SECONDS)
 
+    async def _requeue(self):
+        """Give back the server day changes of workers that stopped responding, forever."""
+
+        while True:
+            try:
+                if requeued := await requeue_stale_server_day_changes():
+                    logger.warning(f"Gave back {requeued} server day change(s) of workers that stopped responding")
+            except Exception:
+                logger.exception("Couldn't give back the stale server day changes")
+            await asyncio.sleep(REQUEUE_SECONDS)
+
+    async def run(self):
+        tasks = [asyncio.create_task(loop()) for loop in (self._schedule, self._deliver, self._requeue)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _schedule(self):
+        # a new leader picks up after the last world day change that ran, not from now, so a midnight that passed while
+        # the leader was changing (like in a rolling deploy or a failover) still runs, late, instead of being skipped
+        _, last_world_change = await get_world_day_schedule()
+        next_world_change = get_next_day_change(self.world_timezone, 0, last_world_change or datetime.now(timezone.utc))
+
+        while True:
+            # every server's next day change, with the world's first when they're at the same time
+            schedule: list[tuple[datetime, int, Optional[int]]] = [(next_world_change, 0, None)]
+            world_day, world_day_started = await get_world_day_schedule()
+            now = datetime.now(timezone.utc)
+            for server in await list_all_servers():
+                when = self._next_server_change(server, now, world_day, world_day_started)
+                schedule.append((when, 1, server.discord_id))
+            schedule.sort()
+
+            first = schedule[0][0]
+            if (first - datetime.now(timezone.utc)).total_seconds() > REPLAN_SECONDS:
+                await asyncio.sleep(REPLAN_SECONDS)
+                continue
+
+            bucket_end = first + timedelta(seconds=BUCKET_SECONDS)
+            for when, _, server_discord_id in schedule:
+                if when >= bucket_end:
+                    break
+                await _sleep_until(when)
+
+                if server_discord_id is None:
+                    logger.info("Changing world day...")
+                    if await run_world_day_change(scheduled_for=when) is None:
+                        logger.warning("The world day change was already run by another process. Skipping it...")
+                    next_world_change = get_next_day_change(self.world_timezone, 0, when)
+                    continue
+
+                self._last_scheduled[server_discord_id] = when
+                try:
+                    await enqueue_server_day_changes([server_discord_id], scheduled_for=when)
+                except Exception:
+                    logger.exception(f"Couldn't queue the day change of server with ID '{server_discord_id}'")
+
+
+async def day_change_runner(
+    bot: discord.Client, *, stage: str, tz: str = "America/New_York", jitter_seconds: float = DEFAULT_JITTER_SECONDS
+):
     if stage == "dev":
         logger.info("Beginning day change loop as DEV...")
         while True:
-            await run_once()
+            logger.info("Changing day...")
+            summaries = await run_day_change()
+            await post_day_change_summaries(bot, summaries)
             await asyncio.sleep(60)
     else:
         logger.info("Beginning day change loop as PROD...")
-        while True:
-            now = datetime.now(tz=zone)
-            tomorrow = (now + timedelta(days=1)).date()
-            midnight = datetime.combine(tomorrow, time(0, 0), tzinfo=zone)
-            sleep_seconds = max((midnight - now).total_seconds(), 1.0)
-            await asyncio.sleep(sleep_seconds)
-            await run_once()
+        await DayChangeScheduler(bot, world_timezone=tz, jitter_seconds=jitter_seconds).run()
+
+
+async def lead_day_change_runner(
+    bot: discord.Client, *, stage: str, tz: str = "America/New_York", jitter_seconds: float = DEFAULT_JITTER_SECONDS
+):
+    """Run the day change loop while this process is the day change leader (see `game.lead_day_changes`)."""
+
+    await lead_day_changes(lambda: day_change_runner(bot, stage=stage, tz=tz, jitter_seconds=jitter_seconds))
@@ -0,0 +1,34 @@
+import functools
+
+from discord.http import HTTPClient, Route
+from discord.webhook.async_ import AsyncWebhookAdapter
+
+from tracing import span
+
+_INSTALLED = False
+
+
+def _traced_request(request):
+    @functools.wraps(request)
+    async def call(self, route: Route, *args, **kwargs):
+        # the path is the route's template (like `/channels/{channel_id}/messages`), so spans group by endpoint
+        with span(f"{route.method} {route.path}", "discord"):
+            return await request(self, route, *args, **kwargs)
+
+    return call
+
+
+def trace_discord_requests():
+    """
+    Make every request to the Discord API a span (see `tracing`), including interaction responses and edits.
+    """
+
+    global _INSTALLED
+    if _INSTALLED:
+        return
+
+    # discord.py has no public hook around its requests, so this wraps the two methods every request goes through:
+    # the bot's HTTP client, and the webhook adapter interaction responses (and their edits) are sent with
+    HTTPClient.request = _traced_request(HTTPClient.request)
+    AsyncWebhookAdapter.request = _traced_request(AsyncWebhookAdapter.request)
+    _INSTALLED = True
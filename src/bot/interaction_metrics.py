@@ -0,0 +1,45 @@
+import time
+
+import discord
+from discord import app_commands
+
+from metrics import counter, histogram
+from profiling import profiled
+from tracing import span
+
+INTERACTION_SECONDS = histogram(
+    "pimpy_interaction_seconds",
+    "How long the bot took to handle an interaction, by kind (command or component) and name.",
+    ("kind", "name"),
+)
+INTERACTION_ERRORS = counter(
+    "pimpy_interaction_errors_total",
+    "Interactions that failed, by kind (command or component) and name.",
+    ("kind", "name"),
+)
+
+
+class MetricsCommandTree(app_commands.CommandTree):
+    """
+    A command tree that records how long every application command takes, and whether it failed.
+    Every command is the root span of a trace (see `tracing`), and slow commands are profiled (see `profiling`).
+    """
+
+    # discord.py has no public hook around a whole command invocation, so this wraps the one that dispatches it
+    async def _call(self, interaction: discord.Interaction):
+        command = interaction.command
+        name = command.qualified_name if command is not None else "unknown"
+
+        start = time.perf_counter()
+        failed = True
+        try:
+            with (
+                span(f"command:{name}", "interaction", user_id=interaction.user.id, guild_id=interaction.guild_id),
+                profiled(f"command:{name}", "interaction"),
+            ):
+                await super()._call(interaction)
+            failed = interaction.command_failed
+        finally:
+            INTERACTION_SECONDS.labels("command", name).observe(time.perf_counter() - start)
+            if failed:
+                INTERACTION_ERRORS.labels("command", name).inc()
@@ -0,0 +1,41 @@
+import time
+from typing import Any
+
+import discord
+from discord.ui import Item, View
+
+from bot.interaction_metrics import INTERACTION_ERRORS, INTERACTION_SECONDS
+from profiling import profiled
+from tracing import span
+
+
+def _component_name(view: View, item: Item[Any]) -> str:
+    """Name a component by its view and callback (like `PaginatorView._on_next`), which is bounded, unlike its ID."""
+
+    callback = getattr(item.callback, "__name__", "callback")
+    return f"{type(view).__name__}.{type(item).__name__ if callback == 'callback' else callback}"
+
+
+class InstrumentedView(View):
+    """
+    A view that records how long every component interaction on it takes, and whether it failed.
+    Every interaction is the root span of a trace (see `tracing`), and slow interactions are profiled
+    (see `profiling`).
+    """
+
+    # discord.py has no public hook around a whole component callback, so this wraps the one that runs it
+    async def _scheduled_task(self, item: Item[Any], interaction: discord.Interaction):
+        name = _component_name(self, item)
+        start = time.perf_counter()
+        try:
+            with (
+                span(f"component:{name}", "interaction", user_id=interaction.user.id, guild_id=interaction.guild_id),
+                profiled(f"component:{name}", "interaction"),
+            ):
+                await super()._scheduled_task(item, interaction)
+        finally:
+            INTERACTION_SECONDS.labels("component", name).observe(time.perf_counter() - start)
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception, item: Item[Any]):
+        INTERACTION_ERRORS.labels("component", _component_name(self, item)).inc()
+        await super().on_error(interaction, error, item)
@@ -1,24 +1,131 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Protocol
+
 import discord
 from discord.ui import View, Button
-from typing import Optional, Protocol
 
-from bot.ui.util import edit_interaction
+from bot.ui.util import edit_interaction, run_deferrable
+
+from .instrumented_view import InstrumentedView
 
 
 class PageSource(Protocol):
     async def load(self): ...
     def page_count(self) -> int: ...
-    async def render(self, view: View, page_index: int) -> tuple[Optional[str], Optional[discord.Embed]]: ...
+    async def fetch(self, page_index: int) -> Any: ...
+    def render(self, page_index: int, data: Any) -> tuple[Optional[str], Optional[discord.Embed]]: ...
+    def attach(self, view: View, page_index: int, data: Any): ...
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    data: Any
+    content: Optional[str]
+    embed: Optional[discord.Embed]
+
+
+class PageCache(Protocol):
+    def get(self, page_index: int) -> Optional[CachedPage]: ...
+    def put(self, page_index: int, page: CachedPage): ...
+    def invalidate(self, page_index: int): ...
+    def clear(self): ...
+
+
+class LRUPageCache(PageCache):
+    """
+    A bounded page cache that evicts the least recently used page once full.
+    Pages older than `ttl` seconds are treated as missing, so a long-lived view can't serve stale data forever.
+    """
+
+    def __init__(self, *, max_pages: int = 16, ttl: Optional[float] = 60.0):
+        self._max_pages = max_pages
+        self._ttl = ttl
+        self._pages: OrderedDict[int, tuple[float, CachedPage]] = OrderedDict()
+
+    def get(self, page_index: int) -> Optional[CachedPage]:
+        entry = self._pages.get(page_index)
+        if entry is None:
+            return None
+
+        stored_at, page = entry
+        if self._ttl is not None and time.monotonic() - stored_at > self._ttl:
+            del self._pages[page_index]
+            return None
+
+        self._pages.move_to_end(page_index)
+        return page
+
+    def put(self, page_index: int, page: CachedPage):
+        self._pages[page_index] = (time.monotonic(), page)
+        self._pages.move_to_end(page_index)
+        while len(self._pages) > self._max_pages:
+            self._pages.popitem(last=False)
+
+    def invalidate(self, page_index: int):
+        self._pages.pop(page_index, None)
 
+    def clear(self):
+        self._pages.clear()
 
-class PaginatorView(View):
 
-    def __init__(self, source: PageSource, owner_discord_id: int, *, timeout: float = 300):
+class KeysetPageSource(PageSource):
+    """
+    A page source over a keyset-paginated listing, holding only a total count and one cursor per visited page.
+    Subclasses implement `count`, `fetch_after` and `cursor_of`, along with `render` and `attach`.
+    """
+
+    def __init__(self, *, page_size: int):
+        self.page_size = page_size
+        self._count = 0
+        self._cursors: dict[int, Any] = {0: None}
+
+    async def load(self):
+        self._count = await self.count()
+        self._cursors = {0: None}
+
+    def page_count(self) -> int:
+        return max(-(-self._count // self.page_size), 1)
+
+    async def fetch(self, page_index: int) -> list[Any]:
+        # walk forward from the nearest page we know the cursor for (normally the previous one)
+        start = max(index for index in self._cursors if index <= page_index)
+        items: list[Any] = []
+        for index in range(start, page_index + 1):
+            items = await self.fetch_after(self._cursors[index], self.page_size)
+            if not items:
+                break
+            self._cursors[index + 1] = self.cursor_of(items[-1])
+        return items
+
+    async def count(self) -> int: ...
+    async def fetch_after(self, cursor: Any, limit: int) -> list[Any]: ...
+    def cursor_of(self, item: Any) -> Any: ...
+
+
+class PaginatorView(InstrumentedView):
+
+    def __init__(
+        self,
+        source: PageSource,
+        owner_discord_id: int,
+        *,
+        timeout: float = 300,
+        cache: Optional[PageCache] = None,
+        prefetch: int = 1,
+    ):
         super().__init__(timeout=timeout)
         self._source = source
         self._owner_id = owner_discord_id
         self._page = 0
 
+        self._cache = cache if cache is not None else LRUPageCache()
+        self._prefetch = prefetch
+        self._pending: dict[int, asyncio.Task[CachedPage]] = {}
+        self._generation = 0
+
         self._prev = Button(label="◀", style=discord.ButtonStyle.secondary, disabled=True)
         self._next = Button(label="▶", style=discord.ButtonStyle.secondary, disabled=True)
         self._prev.callback = self._on_prev  # type: ignore
@@ -30,14 +137,72 @@ class PaginatorView(View):
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         return interaction.user.id == self._owner_id
 
+    @property
+    def page(self) -> int:
+        return self._page
+
     async def start(self, interaction: discord.Interaction):
-        await self._source.load()
         self._page = 0
-        await self._render(interaction)
+        await self._render(interaction, reload=True)
 
-    async def refresh(self, interaction: discord.Interaction):
-        await self._source.load()
-        await self._render(interaction)
+    async def refresh(self, interaction: discord.Interaction, *, page_indexes: Optional[Iterable[int]] = None):
+        """
+        Re-render the current page after the underlying data changed.
+
+        Parameters
+        ----------
+        interaction: discord.Interaction
+            The interaction to respond to with the re-rendered page.
+
+        page_indexes: Iterable[int], optional
+            The pages whose data changed. Only those pages are dropped from the cache.
+            If not given, the source is reloaded and every cached page is dropped.
+        """
+
+        if page_indexes is None:
+            self.invalidate()
+        else:
+            for page_index in page_indexes:
+                self.invalidate(page_index)
+        await self._render(interaction, reload=page_indexes is None)
+
+    def invalidate(self, page_index: Optional[int] = None):
+        """
+        Drop a page (or every page, if no index is given) from the cache, cancelling any prefetch in flight for it.
+        """
+
+        if page_index is None:
+            self._generation += 1
+            for task in self._pending.values():
+                task.cancel()
+            self._pending.clear()
+            self._cache.clear()
+            return
+
+        task = self._pending.pop(page_index, None)
+        if task is not None:
+            task.cancel()
+        self._cache.invalidate(page_index)
+
+    async def draw(self) -> tuple[Optional[str], Optional[discord.Embed]]:
+        """
+        Rebuild the components for the current page and return its content and embed, without editing any message.
+        Serves the page from the cache when possible, then schedules prefetches of the neighbouring pages.
+        """
+
+        self._clamp_page()
+        self.clear_items()
+        self.add_item(self._prev)
+        self.add_item(self._next)
+        self._update_nav_disabled()
+
+        page = await self._get_page(self._page)
+        self._source.attach(self, self._page, page.data)
+        self._schedule_prefetch()
+        return page.content, page.embed
+
+    async def on_timeout(self):
+        self.invalidate()
 
     def _clamp_page(self):
         max_page = max(self._source.page_count() - 1, 0)
@@ -48,13 +213,60 @@ class PaginatorView(View):
         self._prev.disabled = (count <= 1) or (self._page <= 0)
         self._next.disabled = (count <= 1) or (self._page >= count - 1)
 
-    async def _render(self, interaction: discord.Interaction):
-        self._clamp_page()
-        self.clear_items()
-        self.add_item(self._prev)
-        self.add_item(self._next)
-        self._update_nav_disabled()
-        content, embed = await self._source.render(self, self._page)
+    async def _get_page(self, page_index: int) -> CachedPage:
+        while True:
+            page = self._cache.get(page_index)
+            if page is not None:
+                return page
+
+            task = self._pending.get(page_index)
+            if task is None:
+                task = self._start_fetch(page_index)
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                # the fetch was invalidated while we waited on it, so fetch again unless we were cancelled ourselves
+                current = asyncio.current_task()
+                if not task.cancelled() or (current is not None and current.cancelling()):
+                    raise
+
+    def _start_fetch(self, page_index: int) -> asyncio.Task[CachedPage]:
+        task = asyncio.create_task(self._fetch_page(page_index, self._generation))
+        self._pending[page_index] = task
+        task.add_done_callback(lambda done: self._forget_pending(page_index, done))
+        return task
+
+    def _forget_pending(self, page_index: int, task: asyncio.Task[CachedPage]):
+        if self._pending.get(page_index) is task:
+            del self._pending[page_index]
+        if not task.cancelled():
+            task.exception()  # prefetch failures are retried on demand, so don't let them go unretrieved
+
+    async def _fetch_page(self, page_index: int, generation: int) -> CachedPage:
+        data = await self._source.fetch(page_index)
+        content, embed = self._source.render(page_index, data)
+        page = CachedPage(data=data, content=content, embed=embed)
+        if generation == self._generation:
+            self._cache.put(page_index, page)
+        return page
+
+    def _schedule_prefetch(self):
+        count = self._source.page_count()
+        for offset in range(1, self._prefetch + 1):
+            for page_index in (self._page + offset, self._page - offset):
+                if not 0 <= page_index < count:
+                    continue
+                if page_index in self._pending or self._cache.get(page_index) is not None:
+                    continue
+                self._start_fetch(page_index)
+
+    async def _render(self, interaction: discord.Interaction, *, reload: bool = False):
+        async def load() -> tuple[Optional[str], Optional[discord.Embed]]:
+            if reload:
+                await self._source.load()
+            return await self.draw()
+
+        content, embed = await run_deferrable(interaction, load)
         await edit_interaction(interaction, content=content, embed=embed, view=self)
 
     async def _on_prev(self, interaction: discord.Interaction):
@@ -2,18 +2,20 @@ import discord
 from discord.ui import Button, Select, View
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
+from game import get_pooches_by_ids
+
 from .pooch_info import PoochInfoView
 from .components.paginator import PageSource, PaginatorView
-from bot.ui.util import edit_interaction
+from bot.ui.util import edit_interaction, run_deferrable
 
 if TYPE_CHECKING:
     from game.model import Server, Pooch
 
 
 class DayChangeStatusPageSource(PageSource):
-    def __init__(self, *, server: Server, pooches: List[Pooch], title: str, description: str):
+    def __init__(self, *, server: Server, pooch_ids: List[int], title: str, description: str):
         self.server = server
-        self.pooches = pooches
+        self.pooch_ids = pooch_ids
         self.title = title
         self.description = description
 
@@ -21,24 +23,28 @@ class DayChangeStatusPageSource(PageSource):
         return
 
     def page_count(self) -> int:
-        return max((len(self.pooches) + 9) // 10, 1)
+        return max((len(self.pooch_ids) + 9) // 10, 1)
+
+    async def fetch(self, page_index: int) -> List[Pooch]:
+        start = page_index * 10
+        return await get_pooches_by_ids(self.pooch_ids[start : start + 10])
 
-    async def render(self, view: View, page_index: int) -> Tuple[Optional[str], Optional[discord.Embed]]:
+    def render(self, page_index: int, data: List[Pooch]) -> Tuple[Optional[str], Optional[discord.Embed]]:
         start = page_index * 10
-        end = min(start + 10, len(self.pooches))
-        pooches = self.pooches[start:end]
+        end = start + len(data)
 
         embed = discord.Embed(title=self.title, description=self.description)
 
         embed.add_field(
-            name=f"Mentioned Pooches ({start + 1}-{end} of {len(self.pooches)})",
-            value="\n".join(f"• {pooch.name}" for pooch in pooches) or "None",
+            name=f"Mentioned Pooches ({start + 1}-{end} of {len(self.pooch_ids)})",
+            value="\n".join(f"• {pooch.name}" for pooch in data) or "None",
             inline=False,
         )
+        return None, embed
 
-        controls = _StatusControls(server=self.server, pooches=pooches)
+    def attach(self, view: View, page_index: int, data: List[Pooch]):
+        controls = _StatusControls(server=self.server, pooches=data)
         controls.attach(view)
-        return None, embed
 
 
 class _StatusControls:
@@ -75,8 +81,8 @@ class _StatusControls:
         if self.selected_pooch is None:
             return
         info_view = PoochInfoView(server=self.server, pooch=self.selected_pooch, owner=None)
-        embed = await info_view.build_embed()
-        await interaction.response.edit_message(embed=embed, view=info_view)
+        embed = await run_deferrable(interaction, info_view.build_embed)
+        await edit_interaction(interaction, embed=embed, view=info_view)
 
 
 class PublicPaginatorView(PaginatorView):
@@ -87,6 +93,6 @@ class PublicPaginatorView(PaginatorView):
         return True
 
 
-def make_status_view(*, server: Server, pooches: List[Pooch], title: str, description: str) -> PublicPaginatorView:
-    source = DayChangeStatusPageSource(server=server, pooches=pooches, title=title, description=description)
+def make_status_view(*, server: Server, pooch_ids: List[int], title: str, description: str) -> PublicPaginatorView:
+    source = DayChangeStatusPageSource(server=server, pooch_ids=pooch_ids, title=title, description=description)
     return PublicPaginatorView(source)
@@ -0,0 +1,43 @@
+import discord
+from discord.ui import View
+from typing import Optional
+
+from game import DayEventCursor, count_server_history, list_server_history_page
+from game.model import DayEvent
+
+from .components.paginator import KeysetPageSource
+
+
+class HistoryPageSource(KeysetPageSource):
+    def __init__(self, *, server_discord_id: int):
+        super().__init__(page_size=10)
+        self.server_discord_id = server_discord_id
+
+    async def count(self) -> int:
+        return await count_server_history(self.server_discord_id)
+
+    async def fetch_after(self, cursor: Optional[DayEventCursor], limit: int) -> list[DayEvent]:
+        return await list_server_history_page(self.server_discord_id, limit, cursor)
+
+    def cursor_of(self, item: DayEvent) -> DayEventCursor:
+        return (item.day, item.id)
+
+    def render(self, page_index: int, data: list[DayEvent]) -> tuple[Optional[str], Optional[discord.Embed]]:
+        if not data:
+            return None, discord.Embed(title="📜 History", description="Nothing has happened here yet.")
+
+        return None, discord.Embed(
+            title="📜 History",
+            description="\n".join(_describe(event) for event in data),
+        )
+
+    def attach(self, view: View, page_index: int, data: list[DayEvent]):
+        return
+
+
+def _describe(event: DayEvent) -> str:
+    if event.kind == "death":
+        return f"**Day {event.day}** · 💀 {event.pooch_name} died."
+    if event.detail is not None:
+        return f"**Day {event.day}** · 🥀 {event.other_pooch_name}'s baby {event.pooch_name} was lost. {event.detail}"
+    return f"**Day {event.day}** · 🐣 {event.pooch_name} was born to {event.other_pooch_name}."
@@ -1,14 +1,15 @@
 import discord
-from discord.ui import View, Select
+from discord.ui import Select
 
 from bot.ui.util import edit_interaction
 
 from .kennels import KennelsPageSource
 from .vendors import VendorsPageSource
+from .components.instrumented_view import InstrumentedView
 from .components.paginator import PaginatorView
 
 
-class HomeView(View):
+class HomeView(InstrumentedView):
     def __init__(self):
         super().__init__(timeout=300)
         self.add_item(NavigationSelect())
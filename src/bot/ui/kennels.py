@@ -2,41 +2,66 @@ import discord
 from discord.ui import Select, Button, View
 from typing import Optional
 
-from bot.ui.util import edit_interaction
+from bot.ui.util import SELECT_OPTION_LIMIT, edit_interaction, run_deferrable
 from game.model import Kennel, Pooch
 
-from .components.paginator import PageSource
+from .components.paginator import KeysetPageSource
 from .pooch_info import PoochInfoView
 
-from game import get_or_create_owner, get_or_create_server, list_kennel_pooches, list_owner_kennels
+from game import (
+    Cursor,
+    count_kennel_pooches,
+    count_owner_kennels,
+    get_or_create_owner,
+    get_or_create_server,
+    list_kennel_pooches_page,
+    list_owner_kennels_page,
+)
 
 
-class KennelsPageSource(PageSource):
+class KennelsPageSource(KeysetPageSource):
     def __init__(self, *, server_discord_id: int, owner_discord_id: int):
+        super().__init__(page_size=1)
         self.server_discord_id = server_discord_id
         self.owner_discord_id = owner_discord_id
-        self._kennels: list[Kennel] = []
 
-    async def load(self):
-        self._kennels = await list_owner_kennels(self.owner_discord_id)
+    async def count(self) -> int:
+        return await count_owner_kennels(self.owner_discord_id)
 
-    def page_count(self) -> int:
-        return max(len(self._kennels), 1)
+    async def fetch_after(self, cursor: Optional[Cursor], limit: int) -> list[Kennel]:
+        return await list_owner_kennels_page(self.owner_discord_id, limit, cursor)
 
-    async def render(self, view: View, page_index: int) -> tuple[Optional[str], Optional[discord.Embed]]:
-        if not self._kennels:
+    def cursor_of(self, item: Kennel) -> Cursor:
+        return (item.created_at, item.id)
+
+    async def fetch(self, page_index: int) -> Optional[tuple[Kennel, list[Pooch], int]]:
+        kennels = await super().fetch(page_index)
+        if not kennels:
+            return None
+
+        kennel = kennels[0]
+        pooches = await list_kennel_pooches_page(kennel.id, SELECT_OPTION_LIMIT)
+        pooch_count = len(pooches) if len(pooches) < SELECT_OPTION_LIMIT else await count_kennel_pooches(kennel.id)
+        return kennel, pooches, pooch_count
+
+    def render(
+        self, page_index: int, data: Optional[tuple[Kennel, list[Pooch], int]]
+    ) -> tuple[Optional[str], Optional[discord.Embed]]:
+        if data is None:
             return None, discord.Embed(title="Kennels", description="You don't have any kennels yet.")
 
-        kennel = self._kennels[page_index]
-        pooches = await list_kennel_pooches(kennel.id)
+        kennel, _, pooch_count = data
+        return None, discord.Embed(title=kennel.name, description=f"{pooch_count} / {kennel.pooch_limit} pooches")
 
-        embed = discord.Embed(title=kennel.name, description=f"{len(pooches)} / {kennel.pooch_limit} pooches")
+    def attach(self, view: View, page_index: int, data: Optional[tuple[Kennel, list[Pooch], int]]):
+        if data is None:
+            return
 
+        _, pooches, _ = data
         controls = KennelPageControls(
             server_discord_id=self.server_discord_id, owner_discord_id=self.owner_discord_id, pooches=pooches
         )
         controls.attach(view)
-        return None, embed
 
 
 class KennelPageControls:
@@ -91,10 +116,15 @@ class KennelPageControls:
     async def _on_info(self, interaction: discord.Interaction):
         if self.selected_pooch is None:
             return
-        server = await get_or_create_server(self.server_discord_id)
-        owner = await get_or_create_owner(self.server_discord_id, self.owner_discord_id)
-        view = PoochInfoView(server=server, pooch=self.selected_pooch, owner=owner)
-        embed = await view.build_embed()
+        pooch = self.selected_pooch
+
+        async def load() -> tuple[PoochInfoView, discord.Embed]:
+            server = await get_or_create_server(self.server_discord_id)
+            owner = await get_or_create_owner(self.server_discord_id, self.owner_discord_id)
+            view = PoochInfoView(server=server, pooch=pooch, owner=owner)
+            return view, await view.build_embed()
+
+        view, embed = await run_deferrable(interaction, load)
         await edit_interaction(interaction, embed=embed, view=view)
 
     async def _noop(self, interaction: discord.Interaction):
@@ -1,9 +1,10 @@
 import discord
-from discord.ui import View, Select, Button
+from discord.ui import Select, Button
 from typing import TYPE_CHECKING, Optional, Sequence
 
 from game import get_pooch_family
-from bot.ui.util import edit_interaction, mention
+from bot.ui.util import edit_interaction, mention, run_deferrable
+from .components.instrumented_view import InstrumentedView
 
 if TYPE_CHECKING:
     from game.model import Server, Pooch, Owner
@@ -21,7 +22,7 @@ class _FamilySelect(Select):
         self._members = list(members)
 
 
-class PoochInfoView(View):
+class PoochInfoView(InstrumentedView):
     def __init__(self, *, server: Server, pooch: Pooch, owner: Optional[Owner], timeout: float = 300):
         super().__init__(timeout=timeout)
         self.server = server
@@ -124,7 +125,7 @@ class PoochInfoView(View):
         if pooch is None:
             return
         self.pooch = pooch
-        embed = await self.build_embed()
+        embed = await run_deferrable(interaction, self.build_embed)
         await edit_interaction(interaction, embed=embed, view=self)
 
     async def _open_child(self, interaction: discord.Interaction):
@@ -132,7 +133,7 @@ class PoochInfoView(View):
         if pooch is None:
             return
         self.pooch = pooch
-        embed = await self.build_embed()
+        embed = await run_deferrable(interaction, self.build_embed)
         await edit_interaction(interaction, embed=embed, view=self)
 
     async def _open_sibling(self, interaction: discord.Interaction):
@@ -140,5 +141,5 @@ class PoochInfoView(View):
         if pooch is None:
             return
         self.pooch = pooch
-        embed = await self.build_embed()
+        embed = await run_deferrable(interaction, self.build_embed)
         await edit_interaction(interaction, embed=embed, view=self)
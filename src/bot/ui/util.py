@@ -1,8 +1,35 @@
 import asyncio
-from typing import Any, Callable, Optional
+import time
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
 
 import discord
 
+from logger import get_logger
+from metrics import counter
+
+log = get_logger("ui")
+
+T = TypeVar("T")
+
+# Discord rejects select menus with more options than this.
+SELECT_OPTION_LIMIT = 25
+
+# How long after an interaction is created its work can run before it's deferred. Discord fails an interaction
+# that isn't responded to within 3 seconds, so this leaves room for the deferral itself to get there.
+DEFER_BUDGET_SECONDS = 2.0  # TODO
+
+# The most interaction work run at once. Anything more waits for a slot.
+MAX_CONCURRENT_WORK = 16  # TODO
+
+# How quickly the estimate of how long some work takes follows its latest runs (from 0 to 1).
+ESTIMATE_SMOOTHING = 0.2  # TODO
+
+INTERACTION_DEFERRALS = counter(
+    "pimpy_interaction_deferrals_total",
+    "Interactions deferred because their work was slow (or was expected to be), by work.",
+    ("work",),
+)
+
 
 async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
     return await asyncio.to_thread(fn, *args, **kwargs)
@@ -27,3 +54,129 @@ async def edit_interaction(
         await interaction.edit_original_response(content=content, embed=embed, view=view)
     else:
         await interaction.response.edit_message(content=content, embed=embed, view=view)
+
+
+async def send_interaction(interaction: discord.Interaction, content: str, *, ephemeral: bool = False):
+    """
+    Send a message in reply to an interaction safely, as its response if it hasn't had one yet
+    (or as a followup if it has, like after being deferred).
+    """
+
+    if interaction.response.is_done():
+        await interaction.followup.send(content, ephemeral=ephemeral)
+    else:
+        await interaction.response.send_message(content, ephemeral=ephemeral)
+
+
+class OrderedExecutor:
+    """
+    Runs work in background tasks, at most `max_concurrency` at a time, and one at a time in the order it was
+    submitted for each key (so two quick clicks by the same user can't race each other).
+    """
+
+    def __init__(self, max_concurrency: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tails: dict[Hashable, asyncio.Task[Any]] = {}
+
+    def submit(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> asyncio.Task[T]:
+        """
+        Run some work once the work submitted before it with the same key is done, and a slot is free.
+
+        Parameters
+        ----------
+        key: Hashable
+            What to order the work by, like a user's Discord ID.
+
+        work: Callable[[], Awaitable[T]]
+            The work to run.
+
+        Returns
+        -------
+        asyncio.Task[T]
+            The task running the work.
+        """
+
+        previous = self._tails.get(key)
+        task = asyncio.create_task(self._run(previous, work))
+        self._tails[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return task
+
+    async def _run(self, previous: Optional[asyncio.Task[Any]], work: Callable[[], Awaitable[T]]) -> T:
+        if previous is not None:
+            await asyncio.wait({previous})  # its result (or error) belongs to whoever submitted it
+        async with self._semaphore:
+            return await work()
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]):
+        if self._tails.get(key) is task:
+            del self._tails[key]
+
+
+# The executor all interaction work runs on, ordered by user.
+INTERACTION_EXECUTOR = OrderedExecutor(MAX_CONCURRENT_WORK)
+
+# How long each kind of work has been taking (in seconds), by name.
+_ESTIMATES: dict[str, float] = {}
+
+
+async def _defer(interaction: discord.Interaction, *, ephemeral: bool):
+    try:
+        if interaction.type == discord.InteractionType.component:
+            # acknowledge the click without a visible reply, the result edits the message it was on
+            await interaction.response.defer()
+        else:
+            await interaction.response.defer(thinking=True, ephemeral=ephemeral)
+    except discord.InteractionResponded:
+        pass
+    except discord.HTTPException:
+        log.warning(f"Couldn't defer interaction {interaction.id}, it probably expired already")
+
+
+async def run_deferrable(
+    interaction: discord.Interaction, work: Callable[[], Awaitable[T]], *, ephemeral: bool = False
+) -> T:
+    """
+    Run the work an interaction needs before it can respond, deferring the interaction if the work takes
+    (or is expected to take) too long to respond in time. Respond afterwards with `edit_interaction` or
+    `send_interaction`, which pick the right way to respond whether or not the interaction was deferred.
+
+    The work runs on `INTERACTION_EXECUTOR`, after any work the same user started before it.
+
+    Parameters
+    ----------
+    interaction: discord.Interaction
+        The interaction the work is for.
+
+    work: Callable[[], Awaitable[T]]
+        The work to run, like a game function call that reads from the database.
+
+    ephemeral: bool, default: False
+        Whether the response to a deferred command will be ephemeral (it can't be changed after deferring).
+
+    Returns
+    -------
+    T
+        What the work returned.
+    """
+
+    name = getattr(work, "__qualname__", type(work).__name__)
+    start = time.perf_counter()
+    task = INTERACTION_EXECUTOR.submit(interaction.user.id, work)
+
+    if not interaction.response.is_done():
+        elapsed = max((discord.utils.utcnow() - interaction.created_at).total_seconds(), 0.0)
+        remaining = DEFER_BUDGET_SECONDS - elapsed
+        # don't wait for work that's been taking longer than there's time left, defer right away
+        if _ESTIMATES.get(name, 0.0) < remaining:
+            await asyncio.wait({task}, timeout=remaining)
+        if not task.done() and not interaction.response.is_done():
+            INTERACTION_DEFERRALS.labels(name).inc()
+            await _defer(interaction, ephemeral=ephemeral)
+
+    try:
+        return await task
+    finally:
+        seconds = time.perf_counter() - start
+        estimate = _ESTIMATES.get(name)
+        _ESTIMATES[name] = seconds if estimate is None else estimate + ESTIMATE_SMOOTHING * (seconds - estimate)
@@ -2,15 +2,16 @@ import discord
 from discord.ui import Select, Button, View
 from typing import Optional
 
-from bot.ui.util import edit_interaction
+from bot.ui.util import SELECT_OPTION_LIMIT, edit_interaction, run_deferrable, send_interaction
 from game.model import Pooch, Vendor
 from game import (
     buy_pooch,
+    count_vendor_pooches,
     get_or_create_owner,
     get_or_create_server,
     get_pooch_price,
     list_server_vendors,
-    list_vendor_pooches,
+    list_vendor_pooches_page,
 )
 
 from .components.paginator import PageSource, PaginatorView
@@ -29,23 +30,36 @@ class VendorsPageSource(PageSource):
     def page_count(self) -> int:
         return max(len(self._vendors), 1)
 
-    async def render(self, view: View, page_index: int) -> tuple[Optional[str], Optional[discord.Embed]]:
+    async def fetch(self, page_index: int) -> tuple[list[Pooch], int]:
+        if not self._vendors:
+            return [], 0
+
+        vendor_id = self._vendors[page_index].id
+        pooches = await list_vendor_pooches_page(vendor_id, SELECT_OPTION_LIMIT)
+        pooch_count = len(pooches) if len(pooches) < SELECT_OPTION_LIMIT else await count_vendor_pooches(vendor_id)
+        return pooches, pooch_count
+
+    def render(self, page_index: int, data: tuple[list[Pooch], int]) -> tuple[Optional[str], Optional[discord.Embed]]:
         if not self._vendors:
             return None, discord.Embed(title="Vendors", description="There are no vendors in this server yet.")
 
         vendor = self._vendors[page_index]
-        pooches = await list_vendor_pooches(vendor.id)
+        _, pooch_count = data
+        return None, discord.Embed(title=vendor.name, description=f"{pooch_count} pooches for sale")
 
-        embed = discord.Embed(title=vendor.name, description=f"{len(pooches)} pooches for sale")
+    def attach(self, view: View, page_index: int, data: tuple[list[Pooch], int]):
+        if not self._vendors:
+            return
 
+        pooches, _ = data
         controls = VendorPageControls(
             server_discord_id=self.server_discord_id,
             owner_discord_id=self.owner_discord_id,
-            vendor=vendor,
+            vendor=self._vendors[page_index],
             pooches=pooches,
+            page_index=page_index,
         )
         controls.attach(view)
-        return None, embed
 
 
 class VendorPageControls:
@@ -56,11 +70,13 @@ class VendorPageControls:
         owner_discord_id: int,
         vendor: Vendor,
         pooches: list[Pooch],
+        page_index: int,
     ):
         self.server_discord_id = server_discord_id
         self.owner_discord_id = owner_discord_id
         self.vendor = vendor
         self.pooches = pooches
+        self.page_index = page_index
         self.selected_pooch: Optional[Pooch] = None
 
         if not pooches:
@@ -112,28 +128,34 @@ class VendorPageControls:
     async def _on_info(self, interaction: discord.Interaction):
         if self.selected_pooch is None:
             return
-        server = await get_or_create_server(self.server_discord_id)
-        owner = await get_or_create_owner(self.server_discord_id, self.owner_discord_id)
-        view = PoochInfoView(server=server, pooch=self.selected_pooch, owner=owner)
-        embed = await view.build_embed()
+        pooch = self.selected_pooch
+
+        async def load() -> tuple[PoochInfoView, discord.Embed]:
+            server = await get_or_create_server(self.server_discord_id)
+            owner = await get_or_create_owner(self.server_discord_id, self.owner_discord_id)
+            view = PoochInfoView(server=server, pooch=pooch, owner=owner)
+            return view, await view.build_embed()
+
+        view, embed = await run_deferrable(interaction, load)
         await edit_interaction(interaction, embed=embed, view=view)
 
     async def _on_buy(self, interaction: discord.Interaction):
         if self.selected_pooch is None:
             return
 
-        success, message = await buy_pooch(
-            self.owner_discord_id,
-            self.vendor.id,
-            self.selected_pooch.id,
+        pooch_id = self.selected_pooch.id
+        success, message = await run_deferrable(
+            interaction, lambda: buy_pooch(self.owner_discord_id, self.vendor.id, pooch_id), ephemeral=True
         )
 
         # If the purchase failed, tell the user why and keep the menu up.
         if not success:
-            await interaction.response.send_message(message, ephemeral=True)
+            await send_interaction(interaction, message, ephemeral=True)
             return
 
-        # Refresh the existing paginator message to reflect the updated stock.
-        await interaction.response.send_message(f"✅ {message}", ephemeral=True)
+        # Refresh the existing paginator message to reflect the updated stock, before confirming (so the refresh
+        # edits the paginator message and not the confirmation).
+        # Only this vendor's page changed, so every other cached page stays valid.
         if isinstance(interaction.view, PaginatorView):
-            await interaction.view.refresh(interaction)
+            await interaction.view.refresh(interaction, page_indexes=[self.page_index])
+        await send_interaction(interaction, f"✅ {message}", ephemeral=True)
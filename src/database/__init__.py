@@ -1,5 +1,6 @@
 from .get import (
     get_pooch_by_id,
+    get_archived_pooch_by_id,
     get_owner_by_discord_id,
     get_kennel_by_id,
     get_vendor_by_id,
@@ -8,20 +9,67 @@ from .get import (
     get_pooch_parents,
     get_vendor_server,
     get_owner_server,
+    get_world_day,
+    get_last_world_day_change,
 )
 
 from .list import (
+    Cursor,
     list_pooches_for_kennel,
+    list_pooches_for_kennel_page,
+    count_pooches_for_kennel,
     list_kennels_for_owner,
+    list_kennels_for_owner_page,
+    count_kennels_for_owner,
     list_living_pooches,
+    list_living_pooches_page,
+    count_living_pooches,
     list_pooch_children,
+    list_pooch_children_page,
+    count_pooch_children,
     list_pooch_siblings,
+    list_pooch_siblings_page,
     list_pooch_pregnancies,
     list_vendors,
     list_vendor_pooch_stock,
+    list_vendor_pooch_stock_page,
+    count_vendor_pooch_stock,
     list_servers_for_pooch,
     list_owner_servers,
     list_servers,
+    list_pooches_by_ids,
+    list_pooch_rows_by_ids,
+    DayEventCursor,
+    list_server_day_events,
+    list_server_day_events_page,
+    count_server_day_events,
+    list_pooch_day_events,
+    stream_day_events,
+    list_due_events_page,
+    list_mutations,
+    list_day_change_work,
+    list_undelivered_day_change_work,
+)
+
+from .projections import (
+    PoochRow,
+)
+
+from .backend import (
+    BACKEND_FUNCTIONS,
+    get_backend,
+    use_backend,
+)
+
+from .memory import (
+    MemoryBackend,
+)
+
+from .invalidation import (
+    ALL_TABLES,
+    add_invalidation_listener,
+    publish_invalidation,
+    listen_for_invalidations,
 )
 
 from .set import (
@@ -30,19 +78,39 @@ from .set import (
     create_kennel,
     create_vendor,
     create_server,
+    bootstrap_server,
+    bootstrap_servers,
+    bootstrap_owner,
     add_pooch_to_kennel,
     add_owner_to_server,
     add_pooch_to_vendor_stock,
     bury_pooch,
+    log_day_events,
+    add_pregnancy,
+    schedule_events,
+    archive_pooches,
+    enqueue_day_change_work,
 )
 
 from .update import (
-    age_pooch,
-    decrement_pooch_breeding_cooldown,
     set_pooch_dead,
     give_money_to_owner,
     transfer_pooch_to_owner,
+    purchase_pooch,
     set_event_channel_discord_id,
+    set_server_day_schedule,
+    set_servers_command_tree_hash,
+    claim_server_day_change,
+    claim_vendor_restock,
+    advance_world_day,
+    claim_day_change_work,
+    finish_day_change_work,
+    requeue_stale_day_change_work,
+    mark_day_change_work_delivered,
+)
+
+from .leadership import (
+    run_as_leader,
 )
 
 from .delete import (
@@ -50,11 +118,13 @@ from .delete import (
     remove_pooch_from_vendor_stock,
     clear_vendor_pooch_stock,
     delete_pregnancy,
+    clear_due_events,
 )
 
 __all__ = [
     # Get
     "get_pooch_by_id",
+    "get_archived_pooch_by_id",
     "get_owner_by_discord_id",
     "get_kennel_by_id",
     "get_vendor_by_id",
@@ -63,38 +133,95 @@ __all__ = [
     "get_pooch_parents",
     "get_vendor_server",
     "get_owner_server",
+    "get_world_day",
+    "get_last_world_day_change",
     # List
+    "Cursor",
     "list_pooches_for_kennel",
+    "list_pooches_for_kennel_page",
+    "count_pooches_for_kennel",
     "list_kennels_for_owner",
+    "list_kennels_for_owner_page",
+    "count_kennels_for_owner",
     "list_living_pooches",
+    "list_living_pooches_page",
+    "count_living_pooches",
     "list_pooch_children",
+    "list_pooch_children_page",
+    "count_pooch_children",
     "list_pooch_siblings",
+    "list_pooch_siblings_page",
     "list_pooch_pregnancies",
     "list_vendors",
     "list_vendor_pooch_stock",
+    "list_vendor_pooch_stock_page",
+    "count_vendor_pooch_stock",
     "list_servers_for_pooch",
     "list_owner_servers",
     "list_servers",
+    "list_pooches_by_ids",
+    "list_pooch_rows_by_ids",
+    "DayEventCursor",
+    "list_server_day_events",
+    "list_server_day_events_page",
+    "count_server_day_events",
+    "list_pooch_day_events",
+    "stream_day_events",
+    "list_due_events_page",
+    "list_mutations",
+    "list_day_change_work",
+    "list_undelivered_day_change_work",
+    # Projections
+    "PoochRow",
+    # Backend
+    "BACKEND_FUNCTIONS",
+    "get_backend",
+    "use_backend",
+    "MemoryBackend",
+    # Invalidation
+    "ALL_TABLES",
+    "add_invalidation_listener",
+    "publish_invalidation",
+    "listen_for_invalidations",
     # Set
     "create_pooch",
     "create_owner",
     "create_kennel",
     "create_vendor",
     "create_server",
+    "bootstrap_server",
+    "bootstrap_servers",
+    "bootstrap_owner",
     "add_pooch_to_kennel",
     "add_owner_to_server",
     "add_pooch_to_vendor_stock",
     "bury_pooch",
+    "log_day_events",
+    "add_pregnancy",
+    "schedule_events",
+    "archive_pooches",
+    "enqueue_day_change_work",
     # Update
-    "age_pooch",
-    "decrement_pooch_breeding_cooldown",
     "set_pooch_dead",
     "give_money_to_owner",
     "transfer_pooch_to_owner",
+    "purchase_pooch",
     "set_event_channel_discord_id",
+    "set_server_day_schedule",
+    "set_servers_command_tree_hash",
+    "claim_server_day_change",
+    "claim_vendor_restock",
+    "advance_world_day",
+    "claim_day_change_work",
+    "finish_day_change_work",
+    "requeue_stale_day_change_work",
+    "mark_day_change_work_delivered",
+    # Leadership
+    "run_as_leader",
     # Delete
     "remove_pooch_from_kennel",
     "remove_pooch_from_vendor_stock",
     "clear_vendor_pooch_stock",
     "delete_pregnancy",
+    "clear_due_events",
 ]
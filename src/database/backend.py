@@ -0,0 +1,89 @@
+import functools
+import inspect
+from typing import Any, Callable, Optional, TypeVar
+
+from .invalidation import ALL_TABLES, _notify_listeners
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Every function in the repository interface, by name. Filled in by `backend_function`.
+BACKEND_FUNCTIONS: dict[str, Callable[..., Any]] = {}
+
+# The backend every repository function is sent to, or None for Postgres.
+_BACKEND: Optional[Any] = None
+
+
+def backend_function(function: F) -> F:
+    """
+    Make a database function part of the repository interface.
+    While a backend is set with `use_backend`, calls to it are sent to the backend's method with the same name
+    (and the same arguments) instead of to Postgres.
+    """
+
+    name = function.__name__
+    BACKEND_FUNCTIONS[name] = function
+
+    if inspect.isasyncgenfunction(function):
+
+        @functools.wraps(function)
+        async def stream(*args, **kwargs):
+            source = function if _BACKEND is None else getattr(_BACKEND, name)
+            async for item in source(*args, **kwargs):
+                yield item
+
+        return stream
+
+    @functools.wraps(function)
+    async def call(*args, **kwargs):
+        if _BACKEND is None:
+            return await function(*args, **kwargs)
+        return await getattr(_BACKEND, name)(*args, **kwargs)
+
+    return call
+
+
+def get_backend() -> Optional[Any]:
+    """
+    Get the backend the repository functions are sent to.
+
+    Returns
+    -------
+    Any, optional
+        The backend set with `use_backend`, or None if they go to Postgres.
+    """
+
+    return _BACKEND
+
+
+def use_backend(backend: Optional[Any]) -> Optional[Any]:
+    """
+    Send every repository function to the given backend instead of Postgres (or back to Postgres).
+    Every invalidation listener is told to drop everything, since nothing cached from the old backend is valid.
+
+    Parameters
+    ----------
+    backend: Any, optional
+        An object with an async method for every function in BACKEND_FUNCTIONS, taking the same arguments
+        (like `MemoryBackend`). Goes back to Postgres if None.
+
+    Returns
+    -------
+    Any, optional
+        The backend that was being used before, so it can be put back.
+
+    Raises
+    ------
+    TypeError
+        If the backend is missing any of the repository functions.
+    """
+
+    global _BACKEND
+
+    if backend is not None:
+        missing = [name for name in BACKEND_FUNCTIONS if not callable(getattr(backend, name, None))]
+        if missing:
+            raise TypeError(f"{type(backend).__name__} doesn't implement {', '.join(sorted(missing))}")
+
+    previous, _BACKEND = _BACKEND, backend
+    _notify_listeners(ALL_TABLES, None)
+    return previous
@@ -1,13 +1,15 @@
 from typing import Optional
 from sqlalchemy import delete, select
 
+from .backend import backend_function
 from .session import session_scope
 
 from .models import *  # loads all ORM models (via database/models/__init__.py)
 
-from .get import get_vendor_by_id, get_pooch_by_id
+from .get import get_pooch_by_id
 
 
+@backend_function
 async def remove_pooch_from_kennel(pooch_id: int) -> Pooch:
     """
     Remove the pooch with the given ID from the kennel it's in, if any.
@@ -45,6 +47,7 @@ async def remove_pooch_from_kennel(pooch_id: int) -> Pooch:
     return pooch
 
 
+@backend_function
 async def remove_pooch_from_vendor_stock(vendor_id: int, pooch_id: int) -> Optional[Pooch]:
     """
     Remove the pooch with the given ID from the given vendor's inventory.
@@ -87,6 +90,7 @@ async def remove_pooch_from_vendor_stock(vendor_id: int, pooch_id: int) -> Optio
     return pooch
 
 
+@backend_function
 async def clear_vendor_pooch_stock(vendor_id: int) -> Optional[Vendor]:
     """
     Clear the pooch stock of the vendor with the given ID.
@@ -102,17 +106,17 @@ async def clear_vendor_pooch_stock(vendor_id: int) -> Optional[Vendor]:
         The Vendor ORM object whose stock was just cleared, or None if the vendor wasn't found.
     """
 
-    vendor = await get_vendor_by_id(vendor_id)
-
-    if vendor is None:
-        return None
-
     async with session_scope() as session:
+        vendor = await session.get(Vendor, vendor_id)
+        if vendor is None:
+            return None
+
         await session.execute(delete(VendorPoochForSale).where(VendorPoochForSale.vendor_id == vendor_id))
 
     return vendor
 
 
+@backend_function
 async def delete_pregnancy(mother_id: int, fetus_id: int) -> Optional[Pooch]:
     """
     Delete a pooch pregnancy instance.
@@ -145,3 +149,21 @@ async def delete_pregnancy(mother_id: int, fetus_id: int) -> Optional[Pooch]:
         )
 
     return fetus
+
+
+@backend_function
+async def clear_due_events(kind: str, day: int):
+    """
+    Remove every scheduled event of the given kind that's due on or before the given day, once it's been handled.
+
+    Parameters
+    ----------
+    kind: str
+        The kind of event to remove.
+
+    day: int
+        The world day to remove the due events for. Overdue events are removed too.
+    """
+
+    async with session_scope() as session:
+        await session.execute(delete(ScheduledEvent).where(ScheduledEvent.kind == kind, ScheduledEvent.day <= day))
@@ -1,11 +1,15 @@
+from datetime import datetime
 from typing import Optional
 from sqlalchemy import select
 
+from .backend import backend_function
 from .session import session_scope
+from .projections import RAISE_ON_LAZY_LOAD, PoochRow, pooch_row_columns
 
 from .models import *  # loads all ORM models (via database/models/__init__.py)
 
 
+@backend_function
 async def get_pooch_by_id(pooch_id: int) -> Optional[Pooch]:
     """
     Fetch the pooch with the given ID.
@@ -22,12 +26,36 @@ async def get_pooch_by_id(pooch_id: int) -> Optional[Pooch]:
     """
 
     async with session_scope() as session:
-        query = select(Pooch).where(Pooch.id == pooch_id)
+        query = select(Pooch).where(Pooch.id == pooch_id).options(RAISE_ON_LAZY_LOAD)
         response = await session.execute(query)
 
     return response.scalar_one_or_none()
 
 
+@backend_function
+async def get_archived_pooch_by_id(pooch_id: int) -> Optional[ArchivedPooch]:
+    """
+    Fetch the archived pooch with the given ID.
+
+    Parameters
+    ----------
+    pooch_id: int
+        The ID the pooch had before it was archived.
+
+    Returns
+    -------
+    Optional[ArchivedPooch]
+        The ArchivedPooch ORM object with the given ID, or None if no pooch with that ID was archived.
+    """
+
+    async with session_scope() as session:
+        query = select(ArchivedPooch).where(ArchivedPooch.id == pooch_id).options(RAISE_ON_LAZY_LOAD)
+        response = await session.execute(query)
+
+    return response.scalar_one_or_none()
+
+
+@backend_function
 async def get_owner_by_discord_id(owner_discord_id: int) -> Optional[Owner]:
     """
     Fetch an owner by their Discord ID.
@@ -50,6 +78,7 @@ async def get_owner_by_discord_id(owner_discord_id: int) -> Optional[Owner]:
     return response.scalar_one_or_none()
 
 
+@backend_function
 async def get_kennel_by_id(kennel_id: int) -> Optional[Kennel]:
     """
     Fetch the kennel with the given ID.
@@ -71,6 +100,7 @@ async def get_kennel_by_id(kennel_id: int) -> Optional[Kennel]:
     return response.scalar_one_or_none()
 
 
+@backend_function
 async def get_vendor_by_id(vendor_id: int) -> Optional[Vendor]:
     """
     Fetch the vendor with the given ID.
@@ -93,6 +123,7 @@ async def get_vendor_by_id(vendor_id: int) -> Optional[Vendor]:
     return vendor
 
 
+@backend_function
 async def get_server_by_discord_id(server_discord_id: int) -> Optional[Server]:
     """
     Fetch a server by its Discord ID.
@@ -115,6 +146,7 @@ async def get_server_by_discord_id(server_discord_id: int) -> Optional[Server]:
     return response.scalar_one_or_none()
 
 
+@backend_function
 async def get_pooch_kennel(pooch_id: int) -> Optional[Kennel]:
     """
     Fetch the kennel the pooch with the given ID belongs to.
@@ -144,9 +176,10 @@ async def get_pooch_kennel(pooch_id: int) -> Optional[Kennel]:
     return kennel
 
 
-async def get_pooch_parents(pooch_id: int) -> tuple[Optional[Pooch], Optional[Pooch]]:
+@backend_function
+async def get_pooch_parents(pooch_id: int) -> tuple[Optional[PoochRow], Optional[PoochRow]]:
     """
-    Fetch the parents of the pooch with the given ID.
+    Fetch the parents of the pooch with the given ID. Parents that have been archived are fetched from the archive.
 
     Parameters
     ----------
@@ -155,24 +188,30 @@ async def get_pooch_parents(pooch_id: int) -> tuple[Optional[Pooch], Optional[Po
 
     Returns
     -------
-    tuple[Optional[Pooch], Optional[Pooch]]
-        A tuple of Pooch ORM objects in the form (father, mother).
+    tuple[Optional[PoochRow], Optional[PoochRow]]
+        The rows of the pooch's parents in the form (father, mother).
     """
 
     async with session_scope() as session:
         parentage = (
-            await session.execute(select(PoochParentage).where(PoochParentage.child_id == pooch_id))
-        ).scalar_one_or_none()
+            await session.execute(
+                select(PoochParentage.father_id, PoochParentage.mother_id).where(PoochParentage.child_id == pooch_id)
+            )
+        ).one_or_none()
 
-    if not parentage:
-        return (None, None)
+        if parentage is None:
+            return (None, None)
 
-    father = await get_pooch_by_id(parentage.father_id)
-    mother = await get_pooch_by_id(parentage.mother_id)
+        # the archive first, so the pooches table wins for a parent found in both
+        parents: dict[int, PoochRow] = {}
+        for model in (ArchivedPooch, Pooch):
+            query = select(*pooch_row_columns(model)).where(model.id.in_([parentage.father_id, parentage.mother_id]))
+            parents.update((parent.id, parent) for parent in (await session.execute(query)).all())
 
-    return (father, mother)
+    return (parents.get(parentage.father_id), parents.get(parentage.mother_id))
 
 
+@backend_function
 async def get_vendor_server(vendor_id: int) -> Optional[Server]:
     """
     Get the server the vendor with the given ID belongs to.
@@ -195,6 +234,7 @@ async def get_vendor_server(vendor_id: int) -> Optional[Server]:
     return response.scalar_one_or_none()
 
 
+@backend_function
 async def get_owner_server(server_discord_id: int, owner_discord_id: int) -> Optional[OwnerServer]:
     """
     Get the owner-server relationship with the given server and owner Discord IDs.
@@ -215,8 +255,42 @@ async def get_owner_server(server_discord_id: int, owner_discord_id: int) -> Opt
 
     async with session_scope() as session:
         query = select(OwnerServer).where(
-            OwnerServer.server_discord_id == server_discord_id and OwnerServer.owner_discord_id == owner_discord_id
+            OwnerServer.server_discord_id == server_discord_id, OwnerServer.owner_discord_id == owner_discord_id
         )
         response = await session.execute(query)
 
     return response.scalar_one_or_none()
+
+
+@backend_function
+async def get_world_day() -> int:
+    """
+    Get the current world day, which goes up by 1 every day change.
+
+    Returns
+    -------
+    int
+        The current world day.
+    """
+
+    async with session_scope() as session:
+        response = await session.execute(select(WorldState.day))
+
+    return response.scalar_one()
+
+
+@backend_function
+async def get_last_world_day_change() -> Optional[datetime]:
+    """
+    Get the time the last scheduled world day change was scheduled for (see `advance_world_day`).
+
+    Returns
+    -------
+    datetime, optional
+        The scheduled time of the last scheduled world day change, or None if none has run yet.
+    """
+
+    async with session_scope() as session:
+        response = await session.execute(select(WorldState.last_day_change_for))
+
+    return response.scalar_one()
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import uuid
+from typing import Any, Callable, Optional
+
+from sqlalchemy import Text, cast, event, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from logger import get_logger
+
+from .session import _get_engine
+
+logger = get_logger("database/invalidation")
+
+InvalidationListener = Callable[[str, Optional[Any]], None]
+
+CHANNEL = "cache_invalidation"
+ALL_TABLES = "*"  # sent to local listeners when invalidations might have been missed, so they should drop everything
+
+_LISTENERS: list[InvalidationListener] = []
+_PENDING = "pending_invalidations"
+_SENDER = uuid.uuid4().hex[:8]  # lets a process skip the notifications it sent itself
+
+
+def add_invalidation_listener(listener: InvalidationListener):
+    """
+    Register a callback to be told whenever a row is written, by this process or any other one,
+    so anything caching it can drop it.
+
+    Parameters
+    ----------
+    listener: InvalidationListener
+        Called as `listener(table, key)` after every committed write, where `key` is the primary key of the row
+        that changed, or None if any row in the table might have.
+        Called as `listener(ALL_TABLES, None)` if notifications from other processes might have been missed.
+    """
+
+    _LISTENERS.append(listener)
+
+
+def publish_invalidation(session: AsyncSession, table: str, key: Optional[Any] = None):
+    """
+    Queue an invalidation for a row (or a whole table) written in the given session.
+    When the session commits, every other process is notified through Postgres `NOTIFY` in the same transaction,
+    and this process's listeners are told right after the commit. Nothing is sent if the session rolls back.
+
+    Parameters
+    ----------
+    session: AsyncSession
+        The session the write was made in.
+
+    table: str
+        The name of the table that was written to.
+
+    key: Any, optional
+        The primary key of the row that changed. If not given, any row in the table might have changed.
+    """
+
+    session.info.setdefault(_PENDING, []).append((table, key))
+
+
+async def listen_for_invalidations(*, reconnect_delay: float = 5.0):
+    """
+    Listen for invalidations published by other processes and pass them to this process's listeners, forever.
+    Reconnects if the connection drops, telling every listener to drop everything since notifications sent while
+    disconnected are lost.
+
+    Parameters
+    ----------
+    reconnect_delay: float, default: 5.0
+        How many seconds to wait before reconnecting after the connection drops.
+    """
+
+    while True:
+        try:
+            async with _get_engine().connect() as connection:
+                driver_connection = (await connection.get_raw_connection()).driver_connection
+                closed = asyncio.Event()
+                driver_connection.add_termination_listener(lambda _: closed.set())
+                await driver_connection.add_listener(CHANNEL, _on_notification)
+
+                _notify_listeners(ALL_TABLES, None)
+                logger.info(f"Listening for cache invalidations on '{CHANNEL}'.")
+                await closed.wait()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Cache invalidation listener failed.")
+
+        logger.warning(f"Lost the cache invalidation connection, reconnecting in {reconnect_delay}s.")
+        await asyncio.sleep(reconnect_delay)
+
+
+def _notify_listeners(table: str, key: Optional[Any]):
+    for listener in _LISTENERS:
+        listener(table, key)
+
+
+def _on_notification(connection: Any, pid: int, channel: str, payload: str):
+    message = json.loads(payload)
+    if message["s"] == _SENDER:
+        return
+
+    key = message.get("k")
+    _notify_listeners(message["t"], tuple(key) if isinstance(key, list) else key)
+
+
+@event.listens_for(Session, "before_commit")
+def _send_pending(session: Session):
+    pending = session.info.get(_PENDING)
+    if not pending:
+        return
+
+    payloads = [json.dumps({"s": _SENDER, "t": table, "k": key}, separators=(",", ":")) for table, key in pending]
+    # one row per notification (not one column), so bulk writes aren't capped by the select list limit
+    payload = func.unnest(cast(payloads, ARRAY(Text))).column_valued("payload")
+    session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session):
+    for table, key in session.info.pop(_PENDING, []):
+        _notify_listeners(table, key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session):
+    session.info.pop(_PENDING, None)
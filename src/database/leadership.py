@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from logger import get_logger
+from metrics import gauge
+
+from .backend import get_backend
+from .session import _get_engine
+
+logger = get_logger("database/leadership")
+
+# How often a standby tries to take over, and how often the leader checks it still holds the lock.
+# Failover takes at most about this long once the old leader's connection is gone.
+LEADER_POLL_SECONDS = 2.0  # TODO
+
+_IS_LEADER = gauge("pimpy_is_leader", "Whether this process is the leader (1) or a standby (0), by role.", ("role",))
+
+
+def advisory_lock_key(name: str) -> int:
+    """
+    Get the Postgres advisory lock key for a name, so every process agrees on it without a shared list of numbers.
+
+    Parameters
+    ----------
+    name: str
+        The name of the lock (like "day_change").
+
+    Returns
+    -------
+    int
+        The lock key (a signed 64 bit integer, like Postgres takes).
+    """
+
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+async def _try_lock(connection: AsyncConnection, key: int) -> bool:
+    response = await connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+    return bool(response.scalar_one())
+
+
+async def _unlock(connection: AsyncConnection, key: int):
+    try:
+        await connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+    except Exception:
+        # never hand a connection that might still hold the lock back to the pool
+        await connection.invalidate()
+
+
+async def _lead(connection: AsyncConnection, key: int, role: str, work: Callable[[], Awaitable[None]]):
+    """Run the work until it ends, or until the connection holding the lock is lost."""
+
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+    lost = asyncio.Event()
+    driver_connection.add_termination_listener(lambda _: lost.set())
+
+    _IS_LEADER.labels(role).set(1)
+    logger.info(f"Became the {role} leader.")
+    task = asyncio.create_task(work())
+    lost_task = asyncio.create_task(lost.wait())
+    try:
+        while not task.done():
+            await asyncio.wait({task, lost_task}, timeout=LEADER_POLL_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+            if lost.is_set():
+                logger.warning(f"Lost the connection holding the {role} lock.")
+                return
+            if not task.done():
+                # a connection that stops answering can't be trusted to still hold the lock
+                await asyncio.wait_for(connection.execute(text("SELECT 1")), timeout=LEADER_POLL_SECONDS)
+        task.result()
+    finally:
+        _IS_LEADER.labels(role).set(0)
+        lost_task.cancel()
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        if not lost.is_set():
+            await _unlock(connection, key)
+
+
+async def run_as_leader(role: str, work: Callable[[], Awaitable[None]]):
+    """
+    Run some work in exactly one process at a time, forever: the one holding the role's Postgres advisory lock.
+    Every other process waits as a standby, and takes over within about `LEADER_POLL_SECONDS` of the leader's
+    connection closing (like when it exits or crashes). The work is cancelled if this process stops being the leader,
+    and started again if it ends or fails while this process still is.
+
+    The lock is held on a connection of its own for as long as this process leads.
+    While an in-memory backend is set, there's only this process, so the work just runs.
+
+    Parameters
+    ----------
+    role: str
+        The name of what the leader does (like "day_change"). Processes only compete with others for the same role.
+
+    work: Callable[[], Awaitable[None]]
+        Starts the work to run while leading.
+    """
+
+    if get_backend() is not None:
+        _IS_LEADER.labels(role).set(1)
+        await work()
+        return
+
+    key = advisory_lock_key(role)
+    _IS_LEADER.labels(role).set(0)
+    while True:
+        try:
+            async with _get_engine().connect() as connection:
+                # autocommit, so the connection doesn't sit idle in a transaction while it holds the lock
+                await connection.execution_options(isolation_level="AUTOCOMMIT")
+                if await _try_lock(connection, key):
+                    await _lead(connection, key, role, work)
+                    logger.warning(f"Stopped being the {role} leader.")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"The {role} leader failed.")
+
+        await asyncio.sleep(LEADER_POLL_SECONDS)
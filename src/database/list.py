@@ -1,12 +1,63 @@
-from sqlalchemy import or_, select
+from datetime import datetime
+from typing import AsyncIterator, Callable, Optional
+from sqlalchemy import ColumnElement, Select, func, literal, or_, select, tuple_
 
+from .backend import backend_function
 from .session import session_scope
 from .get import get_pooch_parents
+from .projections import RAISE_ON_LAZY_LOAD, PoochRow, pooch_row_columns
 
 from .models import *  # loads all ORM models (via database/models/__init__.py)
 
+# A keyset cursor, in the form (created_at, id) of the last row of the previous page.
+Cursor = tuple[datetime, int]
 
-async def list_pooches_for_kennel(kennel_id: int) -> list[Pooch]:
+# A keyset cursor into the day event log, in the form (day, id) of the last event of the previous page.
+DayEventCursor = tuple[int, int]
+
+
+def _keyset(query: Select, created_at: ColumnElement, id: ColumnElement, after: Optional[Cursor], limit: int) -> Select:
+    """Order a query by (created_at, id) and restrict it to the `limit` rows following the `after` cursor."""
+
+    if after is not None:
+        after_created_at, after_id = after
+        query = query.where(
+            tuple_(created_at, id) > tuple_(literal(after_created_at, created_at.type), literal(after_id, id.type))
+        )
+    return query.order_by(created_at.asc(), id.asc()).limit(limit)
+
+
+async def _list_with_archive(
+    build: Callable[[type[Pooch] | type[ArchivedPooch]], Select], after: Optional[Cursor], limit: Optional[int]
+) -> list[PoochRow]:
+    """
+    Run a pooch row query against both the pooches table and the archive,
+    and merge the results into one (created_at, id) ordered page.
+    """
+
+    pooches: list[PoochRow] = []
+    async with session_scope() as session:
+        for model in (Pooch, ArchivedPooch):
+            query = build(model)
+            if limit is None:
+                query = query.order_by(model.created_at.asc(), model.id.asc())
+            else:
+                query = _keyset(query, model.created_at, model.id, after, limit)
+            pooches.extend((await session.execute(query)).all())
+
+    pooches.sort(key=lambda pooch: (pooch.created_at, pooch.id))
+    return pooches if limit is None else pooches[:limit]
+
+
+async def _count(query: Select) -> int:
+    async with session_scope() as session:
+        response = await session.execute(query)
+
+    return response.scalar_one()
+
+
+@backend_function
+async def list_pooches_for_kennel(kennel_id: int) -> list[PoochRow]:
     """
     Fetch the list of Pooches in the kennel with the given ID.
 
@@ -17,22 +68,76 @@ async def list_pooches_for_kennel(kennel_id: int) -> list[Pooch]:
 
     Returns
     -------
-    list[Pooch]
-        The list of Pooch ORM objects in the kennel.
+    list[PoochRow]
+        The rows of the pooches in the kennel.
     """
 
     async with session_scope() as session:
         query = (
-            select(Pooch)
+            select(*pooch_row_columns(Pooch))
             .join(KennelPooch, KennelPooch.pooch_id == Pooch.id)
             .where(KennelPooch.kennel_id == kennel_id)
             .order_by(Pooch.created_at.asc(), Pooch.id.asc())
         )
         response = await session.execute(query)
 
-    return list(response.scalars().all())
+    return list(response.all())
+
+
+@backend_function
+async def list_pooches_for_kennel_page(kennel_id: int, limit: int, after: Optional[Cursor] = None) -> list[PoochRow]:
+    """
+    Fetch one page of the pooches in the kennel with the given ID, ordered by (created_at, id).
 
+    Parameters
+    ----------
+    kennel_id: int
+        The ID of the kennel to fetch the pooches from.
+
+    limit: int
+        The maximum number of pooches to fetch.
+
+    after: Cursor, optional
+        The (created_at, id) of the last pooch on the previous page. Fetches the first page if not given.
+
+    Returns
+    -------
+    list[PoochRow]
+        At most `limit` rows of the pooches in the kennel, following the cursor.
+    """
+
+    query = (
+        select(*pooch_row_columns(Pooch))
+        .join(KennelPooch, KennelPooch.pooch_id == Pooch.id)
+        .where(KennelPooch.kennel_id == kennel_id)
+    )
+
+    async with session_scope() as session:
+        response = await session.execute(_keyset(query, Pooch.created_at, Pooch.id, after, limit))
+
+    return list(response.all())
+
+
+@backend_function
+async def count_pooches_for_kennel(kennel_id: int) -> int:
+    """
+    Count the pooches in the kennel with the given ID.
+
+    Parameters
+    ----------
+    kennel_id: int
+        The ID of the kennel to count the pooches of.
 
+    Returns
+    -------
+    int
+        The number of pooches in the kennel.
+    """
+
+    return await _count(select(func.count()).select_from(KennelPooch).where(KennelPooch.kennel_id == kennel_id))
+
+
+@backend_function
 async def list_kennels_for_owner(owner_discord_id: int) -> list[Kennel]:
     """
     Fetch the list of kennels owned by the owner with the given Discord ID.
@@ -63,6 +168,58 @@ async def list_kennels_for_owner(owner_discord_id: int) -> list[Kennel]:
     return list(response.scalars().all())
 
 
+@backend_function
+async def list_kennels_for_owner_page(
+    owner_discord_id: int, limit: int, after: Optional[Cursor] = None
+) -> list[Kennel]:
+    """
+    Fetch one page of the kennels owned by the owner with the given Discord ID, ordered by (created_at, id).
+
+    Parameters
+    ----------
+    owner_discord_id: int
+        The Discord ID of the owner to fetch the kennels for.
+
+    limit: int
+        The maximum number of kennels to fetch.
+
+    after: Cursor, optional
+        The (created_at, id) of the last kennel on the previous page. Fetches the first page if not given.
+
+    Returns
+    -------
+    list[Kennel]
+        At most `limit` Kennel ORM objects the owner owns, following the cursor.
+    """
+
+    query = select(Kennel).where(Kennel.owner_discord_id == owner_discord_id)
+
+    async with session_scope() as session:
+        response = await session.execute(_keyset(query, Kennel.created_at, Kennel.id, after, limit))
+
+    return list(response.scalars().all())
+
+
+@backend_function
+async def count_kennels_for_owner(owner_discord_id: int) -> int:
+    """
+    Count the kennels owned by the owner with the given Discord ID.
+
+    Parameters
+    ----------
+    owner_discord_id: int
+        The Discord ID of the owner to count the kennels of.
+
+    Returns
+    -------
+    int
+        The number of kennels the owner owns.
+    """
+
+    return await _count(select(func.count()).select_from(Kennel).where(Kennel.owner_discord_id == owner_discord_id))
+
+
+@backend_function
 async def list_living_pooches() -> list[Pooch]:
     """
     Fetch a list of every living pooch.
@@ -74,42 +231,157 @@ async def list_living_pooches() -> list[Pooch]:
     """
 
     async with session_scope() as session:
-        query = select(Pooch).where(Pooch.alive == True).order_by(Pooch.created_at.asc(), Pooch.id.asc())
+        query = (
+            select(Pooch)
+            .where(Pooch.alive == True)
+            .order_by(Pooch.created_at.asc(), Pooch.id.asc())
+            .options(RAISE_ON_LAZY_LOAD)
+        )
         response = await session.execute(query)
 
     return list(response.scalars().all())
 
 
-async def list_pooch_children(pooch_id: int) -> list[Pooch]:
+@backend_function
+async def list_living_pooches_page(
+    limit: int, after: Optional[Cursor] = None, below_health: Optional[int] = None
+) -> list[Pooch]:
     """
-    Fetch the children of the pooch with the given ID.
+    Fetch one page of living pooches across all servers, ordered by (created_at, id).
 
     Parameters
     ----------
-    pooch_id: int
-        The ID of the pooch to fetch the children of.
+    limit: int
+        The maximum number of pooches to fetch.
+
+    after: Cursor, optional
+        The (created_at, id) of the last pooch on the previous page. Fetches the first page if not given.
+
+    below_health: int, optional
+        Only fetch pooches whose total health (as of the current world day) is below this.
 
     Returns
     -------
     list[Pooch]
-        A list of Pooch ORM objects representing the pooch's children.
+        At most `limit` living Pooch ORM objects, following the cursor.
     """
 
+    query = select(Pooch).where(Pooch.alive == True).options(RAISE_ON_LAZY_LOAD)
+    if below_health is not None:
+        query = query.where(Pooch.health < below_health)
+
     async with session_scope() as session:
-        query = (
-            select(Pooch)
-            .join(PoochParentage, PoochParentage.child_id == Pooch.id)
-            .where(or_(PoochParentage.father_id == pooch_id, PoochParentage.mother_id == pooch_id))
-            .order_by(Pooch.created_at.asc(), Pooch.id.asc())
+        response = await session.execute(_keyset(query, Pooch.created_at, Pooch.id, after, limit))
+
+    return list(response.scalars().all())
+
+
+@backend_function
+async def count_living_pooches() -> int:
+    """
+    Count every living pooch across all servers.
+
+    Returns
+    -------
+    int
+        The number of living pooches.
+    """
+
+    return await _count(select(func.count()).select_from(Pooch).where(Pooch.alive == True))
+
+
+def _children_query(model: type[Pooch] | type[ArchivedPooch], pooch_id: int) -> Select:
+    return (
+        select(*pooch_row_columns(model))
+        .join(PoochParentage, PoochParentage.child_id == model.id)
+        .where(or_(PoochParentage.father_id == pooch_id, PoochParentage.mother_id == pooch_id))
+    )
+
+
+def _siblings_query(model: type[Pooch] | type[ArchivedPooch], pooch_id: int) -> Select:
+    parentage = select(PoochParentage).where(PoochParentage.child_id == pooch_id).subquery()
+    return (
+        select(*pooch_row_columns(model))
+        .join(PoochParentage, PoochParentage.child_id == model.id)
+        .join(
+            parentage,
+            (parentage.c.father_id == PoochParentage.father_id) & (parentage.c.mother_id == PoochParentage.mother_id),
         )
-        children = list((await session.execute(query)).scalars().all())
+        .where(model.id != pooch_id)
+    )
+
+
+@backend_function
+async def list_pooch_children(pooch_id: int) -> list[PoochRow]:
+    """
+    Fetch the children of the pooch with the given ID, including archived ones.
+
+    Parameters
+    ----------
+    pooch_id: int
+        The ID of the pooch to fetch the children of.
+
+    Returns
+    -------
+    list[PoochRow]
+        The rows of the pooch's children.
+    """
+
+    return await _list_with_archive(lambda model: _children_query(model, pooch_id), None, None)
+
+
+@backend_function
+async def list_pooch_children_page(pooch_id: int, limit: int, after: Optional[Cursor] = None) -> list[PoochRow]:
+    """
+    Fetch one page of the children of the pooch with the given ID, including archived ones, ordered by (created_at, id).
+
+    Parameters
+    ----------
+    pooch_id: int
+        The ID of the pooch to fetch the children of.
+
+    limit: int
+        The maximum number of children to fetch.
+
+    after: Cursor, optional
+        The (created_at, id) of the last child on the previous page. Fetches the first page if not given.
+
+    Returns
+    -------
+    list[PoochRow]
+        At most `limit` rows of the pooch's children, following the cursor.
+    """
+
+    return await _list_with_archive(lambda model: _children_query(model, pooch_id), after, limit)
+
+
+@backend_function
+async def count_pooch_children(pooch_id: int) -> int:
+    """
+    Count the children of the pooch with the given ID.
+
+    Parameters
+    ----------
+    pooch_id: int
+        The ID of the pooch to count the children of.
+
+    Returns
+    -------
+    int
+        The number of children the pooch has.
+    """
 
-    return children
+    return await _count(
+        select(func.count())
+        .select_from(PoochParentage)
+        .where(or_(PoochParentage.father_id == pooch_id, PoochParentage.mother_id == pooch_id))
+    )
 
 
-async def list_pooch_siblings(pooch_id: int) -> list[Pooch]:
+@backend_function
+async def list_pooch_siblings(pooch_id: int) -> list[PoochRow]:
     """
-    Fetch the full siblings of the pooch with the given ID.
+    Fetch the full siblings of the pooch with the given ID, including archived ones.
 
     Parameters
     ----------
@@ -118,8 +390,8 @@ async def list_pooch_siblings(pooch_id: int) -> list[Pooch]:
 
     Returns
     -------
-    list[Pooch]
-        A list of Pooch ORM objects representing the pooch's full siblings (sharing both a mother and father).
+    list[PoochRow]
+        The rows of the pooch's full siblings (sharing both a mother and father).
     """
 
     father, mother = await get_pooch_parents(pooch_id)
@@ -127,25 +399,44 @@ async def list_pooch_siblings(pooch_id: int) -> list[Pooch]:
     if not father or not mother:
         return []
 
-    async with session_scope() as session:
-        query = (
-            select(Pooch)
-            .join(PoochParentage, PoochParentage.child_id == Pooch.id)
-            .where(
-                Pooch.id != pooch_id,
-                PoochParentage.father_id == father.id,
-                PoochParentage.mother_id == mother.id,
-            )
-            .order_by(Pooch.created_at.asc(), Pooch.id.asc())
-        )
-        siblings = list((await session.execute(query)).scalars().all())
+    return await _list_with_archive(lambda model: _siblings_query(model, pooch_id), None, None)
+
+
+@backend_function
+async def list_pooch_siblings_page(pooch_id: int, limit: int, after: Optional[Cursor] = None) -> list[PoochRow]:
+    """
+    Fetch one page of the full siblings of the pooch with the given ID, including archived ones,
+    ordered by (created_at, id).
+
+    Parameters
+    ----------
+    pooch_id: int
+        The ID of the pooch to fetch the full siblings of.
 
-    return siblings
+    limit: int
+        The maximum number of siblings to fetch.
 
+    after: Cursor, optional
+        The (created_at, id) of the last sibling on the previous page. Fetches the first page if not given.
 
-async def list_pooch_pregnancies() -> list[PoochPregnancy]:
+    Returns
+    -------
+    list[PoochRow]
+        At most `limit` rows of the pooch's full siblings, following the cursor.
     """
-    Fetch a list of every all pooch pregnancy instances.
+
+    return await _list_with_archive(lambda model: _siblings_query(model, pooch_id), after, limit)
+
+
+@backend_function
+async def list_pooch_pregnancies(fetus_ids: Optional[list[int]] = None) -> list[PoochPregnancy]:
+    """
+    Fetch a list of every pooch pregnancy instance, or just the ones with the given fetuses.
+
+    Parameters
+    ----------
+    fetus_ids: list[int], optional
+        The IDs of the fetuses to fetch the pregnancies of. Fetches every pregnancy if not given.
 
     Returns
     -------
@@ -153,12 +444,17 @@ async def list_pooch_pregnancies() -> list[PoochPregnancy]:
         The list of PoochPregnancy ORM relationship objects across all servers.
     """
 
+    query = select(PoochPregnancy).order_by(PoochPregnancy.fetus_id.asc())
+    if fetus_ids is not None:
+        query = query.where(PoochPregnancy.fetus_id.in_(fetus_ids))
+
     async with session_scope() as session:
-        response = await session.execute(select(PoochPregnancy).order_by(PoochPregnancy.fetus_id.asc()))
+        response = await session.execute(query)
 
     return list(response.scalars().all())
 
 
+@backend_function
 async def list_vendors(server_discord_id: int) -> list[Vendor]:
     """
     Fetch the list of vendors for a given server.
@@ -184,7 +480,8 @@ async def list_vendors(server_discord_id: int) -> list[Vendor]:
     return list(response.scalars().all())
 
 
-async def list_vendor_pooch_stock(vendor_id: int) -> list[Pooch]:
+@backend_function
+async def list_vendor_pooch_stock(vendor_id: int) -> list[PoochRow]:
     """
     Fetch a list of every pooch a given vendor has for sale.
 
@@ -195,22 +492,78 @@ async def list_vendor_pooch_stock(vendor_id: int) -> list[Pooch]:
 
     Returns
     -------
-    list[Pooch]
-        The list of Pooch ORM objects representing the pooches the given vendor has for sale.
+    list[PoochRow]
+        The rows of the pooches the given vendor has for sale.
     """
 
     async with session_scope() as session:
         query = (
-            select(Pooch)
+            select(*pooch_row_columns(Pooch))
             .join(VendorPoochForSale, VendorPoochForSale.pooch_id == Pooch.id)
             .where(VendorPoochForSale.vendor_id == vendor_id)
             .order_by(Pooch.created_at.asc(), Pooch.id.asc())
         )
         response = await session.execute(query)
 
-    return list(response.scalars().all())
+    return list(response.all())
+
+
+@backend_function
+async def list_vendor_pooch_stock_page(vendor_id: int, limit: int, after: Optional[Cursor] = None) -> list[PoochRow]:
+    """
+    Fetch one page of the pooches a given vendor has for sale, ordered by (created_at, id).
+
+    Parameters
+    ----------
+    vendor_id: int
+        The ID of the vendor to fetch the pooches from.
+
+    limit: int
+        The maximum number of pooches to fetch.
+
+    after: Cursor, optional
+        The (created_at, id) of the last pooch on the previous page. Fetches the first page if not given.
+
+    Returns
+    -------
+    list[PoochRow]
+        At most `limit` rows of the pooches the vendor has for sale, following the cursor.
+    """
+
+    query = (
+        select(*pooch_row_columns(Pooch))
+        .join(VendorPoochForSale, VendorPoochForSale.pooch_id == Pooch.id)
+        .where(VendorPoochForSale.vendor_id == vendor_id)
+    )
+
+    async with session_scope() as session:
+        response = await session.execute(_keyset(query, Pooch.created_at, Pooch.id, after, limit))
+
+    return list(response.all())
+
+
+@backend_function
+async def count_vendor_pooch_stock(vendor_id: int) -> int:
+    """
+    Count the pooches a given vendor has for sale.
+
+    Parameters
+    ----------
+    vendor_id: int
+        The ID of the vendor to count the stock of.
+
+    Returns
+    -------
+    int
+        The number of pooches the vendor has for sale.
+    """
+
+    return await _count(
+        select(func.count()).select_from(VendorPoochForSale).where(VendorPoochForSale.vendor_id == vendor_id)
+    )
 
 
+@backend_function
 async def list_servers_for_pooch(pooch_id: int) -> list[Server]:
     """
     Fetch a list of all the servers in which a pooch is relevant.
@@ -241,6 +594,7 @@ async def list_servers_for_pooch(pooch_id: int) -> list[Server]:
     return list(response.scalars().all())
 
 
+@backend_function
 async def list_owner_servers(owner_discord_id: int) -> list[Server]:
     """
     Fetch a list of all the servers the owner with the given Discord ID is in.
@@ -268,6 +622,7 @@ async def list_owner_servers(owner_discord_id: int) -> list[Server]:
     return list(response.scalars().all())
 
 
+@backend_function
 async def list_servers() -> list[Server]:
     """
     Fetch a list of all servers in the database.
@@ -283,3 +638,306 @@ async def list_servers() -> list[Server]:
         response = await session.execute(query)
 
     return list(response.scalars().all())
+
+
+@backend_function
+async def list_pooches_by_ids(pooch_ids: list[int], include_archived: bool = False) -> list[Pooch | ArchivedPooch]:
+    """
+    Fetch the pooches with the given IDs.
+
+    Parameters
+    ----------
+    pooch_ids: list[int]
+        The IDs of the pooches to fetch.
+
+    include_archived: bool, default: False
+        Whether to also fetch the pooches with the given IDs that have been archived.
+
+    Returns
+    -------
+    list[Pooch | ArchivedPooch]
+        The Pooch (or ArchivedPooch) ORM objects with the given IDs, in no particular order.
+        IDs with no pooch are skipped.
+    """
+
+    if not pooch_ids:
+        return []
+
+    async with session_scope() as session:
+        query = select(Pooch).where(Pooch.id.in_(pooch_ids)).options(RAISE_ON_LAZY_LOAD)
+        pooches = list((await session.execute(query)).scalars().all())
+        if include_archived and len(pooches) < len(set(pooch_ids)):
+            missing = set(pooch_ids) - {pooch.id for pooch in pooches}
+            response = await session.execute(
+                select(ArchivedPooch).where(ArchivedPooch.id.in_(missing)).options(RAISE_ON_LAZY_LOAD)
+            )
+            pooches.extend(response.scalars().all())
+
+    return pooches
+
+
+@backend_function
+async def list_pooch_rows_by_ids(pooch_ids: list[int]) -> list[PoochRow]:
+    """
+    Fetch the rows of the (unarchived) pooches with the given IDs, for read paths that don't need the ORM objects.
+
+    Parameters
+    ----------
+    pooch_ids: list[int]
+        The IDs of the pooches to fetch.
+
+    Returns
+    -------
+    list[PoochRow]
+        The rows of the pooches with the given IDs, ordered by ID. IDs with no pooch are skipped.
+    """
+
+    if not pooch_ids:
+        return []
+
+    async with session_scope() as session:
+        query = select(*pooch_row_columns(Pooch)).where(Pooch.id.in_(pooch_ids)).order_by(Pooch.id.asc())
+        response = await session.execute(query)
+
+    return list(response.all())
+
+
+@backend_function
+async def list_server_day_events(server_discord_id: int, day: int) -> list[DayEvent]:
+    """
+    Fetch every event logged for the server with the given Discord ID on the given day, in the order they happened.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The Discord ID of the server to fetch the events of.
+
+    day: int
+        The world day to fetch the events of.
+
+    Returns
+    -------
+    list[DayEvent]
+        The DayEvent ORM objects logged for the server on that day.
+    """
+
+    async with session_scope() as session:
+        query = (
+            select(DayEvent)
+            .where(DayEvent.server_discord_id == server_discord_id, DayEvent.day == day)
+            .order_by(DayEvent.id.asc())
+        )
+        response = await session.execute(query)
+
+    return list(response.scalars().all())
+
+
+@backend_function
+async def list_server_day_events_page(
+    server_discord_id: int, limit: int, before: Optional[DayEventCursor] = None
+) -> list[DayEvent]:
+    """
+    Fetch one page of the events logged for the server with the given Discord ID, newest first.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The Discord ID of the server to fetch the events of.
+
+    limit: int
+        The maximum number of events to fetch.
+
+    before: DayEventCursor, optional
+        The (day, id) of the last event on the previous page. Fetches the newest events if not given.
+
+    Returns
+    -------
+    list[DayEvent]
+        At most `limit` DayEvent ORM objects logged for the server, older than the cursor.
+    """
+
+    query = select(DayEvent).where(DayEvent.server_discord_id == server_discord_id)
+    if before is not None:
+        before_day, before_id = before
+        query = query.where(
+            tuple_(DayEvent.day, DayEvent.id)
+            < tuple_(literal(before_day, DayEvent.day.type), literal(before_id, DayEvent.id.type))
+        )
+    query = query.order_by(DayEvent.day.desc(), DayEvent.id.desc()).limit(limit)
+
+    async with session_scope() as session:
+        response = await session.execute(query)
+
+    return list(response.scalars().all())
+
+
+@backend_function
+async def count_server_day_events(server_discord_id: int) -> int:
+    """
+    Count the events logged for the server with the given Discord ID.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The Discord ID of the server to count the events of.
+
+    Returns
+    -------
+    int
+        The number of events logged for the server.
+    """
+
+    return await _count(
+        select(func.count()).select_from(DayEvent).where(DayEvent.server_discord_id == server_discord_id)
+    )
+
+
+@backend_function
+async def list_pooch_day_events(pooch_id: int) -> list[DayEvent]:
+    """
+    Fetch every event logged about the pooch with the given ID, oldest first.
+    Only counts events where the pooch is the subject (the baby of a birth, or the pooch that died).
+
+    Parameters
+    ----------
+    pooch_id: int
+        The ID of the pooch to fetch the events of.
+
+    Returns
+    -------
+    list[DayEvent]
+        The DayEvent ORM objects logged about the pooch.
+    """
+
+    async with session_scope() as session:
+        query = select(DayEvent).where(DayEvent.pooch_id == pooch_id).order_by(DayEvent.day.asc(), DayEvent.id.asc())
+        response = await session.execute(query)
+
+    return list(response.scalars().all())
+
+
+@backend_function
+async def stream_day_events(after_day: Optional[int] = None, batch_size: int = 1000) -> AsyncIterator[DayEvent]:
+    """
+    Stream every event in the day event log, oldest first, without loading the whole log into memory.
+    Designed to be used like `async for event in stream_day_events()`.
+
+    Parameters
+    ----------
+    after_day: int, optional
+        Only stream events from after this world day. Streams the whole log if not given.
+
+    batch_size: int, default: 1000
+        How many events to fetch from the database at a time.
+
+    Returns
+    -------
+    AsyncIterator[DayEvent]
+        The DayEvent ORM objects in the log.
+    """
+
+    query = select(DayEvent).order_by(DayEvent.day.asc(), DayEvent.id.asc()).execution_options(yield_per=batch_size)
+    if after_day is not None:
+        query = query.where(DayEvent.day > after_day)
+
+    async with session_scope() as session:
+        async for event in await session.stream_scalars(query):
+            yield event
+
+
+@backend_function
+async def list_due_events_page(
+    kind: str, day: int, limit: int, after_pooch_id: Optional[int] = None
+) -> list[ScheduledEvent]:
+    """
+    Fetch one page of the scheduled events of the given kind that are due on or before the given day,
+    ordered by pooch ID.
+
+    Parameters
+    ----------
+    kind: str
+        The kind of event to fetch.
+
+    day: int
+        The world day to fetch the due events for. Overdue events are included.
+
+    limit: int
+        The maximum number of events to fetch.
+
+    after_pooch_id: int, optional
+        The pooch ID of the last event on the previous page. Fetches the first page if not given.
+
+    Returns
+    -------
+    list[ScheduledEvent]
+        At most `limit` due ScheduledEvent ORM objects, following the cursor.
+    """
+
+    query = select(ScheduledEvent).where(ScheduledEvent.kind == kind, ScheduledEvent.day <= day)
+    if after_pooch_id is not None:
+        query = query.where(ScheduledEvent.pooch_id > after_pooch_id)
+    query = query.order_by(ScheduledEvent.pooch_id.asc()).limit(limit)
+
+    async with session_scope() as session:
+        response = await session.execute(query)
+
+    return list(response.scalars().all())
+
+
+@backend_function
+async def list_mutations() -> list[Mutation]:
+    """
+    Fetch every mutation, including retired ones (pooches can still have them).
+
+    Returns
+    -------
+    list[Mutation]
+        Every Mutation ORM object, ordered by ID.
+    """
+
+    async with session_scope() as session:
+        response = await session.execute(select(Mutation).order_by(Mutation.id.asc()))
+
+    return list(response.scalars().all())
+
+
+@backend_function
+async def list_day_change_work(day: int) -> list[DayChangeWork]:
+    """
+    Fetch every day change work item queued for the given world day, in the order they were queued.
+
+    Parameters
+    ----------
+    day: int
+        The world day to fetch the work items of.
+
+    Returns
+    -------
+    list[DayChangeWork]
+        The DayChangeWork ORM objects queued for the day.
+    """
+
+    async with session_scope() as session:
+        query = select(DayChangeWork).where(DayChangeWork.day == day).order_by(DayChangeWork.id.asc())
+        response = await session.execute(query)
+
+    return list(response.scalars().all())
+
+
+@backend_function
+async def list_undelivered_day_change_work() -> list[DayChangeWork]:
+    """
+    Fetch every day change work item whose summary hasn't been posted yet (see `mark_day_change_work_delivered`),
+    whatever world day it was queued for, in the order they were queued.
+
+    Returns
+    -------
+    list[DayChangeWork]
+        The undelivered DayChangeWork ORM objects, including the ones still queued or running.
+    """
+
+    async with session_scope() as session:
+        query = select(DayChangeWork).where(DayChangeWork.delivered_at.is_(None)).order_by(DayChangeWork.id.asc())
+        response = await session.execute(query)
+
+    return list(response.scalars().all())
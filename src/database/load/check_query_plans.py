@@ -0,0 +1,377 @@
+import argparse
+import asyncio
+import inspect
+import json
+import sys
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, async_sessionmaker
+
+import database.delete as db_delete
+import database.get as db_get
+import database.list as db_list
+import database.session as db_session
+import database.set as db_set
+import database.update as db_update
+from database.session import _get_engine, session_scope
+from database.set import DAY_EVENT_PARTITION_DAYS
+
+# How many rows of pooches (and proportionally of everything else) to seed the database with if it has fewer.
+DEFAULT_ROWS = 50_000
+
+# A sequential scan over a table with more rows than this counts as a regression.
+DEFAULT_SEQ_SCAN_THRESHOLD = 1_000
+
+# How many rows the paged queries are checked with.
+PAGE_SIZE = 25
+
+# Query functions that read a whole table (or a single-row one) on purpose, so a sequential scan is the right plan,
+# and write functions that only insert the rows they're given, so there's nothing to scan.
+UNCHECKED = {
+    "get_world_day": "reads the single-row world state",
+    "get_last_world_day_change": "reads the single-row world state",
+    "list_living_pooches": "reads every living pooch",
+    "count_living_pooches": "counts every living pooch",
+    "list_servers": "reads every server",
+    "stream_day_events": "streams the whole day event log",
+    "list_mutations": "reads the whole (small, static) mutations table",
+    "create_owner": "inserts a single row",
+    "create_kennel": "inserts a single row",
+    "create_server": "inserts a single row",
+    "add_pooch_to_kennel": "inserts a single row",
+    "add_owner_to_server": "inserts a single row",
+    "add_pooch_to_vendor_stock": "inserts a single row",
+    "bury_pooch": "inserts a single row",
+    "add_pregnancy": "inserts the pregnancy and its due event",
+    "log_day_events": "bulk inserts the given events",
+    "schedule_events": "bulk inserts the given events",
+}
+
+
+@dataclass(frozen=True)
+class _Sample:
+    """IDs from the seeded database to call every query function with."""
+
+    server_discord_id: int
+    owner_discord_id: int
+    kennel_id: int
+    vendor_id: int
+    pooch_id: int  # a pooch with both parents
+    parent_id: int
+    stock_pooch_id: int  # a pooch for sale from the vendor
+    day: int
+
+
+CHECKS: dict[str, Callable[[_Sample], Awaitable[Any]]] = {
+    # get
+    "get_pooch_by_id": lambda s: db_get.get_pooch_by_id(s.pooch_id),
+    "get_archived_pooch_by_id": lambda s: db_get.get_archived_pooch_by_id(s.pooch_id),
+    "get_owner_by_discord_id": lambda s: db_get.get_owner_by_discord_id(s.owner_discord_id),
+    "get_kennel_by_id": lambda s: db_get.get_kennel_by_id(s.kennel_id),
+    "get_vendor_by_id": lambda s: db_get.get_vendor_by_id(s.vendor_id),
+    "get_server_by_discord_id": lambda s: db_get.get_server_by_discord_id(s.server_discord_id),
+    "get_pooch_kennel": lambda s: db_get.get_pooch_kennel(s.pooch_id),
+    "get_pooch_parents": lambda s: db_get.get_pooch_parents(s.pooch_id),
+    "get_vendor_server": lambda s: db_get.get_vendor_server(s.vendor_id),
+    "get_owner_server": lambda s: db_get.get_owner_server(s.server_discord_id, s.owner_discord_id),
+    # list
+    "list_pooches_for_kennel": lambda s: db_list.list_pooches_for_kennel(s.kennel_id),
+    "list_pooches_for_kennel_page": lambda s: db_list.list_pooches_for_kennel_page(s.kennel_id, PAGE_SIZE),
+    "count_pooches_for_kennel": lambda s: db_list.count_pooches_for_kennel(s.kennel_id),
+    "list_kennels_for_owner": lambda s: db_list.list_kennels_for_owner(s.owner_discord_id),
+    "list_kennels_for_owner_page": lambda s: db_list.list_kennels_for_owner_page(s.owner_discord_id, PAGE_SIZE),
+    "count_kennels_for_owner": lambda s: db_list.count_kennels_for_owner(s.owner_discord_id),
+    "list_living_pooches_page": lambda s: db_list.list_living_pooches_page(PAGE_SIZE),
+    "list_pooch_children": lambda s: db_list.list_pooch_children(s.parent_id),
+    "list_pooch_children_page": lambda s: db_list.list_pooch_children_page(s.parent_id, PAGE_SIZE),
+    "count_pooch_children": lambda s: db_list.count_pooch_children(s.parent_id),
+    "list_pooch_siblings": lambda s: db_list.list_pooch_siblings(s.pooch_id),
+    "list_pooch_siblings_page": lambda s: db_list.list_pooch_siblings_page(s.pooch_id, PAGE_SIZE),
+    "list_pooch_pregnancies": lambda s: db_list.list_pooch_pregnancies([s.pooch_id]),
+    "list_vendors": lambda s: db_list.list_vendors(s.server_discord_id),
+    "list_vendor_pooch_stock": lambda s: db_list.list_vendor_pooch_stock(s.vendor_id),
+    "list_vendor_pooch_stock_page": lambda s: db_list.list_vendor_pooch_stock_page(s.vendor_id, PAGE_SIZE),
+    "count_vendor_pooch_stock": lambda s: db_list.count_vendor_pooch_stock(s.vendor_id),
+    "list_servers_for_pooch": lambda s: db_list.list_servers_for_pooch(s.pooch_id),
+    "list_owner_servers": lambda s: db_list.list_owner_servers(s.owner_discord_id),
+    "list_pooches_by_ids": lambda s: db_list.list_pooches_by_ids([s.pooch_id, s.parent_id], include_archived=True),
+    "list_pooch_rows_by_ids": lambda s: db_list.list_pooch_rows_by_ids([s.pooch_id, s.parent_id]),
+    "list_server_day_events": lambda s: db_list.list_server_day_events(s.server_discord_id, s.day),
+    "list_server_day_events_page": lambda s: db_list.list_server_day_events_page(s.server_discord_id, PAGE_SIZE),
+    "count_server_day_events": lambda s: db_list.count_server_day_events(s.server_discord_id),
+    "list_pooch_day_events": lambda s: db_list.list_pooch_day_events(s.pooch_id),
+    "list_due_events_page": lambda s: db_list.list_due_events_page("death_risk", s.day, PAGE_SIZE),
+    "list_day_change_work": lambda s: db_list.list_day_change_work(s.day),
+    "list_undelivered_day_change_work": lambda s: db_list.list_undelivered_day_change_work(),
+    # set (every write is rolled back, see `check_query_plans`)
+    "create_pooch": lambda s: db_set.create_pooch(vendor_id=s.vendor_id),
+    "create_vendor": lambda s: db_set.create_vendor(s.server_discord_id),
+    "bootstrap_server": lambda s: db_set.bootstrap_server(s.server_discord_id),
+    "bootstrap_servers": lambda s: db_set.bootstrap_servers([s.server_discord_id]),
+    "bootstrap_owner": lambda s: db_set.bootstrap_owner(s.server_discord_id, s.owner_discord_id),
+    "archive_pooches": lambda s: db_set.archive_pooches(s.day, PAGE_SIZE),
+    "enqueue_day_change_work": lambda s: db_set.enqueue_day_change_work(s.day + 1, [s.server_discord_id]),
+    # update
+    "set_pooch_dead": lambda s: db_update.set_pooch_dead(s.pooch_id),
+    "give_money_to_owner": lambda s: db_update.give_money_to_owner(s.owner_discord_id, 0),
+    "transfer_pooch_to_owner": lambda s: db_update.transfer_pooch_to_owner(s.pooch_id, s.owner_discord_id),
+    "purchase_pooch": lambda s: db_update.purchase_pooch(
+        s.owner_discord_id, s.vendor_id, s.stock_pooch_id, s.kennel_id, 0
+    ),
+    "set_event_channel_discord_id": lambda s: db_update.set_event_channel_discord_id(s.server_discord_id, 0),
+    "set_server_day_schedule": lambda s: db_update.set_server_day_schedule(s.server_discord_id, "UTC", 0),
+    "set_servers_command_tree_hash": lambda s: db_update.set_servers_command_tree_hash([s.server_discord_id], ""),
+    "claim_server_day_change": lambda s: db_update.claim_server_day_change(s.server_discord_id, s.day + 1),
+    "claim_vendor_restock": lambda s: db_update.claim_vendor_restock(s.vendor_id, s.day + 1),
+    "advance_world_day": lambda s: db_update.advance_world_day(),
+    "claim_day_change_work": lambda s: db_update.claim_day_change_work("plan-check", PAGE_SIZE),
+    "finish_day_change_work": lambda s: db_update.finish_day_change_work(0, "plan-check", "done"),
+    "requeue_stale_day_change_work": lambda s: db_update.requeue_stale_day_change_work(datetime.now(timezone.utc), 3),
+    "mark_day_change_work_delivered": lambda s: db_update.mark_day_change_work_delivered([0]),
+    # delete
+    "remove_pooch_from_kennel": lambda s: db_delete.remove_pooch_from_kennel(s.pooch_id),
+    "remove_pooch_from_vendor_stock": lambda s: db_delete.remove_pooch_from_vendor_stock(s.vendor_id, s.stock_pooch_id),
+    "clear_vendor_pooch_stock": lambda s: db_delete.clear_vendor_pooch_stock(s.vendor_id),
+    "delete_pregnancy": lambda s: db_delete.delete_pregnancy(s.parent_id, s.pooch_id),
+    "clear_due_events": lambda s: db_delete.clear_due_events("death_risk", s.day),
+}
+
+# The statements `EXPLAIN` can plan (not the savepoints around them).
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+# Scaled by the number of pooches to seed. Owner Discord IDs are offset so they can't collide with server ones.
+_SEED_STATEMENTS = [
+    "INSERT INTO servers (discord_id) SELECT s FROM generate_series(1, :servers) s ON CONFLICT DO NOTHING",
+    "INSERT INTO owners (discord_id) SELECT 1000000 + o FROM generate_series(1, :owners) o ON CONFLICT DO NOTHING",
+    "INSERT INTO owner_servers (server_discord_id, owner_discord_id) "
+    "SELECT 1 + o % :servers, 1000000 + o FROM generate_series(1, :owners) o ON CONFLICT DO NOTHING",
+    "INSERT INTO vendors (server_discord_id, name) "
+    "SELECT 1 + v % :servers, 'Plan Check Vendor ' || v FROM generate_series(1, :vendors) v ON CONFLICT DO NOTHING",
+    "INSERT INTO kennels (owner_discord_id, name) "
+    "SELECT 1000001 + k % :owners, 'Plan Check Kennel ' || k FROM generate_series(1, :kennels) k",
+    # a quarter dead, a third vendor stock, the rest owned
+    "INSERT INTO pooches "
+    "(name, sex, birth_day, health_loss_start_day, cooldown_ready_day, death_day, alive, owner_discord_id, vendor_id) "
+    "SELECT 'Plan Check Pooch ' || p, (ARRAY['female', 'male']::sex[])[1 + p % 2], 0, 5, 0, "
+    "CASE WHEN p % 4 = 0 THEN 1 END, p % 4 <> 0, "
+    "CASE WHEN p % 3 <> 0 THEN 1000001 + p % :owners END, "
+    "CASE WHEN p % 3 = 0 THEN (SELECT array_agg(id) FROM vendors)[1 + p % :vendors] END "
+    "FROM generate_series(1, :rows) p",
+    "INSERT INTO kennel_pooches (pooch_id, kennel_id) "
+    "SELECT pooches.id, kennel.id FROM pooches "
+    "JOIN LATERAL (SELECT id FROM kennels WHERE kennels.owner_discord_id = pooches.owner_discord_id LIMIT 1) kennel "
+    "ON true WHERE pooches.alive ON CONFLICT DO NOTHING",
+    "INSERT INTO vendor_pooches_for_sale (pooch_id, vendor_id) "
+    "SELECT id, vendor_id FROM pooches WHERE vendor_id IS NOT NULL AND alive AND id % 2 = 0 ON CONFLICT DO NOTHING",
+    # every 10 consecutive pooches are full siblings
+    "INSERT INTO pooch_parentage (child_id, father_id, mother_id) "
+    "SELECT id, id / 10 * 10 - 1, id / 10 * 10 - 2 FROM pooches WHERE id >= 20 ON CONFLICT DO NOTHING",
+    "INSERT INTO scheduled_events (kind, day, pooch_id) "
+    "SELECT 'death_risk', id % 30, id FROM pooches WHERE alive ON CONFLICT DO NOTHING",
+    "CREATE TABLE IF NOT EXISTS day_events_0 PARTITION OF day_events "
+    f"FOR VALUES FROM (0) TO ({DAY_EVENT_PARTITION_DAYS})",
+    "INSERT INTO day_events (day, server_discord_id, kind, pooch_id, pooch_name) "
+    f"SELECT p % {DAY_EVENT_PARTITION_DAYS}, 1 + p % :servers, 'death', p, 'Plan Check Pooch ' || p "
+    "FROM generate_series(1, :rows) p",
+    # a hundred days of finished (and delivered) day changes for every server
+    "INSERT INTO day_change_work (day, server_discord_id, status, delivered_at) "
+    "SELECT -d, s, 'done', now() FROM generate_series(1, 100) d, generate_series(1, :servers) s "
+    "ON CONFLICT DO NOTHING",
+]
+
+
+async def seed(rows: int):
+    """
+    Seed the database with `rows` pooches and proportionally many servers, owners, vendors, kennels and events,
+    unless it already has that many pooches. Only meant for a local database.
+
+    Parameters
+    ----------
+    rows: int
+        The number of pooches to seed.
+    """
+
+    async with session_scope() as session:
+        existing = (await session.execute(text("SELECT count(*) FROM pooches"))).scalar_one()
+        if existing >= rows:
+            return
+
+        owners = max(rows // 50, 1)
+        servers = max(rows // 2500, 1)
+        parameters = {"rows": rows, "owners": owners, "servers": servers, "vendors": servers * 3, "kennels": owners * 2}
+        for statement in _SEED_STATEMENTS:
+            await session.execute(text(statement), {k: v for k, v in parameters.items() if f":{k}" in statement})
+
+    async with _get_engine().connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("ANALYZE"))
+
+
+async def _get_sample() -> _Sample:
+    async with session_scope() as session:
+        pooch_id, parent_id = (
+            await session.execute(
+                text(
+                    "SELECT child_id, father_id FROM pooch_parentage "
+                    "WHERE father_id IS NOT NULL AND mother_id IS NOT NULL ORDER BY child_id LIMIT 1"
+                )
+            )
+        ).one()
+        kennel_id, owner_discord_id = (
+            await session.execute(text("SELECT id, owner_discord_id FROM kennels ORDER BY id LIMIT 1"))
+        ).one()
+        server_discord_id = (
+            await session.execute(
+                text("SELECT server_discord_id FROM owner_servers WHERE owner_discord_id = :owner LIMIT 1"),
+                {"owner": owner_discord_id},
+            )
+        ).scalar_one()
+        stock_pooch_id, vendor_id = (
+            await session.execute(
+                text("SELECT pooch_id, vendor_id FROM vendor_pooches_for_sale ORDER BY pooch_id LIMIT 1")
+            )
+        ).one()
+        day = (await session.execute(text("SELECT day FROM world_state"))).scalar_one()
+
+    return _Sample(
+        server_discord_id=server_discord_id,
+        owner_discord_id=owner_discord_id,
+        kennel_id=kennel_id,
+        vendor_id=vendor_id,
+        pooch_id=pooch_id,
+        parent_id=parent_id,
+        stock_pooch_id=stock_pooch_id,
+        day=day,
+    )
+
+
+def _seq_scans(plan: dict[str, Any]) -> Iterator[str]:
+    """Yield the name of every relation a plan node (or any of its children) reads with a sequential scan."""
+
+    if plan["Node Type"] == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+def _unchecked_query_functions() -> list[str]:
+    """List the public query functions in the `database` get, list, set, update and delete modules without a check."""
+
+    names = []
+    for module in (db_get, db_list, db_set, db_update, db_delete):
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if name.startswith("_") or function.__module__ != module.__name__:
+                continue
+            if not (inspect.iscoroutinefunction(function) or inspect.isasyncgenfunction(function)):
+                continue
+            if name not in CHECKS and name not in UNCHECKED:
+                names.append(name)
+    return names
+
+
+@asynccontextmanager
+async def _joined_sessions(connection: AsyncConnection) -> AsyncIterator[None]:
+    """Make every `session_scope` run in a savepoint of the given connection's transaction instead of committing."""
+
+    previous = db_session._SESSIONMAKER
+    db_session._SESSIONMAKER = async_sessionmaker(
+        connection, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    )
+    try:
+        yield
+    finally:
+        db_session._SESSIONMAKER = previous
+
+
+async def check_query_plans(threshold: int) -> list[str]:
+    """
+    Run every checked query function against the database, `EXPLAIN` every statement it sends,
+    and find the ones that fall back to a sequential scan over a table with more than `threshold` rows.
+    Everything runs in one transaction that's rolled back, so checking the write functions doesn't change anything.
+
+    Parameters
+    ----------
+    threshold: int
+        The most rows a table can have for a sequential scan over it to be acceptable.
+
+    Returns
+    -------
+    list[str]
+        A description of every problem found. Empty if every query is fine.
+    """
+
+    problems = [f"{name}: no plan check (add it to CHECKS or UNCHECKED)" for name in _unchecked_query_functions()]
+
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    engine = _get_engine()
+    sample = await _get_sample()
+
+    async with engine.connect() as connection:
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        table_rows = {
+            name: rows
+            for name, rows in await driver_connection.fetch(
+                "SELECT relname, reltuples FROM pg_class WHERE relkind IN ('r', 'p')"
+            )
+        }
+
+        transaction = await connection.begin()
+        try:
+            async with _joined_sessions(connection):
+                for name, call in CHECKS.items():
+                    # each check starts from the seeded data, whatever the checks before it wrote
+                    savepoint = await connection.begin_nested()
+                    captured.clear()
+                    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+                    try:
+                        await call(sample)
+                    finally:
+                        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+                    for statement, parameters in captured:
+                        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+                            continue
+                        explained = await driver_connection.fetchval(
+                            f"EXPLAIN (FORMAT JSON) {statement}", *(parameters or ())
+                        )
+                        plan = json.loads(explained)[0]["Plan"]
+                        for relation in _seq_scans(plan):
+                            rows = table_rows.get(relation, 0)
+                            if rows > threshold:
+                                problems.append(f"{name}: Seq Scan on {relation} (~{int(rows)} rows)\n    {statement}")
+                    await savepoint.rollback()
+        finally:
+            await transaction.rollback()
+
+    return problems
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Fail if a hot query falls back to a sequential scan.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="how many pooches to seed the database with")
+    parser.add_argument(
+        "--threshold",
+        type=int,
+        default=DEFAULT_SEQ_SCAN_THRESHOLD,
+        help="the most rows a table can have for a sequential scan over it to be acceptable",
+    )
+    args = parser.parse_args()
+
+    await seed(args.rows)
+    problems = await check_query_plans(args.threshold)
+    for problem in problems:
+        print(problem)
+    print(f"{len(CHECKS)} queries checked, {len(problems)} problem(s).")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
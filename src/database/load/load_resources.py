@@ -1,119 +1,167 @@
 import asyncio
 import json
+from dataclasses import dataclass, field
 from typing import Any
 
+from database.invalidation import publish_invalidation
 from database.models import Breed, Mutation, DogName, VendorFirstName, VendorLastName
 from database.session import session_scope
-from sqlalchemy import delete, func, select
+from sqlalchemy import Column, func, literal_column, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-async def load_breeds():
-    with open("resources/breeds.json", "r") as breeds_json_file:
-        breeds_json: dict[str, dict[str, dict[str, str | Any]]] = json.loads(breeds_json_file.read().strip())
-
-    async with session_scope() as session:
+@dataclass
+class SyncReport:
+    """What syncing one static table changed, by row name."""
 
-        # delete
-        await session.execute(delete(Breed))
+    table: str
+    inserted: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    retired: list[str] = field(default_factory=list)
 
-        # load
-        for breed_category, breeds in breeds_json.items():
-            for breed, attributes in breeds.items():
-                session.add(
-                    Breed(
-                        name=str(breed),
-                        alt_name=str(attributes.get("alt_name", str(breed))),
-                        category=str(breed_category),
-                        description=str(attributes.get("description", f"{str(breed).capitalize()} is a type of dog.")),
-                        rarity=str(attributes.get("rarity", "common")).lower(),
-                    )
-                )
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.retired)
 
+    def __str__(self) -> str:
+        return (
+            f"{self.table}: {len(self.inserted)} inserted, {len(self.updated)} updated, {len(self.retired)} retired"
+            + "".join(f"\n  + {name}" for name in self.inserted)
+            + "".join(f"\n  ~ {name}" for name in self.updated)
+            + "".join(f"\n  - {name}" for name in self.retired)
+        )
 
-async def load_mutations():
-    with open("resources/mutations.json", "r") as mutations_json_file:
-        mutations_json: dict[str, dict[str, dict[str, str | Any]]] = json.loads(mutations_json_file.read().strip())
-
-    async with session_scope() as session:
-
-        # delete
-        await session.execute(delete(Mutation))
-
-        # load
-        for mutation_category, mutations in mutations_json.items():
-            for mutation, attributes in mutations.items():
-                session.add(
-                    Mutation(
-                        name=str(mutation),
-                        alt_name=str(attributes.get("alt_name", str(mutation))),
-                        category=str(mutation_category),
-                        description=str(
-                            attributes.get("description", f"{str(mutation).capitalize()} is a mutation for dogs.")
-                        ),
-                        heritability=float(attributes.get("heritability", 25.0)),
-                        health_impact=str(attributes.get("health_impact", "neutral")).lower(),
-                        rarity=str(attributes.get("rarity", "common")).lower(),
-                        affects_males=bool(attributes.get("affects_males", True)),
-                        affects_females=bool(attributes.get("affects_females", True)),
-                        advanced_options=attributes.get("advanced_options", {}),
-                    )
-                )
-
-
-async def load_dog_names():
-    with open("resources/dog_names.txt", "r") as dog_names_file:
-        dog_names = dog_names_file.readlines()
-
-    async with session_scope() as session:
 
-        # delete
-        await session.execute(delete(DogName))
-
-        # load
-        for dog_name in dog_names:
-            dog_name = dog_name.strip()
-            if dog_name:
-                session.add(DogName(name=dog_name))
-
-
-async def load_vendor_first_names():
-    with open("resources/vendor_first_names.txt", "r") as vendor_first_names_file:
-        vendor_first_names = vendor_first_names_file.readlines()
-
-    async with session_scope() as session:
+def read_breeds() -> list[dict[str, Any]]:
+    with open("resources/breeds.json", "r") as breeds_json_file:
+        breeds_json: dict[str, dict[str, dict[str, str | Any]]] = json.loads(breeds_json_file.read().strip())
 
-        # delete
-        await session.execute(delete(VendorFirstName))
+    return [
+        {
+            "name": str(breed),
+            "alt_name": str(attributes.get("alt_name", str(breed))),
+            "category": str(breed_category),
+            "description": str(attributes.get("description", f"{str(breed).capitalize()} is a type of dog.")),
+            "rarity": str(attributes.get("rarity", "common")).lower(),
+        }
+        for breed_category, breeds in breeds_json.items()
+        for breed, attributes in breeds.items()
+    ]
 
-        # load
-        for vendor_first_name in vendor_first_names:
-            vendor_first_name = vendor_first_name.strip()
-            if vendor_first_name:
-                session.add(VendorFirstName(name=vendor_first_name))
 
+def read_mutations() -> list[dict[str, Any]]:
+    with open("resources/mutations.json", "r") as mutations_json_file:
+        mutations_json: dict[str, dict[str, dict[str, str | Any]]] = json.loads(mutations_json_file.read().strip())
 
-async def load_vendor_last_names():
-    with open("resources/vendor_last_names.txt", "r") as vendor_last_names_file:
-        vendor_last_names = vendor_last_names_file.readlines()
+    return [
+        {
+            "name": str(mutation),
+            "alt_name": str(attributes.get("alt_name", str(mutation))),
+            "category": str(mutation_category),
+            "description": str(attributes.get("description", f"{str(mutation).capitalize()} is a mutation for dogs.")),
+            "heritability": float(attributes.get("heritability", 0.25)),
+            "health_impact": str(attributes.get("health_impact", "neutral")).lower(),
+            "rarity": str(attributes.get("rarity", "common")).lower(),
+            "affects_males": bool(attributes.get("affects_males", True)),
+            "affects_females": bool(attributes.get("affects_females", True)),
+            "advanced_options": attributes.get("advanced_options", {}),
+        }
+        for mutation_category, mutations in mutations_json.items()
+        for mutation, attributes in mutations.items()
+    ]
+
+
+def read_names(path: str) -> list[dict[str, Any]]:
+    with open(path, "r") as names_file:
+        names = (name.strip() for name in names_file.readlines())
+
+    return [{"name": name} for name in names if name]
+
+
+async def sync_static_table(session: AsyncSession, model: type, rows: list[dict[str, Any]]) -> SyncReport:
+    """
+    Make a static table match the given rows, matching them up by their unique name, in two bulk statements.
+    New rows are inserted, changed rows are updated (and unretired), and rows that aren't given anymore are retired.
+    Rows are never deleted, so nothing that references them is ever orphaned.
+
+    Parameters
+    ----------
+    session: AsyncSession
+        The session to sync in. Nothing is committed, so every table can be synced in the same transaction.
+
+    model: type
+        The ORM model of the static table to sync. It must have a unique `name` and a `retired_at` column.
+
+    rows: list[dict[str, Any]]
+        Every row the table should have, each a dict of column values. Later rows with the same name win.
+
+    Returns
+    -------
+    SyncReport
+        The names of the rows that were inserted, updated and retired.
+    """
+
+    table = model.__table__
+    report = SyncReport(table=table.name)
+    rows = list({row["name"]: row for row in rows}.values())
+
+    if rows:
+        statement = pg_insert(table).values(rows)
+        synced: list[Column] = [table.c[column] for column in rows[0] if column != "name"]
+        upsert = statement.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={**{column.name: statement.excluded[column.name] for column in synced}, "retired_at": None},
+            where=or_(
+                table.c.retired_at.is_not(None),
+                *(column.is_distinct_from(statement.excluded[column.name]) for column in synced),
+            ),
+        )
+        # a row that was just inserted has no previous version, so its xmax is 0
+        response = await session.execute(
+            upsert.returning(table.c.name, (literal_column("xmax") == 0).label("inserted"))
+        )
+        for name, inserted in response.all():
+            (report.inserted if inserted else report.updated).append(name)
+
+    response = await session.execute(
+        update(table)
+        .where(table.c.retired_at.is_(None), table.c.name.not_in([row["name"] for row in rows]))
+        .values(retired_at=func.now())
+        .returning(table.c.name)
+    )
+    report.retired.extend(response.scalars().all())
+
+    if report.changed:
+        publish_invalidation(session, table.name)
+    return report
+
+
+async def sync_resources() -> list[SyncReport]:
+    """
+    Sync every static table with `resources/`, all in one transaction.
+
+    Returns
+    -------
+    list[SyncReport]
+        What changed in each table.
+    """
 
     async with session_scope() as session:
+        reports = [
+            await sync_static_table(session, Breed, read_breeds()),
+            await sync_static_table(session, Mutation, read_mutations()),
+            await sync_static_table(session, DogName, read_names("resources/dog_names.txt")),
+            await sync_static_table(session, VendorFirstName, read_names("resources/vendor_first_names.txt")),
+            await sync_static_table(session, VendorLastName, read_names("resources/vendor_last_names.txt")),
+        ]
 
-        # delete
-        await session.execute(delete(VendorLastName))
-
-        # load
-        for vendor_last_name in vendor_last_names:
-            vendor_last_name = vendor_last_name.strip()
-            if vendor_last_name:
-                session.add(VendorLastName(name=vendor_last_name))
+    return reports
 
 
 async def main():
-    await load_breeds()
-    await load_mutations()
-    await load_dog_names()
-    await load_vendor_first_names()
-    await load_vendor_last_names()
+    for report in await sync_resources():
+        print(report)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+from pathlib import Path
+from dotenv import load_dotenv
+import os
+import re
+import psycopg
+
+load_dotenv()
+
+MIGRATIONS_DIRECTORY = Path(__file__).parent.parent / "schema" / "migrations"
+
+_CREATE_INDEX_CONCURRENTLY = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE
+)
+
+
+def get_sync_dsn() -> str:
+    return (
+        f"dbname={os.environ['DATABASE']} "
+        f"user={os.environ['USER']} "
+        f"password={os.environ['PASSWORD']} "
+        f"host={os.environ['HOST']} "
+        f"port={os.environ.get('PORT', '5432')}"
+    )
+
+
+def _read_statements(path: Path) -> list[str]:
+    """
+    Split a migration file into its statements, dropping comments.
+    Semicolons inside `$$`-quoted bodies (like a `DO $$ ... $$` block) don't end a statement.
+    """
+
+    chunks: list[str] = []
+    current = ""
+    for i, part in enumerate(path.read_text(encoding="utf-8").split("$$")):
+        if i % 2:
+            # the inside of a $$-quoted body
+            current += f"$${part}$$"
+            continue
+        first, *rest = part.split(";")
+        current += first
+        for chunk in rest:
+            chunks.append(current)
+            current = chunk
+    chunks.append(current)
+
+    statements: list[str] = []
+    for chunk in chunks:
+        lines = [line for line in chunk.splitlines() if line.strip() and not line.strip().startswith("--")]
+        if lines:
+            statements.append("\n".join(lines))
+    return statements
+
+
+def _drop_invalid_indexes(cur: psycopg.Cursor, statements: list[str]):
+    """
+    Drop the invalid indexes a `CREATE INDEX CONCURRENTLY` in the given statements left behind by failing part way,
+    so it can be rerun. Invalid indexes the statements don't create (like one being built right now) are left alone.
+    """
+
+    index_names = [
+        match.group(1) for statement in statements for match in _CREATE_INDEX_CONCURRENTLY.finditer(statement)
+    ]
+    if not index_names:
+        return
+
+    cur.execute(
+        "SELECT index_class.oid::regclass::text FROM pg_index "
+        "JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid "
+        "WHERE NOT pg_index.indisvalid AND index_class.relkind = 'i' "
+        "AND index_class.relname = ANY(%s) AND pg_catalog.pg_table_is_visible(index_class.oid)",
+        (index_names,),
+    )
+    for (index_name,) in cur.fetchall():
+        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+
+def apply_migrations(conn: psycopg.Connection) -> list[str]:
+    """
+    Apply every migration in `schema/migrations` that hasn't been applied to the database yet, in version order.
+    Unlike `reset_db`, this never drops anything, so it's safe to run against a live database.
+
+    Each statement runs in its own transaction, so indexes can be built `CONCURRENTLY`.
+    Migrations should only use idempotent statements (like `IF NOT EXISTS`), so one that fails part way can be rerun.
+
+    Parameters
+    ----------
+    conn: psycopg.Connection
+        An autocommit connection to the database to migrate.
+
+    Returns
+    -------
+    list[str]
+        The versions of the migrations that were just applied.
+    """
+
+    applied: list[str] = []
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version TEXT PRIMARY KEY, applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+        )
+        cur.execute("SELECT version FROM schema_migrations")
+        already_applied = {version for (version,) in cur.fetchall()}
+
+        for path in sorted(MIGRATIONS_DIRECTORY.glob("*.sql")):
+            version = path.stem
+            if version in already_applied:
+                continue
+
+            statements = _read_statements(path)
+            _drop_invalid_indexes(cur, statements)
+            for statement in statements:
+                cur.execute(statement)
+            cur.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+            applied.append(version)
+
+    return applied
+
+
+def main():
+    with psycopg.connect(get_sync_dsn(), autocommit=True) as conn:
+        applied = apply_migrations(conn)
+
+    print(f"Applied {len(applied)} migration(s): {', '.join(applied)}" if applied else "Already up to date.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+from .backend import MemoryBackend
+from .records import MutationRecord
+
+__all__ = ["MemoryBackend", "MutationRecord"]
@@ -0,0 +1,904 @@
+import hashlib
+from collections import defaultdict
+from dataclasses import replace
+from datetime import datetime, timezone
+from itertools import count
+from typing import Any, AsyncIterator, Iterable, Optional, TypeVar
+
+import numpy as np
+from sqlalchemy.exc import IntegrityError
+
+from rng import derive_seed, generator
+from rules import (
+    ARCHIVE_DEAD_AFTER_DAYS,
+    BREEDING_COOLDOWN_DAYS,
+    FETAL_AGE,
+    HEALTH_LOSS_START_AGE,
+    MAX_BASE_HEALTH,
+    MIN_BASE_HEALTH,
+)
+
+from ..invalidation import _notify_listeners
+from ..list import Cursor, DayEventCursor
+from ..load.load_resources import read_mutations, read_names
+from ..models import Kennel, Owner, OwnerServer, Server, Vendor
+from ..models.enums.sex import SEX
+from ..projections import PoochRow
+from ..set import _death_risk_day
+from .records import (
+    ArchivedPoochRecord,
+    DayChangeWorkRecord,
+    DayEventRecord,
+    GraveyardPoochRecord,
+    KennelPoochRecord,
+    KennelRecord,
+    MutationRecord,
+    NameRecord,
+    OwnerRecord,
+    OwnerServerRecord,
+    PoochParentageRecord,
+    PoochPregnancyRecord,
+    PoochRecord,
+    ScheduledEventRecord,
+    ServerRecord,
+    VendorPoochForSaleRecord,
+    VendorRecord,
+)
+
+R = TypeVar("R")
+
+
+def _violation(constraint: str, detail: str) -> IntegrityError:
+    """Build the error Postgres would raise for a write that breaks the given constraint."""
+
+    return IntegrityError(f"in-memory write violating {constraint}", None, ValueError(detail))
+
+
+def _page(records: Iterable[R], after: Optional[Cursor], limit: Optional[int]) -> list[R]:
+    """Order records by (created_at, id) and keep the `limit` records following the `after` cursor."""
+
+    ordered = sorted(records, key=lambda record: (record.created_at, record.id))
+    if after is not None:
+        ordered = [record for record in ordered if (record.created_at, record.id) > after]
+    return ordered if limit is None else ordered[:limit]
+
+
+def _rows(pooches: Iterable[PoochRecord]) -> list[PoochRow]:
+    """Project pooches down to the columns the Postgres read paths select."""
+
+    return [
+        PoochRow(
+            pooch.id,
+            pooch.name,
+            pooch.sex,
+            pooch.birth_day,
+            pooch.base_health,
+            pooch.health_loss_start_day,
+            pooch.cooldown_ready_day,
+            pooch.as_of_day,
+            pooch.alive,
+            pooch.owner_discord_id,
+            pooch.created_at,
+        )
+        for pooch in pooches
+    ]
+
+
+def _pick_name(names: list[NameRecord], rng: np.random.Generator) -> Optional[NameRecord]:
+    """Pick a name the same way the seeded name pickers in `database.set` do, so a seed picks the same name."""
+
+    salt = str(derive_seed(rng))
+    candidates = [name for name in names if name.retired_at is None]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda name: (hashlib.md5((name.name + salt).encode()).hexdigest(), name.id))
+
+
+class MemoryBackend:
+    """
+    A pure-Python stand-in for Postgres behind every repository function (see `database.backend`),
+    so game logic can run (and be tested, or simulated) without a database.
+
+    Rows are slotted records in dicts keyed by their primary key, with a secondary index for every lookup
+    the repository functions make. The same constraints are enforced (owner xor vendor, a fetus in only one pregnancy,
+    a pooch in only one kennel, unique keys and foreign keys), raising IntegrityError like Postgres would.
+    Every read returns a copy, so like a detached ORM object it doesn't change when the backend is written to.
+    """
+
+    def __init__(
+        self,
+        mutations: Iterable[MutationRecord] = (),
+        dog_names: Iterable[str] = (),
+        vendor_first_names: Iterable[str] = (),
+        vendor_last_names: Iterable[str] = (),
+        world_day: int = 0,
+    ):
+        self.world_day = world_day
+        self.last_day_change_for: Optional[datetime] = None
+        self._pooch_ids = count(1)
+        self._kennel_ids = count(1)
+        self._vendor_ids = count(1)
+        self._day_event_ids = count(1)
+        self._day_change_work_ids = count(1)
+
+        self.mutations: dict[int, MutationRecord] = {mutation.id: mutation for mutation in mutations}
+        self.dog_names = [NameRecord(id=i, name=name) for i, name in enumerate(dog_names, 1)]
+        self.vendor_first_names = [NameRecord(id=i, name=name) for i, name in enumerate(vendor_first_names, 1)]
+        self.vendor_last_names = [NameRecord(id=i, name=name) for i, name in enumerate(vendor_last_names, 1)]
+
+        self.pooches: dict[int, PoochRecord] = {}
+        self.archived_pooches: dict[int, ArchivedPoochRecord] = {}
+        self.owners: dict[int, OwnerRecord] = {}
+        self.kennels: dict[int, KennelRecord] = {}
+        self.vendors: dict[int, VendorRecord] = {}
+        self.servers: dict[int, ServerRecord] = {}
+        self.owner_servers: dict[tuple[int, int], OwnerServerRecord] = {}
+        self.kennel_pooches: dict[int, KennelPoochRecord] = {}  # by pooch ID
+        self.vendor_pooches_for_sale: dict[int, VendorPoochForSaleRecord] = {}  # by pooch ID
+        self.graveyard_pooches: dict[int, GraveyardPoochRecord] = {}  # by pooch ID
+        self.pooch_pregnancies: dict[int, PoochPregnancyRecord] = {}  # by fetus ID
+        self.pooch_parentage: dict[int, PoochParentageRecord] = {}  # by child ID
+        self.day_events: list[DayEventRecord] = []
+        self.day_change_work: dict[int, DayChangeWorkRecord] = {}
+
+        # secondary indexes
+        self._kennels_by_owner: defaultdict[int, set[int]] = defaultdict(set)
+        self._pooches_by_kennel: defaultdict[int, set[int]] = defaultdict(set)
+        self._vendors_by_server: defaultdict[int, set[int]] = defaultdict(set)
+        self._stock_by_vendor: defaultdict[int, set[int]] = defaultdict(set)
+        self._servers_by_owner: defaultdict[int, set[int]] = defaultdict(set)
+        self._children_by_parent: defaultdict[int, set[int]] = defaultdict(set)
+        self._fetuses_by_mother: defaultdict[int, set[int]] = defaultdict(set)
+        self._day_events_by_server: defaultdict[int, list[DayEventRecord]] = defaultdict(list)
+        self._day_events_by_pooch: defaultdict[int, list[DayEventRecord]] = defaultdict(list)
+        self._due_events: defaultdict[str, defaultdict[int, set[int]]] = defaultdict(lambda: defaultdict(set))
+        self._due_events_by_pooch: defaultdict[int, set[tuple[str, int]]] = defaultdict(set)
+
+    @classmethod
+    def from_resources(cls) -> MemoryBackend:
+        """
+        Create an empty world with the mutations and names in `resources/` (read relative to the working directory).
+
+        Returns
+        -------
+        MemoryBackend
+            The new backend.
+        """
+
+        return cls(
+            mutations=[MutationRecord(id=i, **mutation) for i, mutation in enumerate(read_mutations(), 1)],
+            dog_names=[row["name"] for row in read_names("resources/dog_names.txt")],
+            vendor_first_names=[row["name"] for row in read_names("resources/vendor_first_names.txt")],
+            vendor_last_names=[row["name"] for row in read_names("resources/vendor_last_names.txt")],
+        )
+
+    # helpers
+
+    def _pooch(self, pooch: Optional[PoochRecord]) -> Optional[PoochRecord]:
+        """Copy a pooch as of the current world day, like loading it."""
+
+        return replace(pooch, world_day=self.world_day) if pooch is not None else None
+
+    def _any_pooch(self, pooch_id: Optional[int]) -> Optional[PoochRecord]:
+        if pooch_id is None:
+            return None
+        pooch = self.pooches.get(pooch_id)
+        return self._pooch(pooch) if pooch is not None else self._copy(self.archived_pooches.get(pooch_id))
+
+    @staticmethod
+    def _copy(record: Optional[R]) -> Optional[R]:
+        return replace(record) if record is not None else None
+
+    def _pooches(self, pooch_ids: Iterable[int], include_archived: bool = False) -> list[PoochRecord]:
+        pooches = []
+        for pooch_id in pooch_ids:
+            pooch = self._any_pooch(pooch_id) if include_archived else self._pooch(self.pooches.get(pooch_id))
+            if pooch is not None:
+                pooches.append(pooch)
+        return pooches
+
+    def _siblings(self, pooch_id: int) -> set[int]:
+        parentage = self.pooch_parentage.get(pooch_id)
+        if parentage is None or parentage.father_id is None or parentage.mother_id is None:
+            return set()
+        return {
+            child_id
+            for child_id in self._children_by_parent[parentage.father_id]
+            if child_id != pooch_id
+            and self.pooch_parentage[child_id].father_id == parentage.father_id
+            and self.pooch_parentage[child_id].mother_id == parentage.mother_id
+        }
+
+    def _schedule(self, kind: str, day: int, pooch_id: int):
+        self._due_events[kind][day].add(pooch_id)
+        self._due_events_by_pooch[pooch_id].add((kind, day))
+
+    def add_parentage(self, child_id: int, father_id: Optional[int], mother_id: Optional[int]):
+        """
+        Record a pooch's parents. Nothing in the repository interface writes lineage yet,
+        so this is how a scenario sets up a family.
+
+        Parameters
+        ----------
+        child_id: int
+            The ID of the child pooch.
+
+        father_id: int, optional
+            The ID of its father.
+
+        mother_id: int, optional
+            The ID of its mother.
+        """
+
+        if child_id in self.pooch_parentage:
+            raise _violation("pooch_parentage_pkey", f"pooch {child_id} already has parents")
+        self.pooch_parentage[child_id] = PoochParentageRecord(child_id, father_id, mother_id)
+        for parent_id in (father_id, mother_id):
+            if parent_id is not None:
+                self._children_by_parent[parent_id].add(child_id)
+
+    # get
+
+    async def get_pooch_by_id(self, pooch_id: int) -> Optional[PoochRecord]:
+        return self._pooch(self.pooches.get(pooch_id))
+
+    async def get_archived_pooch_by_id(self, pooch_id: int) -> Optional[ArchivedPoochRecord]:
+        return self._copy(self.archived_pooches.get(pooch_id))
+
+    async def get_owner_by_discord_id(self, owner_discord_id: int) -> Optional[OwnerRecord]:
+        return self._copy(self.owners.get(owner_discord_id))
+
+    async def get_kennel_by_id(self, kennel_id: int) -> Optional[KennelRecord]:
+        return self._copy(self.kennels.get(kennel_id))
+
+    async def get_vendor_by_id(self, vendor_id: int) -> Optional[VendorRecord]:
+        return self._copy(self.vendors.get(vendor_id))
+
+    async def get_server_by_discord_id(self, server_discord_id: int) -> Optional[ServerRecord]:
+        return self._copy(self.servers.get(server_discord_id))
+
+    async def get_pooch_kennel(self, pooch_id: int) -> Optional[KennelRecord]:
+        membership = self.kennel_pooches.get(pooch_id)
+        if membership is None:
+            return None
+        kennel = self.kennels.get(membership.kennel_id)
+        return self._copy(kennel) if kennel is not None and kennel.owner_discord_id in self.owners else None
+
+    async def get_pooch_parents(self, pooch_id: int) -> tuple[Optional[PoochRow], Optional[PoochRow]]:
+        parentage = self.pooch_parentage.get(pooch_id)
+        if parentage is None:
+            return (None, None)
+        father, mother = self._any_pooch(parentage.father_id), self._any_pooch(parentage.mother_id)
+        return (_rows([father])[0] if father else None, _rows([mother])[0] if mother else None)
+
+    async def get_vendor_server(self, vendor_id: int) -> Optional[ServerRecord]:
+        vendor = self.vendors.get(vendor_id)
+        return self._copy(self.servers.get(vendor.server_discord_id)) if vendor is not None else None
+
+    async def get_owner_server(self, server_discord_id: int, owner_discord_id: int) -> Optional[OwnerServerRecord]:
+        return self._copy(self.owner_servers.get((server_discord_id, owner_discord_id)))
+
+    async def get_world_day(self) -> int:
+        return self.world_day
+
+    async def get_last_world_day_change(self) -> Optional[datetime]:
+        return self.last_day_change_for
+
+    # list
+
+    async def list_pooches_for_kennel(self, kennel_id: int) -> list[PoochRow]:
+        return _rows(_page(self._pooches(self._pooches_by_kennel.get(kennel_id, ())), None, None))
+
+    async def list_pooches_for_kennel_page(
+        self, kennel_id: int, limit: int, after: Optional[Cursor] = None
+    ) -> list[PoochRow]:
+        return _rows(_page(self._pooches(self._pooches_by_kennel.get(kennel_id, ())), after, limit))
+
+    async def count_pooches_for_kennel(self, kennel_id: int) -> int:
+        return len(self._pooches_by_kennel.get(kennel_id, ()))
+
+    async def list_kennels_for_owner(self, owner_discord_id: int) -> list[KennelRecord]:
+        if owner_discord_id not in self.owners:
+            return []
+        kennels = (self.kennels[kennel_id] for kennel_id in self._kennels_by_owner.get(owner_discord_id, ()))
+        return [replace(kennel) for kennel in _page(kennels, None, None)]
+
+    async def list_kennels_for_owner_page(
+        self, owner_discord_id: int, limit: int, after: Optional[Cursor] = None
+    ) -> list[KennelRecord]:
+        kennels = (self.kennels[kennel_id] for kennel_id in self._kennels_by_owner.get(owner_discord_id, ()))
+        return [replace(kennel) for kennel in _page(kennels, after, limit)]
+
+    async def count_kennels_for_owner(self, owner_discord_id: int) -> int:
+        return len(self._kennels_by_owner.get(owner_discord_id, ()))
+
+    async def list_living_pooches(self) -> list[PoochRecord]:
+        return _page(self._pooches(pooch.id for pooch in self.pooches.values() if pooch.alive), None, None)
+
+    async def list_living_pooches_page(
+        self, limit: int, after: Optional[Cursor] = None, below_health: Optional[int] = None
+    ) -> list[PoochRecord]:
+        pooches = self._pooches(pooch.id for pooch in self.pooches.values() if pooch.alive)
+        if below_health is not None:
+            pooches = [pooch for pooch in pooches if pooch.health < below_health]
+        return _page(pooches, after, limit)
+
+    async def count_living_pooches(self) -> int:
+        return sum(pooch.alive for pooch in self.pooches.values())
+
+    async def list_pooch_children(self, pooch_id: int) -> list[PoochRow]:
+        return _rows(
+            _page(self._pooches(self._children_by_parent.get(pooch_id, ()), include_archived=True), None, None)
+        )
+
+    async def list_pooch_children_page(
+        self, pooch_id: int, limit: int, after: Optional[Cursor] = None
+    ) -> list[PoochRow]:
+        return _rows(
+            _page(self._pooches(self._children_by_parent.get(pooch_id, ()), include_archived=True), after, limit)
+        )
+
+    async def count_pooch_children(self, pooch_id: int) -> int:
+        return len(self._children_by_parent.get(pooch_id, ()))
+
+    async def list_pooch_siblings(self, pooch_id: int) -> list[PoochRow]:
+        father, mother = await self.get_pooch_parents(pooch_id)
+        if not father or not mother:
+            return []
+        return _rows(_page(self._pooches(self._siblings(pooch_id), include_archived=True), None, None))
+
+    async def list_pooch_siblings_page(
+        self, pooch_id: int, limit: int, after: Optional[Cursor] = None
+    ) -> list[PoochRow]:
+        return _rows(_page(self._pooches(self._siblings(pooch_id), include_archived=True), after, limit))
+
+    async def list_pooch_pregnancies(self, fetus_ids: Optional[list[int]] = None) -> list[PoochPregnancyRecord]:
+        if fetus_ids is None:
+            pregnancies = self.pooch_pregnancies.values()
+        else:
+            pregnancies = (self.pooch_pregnancies[i] for i in set(fetus_ids) if i in self.pooch_pregnancies)
+        return sorted((replace(pregnancy) for pregnancy in pregnancies), key=lambda pregnancy: pregnancy.fetus_id)
+
+    async def list_vendors(self, server_discord_id: int) -> list[VendorRecord]:
+        vendors = (self.vendors[vendor_id] for vendor_id in self._vendors_by_server.get(server_discord_id, ()))
+        return sorted((replace(vendor) for vendor in vendors), key=lambda vendor: (vendor.name, vendor.id))
+
+    async def list_vendor_pooch_stock(self, vendor_id: int) -> list[PoochRow]:
+        return _rows(_page(self._pooches(self._stock_by_vendor.get(vendor_id, ())), None, None))
+
+    async def list_vendor_pooch_stock_page(
+        self, vendor_id: int, limit: int, after: Optional[Cursor] = None
+    ) -> list[PoochRow]:
+        return _rows(_page(self._pooches(self._stock_by_vendor.get(vendor_id, ())), after, limit))
+
+    async def count_vendor_pooch_stock(self, vendor_id: int) -> int:
+        return len(self._stock_by_vendor.get(vendor_id, ()))
+
+    async def list_servers_for_pooch(self, pooch_id: int) -> list[ServerRecord]:
+        pooch = self.pooches.get(pooch_id)
+        if pooch is None:
+            return []
+
+        server_ids: set[int] = set()
+        if pooch.vendor_id is not None and pooch.vendor_id in self.vendors:
+            server_ids.add(self.vendors[pooch.vendor_id].server_discord_id)
+        if pooch.owner_discord_id is not None:
+            server_ids.update(self._servers_by_owner.get(pooch.owner_discord_id, ()))
+
+        servers = (replace(self.servers[server_id]) for server_id in server_ids if server_id in self.servers)
+        return sorted(servers, key=lambda server: (server.joined_at, server.discord_id))
+
+    async def list_owner_servers(self, owner_discord_id: int) -> list[ServerRecord]:
+        server_ids = self._servers_by_owner.get(owner_discord_id, ())
+        servers = (replace(self.servers[server_id]) for server_id in server_ids if server_id in self.servers)
+        return sorted(servers, key=lambda server: (server.joined_at, server.discord_id))
+
+    async def list_servers(self) -> list[ServerRecord]:
+        servers = (replace(server) for server in self.servers.values())
+        return sorted(servers, key=lambda server: (server.joined_at, server.discord_id))
+
+    async def list_pooches_by_ids(self, pooch_ids: list[int], include_archived: bool = False) -> list[PoochRecord]:
+        return self._pooches(set(pooch_ids), include_archived)
+
+    async def list_pooch_rows_by_ids(self, pooch_ids: list[int]) -> list[PoochRow]:
+        return _rows(self._pooches(sorted(set(pooch_ids))))
+
+    async def list_server_day_events(self, server_discord_id: int, day: int) -> list[DayEventRecord]:
+        events = self._day_events_by_server.get(server_discord_id, ())
+        return [replace(event) for event in events if event.day == day]
+
+    async def list_server_day_events_page(
+        self, server_discord_id: int, limit: int, before: Optional[DayEventCursor] = None
+    ) -> list[DayEventRecord]:
+        events = sorted(
+            self._day_events_by_server.get(server_discord_id, ()),
+            key=lambda event: (event.day, event.id),
+            reverse=True,
+        )
+        if before is not None:
+            events = [event for event in events if (event.day, event.id) < before]
+        return [replace(event) for event in events[:limit]]
+
+    async def count_server_day_events(self, server_discord_id: int) -> int:
+        return len(self._day_events_by_server.get(server_discord_id, ()))
+
+    async def list_pooch_day_events(self, pooch_id: int) -> list[DayEventRecord]:
+        events = self._day_events_by_pooch.get(pooch_id, ())
+        return [replace(event) for event in sorted(events, key=lambda event: (event.day, event.id))]
+
+    async def stream_day_events(
+        self, after_day: Optional[int] = None, batch_size: int = 1000
+    ) -> AsyncIterator[DayEventRecord]:
+        for event in sorted(self.day_events, key=lambda event: (event.day, event.id)):
+            if after_day is None or event.day > after_day:
+                yield replace(event)
+
+    async def list_due_events_page(
+        self, kind: str, day: int, limit: int, after_pooch_id: Optional[int] = None
+    ) -> list[ScheduledEventRecord]:
+        due = [
+            ScheduledEventRecord(kind=kind, day=due_day, pooch_id=pooch_id)
+            for due_day, pooch_ids in self._due_events[kind].items()
+            if due_day <= day
+            for pooch_id in pooch_ids
+            if after_pooch_id is None or pooch_id > after_pooch_id
+        ]
+        due.sort(key=lambda event: (event.pooch_id, event.day))
+        return due[:limit]
+
+    async def list_day_change_work(self, day: int) -> list[DayChangeWorkRecord]:
+        return [replace(work) for work in self.day_change_work.values() if work.day == day]
+
+    async def list_undelivered_day_change_work(self) -> list[DayChangeWorkRecord]:
+        return [replace(work) for work in self.day_change_work.values() if work.delivered_at is None]
+
+    async def list_mutations(self) -> list[MutationRecord]:
+        return [replace(self.mutations[mutation_id]) for mutation_id in sorted(self.mutations)]
+
+    # set
+
+    async def create_pooch(
+        self,
+        owner_discord_id: Optional[int] = None,
+        vendor_id: Optional[int] = None,
+        name: Optional[str] = None,
+        sex: Optional[str] = None,
+        age: int = FETAL_AGE,
+        base_health: Optional[int] = None,
+        rng_seed: Optional[int] = None,
+    ) -> PoochRecord:
+        rng = generator(rng_seed)
+
+        if owner_discord_id is not None and owner_discord_id not in self.owners:
+            owner_discord_id = None
+        if vendor_id is not None and vendor_id not in self.vendors:
+            vendor_id = None
+        if owner_discord_id is not None and vendor_id is not None:
+            vendor_id = None
+
+        if not name:
+            dog_name = _pick_name(self.dog_names, rng)
+            name = dog_name.name if dog_name is not None else "Dog"
+        sex = sex or str(rng.choice(SEX.enums))
+        base_health = base_health or int(rng.integers(MIN_BASE_HEALTH, MAX_BASE_HEALTH + 1))
+        if base_health < 0:
+            raise _violation("pooch_base_health_minimum", f"base health {base_health} is below 0")
+
+        birth_day = self.world_day - age
+        health_loss_start_day = max(birth_day + HEALTH_LOSS_START_AGE, self.world_day)
+        pooch = PoochRecord(
+            id=next(self._pooch_ids),
+            name=name,
+            sex=sex,
+            birth_day=birth_day,
+            base_health=base_health,
+            health_loss_start_day=health_loss_start_day,
+            cooldown_ready_day=self.world_day + BREEDING_COOLDOWN_DAYS,
+            owner_discord_id=owner_discord_id,
+            vendor_id=vendor_id,
+        )
+        self.pooches[pooch.id] = pooch
+        self._schedule("death_risk", _death_risk_day(base_health, health_loss_start_day, self.world_day), pooch.id)
+
+        return self._pooch(pooch)
+
+    async def create_owner(self, owner_discord_id: int) -> OwnerRecord:
+        if owner_discord_id in self.owners:
+            raise _violation("owners_pkey", f"owner {owner_discord_id} already exists")
+        owner = self.owners[owner_discord_id] = OwnerRecord(discord_id=owner_discord_id)
+        _notify_listeners(Owner.__tablename__, owner_discord_id)
+        return replace(owner)
+
+    async def create_kennel(
+        self, owner_discord_id: int, name: str = "Kennel", pooch_limit: int = 10  # TODO
+    ) -> Optional[KennelRecord]:
+        if owner_discord_id not in self.owners:
+            return None
+        kennel = KennelRecord(
+            id=next(self._kennel_ids), owner_discord_id=owner_discord_id, name=name, pooch_limit=pooch_limit
+        )
+        self.kennels[kennel.id] = kennel
+        self._kennels_by_owner[owner_discord_id].add(kennel.id)
+        _notify_listeners(Kennel.__tablename__, kennel.id)
+        return replace(kennel)
+
+    async def create_vendor(
+        self, server_discord_id: int, name: Optional[str] = None, rng_seed: Optional[int] = None
+    ) -> Optional[VendorRecord]:
+        rng = generator(rng_seed)
+
+        if not name:
+            first_name = _pick_name(self.vendor_first_names, rng)
+            last_name = _pick_name(self.vendor_last_names, rng)
+            first = f"{first_name.name} " if first_name is not None else ""
+            last = last_name.name if last_name is not None else ""
+            name = f"{first}{last}"
+
+        if server_discord_id not in self.servers:
+            raise _violation("vendors_server_discord_id_fkey", f"server {server_discord_id} doesn't exist")
+        if any(self.vendors[i].name == name for i in self._vendors_by_server.get(server_discord_id, ())):
+            raise _violation("vendors_server_discord_id_name_uniq", f"server {server_discord_id} has a vendor {name}")
+
+        vendor = VendorRecord(id=next(self._vendor_ids), server_discord_id=server_discord_id, name=name)
+        self.vendors[vendor.id] = vendor
+        self._vendors_by_server[server_discord_id].add(vendor.id)
+        _notify_listeners(Vendor.__tablename__, vendor.id)
+        return replace(vendor)
+
+    async def create_server(self, server_discord_id: int) -> ServerRecord:
+        if server_discord_id in self.servers:
+            raise _violation("servers_pkey", f"server {server_discord_id} already exists")
+        server = self.servers[server_discord_id] = ServerRecord(discord_id=server_discord_id)
+        _notify_listeners(Server.__tablename__, server_discord_id)
+        return replace(server)
+
+    async def bootstrap_server(self, server_discord_id: int) -> ServerRecord:
+        server = self.servers.get(server_discord_id)
+        if server is None:
+            server = self.servers[server_discord_id] = ServerRecord(discord_id=server_discord_id)
+            _notify_listeners(Server.__tablename__, server_discord_id)
+        return replace(server)
+
+    async def bootstrap_servers(self, server_discord_ids: list[int]) -> list[ServerRecord]:
+        servers = []
+        for server_discord_id in server_discord_ids:
+            servers.append(await self.bootstrap_server(server_discord_id))
+        return servers
+
+    async def bootstrap_owner(
+        self,
+        server_discord_id: int,
+        owner_discord_id: int,
+        kennel_name: str = "Kennel",
+        kennel_pooch_limit: int = 10,  # TODO
+    ) -> OwnerRecord:
+        if server_discord_id not in self.servers:
+            self.servers[server_discord_id] = ServerRecord(discord_id=server_discord_id)
+            _notify_listeners(Server.__tablename__, server_discord_id)
+
+        owner = self.owners.get(owner_discord_id)
+        if owner is None:
+            owner = self.owners[owner_discord_id] = OwnerRecord(discord_id=owner_discord_id)
+            kennel = KennelRecord(
+                id=next(self._kennel_ids),
+                owner_discord_id=owner_discord_id,
+                name=kennel_name,
+                pooch_limit=kennel_pooch_limit,
+            )
+            self.kennels[kennel.id] = kennel
+            self._kennels_by_owner[owner_discord_id].add(kennel.id)
+            _notify_listeners(Owner.__tablename__, owner_discord_id)
+
+        key = (server_discord_id, owner_discord_id)
+        if key not in self.owner_servers:
+            self.owner_servers[key] = OwnerServerRecord(*key)
+            self._servers_by_owner[owner_discord_id].add(server_discord_id)
+            _notify_listeners(OwnerServer.__tablename__, key)
+
+        return replace(owner)
+
+    async def add_pooch_to_kennel(self, kennel_id: int, pooch_id: int) -> KennelPoochRecord:
+        if kennel_id not in self.kennels:
+            raise _violation("kennel_pooches_kennel_id_fkey", f"kennel {kennel_id} doesn't exist")
+        if pooch_id not in self.pooches:
+            raise _violation("kennel_pooches_pooch_id_fkey", f"pooch {pooch_id} doesn't exist")
+        if pooch_id in self.kennel_pooches:
+            raise _violation("kennel_pooches_pkey", f"pooch {pooch_id} is already in a kennel")
+
+        kennel_pooch = self.kennel_pooches[pooch_id] = KennelPoochRecord(pooch_id=pooch_id, kennel_id=kennel_id)
+        self._pooches_by_kennel[kennel_id].add(pooch_id)
+        return replace(kennel_pooch)
+
+    async def add_owner_to_server(self, server_discord_id: int, owner_discord_id: int) -> OwnerServerRecord:
+        if server_discord_id not in self.servers:
+            raise _violation("owner_servers_server_discord_id_fkey", f"server {server_discord_id} doesn't exist")
+        if owner_discord_id not in self.owners:
+            raise _violation("owner_servers_owner_discord_id_fkey", f"owner {owner_discord_id} doesn't exist")
+        key = (server_discord_id, owner_discord_id)
+        if key in self.owner_servers:
+            raise _violation("owner_servers_pkey", f"owner {owner_discord_id} is already in server {server_discord_id}")
+
+        owner_server = self.owner_servers[key] = OwnerServerRecord(*key)
+        self._servers_by_owner[owner_discord_id].add(server_discord_id)
+        _notify_listeners(OwnerServer.__tablename__, key)
+        return replace(owner_server)
+
+    async def add_pooch_to_vendor_stock(self, vendor_id: int, pooch_id: int) -> Optional[VendorPoochForSaleRecord]:
+        if vendor_id not in self.vendors or pooch_id not in self.pooches:
+            return None
+        if pooch_id in self.vendor_pooches_for_sale:
+            raise _violation("vendor_pooches_for_sale_pkey", f"pooch {pooch_id} is already for sale")
+
+        for_sale = self.vendor_pooches_for_sale[pooch_id] = VendorPoochForSaleRecord(pooch_id, vendor_id)
+        self._stock_by_vendor[vendor_id].add(pooch_id)
+        return replace(for_sale)
+
+    async def bury_pooch(self, owner_discord_id: int, pooch_id: int) -> Optional[GraveyardPoochRecord]:
+        if owner_discord_id not in self.owners or pooch_id not in self.pooches:
+            return None
+        if pooch_id in self.graveyard_pooches:
+            raise _violation("graveyard_pooches_pkey", f"pooch {pooch_id} is already buried")
+
+        graveyard_pooch = self.graveyard_pooches[pooch_id] = GraveyardPoochRecord(pooch_id, owner_discord_id)
+        return replace(graveyard_pooch)
+
+    async def log_day_events(self, day: int, events: list[dict[str, Any]]):
+        for event in events:
+            record = DayEventRecord(id=next(self._day_event_ids), day=day, **event)
+            self.day_events.append(record)
+            self._day_events_by_server[record.server_discord_id].append(record)
+            self._day_events_by_pooch[record.pooch_id].append(record)
+
+    async def add_pregnancy(self, mother_id: int, fetus_id: int) -> PoochPregnancyRecord:
+        for pooch_id in (mother_id, fetus_id):
+            if pooch_id not in self.pooches:
+                raise _violation("pooch_pregnancies_fkey", f"pooch {pooch_id} doesn't exist")
+        if fetus_id in self.pooch_pregnancies:
+            raise _violation("pooch_pregnancy_unique_fetus", f"pooch {fetus_id} is already a fetus")
+
+        pregnancy = self.pooch_pregnancies[fetus_id] = PoochPregnancyRecord(mother_id=mother_id, fetus_id=fetus_id)
+        self._fetuses_by_mother[mother_id].add(fetus_id)
+        self._schedule("pregnancy_due", self.pooches[fetus_id].birth_day, fetus_id)
+        return replace(pregnancy)
+
+    async def schedule_events(self, events: list[dict[str, Any]]):
+        for event in events:
+            self._schedule(event["kind"], event["day"], event["pooch_id"])
+
+    async def enqueue_day_change_work(
+        self, day: int, server_discord_ids: list[int], scheduled_for: Optional[datetime] = None
+    ) -> int:
+        existing = {(work.day, work.server_discord_id) for work in self.day_change_work.values()}
+        queued = 0
+        for server_discord_id in server_discord_ids:
+            if server_discord_id not in self.servers:
+                raise _violation("day_change_work_server_discord_id_fkey", f"server {server_discord_id} doesn't exist")
+            if (day, server_discord_id) in existing:
+                continue
+            work_id = next(self._day_change_work_ids)
+            self.day_change_work[work_id] = DayChangeWorkRecord(
+                id=work_id, day=day, server_discord_id=server_discord_id, scheduled_for=scheduled_for
+            )
+            existing.add((day, server_discord_id))
+            queued += 1
+        return queued
+
+    async def archive_pooches(self, day: int, limit: int) -> int:
+        def archivable(pooch: PoochRecord) -> bool:
+            if pooch.id in self.kennel_pooches or pooch.id in self.pooch_pregnancies:
+                return False
+            if self._fetuses_by_mother.get(pooch.id):
+                return False
+            if not pooch.alive:
+                return pooch.death_day is not None and pooch.death_day <= day - ARCHIVE_DEAD_AFTER_DAYS
+            return (
+                pooch.vendor_id is not None
+                and pooch.owner_discord_id is None
+                and pooch.id not in self.vendor_pooches_for_sale
+            )
+
+        moved = [pooch for pooch_id, pooch in sorted(self.pooches.items()) if archivable(pooch)][:limit]
+        for pooch in moved:
+            graveyard_pooch = self.graveyard_pooches.pop(pooch.id, None)
+            self.archived_pooches[pooch.id] = ArchivedPoochRecord(
+                **{name: getattr(pooch, name) for name in PoochRecord.__dataclass_fields__ if name != "world_day"},
+                archived_day=day,
+                reason="unsold" if pooch.alive else "dead",
+                buried_at=graveyard_pooch.buried_at if graveyard_pooch is not None else None,
+            )
+
+            # everything else referring to the pooch is deleted along with it
+            del self.pooches[pooch.id]
+            for_sale = self.vendor_pooches_for_sale.pop(pooch.id, None)
+            if for_sale is not None:
+                self._stock_by_vendor[for_sale.vendor_id].discard(pooch.id)
+            for kind, due_day in self._due_events_by_pooch.pop(pooch.id, ()):
+                self._due_events[kind][due_day].discard(pooch.id)
+
+        return len(moved)
+
+    # update
+
+    async def set_pooch_dead(self, pooch_id: int) -> Optional[PoochRecord]:
+        pooch = self.pooches.get(pooch_id)
+        if pooch is None:
+            return None
+        pooch.alive = False
+        pooch.death_day = self.world_day
+        return self._pooch(pooch)
+
+    async def give_money_to_owner(self, owner_discord_id: int, dollars: int) -> Optional[OwnerRecord]:
+        owner = self.owners.get(owner_discord_id)
+        if owner is None:
+            return None
+        owner.dollars += dollars
+        _notify_listeners(Owner.__tablename__, owner_discord_id)
+        return replace(owner)
+
+    async def transfer_pooch_to_owner(self, pooch_id: int, owner_discord_id: int) -> Optional[PoochRecord]:
+        pooch = self.pooches.get(pooch_id)
+        if pooch is None:
+            return None
+        if owner_discord_id not in self.owners:
+            raise _violation("pooches_owner_discord_id_fkey", f"owner {owner_discord_id} doesn't exist")
+        pooch.owner_discord_id = owner_discord_id
+        pooch.vendor_id = None
+        return self._pooch(pooch)
+
+    async def purchase_pooch(
+        self, owner_discord_id: int, vendor_id: int, pooch_id: int, kennel_id: int, price: int
+    ) -> Optional[OwnerRecord]:
+        for_sale = self.vendor_pooches_for_sale.get(pooch_id)
+        if for_sale is None or for_sale.vendor_id != vendor_id:
+            return None
+        owner = self.owners.get(owner_discord_id)
+        if owner is None:
+            raise _violation("pooches_owner_discord_id_fkey", f"owner {owner_discord_id} doesn't exist")
+        if kennel_id not in self.kennels:
+            raise _violation("kennel_pooches_kennel_id_fkey", f"kennel {kennel_id} doesn't exist")
+
+        del self.vendor_pooches_for_sale[pooch_id]
+        self._stock_by_vendor[vendor_id].discard(pooch_id)
+        pooch = self.pooches[pooch_id]
+        pooch.owner_discord_id = owner_discord_id
+        pooch.vendor_id = None
+        self.kennel_pooches[pooch_id] = KennelPoochRecord(pooch_id=pooch_id, kennel_id=kennel_id)
+        self._pooches_by_kennel[kennel_id].add(pooch_id)
+        owner.dollars -= price
+        _notify_listeners(Owner.__tablename__, owner_discord_id)
+        return replace(owner)
+
+    async def set_event_channel_discord_id(
+        self, server_discord_id: int, channel_discord_id: int
+    ) -> Optional[ServerRecord]:
+        server = self.servers.get(server_discord_id)
+        if server is not None:
+            server.event_channel_discord_id = channel_discord_id
+        _notify_listeners(Server.__tablename__, server_discord_id)
+        return self._copy(server)
+
+    async def set_server_day_schedule(
+        self, server_discord_id: int, timezone: str, day_boundary_minute: int
+    ) -> Optional[ServerRecord]:
+        server = self.servers.get(server_discord_id)
+        if server is not None:
+            if not 0 <= day_boundary_minute <= 1439:
+                raise _violation("servers_day_boundary_minute_check", f"day boundary minute {day_boundary_minute}")
+            server.timezone = timezone
+            server.day_boundary_minute = day_boundary_minute
+        _notify_listeners(Server.__tablename__, server_discord_id)
+        return self._copy(server)
+
+    async def set_servers_command_tree_hash(self, server_discord_ids: list[int], command_tree_hash: str):
+        for server_discord_id in server_discord_ids:
+            server = self.servers.get(server_discord_id)
+            if server is not None:
+                server.command_tree_hash = command_tree_hash
+                _notify_listeners(Server.__tablename__, server_discord_id)
+
+    async def claim_server_day_change(self, server_discord_id: int, day: int, work_id: Optional[int] = None) -> bool:
+        server = self.servers.get(server_discord_id)
+        if server is None:
+            return False
+        if server.last_day_change_day is not None and server.last_day_change_day >= day:
+            if server.last_day_change_day > day or work_id is None or server.day_change_work_id != work_id:
+                return False
+        server.last_day_change_day = day
+        server.day_change_work_id = work_id
+        return True
+
+    async def claim_vendor_restock(self, vendor_id: int, day: int) -> bool:
+        vendor = self.vendors.get(vendor_id)
+        if vendor is None or (vendor.last_restock_day is not None and vendor.last_restock_day >= day):
+            return False
+        vendor.last_restock_day = day
+        return True
+
+    async def advance_world_day(self, scheduled_for: Optional[datetime] = None) -> Optional[int]:
+        if scheduled_for is not None:
+            if self.last_day_change_for is not None and self.last_day_change_for >= scheduled_for:
+                return None
+            self.last_day_change_for = scheduled_for
+        self.world_day += 1
+        return self.world_day
+
+    async def claim_day_change_work(self, worker_id: str, limit: int = 1) -> list[DayChangeWorkRecord]:
+        claimed = [work for work in self.day_change_work.values() if work.status == "pending"][:limit]
+        for work in claimed:
+            work.status = "running"
+            work.attempts += 1
+            work.claimed_by = worker_id
+            work.claimed_at = datetime.now(timezone.utc)
+        return [replace(work) for work in claimed]
+
+    async def finish_day_change_work(
+        self, work_id: int, worker_id: str, status: str, error: Optional[str] = None
+    ) -> bool:
+        work = self.day_change_work.get(work_id)
+        if work is None or work.status != "running" or work.claimed_by != worker_id:
+            return False
+        work.status = status
+        work.error = error
+        work.completed_at = datetime.now(timezone.utc) if status != "pending" else None
+        return True
+
+    async def requeue_stale_day_change_work(self, claimed_before: datetime, max_attempts: int) -> int:
+        stale = [
+            work
+            for work in self.day_change_work.values()
+            if work.status == "running" and work.claimed_at is not None and work.claimed_at < claimed_before
+        ]
+        for work in stale:
+            work.status = "failed" if work.attempts >= max_attempts else "pending"
+            work.error = "the worker running it stopped responding"
+        return len(stale)
+
+    async def mark_day_change_work_delivered(self, work_ids: list[int]) -> int:
+        delivered = 0
+        for work_id in work_ids:
+            work = self.day_change_work.get(work_id)
+            if work is not None and work.delivered_at is None:
+                work.delivered_at = datetime.now(timezone.utc)
+                delivered += 1
+        return delivered
+
+    # delete
+
+    async def remove_pooch_from_kennel(self, pooch_id: int) -> Optional[PoochRecord]:
+        membership = self.kennel_pooches.pop(pooch_id, None)
+        if membership is None:
+            return None
+        self._pooches_by_kennel[membership.kennel_id].discard(pooch_id)
+        return self._pooch(self.pooches.get(pooch_id))
+
+    async def remove_pooch_from_vendor_stock(self, vendor_id: int, pooch_id: int) -> Optional[PoochRecord]:
+        for_sale = self.vendor_pooches_for_sale.get(pooch_id)
+        if for_sale is None or for_sale.vendor_id != vendor_id:
+            return None
+        del self.vendor_pooches_for_sale[pooch_id]
+        self._stock_by_vendor[vendor_id].discard(pooch_id)
+        return self._pooch(self.pooches.get(pooch_id))
+
+    async def clear_vendor_pooch_stock(self, vendor_id: int) -> Optional[VendorRecord]:
+        vendor = self.vendors.get(vendor_id)
+        if vendor is None:
+            return None
+        for pooch_id in self._stock_by_vendor.pop(vendor_id, ()):
+            del self.vendor_pooches_for_sale[pooch_id]
+        return replace(vendor)
+
+    async def delete_pregnancy(self, mother_id: int, fetus_id: int) -> Optional[PoochRecord]:
+        fetus = self.pooches.get(fetus_id)
+        if fetus is None:
+            return None
+        pregnancy = self.pooch_pregnancies.get(fetus_id)
+        if pregnancy is not None and pregnancy.mother_id == mother_id:
+            del self.pooch_pregnancies[fetus_id]
+            self._fetuses_by_mother[mother_id].discard(fetus_id)
+        return self._pooch(fetus)
+
+    async def clear_due_events(self, kind: str, day: int):
+        due_events = self._due_events[kind]
+        for due_day in [due_day for due_day in due_events if due_day <= day]:
+            for pooch_id in due_events.pop(due_day):
+                self._due_events_by_pooch[pooch_id].discard((kind, due_day))
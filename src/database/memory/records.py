@@ -0,0 +1,204 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# Each record has the same attributes (and derived properties) as the ORM model it stands in for,
+# so the game layer can't tell which backend it came from.
+
+
+@dataclass(slots=True)
+class PoochRecord:
+    id: int
+    name: str
+    sex: str
+    birth_day: int
+    base_health: int
+    health_loss_start_day: int
+    cooldown_ready_day: int
+    death_day: Optional[int] = None
+    alive: bool = True
+    virgin: bool = True
+    owner_discord_id: Optional[int] = None
+    vendor_id: Optional[int] = None
+    created_at: datetime = field(default_factory=_now)
+
+    # the world day as of when this pooch was loaded
+    world_day: int = 0
+
+    @property
+    def as_of_day(self) -> int:
+        return self.death_day if self.death_day is not None else self.world_day
+
+    @property
+    def age(self) -> int:
+        return self.as_of_day - self.birth_day
+
+    @property
+    def health_loss_age(self) -> int:
+        return max(self.as_of_day - self.health_loss_start_day, 0)
+
+    @property
+    def health(self) -> int:
+        return max(self.base_health - self.health_loss_age, 0)
+
+    @property
+    def breeding_cooldown(self) -> int:
+        return max(self.cooldown_ready_day - self.world_day, 0)
+
+
+@dataclass(slots=True)
+class ArchivedPoochRecord(PoochRecord):
+    archived_day: int = 0
+    reason: str = "dead"
+    buried_at: Optional[datetime] = None
+    damned_at: Optional[datetime] = None
+    breeds: list[dict[str, Any]] = field(default_factory=list)
+    mutation_ids: list[int] = field(default_factory=list)
+
+    @property
+    def as_of_day(self) -> int:
+        return self.death_day if self.death_day is not None else self.archived_day
+
+
+@dataclass(slots=True)
+class OwnerRecord:
+    discord_id: int
+    dollars: int = 100
+    bloodskulls: int = 0
+    joined_at: datetime = field(default_factory=_now)
+
+
+@dataclass(slots=True)
+class KennelRecord:
+    id: int
+    owner_discord_id: int
+    name: str
+    pooch_limit: int = 10
+    created_at: datetime = field(default_factory=_now)
+
+
+@dataclass(slots=True)
+class VendorRecord:
+    id: int
+    server_discord_id: int
+    name: str
+    desired_mutation_1: Optional[int] = None
+    desired_mutation_2: Optional[int] = None
+    desired_mutation_3: Optional[int] = None
+    created_at: datetime = field(default_factory=_now)
+    last_restock_day: Optional[int] = None
+
+
+@dataclass(slots=True)
+class ServerRecord:
+    discord_id: int
+    event_channel_discord_id: Optional[int] = None
+    joined_at: datetime = field(default_factory=_now)
+    timezone: str = "America/New_York"
+    day_boundary_minute: int = 0
+    last_day_change_day: Optional[int] = None
+    day_change_work_id: Optional[int] = None
+    command_tree_hash: Optional[str] = None
+
+
+@dataclass(slots=True)
+class OwnerServerRecord:
+    server_discord_id: int
+    owner_discord_id: int
+
+
+@dataclass(slots=True)
+class KennelPoochRecord:
+    pooch_id: int
+    kennel_id: int
+
+
+@dataclass(slots=True)
+class VendorPoochForSaleRecord:
+    pooch_id: int
+    vendor_id: int
+
+
+@dataclass(slots=True)
+class GraveyardPoochRecord:
+    pooch_id: int
+    owner_discord_id: int
+    buried_at: datetime = field(default_factory=_now)
+
+
+@dataclass(slots=True)
+class PoochPregnancyRecord:
+    mother_id: int
+    fetus_id: int
+
+
+@dataclass(slots=True)
+class PoochParentageRecord:
+    child_id: int
+    father_id: Optional[int]
+    mother_id: Optional[int]
+
+
+@dataclass(slots=True)
+class ScheduledEventRecord:
+    kind: str
+    day: int
+    pooch_id: int
+
+
+@dataclass(slots=True)
+class DayEventRecord:
+    id: int
+    day: int
+    server_discord_id: int
+    kind: str
+    pooch_id: int
+    pooch_name: str
+    other_pooch_id: Optional[int] = None
+    other_pooch_name: Optional[str] = None
+    detail: Optional[str] = None
+    created_at: datetime = field(default_factory=_now)
+
+
+@dataclass(slots=True)
+class DayChangeWorkRecord:
+    id: int
+    day: int
+    server_discord_id: int
+    status: str = "pending"
+    attempts: int = 0
+    scheduled_for: Optional[datetime] = None
+    claimed_by: Optional[str] = None
+    claimed_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+    delivered_at: Optional[datetime] = None
+    created_at: datetime = field(default_factory=_now)
+
+
+@dataclass(slots=True)
+class MutationRecord:
+    id: int
+    name: str
+    alt_name: str
+    category: str
+    description: str
+    heritability: float
+    health_impact: str = "neutral"
+    rarity: str = "common"
+    affects_males: bool = True
+    affects_females: bool = True
+    advanced_options: dict[str, Any] = field(default_factory=dict)
+    retired_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class NameRecord:
+    id: int
+    name: str
+    retired_at: Optional[datetime] = None
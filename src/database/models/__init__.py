@@ -4,6 +4,17 @@ from .owner import Owner
 from .pooch import Pooch
 from .server import Server
 from .vendor import Vendor
+from .world_state import WorldState
+
+# Archive tables
+from .archived_pooch import ArchivedPooch
+
+# Event tables
+from .day_event import DayEvent
+from .scheduled_event import ScheduledEvent
+
+# Work queue tables
+from .day_change_work import DayChangeWork
 
 # Relationship tables
 from .relationships.graveyard_pooch import GraveyardPooch
@@ -35,6 +46,11 @@ __all__ = [
     "Pooch",
     "Server",
     "Vendor",
+    "WorldState",
+    "ArchivedPooch",
+    "DayEvent",
+    "ScheduledEvent",
+    "DayChangeWork",
     "GraveyardPooch",
     "HellPooch",
     "KennelPooch",
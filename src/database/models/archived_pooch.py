@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Index, Integer, Text, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.ext.hybrid import hybrid_property
+
+from .base import Base
+from .enums.archive_reason import ARCHIVE_REASON
+from .enums.sex import SEX
+
+
+class ArchivedPooch(Base):
+    __tablename__ = "archived_pooches"
+    __table_args__ = (
+        Index("archived_pooches_id", "id"),
+        {"postgresql_partition_by": "RANGE (archived_day)"},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    archived_day: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    reason: Mapped[str] = mapped_column(ARCHIVE_REASON)
+
+    name: Mapped[str] = mapped_column(Text)
+    sex: Mapped[str] = mapped_column(SEX)
+
+    birth_day: Mapped[int] = mapped_column(Integer)
+    base_health: Mapped[int] = mapped_column(Integer)
+    health_loss_start_day: Mapped[int] = mapped_column(Integer)
+    cooldown_ready_day: Mapped[int] = mapped_column(Integer)
+    death_day: Mapped[int] = mapped_column(Integer, nullable=True)
+
+    alive: Mapped[bool] = mapped_column(Boolean)
+    virgin: Mapped[bool] = mapped_column(Boolean)
+
+    owner_discord_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    vendor_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    buried_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    damned_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # copies of the pooch's pooch_breeds (as `{ "breed_id", "weight" }` objects) and pooch_mutations rows
+    breeds: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, server_default=text("'[]'"))
+    mutation_ids: Mapped[list[int]] = mapped_column(ARRAY(BigInteger), server_default=text("'{}'"))
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    @hybrid_property
+    def as_of_day(self) -> int:
+        """The day this pooch's age and health are frozen at: the day it died, or the day it was archived."""
+        return self.death_day if self.death_day is not None else self.archived_day
+
+    @as_of_day.inplace.expression
+    @classmethod
+    def _as_of_day_expression(cls):
+        return func.coalesce(cls.death_day, cls.archived_day)
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, Text, UniqueConstraint, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .enums.day_change_work_status import DAY_CHANGE_WORK_STATUS
+
+
+class DayChangeWork(Base):
+    """One server's share of a day change, queued for any worker process to claim."""
+
+    __tablename__ = "day_change_work"
+    __table_args__ = (
+        UniqueConstraint("day", "server_discord_id", name="day_change_work_day_server_discord_id_key"),
+        Index("day_change_work_pending_id", "id", postgresql_where=text("status = 'pending'")),
+        Index("day_change_work_running_claimed_at", "claimed_at", postgresql_where=text("status = 'running'")),
+        Index("day_change_work_undelivered_id", "id", postgresql_where=text("delivered_at IS NULL")),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    day: Mapped[int] = mapped_column(Integer)
+    server_discord_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("servers.discord_id", ondelete="CASCADE"))
+    status: Mapped[str] = mapped_column(DAY_CHANGE_WORK_STATUS, server_default=text("'pending'"))
+    attempts: Mapped[int] = mapped_column(Integer, server_default=text("0"))
+    # when the day change was scheduled for, to measure how late it actually started
+    scheduled_for: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    claimed_by: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # when the item's summary was posted (or given up on), so a new leader can post the ones that weren't
+    delivered_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("now()"))
@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Index, Integer, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .enums.day_event_kind import DAY_EVENT_KIND
+
+
+class DayEvent(Base):
+    __tablename__ = "day_events"
+    __table_args__ = (
+        Index("day_events_server_day_id", "server_discord_id", "day", "id"),
+        Index("day_events_pooch_id", "pooch_id"),
+        {"postgresql_partition_by": "RANGE (day)"},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    day: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    server_discord_id: Mapped[int] = mapped_column(BigInteger)
+    kind: Mapped[str] = mapped_column(DAY_EVENT_KIND)
+
+    pooch_id: Mapped[int] = mapped_column(BigInteger)
+    pooch_name: Mapped[str] = mapped_column(Text)
+    other_pooch_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    other_pooch_name: Mapped[str] = mapped_column(Text, nullable=True)
+    detail: Mapped[str] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("now()"))
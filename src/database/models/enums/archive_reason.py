@@ -0,0 +1,3 @@
+from sqlalchemy.dialects.postgresql import ENUM
+
+ARCHIVE_REASON = ENUM("dead", "unsold", name="archive_reason", create_type=False)
@@ -0,0 +1,5 @@
+from sqlalchemy.dialects.postgresql import ENUM
+
+DAY_CHANGE_WORK_STATUS = ENUM(
+    "pending", "running", "done", "skipped", "failed", name="day_change_work_status", create_type=False
+)
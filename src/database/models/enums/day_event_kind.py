@@ -0,0 +1,3 @@
+from sqlalchemy.dialects.postgresql import ENUM
+
+DAY_EVENT_KIND = ENUM("birth", "death", name="day_event_kind", create_type=False)
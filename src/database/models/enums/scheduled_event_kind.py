@@ -0,0 +1,3 @@
+from sqlalchemy.dialects.postgresql import ENUM
+
+SCHEDULED_EVENT_KIND = ENUM("pregnancy_due", "death_risk", name="scheduled_event_kind", create_type=False)
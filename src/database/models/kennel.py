@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, DateTime, Integer, ForeignKey, Text, text
+from sqlalchemy import BigInteger, DateTime, Index, Integer, ForeignKey, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.associationproxy import association_proxy
 
@@ -14,6 +14,7 @@ if TYPE_CHECKING:
 
 class Kennel(Base):
     __tablename__ = "kennels"
+    __table_args__ = (Index("kennels_owner_created_at_id", "owner_discord_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
 
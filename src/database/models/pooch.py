@@ -1,12 +1,26 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Integer, Text, ForeignKey, CheckConstraint, text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    Integer,
+    Text,
+    ForeignKey,
+    CheckConstraint,
+    Index,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.ext.hybrid import hybrid_property
 
 from .base import Base
 from .enums.sex import SEX
+from .world_state import WorldState
 
 if TYPE_CHECKING:
     from .owner import Owner
@@ -29,21 +43,33 @@ class Pooch(Base):
             "(owner_discord_id IS NULL) OR (vendor_id IS NULL)",
             name="pooch_owner_xor_vendor_simple",
         ),
-        CheckConstraint("age >= -1", name="pooch_age_minimum"),
         CheckConstraint("base_health >= 0", name="pooch_base_health_minimum"),
-        CheckConstraint("breeding_cooldown >= 0", name="pooch_breeding_cooldown_minimum"),
+        CheckConstraint("health_loss_start_day >= birth_day", name="pooch_health_loss_after_birth"),
+        # Partial indexes, so hot queries over living pooches and the archiver's scans never touch the rest
+        Index("pooches_living", "created_at", "id", postgresql_where=text("alive")),
+        Index("pooches_dead", "death_day", postgresql_where=text("NOT alive")),
+        Index(
+            "pooches_vendor_stock",
+            "vendor_id",
+            postgresql_where=text("vendor_id IS NOT NULL AND owner_discord_id IS NULL"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
 
     name: Mapped[str] = mapped_column(Text)
-    age: Mapped[int] = mapped_column(Integer, default=0)
     sex: Mapped[str] = mapped_column(SEX)
 
+    # Age, health loss and breeding cooldown are derived from these and the world day, so they never need updating
+    birth_day: Mapped[int] = mapped_column(Integer)
     base_health: Mapped[int] = mapped_column(Integer, default=10)
-    health_loss_age: Mapped[int] = mapped_column(Integer, default=0)
+    health_loss_start_day: Mapped[int] = mapped_column(Integer)
+    cooldown_ready_day: Mapped[int] = mapped_column(Integer)
+    death_day: Mapped[int] = mapped_column(Integer, nullable=True)
+
+    # the world day as of when this pooch was loaded
+    world_day: Mapped[int] = column_property(select(WorldState.day).scalar_subquery())
 
-    breeding_cooldown: Mapped[int] = mapped_column(Integer, default=2)
     alive: Mapped[bool] = mapped_column(Boolean, default=True)
     virgin: Mapped[bool] = mapped_column(Boolean, default=True)
 
@@ -54,6 +80,47 @@ class Pooch(Base):
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("now()"))
 
+    @hybrid_property
+    def as_of_day(self) -> int:
+        """The day this pooch's age and health are measured at: today, or the day it died."""
+        return self.death_day if self.death_day is not None else self.world_day
+
+    @as_of_day.inplace.expression
+    @classmethod
+    def _as_of_day_expression(cls):
+        return func.coalesce(cls.death_day, cls.world_day)
+
+    @hybrid_property
+    def age(self) -> int:
+        return self.as_of_day - self.birth_day
+
+    @hybrid_property
+    def health_loss_age(self) -> int:
+        return max(self.as_of_day - self.health_loss_start_day, 0)
+
+    @health_loss_age.inplace.expression
+    @classmethod
+    def _health_loss_age_expression(cls):
+        return func.greatest(cls.as_of_day - cls.health_loss_start_day, 0)
+
+    @hybrid_property
+    def health(self) -> int:
+        return max(self.base_health - self.health_loss_age, 0)
+
+    @health.inplace.expression
+    @classmethod
+    def _health_expression(cls):
+        return func.greatest(cls.base_health - cls.health_loss_age, 0)
+
+    @hybrid_property
+    def breeding_cooldown(self) -> int:
+        return max(self.cooldown_ready_day - self.world_day, 0)
+
+    @breeding_cooldown.inplace.expression
+    @classmethod
+    def _breeding_cooldown_expression(cls):
+        return func.greatest(cls.cooldown_ready_day - cls.world_day, 0)
+
     owner: Mapped[Owner] = relationship("Owner", back_populates="owned_pooches", foreign_keys=[owner_discord_id])
     vendor: Mapped[Vendor] = relationship("Vendor", back_populates="owned_pooches", foreign_keys=[vendor_id])
 
@@ -61,8 +128,7 @@ class Pooch(Base):
         "PoochParentage",
         back_populates="child",
         uselist=False,
-        cascade="all, delete-orphan",
-        foreign_keys="PoochParentage.child_id",
+        primaryjoin="Pooch.id == foreign(PoochParentage.child_id)",
     )
     father = association_proxy("parentage", "father")
     mother = association_proxy("parentage", "mother")
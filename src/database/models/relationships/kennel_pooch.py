@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, ForeignKey
+from sqlalchemy import BigInteger, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database.models.base import Base
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 
 class KennelPooch(Base):
     __tablename__ = "kennel_pooches"
+    __table_args__ = (Index("kennel_pooches_kennel_id", "kennel_id"),)
 
     pooch_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("pooches.id", ondelete="CASCADE"), primary_key=True)
     kennel_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("kennels.id", ondelete="CASCADE"), nullable=False)
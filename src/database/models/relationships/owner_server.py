@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, ForeignKey
+from sqlalchemy import BigInteger, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database.models.base import Base
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 
 class OwnerServer(Base):
     __tablename__ = "owner_servers"
+    __table_args__ = (Index("owner_servers_owner_discord_id", "owner_discord_id"),)
 
     server_discord_id: Mapped[int] = mapped_column(
         BigInteger, ForeignKey("servers.discord_id", ondelete="CASCADE"), primary_key=True
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, ForeignKey
+from sqlalchemy import BigInteger, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..base import Base
@@ -11,28 +11,33 @@ if TYPE_CHECKING:
 
 class PoochParentage(Base):
     __tablename__ = "pooch_parentage"
+    __table_args__ = (
+        Index("pooch_parentage_father_id", "father_id"),
+        Index("pooch_parentage_mother_id", "mother_id"),
+    )
 
-    child_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("pooches.id", ondelete="CASCADE"), primary_key=True)
-    father_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("pooches.id", ondelete="SET NULL"), nullable=True)
-    mother_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("pooches.id", ondelete="SET NULL"), nullable=True)
+    # No foreign keys, so lineage survives its pooches being archived. The related pooches are None once they are.
+    child_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    father_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    mother_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
 
     child: Mapped[Pooch] = relationship(
         "Pooch",
-        foreign_keys=[child_id],
+        primaryjoin="foreign(PoochParentage.child_id) == Pooch.id",
         back_populates="parentage",
         uselist=False,
     )
 
     father: Mapped[Pooch] = relationship(
         "Pooch",
-        foreign_keys=[father_id],
+        primaryjoin="foreign(PoochParentage.father_id) == Pooch.id",
         uselist=False,
         viewonly=True,
     )
 
     mother: Mapped[Pooch] = relationship(
         "Pooch",
-        foreign_keys=[mother_id],
+        primaryjoin="foreign(PoochParentage.mother_id) == Pooch.id",
         uselist=False,
         viewonly=True,
     )
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, ForeignKey, UniqueConstraint
+from sqlalchemy import BigInteger, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..base import Base
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 
 class VendorPoochForSale(Base):
     __tablename__ = "vendor_pooches_for_sale"
+    __table_args__ = (Index("vendor_pooches_for_sale_vendor_id", "vendor_id"),)
 
     pooch_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("pooches.id", ondelete="CASCADE"), primary_key=True)
     vendor_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("vendors.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .enums.scheduled_event_kind import SCHEDULED_EVENT_KIND
+
+
+class ScheduledEvent(Base):
+    __tablename__ = "scheduled_events"
+
+    kind: Mapped[str] = mapped_column(SCHEDULED_EVENT_KIND, primary_key=True)
+    day: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    pooch_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("pooches.id", ondelete="CASCADE"), primary_key=True, autoincrement=False
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
-from sqlalchemy import BigInteger, DateTime, text
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, Integer, SmallInteger, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.associationproxy import association_proxy
 
@@ -13,11 +13,24 @@ if TYPE_CHECKING:
 
 class Server(Base):
     __tablename__ = "servers"
+    __table_args__ = (
+        CheckConstraint("day_boundary_minute BETWEEN 0 AND 1439", name="servers_day_boundary_minute_check"),
+    )
 
     discord_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     event_channel_discord_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
     joined_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("now()"))
 
+    # when the server's day changes: `day_boundary_minute` minutes after midnight in `timezone` (an IANA zone name)
+    timezone: Mapped[str] = mapped_column(Text, server_default=text("'America/New_York'"))
+    day_boundary_minute: Mapped[int] = mapped_column(SmallInteger, server_default=text("0"))
+    # the last world day the server's own day change ran for
+    last_day_change_day: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # the queued day change work item that claimed it, if one did
+    day_change_work_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    # a hash of the slash commands last synced to the server
+    command_tree_hash: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
     vendors: Mapped[list[Vendor]] = relationship("Vendor", back_populates="server", cascade="all, delete-orphan")
 
     owner_server_rows: Mapped[list[OwnerServer]] = relationship(
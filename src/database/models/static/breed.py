@@ -1,4 +1,6 @@
-from sqlalchemy import BigInteger, Text, text
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database.models.base import Base
@@ -15,3 +17,6 @@ class Breed(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False)
 
     rarity: Mapped[str] = mapped_column(RARITY, nullable=False, server_default=text("'common'"))
+
+    # set once the row is gone from resources/, so nothing new picks it (it is never deleted)
+    retired_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
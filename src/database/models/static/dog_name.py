@@ -1,4 +1,6 @@
-from sqlalchemy import BigInteger, Text
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database.models.base import Base
@@ -8,3 +10,6 @@ class DogName(Base):
     __tablename__ = "dog_names"
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     name: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
+
+    # set once the row is gone from resources/, so nothing new picks it (it is never deleted)
+    retired_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,6 @@
-from sqlalchemy import BigInteger, Boolean, CheckConstraint, Numeric, Text, text
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, CheckConstraint, DateTime, Numeric, Text, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -26,3 +28,6 @@ class Mutation(Base):
     affects_females: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="true")
 
     advanced_options: Mapped[dict] = mapped_column(JSONB, nullable=False, server_default="{}")
+
+    # set once the row is gone from resources/, so nothing new picks it (it is never deleted)
+    retired_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
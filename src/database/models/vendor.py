@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
-from sqlalchemy import BigInteger, DateTime, Text, ForeignKey, UniqueConstraint, text
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import BigInteger, DateTime, Integer, Text, ForeignKey, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.associationproxy import association_proxy
 
@@ -25,6 +25,8 @@ class Vendor(Base):
     desired_mutation_3: Mapped[int] = mapped_column(BigInteger, ForeignKey("mutations.id"), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("now()"))
+    # the last world day the vendor was restocked for
+    last_restock_day: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     owned_pooches: Mapped[list[Pooch]] = relationship(
         "Pooch",
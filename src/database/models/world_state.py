@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Boolean, CheckConstraint, DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class WorldState(Base):
+    __tablename__ = "world_state"
+    __table_args__ = (CheckConstraint("id", name="world_state_single_row"),)
+
+    id: Mapped[bool] = mapped_column(Boolean, primary_key=True, default=True)
+    day: Mapped[int] = mapped_column(Integer, default=0)
+    # the scheduled time of the last day change, so a day change scheduled for the same time can't run twice
+    last_day_change_for: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import ColumnElement
+from sqlalchemy.orm import raiseload
+
+from .models import ArchivedPooch, Pooch
+
+# Loader option for queries that do load ORM objects: touching any relationship that wasn't loaded up front raises,
+# instead of quietly lazy loading (or, on an async session, failing somewhere far from the query).
+RAISE_ON_LAZY_LOAD = raiseload("*")
+
+
+class PoochRow(NamedTuple):
+    """
+    Just the columns of a pooch the game reads, in the order of the fields of `game.model.Pooch`,
+    so read paths can build one straight from a row without loading the ORM object.
+    """
+
+    id: int
+    name: str
+    sex: str
+    birth_day: int
+    base_health: int
+    health_loss_start_day: int
+    cooldown_ready_day: int
+    as_of_day: int
+    alive: bool
+    owner_discord_id: Optional[int]
+    created_at: Optional[datetime]
+
+
+def pooch_row_columns(model: type[Pooch] | type[ArchivedPooch]) -> tuple[ColumnElement, ...]:
+    """
+    Get the columns to select for a `PoochRow`, from either the pooches table or the archive.
+
+    Parameters
+    ----------
+    model: type[Pooch] | type[ArchivedPooch]
+        The table to select from.
+
+    Returns
+    -------
+    tuple[ColumnElement, ...]
+        The columns, in the order of the fields of `PoochRow`.
+    """
+
+    return (
+        model.id,
+        model.name,
+        model.sex,
+        model.birth_day,
+        model.base_health,
+        model.health_loss_start_day,
+        model.cooldown_ready_day,
+        model.as_of_day.label("as_of_day"),
+        model.alive,
+        model.owner_discord_id,
+        model.created_at,
+    )
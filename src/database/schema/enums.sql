@@ -73,3 +73,24 @@ INSERT INTO health_impact_weights VALUES
     ('brilliant', 5),
     ('immortality', 1000)
 ;
+
+
+-- DAY EVENT KIND (for the day event log)
+CREATE TYPE day_event_kind AS ENUM (
+    'birth',
+    'death'
+);
+
+
+-- SCHEDULED EVENT KIND (for the event calendar)
+CREATE TYPE scheduled_event_kind AS ENUM (
+    'pregnancy_due',
+    'death_risk'
+);
+
+
+-- ARCHIVE REASON (why a pooch was moved out of the pooches table)
+CREATE TYPE archive_reason AS ENUM (
+    'dead',
+    'unsold'
+);
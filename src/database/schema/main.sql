@@ -45,12 +45,15 @@ CREATE TABLE pooches (
     id                  BIGSERIAL PRIMARY KEY,
 
     name                TEXT NOT NULL,
-    age                 INTEGER NOT NULL DEFAULT 0,
     sex                 sex NOT NULL,
-    base_health         INTEGER NOT NULL DEFAULT 10,
-    health_loss_age     INTEGER NOT NULL DEFAULT 0,
 
-    breeding_cooldown   INTEGER NOT NULL DEFAULT 2,
+    -- age, health loss and breeding cooldown are derived from these and world_state.day
+    birth_day               INTEGER NOT NULL,
+    base_health             INTEGER NOT NULL DEFAULT 10,
+    health_loss_start_day   INTEGER NOT NULL,
+    cooldown_ready_day      INTEGER NOT NULL,
+    death_day               INTEGER NULL,
+
     alive               BOOLEAN NOT NULL DEFAULT TRUE,
     virgin              BOOLEAN NOT NULL DEFAULT TRUE,
 
@@ -64,17 +67,22 @@ CREATE TABLE pooches (
         (owner_discord_id IS NULL) OR (vendor_id IS NULL)
     ),
 
-    CONSTRAINT pooch_age_minimum CHECK (age >= -1),
     CONSTRAINT pooch_base_health_minimum CHECK (base_health >= 0),
-    CONSTRAINT pooch_breeding_cooldown_minimum CHECK (breeding_cooldown >= 0)
+    CONSTRAINT pooch_health_loss_after_birth CHECK (health_loss_start_day >= birth_day)
 );
 
+-- partial indexes, so hot queries over living pooches and the archiver's scans never touch the rest
+CREATE INDEX pooches_living ON pooches (created_at, id) WHERE alive;
+CREATE INDEX pooches_dead ON pooches (death_day) WHERE NOT alive;
+CREATE INDEX pooches_vendor_stock ON pooches (vendor_id) WHERE vendor_id IS NOT NULL AND owner_discord_id IS NULL;
+
 
 -- POOCH RELATIONS (parents and pregnancies)
+-- No foreign keys on parentage, so lineage survives its pooches being moved to archived_pooches.
 CREATE TABLE pooch_parentage (
-    child_id    BIGINT PRIMARY KEY REFERENCES pooches(id) ON DELETE CASCADE,
-    father_id   BIGINT NULL REFERENCES pooches(id) ON DELETE SET NULL,
-    mother_id   BIGINT NULL REFERENCES pooches(id) ON DELETE SET NULL,
+    child_id    BIGINT PRIMARY KEY,
+    father_id   BIGINT NULL,
+    mother_id   BIGINT NULL,
 
     CONSTRAINT no_self_parent CHECK (child_id <> father_id AND child_id <> mother_id),
     CONSTRAINT no_duplicate_parents CHECK (father_id IS NULL OR mother_id IS NULL OR father_id <> mother_id)
@@ -150,3 +158,79 @@ CREATE TABLE hell_pooches (
 
     damned_at   TIMESTAMPTZ NOT NULL DEFAULT now()
 );
+
+
+-- WORLD STATE (a single row)
+CREATE TABLE world_state (
+    id      BOOLEAN PRIMARY KEY DEFAULT TRUE,
+    day     INTEGER NOT NULL DEFAULT 0,
+
+    CONSTRAINT world_state_single_row CHECK (id)
+);
+INSERT INTO world_state DEFAULT VALUES;
+
+
+-- DAY EVENTS (append-only log of what happened each day)
+-- Partitioned by day range; partitions are created on demand by the day change.
+-- No foreign keys, so the log outlives the pooches and servers it mentions.
+CREATE TABLE day_events (
+    id                  BIGSERIAL,
+    day                 INTEGER NOT NULL,
+    server_discord_id   BIGINT NOT NULL,
+    kind                day_event_kind NOT NULL,
+
+    pooch_id            BIGINT NOT NULL,
+    pooch_name          TEXT NOT NULL,
+    other_pooch_id      BIGINT NULL,
+    other_pooch_name    TEXT NULL,
+    detail              TEXT NULL,
+
+    created_at          TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+    PRIMARY KEY (day, id)
+) PARTITION BY RANGE (day);
+
+CREATE INDEX day_events_server_day_id ON day_events (server_discord_id, day, id);
+CREATE INDEX day_events_pooch_id ON day_events (pooch_id);
+
+
+-- SCHEDULED EVENTS (calendar of upcoming simulation events, so the day change only touches pooches with one due)
+CREATE TABLE scheduled_events (
+    kind        scheduled_event_kind NOT NULL,
+    day         INTEGER NOT NULL,
+    pooch_id    BIGINT NOT NULL REFERENCES pooches(id) ON DELETE CASCADE,
+
+    PRIMARY KEY (kind, day, pooch_id)
+);
+
+
+-- ARCHIVED POOCHES (dead and never-sold pooches moved out of pooches by the day change)
+-- Partitioned by the day they were archived; partitions are created on demand by the archiver.
+-- No foreign keys, so archived pooches outlive the owners and vendors they belonged to.
+CREATE TABLE archived_pooches (
+    id                      BIGINT NOT NULL,
+    archived_day            INTEGER NOT NULL,
+    reason                  archive_reason NOT NULL,
+
+    name                    TEXT NOT NULL,
+    sex                     sex NOT NULL,
+
+    birth_day               INTEGER NOT NULL,
+    base_health             INTEGER NOT NULL,
+    health_loss_start_day   INTEGER NOT NULL,
+    cooldown_ready_day      INTEGER NOT NULL,
+    death_day               INTEGER NULL,
+
+    alive                   BOOLEAN NOT NULL,
+    virgin                  BOOLEAN NOT NULL,
+
+    owner_discord_id        BIGINT NULL,
+    vendor_id               BIGINT NULL,
+    buried_at               TIMESTAMPTZ NULL,
+
+    created_at              TIMESTAMPTZ NOT NULL,
+
+    PRIMARY KEY (archived_day, id)
+) PARTITION BY RANGE (archived_day);
+
+CREATE INDEX archived_pooches_id ON archived_pooches (id);
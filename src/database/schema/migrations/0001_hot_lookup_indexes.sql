@@ -0,0 +1,18 @@
+-- Indexes for the hot lookups that filter on columns main.sql doesn't index.
+-- Built CONCURRENTLY so applying them to a live database doesn't block writes.
+-- vendors.server_discord_id is already covered by the leading column of UNIQUE (server_discord_id, name),
+-- and living pooches by the pooches_living partial index.
+
+-- children and siblings
+CREATE INDEX CONCURRENTLY IF NOT EXISTS pooch_parentage_father_id ON pooch_parentage (father_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS pooch_parentage_mother_id ON pooch_parentage (mother_id);
+
+-- pooches in a kennel, and pooches a vendor has for sale
+CREATE INDEX CONCURRENTLY IF NOT EXISTS kennel_pooches_kennel_id ON kennel_pooches (kennel_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS vendor_pooches_for_sale_vendor_id ON vendor_pooches_for_sale (vendor_id);
+
+-- servers an owner is in (the primary key leads with the server)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS owner_servers_owner_discord_id ON owner_servers (owner_discord_id);
+
+-- kennels an owner has, in page order
+CREATE INDEX CONCURRENTLY IF NOT EXISTS kennels_owner_created_at_id ON kennels (owner_discord_id, created_at, id);
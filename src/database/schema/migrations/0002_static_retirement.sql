@@ -0,0 +1,7 @@
+-- Static rows that disappear from resources/ are retired instead of deleted,
+-- so pooches and vendors that reference them keep working. Retired rows are never picked for anything new.
+ALTER TABLE breeds ADD COLUMN IF NOT EXISTS retired_at TIMESTAMPTZ NULL;
+ALTER TABLE mutations ADD COLUMN IF NOT EXISTS retired_at TIMESTAMPTZ NULL;
+ALTER TABLE dog_names ADD COLUMN IF NOT EXISTS retired_at TIMESTAMPTZ NULL;
+ALTER TABLE vendor_first_names ADD COLUMN IF NOT EXISTS retired_at TIMESTAMPTZ NULL;
+ALTER TABLE vendor_last_names ADD COLUMN IF NOT EXISTS retired_at TIMESTAMPTZ NULL;
@@ -0,0 +1,6 @@
+-- Each server changes day at its own local time, instead of every server at once at midnight in one timezone.
+-- `last_day_change_day` is the last world day a server's day change ran for, so it never runs twice for one day.
+ALTER TABLE servers ADD COLUMN IF NOT EXISTS timezone TEXT NOT NULL DEFAULT 'America/New_York';
+ALTER TABLE servers ADD COLUMN IF NOT EXISTS day_boundary_minute SMALLINT NOT NULL DEFAULT 0
+    CONSTRAINT servers_day_boundary_minute_check CHECK (day_boundary_minute BETWEEN 0 AND 1439);
+ALTER TABLE servers ADD COLUMN IF NOT EXISTS last_day_change_day INTEGER NULL;
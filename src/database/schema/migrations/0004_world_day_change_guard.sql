@@ -0,0 +1,3 @@
+-- The scheduled time of the last world day change. Advancing the day is conditional on it being earlier than the
+-- change being run, so two processes running the same scheduled day change can't advance the world twice.
+ALTER TABLE world_state ADD COLUMN IF NOT EXISTS last_day_change_for TIMESTAMPTZ NULL;
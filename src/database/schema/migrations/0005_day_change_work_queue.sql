@@ -0,0 +1,29 @@
+-- A durable queue of day change work: one item per server per world day, claimed by any worker process with
+-- FOR UPDATE SKIP LOCKED. Items a crashed worker was running are put back to pending once their claim goes stale.
+DO $$ BEGIN
+    CREATE TYPE day_change_work_status AS ENUM ('pending', 'running', 'done', 'skipped', 'failed');
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS day_change_work (
+    id                  BIGSERIAL PRIMARY KEY,
+    day                 INTEGER NOT NULL,
+    server_discord_id   BIGINT NOT NULL REFERENCES servers(discord_id) ON DELETE CASCADE,
+    status              day_change_work_status NOT NULL DEFAULT 'pending',
+    attempts            INTEGER NOT NULL DEFAULT 0,
+
+    claimed_by          TEXT NULL,
+    claimed_at          TIMESTAMPTZ NULL,
+    completed_at        TIMESTAMPTZ NULL,
+    error               TEXT NULL,
+
+    created_at          TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+    CONSTRAINT day_change_work_day_server_discord_id_key UNIQUE (day, server_discord_id)
+);
+
+-- workers only ever look for pending items, oldest first
+CREATE INDEX IF NOT EXISTS day_change_work_pending_id ON day_change_work (id) WHERE status = 'pending';
+-- the coordinator finds stale claims
+CREATE INDEX IF NOT EXISTS day_change_work_running_claimed_at ON day_change_work (claimed_at) WHERE status = 'running';
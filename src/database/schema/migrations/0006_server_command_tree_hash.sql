@@ -0,0 +1,2 @@
+-- A hash of the slash commands last synced to the server, so startup only syncs servers whose commands changed.
+ALTER TABLE servers ADD COLUMN IF NOT EXISTS command_tree_hash TEXT NULL;
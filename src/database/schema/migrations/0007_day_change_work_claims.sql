@@ -0,0 +1,4 @@
+-- The queued day change work item holding each server's day change claim, so a retry of the same item can pick the
+-- claim back up, and the last world day each vendor was restocked, so a restock never runs twice for the same day.
+ALTER TABLE servers ADD COLUMN IF NOT EXISTS day_change_work_id BIGINT NULL;
+ALTER TABLE vendors ADD COLUMN IF NOT EXISTS last_restock_day INTEGER NULL;
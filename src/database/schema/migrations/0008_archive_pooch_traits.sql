@@ -0,0 +1,5 @@
+-- Archived pooches keep their breeds, mutations and damnation, which used to be lost when deleting the pooch
+-- cascaded to pooch_breeds, pooch_mutations and hell_pooches.
+ALTER TABLE archived_pooches ADD COLUMN IF NOT EXISTS breeds JSONB NOT NULL DEFAULT '[]';
+ALTER TABLE archived_pooches ADD COLUMN IF NOT EXISTS mutation_ids BIGINT[] NOT NULL DEFAULT '{}';
+ALTER TABLE archived_pooches ADD COLUMN IF NOT EXISTS damned_at TIMESTAMPTZ NULL;
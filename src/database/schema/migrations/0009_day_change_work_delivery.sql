@@ -0,0 +1,10 @@
+-- When the summary of each finished day change work item was posted, so a new day change leader (like after a
+-- failover) can post the ones the old leader didn't get to.
+ALTER TABLE day_change_work ADD COLUMN IF NOT EXISTS delivered_at TIMESTAMPTZ NULL;
+
+-- the summaries of the work finished before this migration were posted by the leader that queued it
+UPDATE day_change_work SET delivered_at = coalesce(completed_at, now())
+WHERE delivered_at IS NULL AND status NOT IN ('pending', 'running');
+
+-- the coordinator only ever looks for undelivered items
+CREATE INDEX IF NOT EXISTS day_change_work_undelivered_id ON day_change_work (id) WHERE delivered_at IS NULL;
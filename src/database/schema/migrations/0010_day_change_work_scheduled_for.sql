@@ -0,0 +1,3 @@
+-- The time each queued server day change was scheduled for, so the lag until a worker actually starts it
+-- (including the time spent waiting in the queue) can be measured.
+ALTER TABLE day_change_work ADD COLUMN IF NOT EXISTS scheduled_for TIMESTAMPTZ NULL;
@@ -1,11 +1,19 @@
 from contextlib import asynccontextmanager
 import os
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Callable, Optional
 from urllib.parse import quote_plus
 from dotenv import load_dotenv
 
+from sqlalchemy.pool import Pool
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
 
+from metrics import counter, gauge, histogram
+from tracing import span
+
+# How many connections the pool keeps open, and how many more it opens under load before callers have to wait.
+POOL_SIZE = 5  # TODO
+POOL_MAX_OVERFLOW = 10  # TODO
+
 _ENGINE: Optional[AsyncEngine] = None
 _SESSIONMAKER: Optional[async_sessionmaker[AsyncSession]] = None
 
@@ -37,13 +45,30 @@ async def session_scope() -> AsyncIterator[AsyncSession]:
     """
 
     sessionmaker = _get_sessionmaker()
-    async with sessionmaker() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+    with span("session_scope", "transaction") as transaction:
+        async with sessionmaker() as session:
+            connection_info = None
+            try:
+                # take a connection up front (instead of at the first query), so how long it takes can be measured
+                pool = _get_engine().pool
+                if pool.checkedin() == 0 and pool.overflow() >= POOL_MAX_OVERFLOW:
+                    _POOL_WAITS.inc()
+                with _POOL_ACQUIRE_SECONDS.time():
+                    connection = await session.connection()
+
+                if transaction is not None:
+                    # the statements sent on this connection are children of this transaction (see `tracing`)
+                    connection_info = connection.sync_connection.info
+                    connection_info["trace_span"] = transaction
+
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                if connection_info is not None:
+                    connection_info.pop("trace_span", None)
 
 
 def _get_database_url() -> str:
@@ -74,9 +99,32 @@ def _make_engine() -> AsyncEngine:
     return create_async_engine(
         _get_database_url(),
         pool_pre_ping=True,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
         future=True,
     )
 
 
 def _make_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _pool_stat(read: Callable[[Pool], float]) -> Callable[[], float]:
+    return lambda: read(_ENGINE.pool) if _ENGINE is not None else 0
+
+
+_POOL_WAITS = counter(
+    "pimpy_db_pool_waits_total", "Sessions that had to wait for a connection because the pool was exhausted."
+)
+_POOL_ACQUIRE_SECONDS = histogram(
+    "pimpy_db_pool_acquire_seconds", "How long sessions took to get a connection from the pool (including pre-ping)."
+)
+gauge("pimpy_db_pool_checked_out", "Connections checked out of the pool.").set_function(
+    _pool_stat(lambda pool: pool.checkedout())
+)
+gauge("pimpy_db_pool_idle", "Open connections waiting in the pool.").set_function(
+    _pool_stat(lambda pool: pool.checkedin())
+)
+gauge("pimpy_db_pool_overflow", "Connections open beyond the pool size.").set_function(
+    _pool_stat(lambda pool: max(pool.overflow(), 0))
+)
@@ -1,21 +1,71 @@
-import random
-from typing import Optional
-from sqlalchemy import cast, func, select
-
+from datetime import datetime
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    exists,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+
+from .invalidation import publish_invalidation
+from .backend import backend_function
 from .session import session_scope
 
 from .models import *  # loads all ORM models (via database/models/__init__.py)
+from .models.enums.archive_reason import ARCHIVE_REASON
 from .models.enums.sex import SEX
+from rng import derive_seed, generator
+from rules import (
+    ARCHIVE_DEAD_AFTER_DAYS,
+    BREEDING_COOLDOWN_DAYS,
+    DEATH_RISK_HEALTH,
+    FETAL_AGE,
+    HEALTH_LOSS_START_AGE,
+    MAX_BASE_HEALTH,
+    MIN_BASE_HEALTH,
+)
 
 from .get import get_owner_by_discord_id, get_vendor_by_id, get_pooch_by_id
 
 
+def _shuffled(name: ColumnElement[str], rng: np.random.Generator) -> ColumnElement[str]:
+    """Order static names pseudo-randomly, in an order that only depends on the names and the generator's next draw."""
+
+    return func.md5(name.concat(str(derive_seed(rng))))
+
+
+def _death_risk_day(base_health: int, health_loss_start_day: int, world_day: int) -> int:
+    """Get the first day after `world_day` that a pooch's health is below the death risk threshold."""
+
+    return max(health_loss_start_day + base_health - DEATH_RISK_HEALTH + 1, world_day + 1)
+
+
+@backend_function
 async def create_pooch(
     owner_discord_id: Optional[int] = None,
     vendor_id: Optional[int] = None,
     name: Optional[str] = None,
     sex: Optional[str] = None,
-    age: int = -1,
+    age: int = FETAL_AGE,
     base_health: Optional[int] = None,
     rng_seed: Optional[int] = None,
 ) -> Pooch:
@@ -36,8 +86,8 @@ async def create_pooch(
     sex: str, optional
         The sex to give the pooch. Chooses a random one if not given.
 
-    age: int, default = -1
-        The age to make the pooch. Defaults to -1 (fetal age).
+    age: int, default = FETAL_AGE
+        The age to make the pooch, as of the current world day. Defaults to fetal age (born next day change).
 
     base_health: int, optional
         The base health to give the pooch. Chooses randomly within a range if not given.
@@ -51,20 +101,19 @@ async def create_pooch(
         The Pooch ORM object that was just created.
     """
 
-    rng = random.Random(rng_seed)
+    rng = generator(rng_seed)
 
     async def _get_random_pooch_name():
-        statement = select(DogName).order_by(func.md5(DogName + rng_seed)).limit(1)
+        statement = (
+            select(DogName)
+            .where(DogName.retired_at.is_(None))
+            .order_by(_shuffled(DogName.name, rng), DogName.id)
+            .limit(1)
+        )
         response = await session.execute(statement)
         dog_name = response.scalar_one_or_none()
         return dog_name.name if dog_name is not None else "Dog"
 
-    async def _get_random_sex():
-        statement = select(func.unnest(func.enum_range(cast(None, SEX)))).order_by(func.md5(SEX + rng_seed)).limit(1)
-        response = await session.execute(statement)
-        sex = response.scalar_one_or_none()
-        return sex if sex is not None else "female"
-
     if owner_discord_id is not None:
         owner = await get_owner_by_discord_id(owner_discord_id)
         if owner is None:
@@ -80,24 +129,31 @@ async def create_pooch(
         vendor_id = None
 
     async with session_scope() as session:
+        world_day = (await session.execute(select(WorldState.day))).scalar_one()
+        birth_day = world_day - age
+        health_loss_start_day = max(birth_day + HEALTH_LOSS_START_AGE, world_day)
         pooch = Pooch(
             owner_discord_id=owner_discord_id,
             vendor_id=vendor_id,
             name=name or await _get_random_pooch_name(),
-            sex=sex or await _get_random_sex(),
-            age=age,
-            base_health=base_health or rng.randint(8, 12),  # TODO
-            health_loss_age=0,  # TODO
-            breeding_cooldown=2,  # TODO
+            sex=sex or str(rng.choice(SEX.enums)),
+            birth_day=birth_day,
+            base_health=base_health or int(rng.integers(MIN_BASE_HEALTH, MAX_BASE_HEALTH + 1)),
+            health_loss_start_day=health_loss_start_day,
+            cooldown_ready_day=world_day + BREEDING_COOLDOWN_DAYS,
             alive=True,
             virgin=True,
         )
         session.add(pooch)
         await session.flush()
 
+        risk_day = _death_risk_day(pooch.base_health, health_loss_start_day, world_day)
+        session.add(ScheduledEvent(kind="death_risk", day=risk_day, pooch_id=pooch.id))
+
     return pooch
 
 
+@backend_function
 async def create_owner(owner_discord_id: int) -> Owner:
     """
     Create an owner with the given Discord ID.
@@ -117,10 +173,12 @@ async def create_owner(owner_discord_id: int) -> Owner:
         owner = Owner(discord_id=owner_discord_id)
         session.add(owner)
         await session.flush()
+        publish_invalidation(session, Owner.__tablename__, owner.discord_id)
 
     return owner
 
 
+@backend_function
 async def create_kennel(owner_discord_id: int, name: str = "Kennel", pooch_limit: int = 10) -> Optional[Kennel]:  # TODO
     """
     Create a kennel for the given owner.
@@ -155,10 +213,12 @@ async def create_kennel(owner_discord_id: int, name: str = "Kennel", pooch_limit
         )
         session.add(kennel)
         await session.flush()
+        publish_invalidation(session, Kennel.__tablename__, kennel.id)
 
     return kennel
 
 
+@backend_function
 async def create_vendor(
     server_discord_id: int, name: Optional[str] = None, rng_seed: Optional[int] = None
 ) -> Optional[Vendor]:
@@ -182,12 +242,24 @@ async def create_vendor(
         The Vendor ORM object that was just created, or None if the server with the given ID wasn't found.
     """
 
+    rng = generator(rng_seed)
+
     async def _get_random_vendor_name():
-        statement = select(VendorFirstName).order_by(func.md5(VendorFirstName + rng_seed)).limit(1)
+        statement = (
+            select(VendorFirstName)
+            .where(VendorFirstName.retired_at.is_(None))
+            .order_by(_shuffled(VendorFirstName.name, rng), VendorFirstName.id)
+            .limit(1)
+        )
         response = await session.execute(statement)
         first_name = response.scalar_one_or_none()
 
-        statement = select(VendorLastName).order_by(func.md5(VendorLastName + rng_seed)).limit(1)
+        statement = (
+            select(VendorLastName)
+            .where(VendorLastName.retired_at.is_(None))
+            .order_by(_shuffled(VendorLastName.name, rng), VendorLastName.id)
+            .limit(1)
+        )
         response = await session.execute(statement)
         last_name = response.scalar_one_or_none()
 
@@ -199,10 +271,12 @@ async def create_vendor(
         vendor = Vendor(server_discord_id=server_discord_id, name=name or await _get_random_vendor_name())
         session.add(vendor)
         await session.flush()
+        publish_invalidation(session, Vendor.__tablename__, vendor.id)
 
     return vendor
 
 
+@backend_function
 async def create_server(server_discord_id: int) -> Server:
     """
     Create a server with the given Discord ID.
@@ -222,10 +296,184 @@ async def create_server(server_discord_id: int) -> Server:
         server = Server(discord_id=server_discord_id)
         session.add(server)
         await session.flush()
+        publish_invalidation(session, Server.__tablename__, server.discord_id)
 
     return server
 
 
+@backend_function
+async def bootstrap_server(server_discord_id: int) -> Server:
+    """
+    Get the server with the given Discord ID, creating it first if it doesn't exist, in a single statement.
+    Safe to call concurrently for the same server.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The Discord ID of the server to get / create.
+
+    Returns
+    -------
+    Server
+        The Server ORM object with the given Discord ID.
+    """
+
+    new_server = (
+        pg_insert(Server)
+        .values(discord_id=server_discord_id)
+        .on_conflict_do_nothing()
+        .returning(*Server.__table__.c)
+        .cte("new_server")
+    )
+    query = union_all(
+        select(new_server, true().label("inserted")),
+        select(Server.__table__, false().label("inserted")).where(Server.discord_id == server_discord_id),
+    )
+
+    async with session_scope() as session:
+        row = (await session.execute(select(Server, column("inserted", Boolean)).from_statement(query))).first()
+        if row is None:
+            # a concurrent transaction created it after our statement's snapshot was taken (and invalidated it)
+            server = (await session.execute(select(Server).where(Server.discord_id == server_discord_id))).scalar_one()
+        else:
+            server, inserted = row
+            if inserted:
+                publish_invalidation(session, Server.__tablename__, server_discord_id)
+
+    return server
+
+
+@backend_function
+async def bootstrap_servers(server_discord_ids: list[int]) -> list[Server]:
+    """
+    Get the servers with the given Discord IDs, creating any that don't exist first, in one bulk insert
+    however many servers there are. Safe to call concurrently for the same servers.
+
+    Parameters
+    ----------
+    server_discord_ids: list[int]
+        The Discord IDs of the servers to get / create.
+
+    Returns
+    -------
+    list[Server]
+        The Server ORM objects with the given Discord IDs.
+    """
+
+    if not server_discord_ids:
+        return []
+
+    ids = cast(server_discord_ids, ARRAY(BigInteger))
+    async with session_scope() as session:
+        response = await session.execute(
+            pg_insert(Server)
+            .from_select(["discord_id"], select(func.unnest(ids)))
+            .on_conflict_do_nothing()
+            .returning(Server.discord_id)
+        )
+        for server_discord_id in response.scalars().all():
+            publish_invalidation(session, Server.__tablename__, server_discord_id)
+
+        response = await session.execute(select(Server).where(Server.discord_id == func.any(ids)))
+        servers = list(response.scalars().all())
+
+    return servers
+
+
+@backend_function
+async def bootstrap_owner(
+    server_discord_id: int, owner_discord_id: int, kennel_name: str = "Kennel", kennel_pooch_limit: int = 10  # TODO
+) -> Owner:
+    """
+    Make sure the server, the owner, the owner's membership in the server and (for new owners) a starter kennel exist,
+    and return the owner, all in a single statement.
+    Every insert is `ON CONFLICT DO NOTHING`, so concurrent first-time calls for the same owner can't race.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The Discord ID of the server the owner is in.
+
+    owner_discord_id: int
+        The Discord ID of the owner to get / create.
+
+    kennel_name: str, default: "Kennel"
+        The name to give the starter kennel, if the owner is new.
+
+    kennel_pooch_limit: int, default: 10
+        The size limit to give the starter kennel, if the owner is new.
+
+    Returns
+    -------
+    Owner
+        The Owner ORM object with the given Discord ID.
+    """
+
+    new_server = (
+        pg_insert(Server)
+        .values(discord_id=server_discord_id)
+        .on_conflict_do_nothing()
+        .returning(Server.discord_id)
+        .cte("new_server")
+    )
+    new_owner = (
+        pg_insert(Owner)
+        .values(discord_id=owner_discord_id)
+        .on_conflict_do_nothing()
+        .returning(*Owner.__table__.c)
+        .cte("new_owner")
+    )
+    new_membership = (
+        pg_insert(OwnerServer)
+        .values(server_discord_id=server_discord_id, owner_discord_id=owner_discord_id)
+        .on_conflict_do_nothing()
+        .returning(OwnerServer.owner_discord_id)
+        .cte("new_membership")
+    )
+    # the starter kennel is only selected from `new_owner`, so it's only created alongside a brand new owner
+    new_kennel = (
+        insert(Kennel)
+        .from_select(
+            ["owner_discord_id", "name", "pooch_limit"],
+            select(new_owner.c.discord_id, literal(kennel_name), literal(kennel_pooch_limit)),
+        )
+        .cte("new_kennel")
+    )
+    # which rows the statement actually inserted, so only those are invalidated
+    inserted = (
+        exists(select(new_server)).label("server_inserted"),
+        exists(select(new_membership)).label("membership_inserted"),
+    )
+    query = union_all(
+        select(new_owner, true().label("owner_inserted"), *inserted),
+        select(Owner.__table__, false().label("owner_inserted"), *inserted).where(Owner.discord_id == owner_discord_id),
+    ).add_cte(new_kennel)
+    flags = (
+        column("owner_inserted", Boolean),
+        column("server_inserted", Boolean),
+        column("membership_inserted", Boolean),
+    )
+
+    async with session_scope() as session:
+        row = (await session.execute(select(Owner, *flags).from_statement(query))).first()
+        if row is None:
+            # a concurrent transaction created it after our statement's snapshot was taken, and we can't tell what
+            # else we inserted, so everything is invalidated
+            owner = (await session.execute(select(Owner).where(Owner.discord_id == owner_discord_id))).scalar_one()
+            owner_inserted = server_inserted = membership_inserted = True
+        else:
+            owner, owner_inserted, server_inserted, membership_inserted = row
+        if server_inserted:
+            publish_invalidation(session, Server.__tablename__, server_discord_id)
+        if owner_inserted:
+            publish_invalidation(session, Owner.__tablename__, owner_discord_id)
+        if membership_inserted:
+            publish_invalidation(session, OwnerServer.__tablename__, (server_discord_id, owner_discord_id))
+
+    return owner
+
+
+@backend_function
 async def add_pooch_to_kennel(kennel_id: int, pooch_id: int) -> KennelPooch:
     """
     Add the pooch with the given ID to the kennel with the given ID.
@@ -252,6 +500,7 @@ async def add_pooch_to_kennel(kennel_id: int, pooch_id: int) -> KennelPooch:
     return kennel_pooch
 
 
+@backend_function
 async def add_owner_to_server(server_discord_id: int, owner_discord_id: int) -> OwnerServer:
     """
     Add an owner with the given Discord ID to the server with the given Discord ID.
@@ -274,10 +523,12 @@ async def add_owner_to_server(server_discord_id: int, owner_discord_id: int) ->
         owner_server = OwnerServer(server_discord_id=server_discord_id, owner_discord_id=owner_discord_id)
         session.add(owner_server)
         await session.flush()
+        publish_invalidation(session, OwnerServer.__tablename__, (server_discord_id, owner_discord_id))
 
     return owner_server
 
 
+@backend_function
 async def add_pooch_to_vendor_stock(vendor_id: int, pooch_id: int) -> Optional[VendorPoochForSale]:
     """
     Add the pooch with the given ID to the given vendor's stock.
@@ -296,19 +547,25 @@ async def add_pooch_to_vendor_stock(vendor_id: int, pooch_id: int) -> Optional[V
         The VendorPoochForSale ORM object that was just created, or None if the vendor or pooch wasn't found.
     """
 
-    vendor = await get_vendor_by_id(vendor_id)
-    pooch = await get_pooch_by_id(pooch_id)
-
-    if vendor is None or pooch is None:
-        return None
+    # only selects a row to insert if both the vendor and the pooch exist, so it's one statement instead of three
+    query = (
+        insert(VendorPoochForSale)
+        .from_select(
+            ["vendor_id", "pooch_id"],
+            select(Vendor.id, Pooch.id).where(Vendor.id == vendor_id, Pooch.id == pooch_id),
+        )
+        .returning(*VendorPoochForSale.__table__.c)
+    )
 
     async with session_scope() as session:
-        vendor_pooch_for_sale = VendorPoochForSale(vendor_id=vendor.id, pooch_id=pooch.id)
-        session.add(vendor_pooch_for_sale)
+        vendor_pooch_for_sale = (
+            (await session.execute(select(VendorPoochForSale).from_statement(query))).scalars().one_or_none()
+        )
 
     return vendor_pooch_for_sale
 
 
+@backend_function
 async def bury_pooch(owner_discord_id: int, pooch_id: int) -> Optional[GraveyardPooch]:
     """
     Move the given pooch to the given owner's graveyard.
@@ -339,3 +596,248 @@ async def bury_pooch(owner_discord_id: int, pooch_id: int) -> Optional[Graveyard
         await session.flush()
 
     return graveyard_pooch
+
+
+# How many days of events go in each partition of the day event log.
+DAY_EVENT_PARTITION_DAYS = 30  # TODO
+
+# How many days of archived pooches go in each partition of the pooch archive.
+ARCHIVE_PARTITION_DAYS = 90  # TODO
+
+
+async def _create_day_partition(session: AsyncSession, table: str, day: int, partition_days: int):
+    """Create the partition of a table partitioned by day range that the given day falls in, if it doesn't exist."""
+
+    start = day - day % partition_days
+    end = start + partition_days
+    await session.execute(
+        text(f"CREATE TABLE IF NOT EXISTS {table}_{start} PARTITION OF {table} FOR VALUES FROM ({start}) TO ({end})")
+    )
+
+
+@backend_function
+async def log_day_events(day: int, events: list[dict[str, Any]]):
+    """
+    Append the events that happened on the given day to the day event log, in a single bulk insert.
+    Creates the log partition for the day first if it doesn't exist yet.
+
+    Parameters
+    ----------
+    day: int
+        The world day the events happened on.
+
+    events: list[dict[str, Any]]
+        The events to log, each a dict of `DayEvent` columns
+        (`server_discord_id`, `kind`, `pooch_id`, `pooch_name` and optionally `other_pooch_id`, `other_pooch_name`,
+        `detail`).
+    """
+
+    if not events:
+        return
+
+    async with session_scope() as session:
+        await _create_day_partition(session, DayEvent.__tablename__, day, DAY_EVENT_PARTITION_DAYS)
+        await session.execute(insert(DayEvent), [{**event, "day": day} for event in events])
+
+
+@backend_function
+async def add_pregnancy(mother_id: int, fetus_id: int) -> PoochPregnancy:
+    """
+    Make the pooch with the given mother ID pregnant with the given fetus,
+    and schedule the pregnancy to come due on the fetus's birth day.
+
+    Parameters
+    ----------
+    mother_id: int
+        The ID of the mother pooch.
+
+    fetus_id: int
+        The ID of the fetal pooch.
+
+    Returns
+    -------
+    PoochPregnancy
+        The PoochPregnancy relationship ORM object just created.
+    """
+
+    async with session_scope() as session:
+        pregnancy = PoochPregnancy(mother_id=mother_id, fetus_id=fetus_id)
+        session.add(pregnancy)
+        await session.flush()
+
+        due_day = select(Pooch.birth_day).where(Pooch.id == fetus_id).scalar_subquery()
+        await session.execute(
+            pg_insert(ScheduledEvent)
+            .values(kind="pregnancy_due", day=due_day, pooch_id=fetus_id)
+            .on_conflict_do_nothing()
+        )
+
+    return pregnancy
+
+
+@backend_function
+async def schedule_events(events: list[dict[str, Any]]):
+    """
+    Add events to the event calendar, in a single bulk insert. Events already scheduled are skipped.
+
+    Parameters
+    ----------
+    events: list[dict[str, Any]]
+        The events to schedule, each a dict of `ScheduledEvent` columns (`kind`, `day`, `pooch_id`).
+    """
+
+    if not events:
+        return
+
+    async with session_scope() as session:
+        await session.execute(pg_insert(ScheduledEvent).values(events).on_conflict_do_nothing())
+
+
+@backend_function
+async def archive_pooches(day: int, limit: int) -> int:
+    """
+    Move up to `limit` pooches that nothing live refers to anymore out of the pooches table and into the archive,
+    in a single statement. Archived pooches keep their lineage, so family lookups still find them.
+
+    A pooch is archived once it's been dead for `ARCHIVE_DEAD_AFTER_DAYS` (buried or not),
+    or once it was vendor stock that got restocked away without being sold.
+    Pooches still in a kennel, for sale, or part of a pregnancy are never archived.
+    Its breeds, mutations, burial and damnation are copied onto the archived row, since deleting the pooch
+    deletes them too.
+
+    Parameters
+    ----------
+    day: int
+        The current world day, recorded as the day the pooches were archived.
+
+    limit: int
+        The maximum number of pooches to archive.
+
+    Returns
+    -------
+    int
+        How many pooches were archived. Fewer than `limit` means there are none left to archive for now.
+    """
+
+    pooches = Pooch.__table__
+    dead = and_(pooches.c.alive == False, pooches.c.death_day <= day - ARCHIVE_DEAD_AFTER_DAYS)
+    unsold = and_(
+        pooches.c.alive == True,
+        pooches.c.vendor_id.is_not(None),
+        pooches.c.owner_discord_id.is_(None),
+        ~exists().where(VendorPoochForSale.pooch_id == pooches.c.id),
+    )
+    archivable = (
+        select(pooches.c.id)
+        .where(
+            or_(dead, unsold),
+            ~exists().where(KennelPooch.pooch_id == pooches.c.id),
+            ~exists().where(or_(PoochPregnancy.mother_id == pooches.c.id, PoochPregnancy.fetus_id == pooches.c.id)),
+        )
+        .order_by(pooches.c.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+    columns = [
+        "id",
+        "name",
+        "sex",
+        "birth_day",
+        "base_health",
+        "health_loss_start_day",
+        "cooldown_ready_day",
+        "death_day",
+        "alive",
+        "virgin",
+        "owner_discord_id",
+        "vendor_id",
+        "created_at",
+    ]
+    moved = delete(pooches).where(pooches.c.id.in_(archivable)).returning(*(pooches.c[c] for c in columns)).cte("moved")
+    # every part of the statement sees the rows from before it, so these still find what the delete cascades to
+    breeds = (
+        select(
+            func.coalesce(
+                func.jsonb_agg(func.jsonb_build_object("breed_id", PoochBreed.breed_id, "weight", PoochBreed.weight)),
+                func.jsonb_build_array(),
+            )
+        )
+        .where(PoochBreed.pooch_id == moved.c.id)
+        .scalar_subquery()
+    )
+    mutation_ids = (
+        select(func.coalesce(func.array_agg(PoochMutation.mutation_id), literal_column("'{}'::bigint[]")))
+        .where(PoochMutation.pooch_id == moved.c.id)
+        .scalar_subquery()
+    )
+    rows = (
+        select(
+            *(moved.c[c] for c in columns),
+            literal(day).label("archived_day"),
+            cast(case((moved.c.alive, "unsold"), else_="dead"), ARCHIVE_REASON).label("reason"),
+            GraveyardPooch.buried_at,
+            HellPooch.damned_at,
+            breeds.label("breeds"),
+            mutation_ids.label("mutation_ids"),
+        )
+        .select_from(moved)
+        .outerjoin(GraveyardPooch, GraveyardPooch.pooch_id == moved.c.id)
+        .outerjoin(HellPooch, HellPooch.pooch_id == moved.c.id)
+    )
+
+    async with session_scope() as session:
+        await _create_day_partition(session, ArchivedPooch.__tablename__, day, ARCHIVE_PARTITION_DAYS)
+        result = await session.execute(
+            insert(ArchivedPooch)
+            .from_select([*columns, "archived_day", "reason", "buried_at", "damned_at", "breeds", "mutation_ids"], rows)
+            .returning(ArchivedPooch.id)
+        )
+        archived = len(result.all())
+
+    return archived
+
+
+@backend_function
+async def enqueue_day_change_work(
+    day: int, server_discord_ids: list[int], scheduled_for: Optional[datetime] = None
+) -> int:
+    """
+    Queue the day changes of the servers with the given Discord IDs for the given world day, for any worker process
+    to claim (see `claim_day_change_work`). Servers already queued for the day are skipped.
+
+    Parameters
+    ----------
+    day: int
+        The world day to queue the day changes for.
+
+    server_discord_ids: list[int]
+        The IDs of the servers to queue the day changes of.
+
+    scheduled_for: datetime, optional
+        The time the day changes were scheduled for, if they were.
+
+    Returns
+    -------
+    int
+        How many day changes were queued.
+    """
+
+    if not server_discord_ids:
+        return 0
+
+    async with session_scope() as session:
+        response = await session.execute(
+            pg_insert(DayChangeWork)
+            .values(
+                [
+                    {"day": day, "server_discord_id": server_discord_id, "scheduled_for": scheduled_for}
+                    for server_discord_id in server_discord_ids
+                ]
+            )
+            .on_conflict_do_nothing()
+            .returning(DayChangeWork.id)
+        )
+        queued = len(response.all())
+
+    return queued
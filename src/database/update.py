@@ -1,70 +1,19 @@
+from datetime import datetime
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import case, cast, delete, func, or_, select, update
 
+from .invalidation import publish_invalidation
+from .backend import backend_function
 from .session import session_scope
 
 from .models import *  # loads all ORM models (via database/models/__init__.py)
+from .models.enums.day_change_work_status import DAY_CHANGE_WORK_STATUS
 
 
-async def age_pooch(pooch_id: int) -> Optional[Pooch]:
-    """
-    Age the pooch with the given ID by 1, and increase its age health loss if it's old enough.
-
-    Parameters
-    ----------
-    pooch_id: int
-        The ID of the pooch to age.
-
-    Returns
-    -------
-    Pooch, optional
-        The Pooch ORM object that just aged, or None if the pooch wasn't found.
-    """
-
-    async with session_scope() as session:
-        query = select(Pooch).where(Pooch.id == pooch_id)
-        pooch = (await session.execute(query)).scalar_one_or_none()
-
-        if pooch is None:
-            return None
-
-        pooch.age += 1
-        if pooch.age > 5:  # TODO
-            pooch.health_loss_age += 1
-
-    return pooch
-
-
-async def decrement_pooch_breeding_cooldown(pooch_id: int) -> Optional[Pooch]:
-    """
-    Decrease the breeding cooldown of the pooch with the given ID by 1, to a minimum of 0.
-
-    Parameters
-    ----------
-    pooch_id: int
-        The ID of the pooch to decrease the breeding cooldown of.
-
-    Returns
-    -------
-    Pooch, optional
-        The Pooch ORM object whose breeding cooldown just decreased.
-    """
-
-    async with session_scope() as session:
-        query = select(Pooch).where(Pooch.id == pooch_id)
-        pooch = (await session.execute(query)).scalar_one_or_none()
-
-        if pooch is None:
-            return None
-
-        pooch.breeding_cooldown = max(pooch.breeding_cooldown - 1, 0)
-
-    return pooch
-
-
+@backend_function
 async def set_pooch_dead(pooch_id: int) -> Optional[Pooch]:
     """
-    Set the pooch with the given ID to dead.
+    Set the pooch with the given ID to dead, stopping its age and health at the current world day.
     Doesn't move the pooch to a graveyard. Call `bury_pooch` to do that.
 
     Parameters
@@ -86,10 +35,12 @@ async def set_pooch_dead(pooch_id: int) -> Optional[Pooch]:
             return None
 
         pooch.alive = False
+        pooch.death_day = pooch.world_day
 
     return pooch
 
 
+@backend_function
 async def give_money_to_owner(owner_discord_id: int, dollars: int) -> Optional[Owner]:
     """
     Add an amount of money to the given owner's `dollars`.
@@ -116,10 +67,12 @@ async def give_money_to_owner(owner_discord_id: int, dollars: int) -> Optional[O
             return None
 
         owner.dollars += dollars
+        publish_invalidation(session, Owner.__tablename__, owner_discord_id)
 
     return owner
 
 
+@backend_function
 async def transfer_pooch_to_owner(pooch_id: int, owner_discord_id: int) -> Optional[Pooch]:
     """
     Transfer a pooch to a new owner, clearing any vendor association.
@@ -151,6 +104,63 @@ async def transfer_pooch_to_owner(pooch_id: int, owner_discord_id: int) -> Optio
     return pooch
 
 
+@backend_function
+async def purchase_pooch(
+    owner_discord_id: int, vendor_id: int, pooch_id: int, kennel_id: int, price: int
+) -> Optional[Owner]:
+    """
+    Sell a pooch from a vendor's stock to an owner in a single transaction: take it out of the stock, give it to the
+    owner, put it in their kennel and charge them the price. Nothing changes if it isn't in the vendor's stock anymore.
+
+    Parameters
+    ----------
+    owner_discord_id: int
+        The Discord ID of the owner buying the pooch.
+
+    vendor_id: int
+        The ID of the vendor selling the pooch.
+
+    pooch_id: int
+        The ID of the pooch being sold.
+
+    kennel_id: int
+        The ID of the owner's kennel to put the pooch in.
+
+    price: int
+        The number of dollars to charge the owner.
+
+    Returns
+    -------
+    Owner, optional
+        The Owner ORM object that bought the pooch (with the price taken off), or None if the pooch wasn't for sale
+        from the vendor.
+    """
+
+    async with session_scope() as session:
+        # locking the pooch first keeps the archiver (which skips locked pooches) away from it for the whole sale
+        query = (
+            select(Pooch)
+            .join(VendorPoochForSale, VendorPoochForSale.pooch_id == Pooch.id)
+            .where(VendorPoochForSale.vendor_id == vendor_id, VendorPoochForSale.pooch_id == pooch_id)
+            .with_for_update(of=Pooch)
+        )
+        pooch = (await session.execute(query)).scalar_one_or_none()
+        if pooch is None:
+            return None
+
+        await session.execute(delete(VendorPoochForSale).where(VendorPoochForSale.pooch_id == pooch_id))
+        pooch.owner_discord_id = owner_discord_id
+        pooch.vendor_id = None
+        session.add(KennelPooch(kennel_id=kennel_id, pooch_id=pooch_id))
+
+        owner = (await session.execute(select(Owner).where(Owner.discord_id == owner_discord_id))).scalar_one()
+        owner.dollars -= price
+        publish_invalidation(session, Owner.__tablename__, owner_discord_id)
+
+    return owner
+
+
+@backend_function
 async def set_event_channel_discord_id(server_discord_id: int, channel_discord_id: int) -> Optional[Server]:
     """
     Set the channel for automated events to be sent to for the server with the given Discord ID.
@@ -173,5 +183,330 @@ async def set_event_channel_discord_id(server_discord_id: int, channel_discord_i
         server = await session.get(Server, {"discord_id": server_discord_id})
         if server is not None:
             server.event_channel_discord_id = channel_discord_id
+        publish_invalidation(session, Server.__tablename__, server_discord_id)
 
     return server
+
+
+@backend_function
+async def set_server_day_schedule(server_discord_id: int, timezone: str, day_boundary_minute: int) -> Optional[Server]:
+    """
+    Set when the day changes for the server with the given Discord ID.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The ID of the server to set the day schedule of.
+
+    timezone: str
+        The IANA name of the server's timezone (like "Europe/Berlin").
+
+    day_boundary_minute: int
+        How many minutes after midnight (in the server's timezone) the day changes, from 0 to 1439.
+
+    Returns
+    -------
+    Server, optional
+        The Server object the day schedule was set for, or None if no server with the given Discord ID was found.
+    """
+
+    async with session_scope() as session:
+        server = await session.get(Server, {"discord_id": server_discord_id})
+        if server is not None:
+            server.timezone = timezone
+            server.day_boundary_minute = day_boundary_minute
+        publish_invalidation(session, Server.__tablename__, server_discord_id)
+
+    return server
+
+
+@backend_function
+async def set_servers_command_tree_hash(server_discord_ids: list[int], command_tree_hash: str):
+    """
+    Record the hash of the slash commands just synced to the servers with the given Discord IDs.
+
+    Parameters
+    ----------
+    server_discord_ids: list[int]
+        The IDs of the servers the commands were synced to.
+
+    command_tree_hash: str
+        The hash of the synced commands.
+    """
+
+    if not server_discord_ids:
+        return
+
+    async with session_scope() as session:
+        await session.execute(
+            update(Server)
+            .where(Server.discord_id.in_(server_discord_ids))
+            .values(command_tree_hash=command_tree_hash)
+            .execution_options(synchronize_session=False)
+        )
+        for server_discord_id in server_discord_ids:
+            publish_invalidation(session, Server.__tablename__, server_discord_id)
+
+
+@backend_function
+async def claim_server_day_change(server_discord_id: int, day: int, work_id: Optional[int] = None) -> bool:
+    """
+    Claim the day change of the server with the given Discord ID for the given world day,
+    unless it was already claimed for that day (or a later one).
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The ID of the server to claim the day change of.
+
+    day: int
+        The world day to claim the day change for.
+
+    work_id: int, optional
+        The ID of the queued day change work item claiming it. A claim made by the same work item (on an earlier
+        attempt) is taken again.
+
+    Returns
+    -------
+    bool
+        Whether the day change was claimed. False if it already ran for the day (or the server doesn't exist).
+    """
+
+    unclaimed = or_(Server.last_day_change_day.is_(None), Server.last_day_change_day < day)
+    if work_id is not None:
+        unclaimed = or_(unclaimed, (Server.last_day_change_day == day) & (Server.day_change_work_id == work_id))
+
+    async with session_scope() as session:
+        query = (
+            update(Server)
+            .where(Server.discord_id == server_discord_id, unclaimed)
+            .values(last_day_change_day=day, day_change_work_id=work_id)
+            .returning(Server.discord_id)
+        )
+        response = await session.execute(query)
+        claimed = response.scalar_one_or_none() is not None
+
+    return claimed
+
+
+@backend_function
+async def claim_vendor_restock(vendor_id: int, day: int) -> bool:
+    """
+    Claim the restock of the vendor with the given ID for the given world day,
+    unless it was already claimed for that day (or a later one).
+
+    Parameters
+    ----------
+    vendor_id: int
+        The ID of the vendor to claim the restock of.
+
+    day: int
+        The world day to claim the restock for.
+
+    Returns
+    -------
+    bool
+        Whether the restock was claimed. False if it already ran for the day (or the vendor doesn't exist).
+    """
+
+    async with session_scope() as session:
+        query = (
+            update(Vendor)
+            .where(Vendor.id == vendor_id, or_(Vendor.last_restock_day.is_(None), Vendor.last_restock_day < day))
+            .values(last_restock_day=day)
+            .returning(Vendor.id)
+        )
+        response = await session.execute(query)
+        claimed = response.scalar_one_or_none() is not None
+
+    return claimed
+
+
+@backend_function
+async def advance_world_day(scheduled_for: Optional[datetime] = None) -> Optional[int]:
+    """
+    Move the world on to the next day.
+
+    Parameters
+    ----------
+    scheduled_for: datetime, optional
+        The time the day change was scheduled for. If given, the day only advances if no day change scheduled for
+        this time (or a later one) already advanced it, so processes racing to run the same day change advance
+        the world only once.
+
+    Returns
+    -------
+    int, optional
+        The new world day, or None if a day change scheduled for the same time already advanced it.
+    """
+
+    async with session_scope() as session:
+        query = update(WorldState).values(day=WorldState.day + 1)
+        if scheduled_for is not None:
+            query = query.where(
+                or_(WorldState.last_day_change_for.is_(None), WorldState.last_day_change_for < scheduled_for)
+            ).values(last_day_change_for=scheduled_for)
+        response = await session.execute(query.returning(WorldState.day))
+        day = response.scalar_one_or_none()
+
+    return day
+
+
+@backend_function
+async def claim_day_change_work(worker_id: str, limit: int = 1) -> list[DayChangeWork]:
+    """
+    Claim the oldest pending day change work items for a worker, skipping any another worker is claiming at the same
+    time (`FOR UPDATE SKIP LOCKED`), so every item goes to exactly one worker without them waiting on each other.
+
+    Parameters
+    ----------
+    worker_id: str
+        The ID of the worker claiming the items.
+
+    limit: int, default: 1
+        The most items to claim.
+
+    Returns
+    -------
+    list[DayChangeWork]
+        The DayChangeWork ORM objects claimed, now running. Empty if nothing is pending.
+    """
+
+    pending = (
+        select(DayChangeWork.id)
+        .where(DayChangeWork.status == "pending")
+        .order_by(DayChangeWork.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    query = (
+        update(DayChangeWork)
+        .where(DayChangeWork.id.in_(pending.scalar_subquery()))
+        .values(
+            status="running",
+            attempts=DayChangeWork.attempts + 1,
+            claimed_by=worker_id,
+            claimed_at=func.now(),
+        )
+        .returning(DayChangeWork)
+        .execution_options(synchronize_session=False)
+    )
+
+    async with session_scope() as session:
+        response = await session.execute(query)
+        claimed = list(response.scalars().all())
+
+    return claimed
+
+
+@backend_function
+async def finish_day_change_work(work_id: int, worker_id: str, status: str, error: Optional[str] = None) -> bool:
+    """
+    Record how a claimed day change work item ended, as long as the worker still holds the claim
+    (it doesn't once the item was requeued from under it, see `requeue_stale_day_change_work`).
+
+    Parameters
+    ----------
+    work_id: int
+        The ID of the work item.
+
+    worker_id: str
+        The ID of the worker that claimed it.
+
+    status: str
+        How the item ended: "done", "skipped" (nothing to do) or "failed". "pending" gives it back to be retried.
+
+    error: str, optional
+        What went wrong, if it failed.
+
+    Returns
+    -------
+    bool
+        Whether the worker still held the claim, so the status was recorded.
+    """
+
+    async with session_scope() as session:
+        query = (
+            update(DayChangeWork)
+            .where(
+                DayChangeWork.id == work_id,
+                DayChangeWork.status == "running",
+                DayChangeWork.claimed_by == worker_id,
+            )
+            .values(status=status, error=error, completed_at=func.now() if status != "pending" else None)
+            .returning(DayChangeWork.id)
+        )
+        response = await session.execute(query)
+        finished = response.scalar_one_or_none() is not None
+
+    return finished
+
+
+@backend_function
+async def requeue_stale_day_change_work(claimed_before: datetime, max_attempts: int) -> int:
+    """
+    Give the running day change work items claimed before the given time back to be claimed again, since the worker
+    running them most likely crashed. Items already claimed `max_attempts` times are marked failed instead.
+
+    Parameters
+    ----------
+    claimed_before: datetime
+        Items claimed before this time are stale.
+
+    max_attempts: int
+        The most times an item is claimed before it's given up on.
+
+    Returns
+    -------
+    int
+        How many items were requeued (or failed).
+    """
+
+    async with session_scope() as session:
+        query = (
+            update(DayChangeWork)
+            .where(DayChangeWork.status == "running", DayChangeWork.claimed_at < claimed_before)
+            .values(
+                status=cast(
+                    case((DayChangeWork.attempts >= max_attempts, "failed"), else_="pending"), DAY_CHANGE_WORK_STATUS
+                ),
+                error="the worker running it stopped responding",
+            )
+            .returning(DayChangeWork.id)
+        )
+        response = await session.execute(query)
+        requeued = len(response.all())
+
+    return requeued
+
+
+@backend_function
+async def mark_day_change_work_delivered(work_ids: list[int]) -> int:
+    """
+    Record that the summaries of the given day change work items were posted, so they're never posted again.
+
+    Parameters
+    ----------
+    work_ids: list[int]
+        The IDs of the work items whose summaries were posted.
+
+    Returns
+    -------
+    int
+        How many of the work items weren't already marked delivered.
+    """
+
+    if not work_ids:
+        return 0
+
+    async with session_scope() as session:
+        query = (
+            update(DayChangeWork)
+            .where(DayChangeWork.id.in_(work_ids), DayChangeWork.delivered_at.is_(None))
+            .values(delivered_at=func.now())
+            .returning(DayChangeWork.id)
+        )
+        response = await session.execute(query)
+        delivered = len(response.all())
+
+    return delivered
@@ -1,54 +1,145 @@
+from database import Cursor, DayEventCursor, listen_for_invalidations
+
+from .model import PoochBatch
+
+from .cache import (
+    CacheStats,
+    cache_stats,
+)
+
 from .change_day import (
     run_day_change,
+    run_world_day_change,
+    run_server_day_change,
+    get_world_day_schedule,
+    enqueue_server_day_changes,
+    run_queued_server_day_change,
+    requeue_stale_server_day_changes,
+    deliver_queued_server_day_changes,
+    profile_next_day_change,
+    lead_day_changes,
+)
+
+from .manage_history import (
+    DayEventReadModel,
+    DayEventTotals,
+    get_day_summary,
+    list_server_history_page,
+    count_server_history,
+    list_pooch_history,
+    replay_day_events,
 )
 
 from .manage_kennels import (
     list_kennel_pooches,
+    list_kennel_pooches_page,
+    count_kennel_pooches,
 )
 
 from .manage_owners import (
     get_or_create_owner,
     list_owner_kennels,
+    list_owner_kennels_page,
+    count_owner_kennels,
     add_money,
 )
 
 from .manage_pooches import (
     get_pooch_by_id,
+    get_pooches_by_ids,
     get_pooch_family,
+    list_pooch_children_page,
+    count_pooch_children,
 )
 
 from .manage_servers import (
     get_or_create_server,
+    get_or_create_servers,
+    set_command_tree_hash,
     get_event_channel,
     set_event_channel,
+    set_day_schedule,
+    list_all_servers,
+    get_next_day_change,
+)
+
+from .mutation_effects import (
+    MutationEffects,
+    MutationEffectTables,
+    get_mutation_effects,
 )
 
 from .manage_vendors import (
     list_server_vendors,
     list_vendor_pooches,
+    list_vendor_pooches_page,
+    count_vendor_pooches,
     buy_pooch,
     get_pooch_price,
 )
 
 __all__ = [
+    # Types
+    "Cursor",
+    "DayEventCursor",
+    "DayEventReadModel",
+    "DayEventTotals",
+    "CacheStats",
+    "MutationEffects",
+    "MutationEffectTables",
+    "PoochBatch",
+    # Cache commands
+    "cache_stats",
+    "listen_for_invalidations",
     # Day change commands
     "run_day_change",
+    "run_world_day_change",
+    "run_server_day_change",
+    "get_world_day_schedule",
+    "enqueue_server_day_changes",
+    "run_queued_server_day_change",
+    "requeue_stale_server_day_changes",
+    "deliver_queued_server_day_changes",
+    "profile_next_day_change",
+    "lead_day_changes",
+    # History commands
+    "get_day_summary",
+    "list_server_history_page",
+    "count_server_history",
+    "list_pooch_history",
+    "replay_day_events",
     # Kennel commands
     "list_kennel_pooches",
+    "list_kennel_pooches_page",
+    "count_kennel_pooches",
     # Owner commands
     "get_or_create_owner",
     "list_owner_kennels",
+    "list_owner_kennels_page",
+    "count_owner_kennels",
     "add_money",
+    # Mutation commands
+    "get_mutation_effects",
     # Pooch commands
     "get_pooch_by_id",
+    "get_pooches_by_ids",
     "get_pooch_family",
+    "list_pooch_children_page",
+    "count_pooch_children",
     # Server commands
     "get_or_create_server",
+    "get_or_create_servers",
+    "set_command_tree_hash",
     "get_event_channel",
     "set_event_channel",
+    "set_day_schedule",
+    "list_all_servers",
+    "get_next_day_change",
     # Vendor commands
     "list_server_vendors",
     "list_vendor_pooches",
+    "list_vendor_pooches_page",
+    "count_vendor_pooches",
     "buy_pooch",
     "get_pooch_price",
 ]
@@ -0,0 +1,179 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+from database import ALL_TABLES, add_invalidation_listener
+from metrics import counter, gauge
+from database.models import Kennel as KennelORM, Owner as OwnerORM, OwnerServer as OwnerServerORM
+from database.models import Server as ServerORM
+
+from .model import Kennel, Owner, Server
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(Generic[K, V]):
+    """
+    A bounded, in-process cache whose entries expire `ttl` seconds after being stored.
+    Once full, the least recently used entry is evicted to make room.
+
+    Only store immutable values (like the frozen `game.model` dataclasses), since every caller shares them.
+    """
+
+    def __init__(self, *, max_entries: int, ttl: float):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._generation = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[Optional[V]]]) -> Optional[V]:
+        """
+        Get the value for a key, loading and storing it on a miss.
+        A value that was invalidated while it was loading is returned but not stored, so it can't go stale in here.
+        Missing values (None) are never stored.
+
+        Parameters
+        ----------
+        key: K
+            The key to get the value of.
+
+        loader: Callable[[], Awaitable[V | None]]
+            Loads the value on a miss.
+
+        Returns
+        -------
+        V, optional
+            The cached or freshly loaded value, or None if the loader didn't find one.
+        """
+
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        generation = self._generation
+        value = await loader()
+        if value is not None and generation == self._generation:
+            self.put(key, value)
+        return value
+
+    def put(self, key: K, value: V):
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, key: K):
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._entries),
+            max_entries=self._max_entries,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Owners change whenever money moves, so these are kept short-lived and written through on every update.
+OWNERS: TTLCache[int, Owner] = TTLCache(max_entries=1024, ttl=30.0)  # TODO
+OWNER_SERVERS: TTLCache[tuple[int, int], bool] = TTLCache(max_entries=4096, ttl=30.0)  # TODO
+SERVERS: TTLCache[int, Server] = TTLCache(max_entries=256, ttl=300.0)  # TODO
+KENNELS: TTLCache[int, Kennel] = TTLCache(max_entries=1024, ttl=300.0)  # TODO
+
+_CACHES: dict[str, TTLCache[Any, Any]] = {
+    OwnerORM.__tablename__: OWNERS,
+    OwnerServerORM.__tablename__: OWNER_SERVERS,
+    ServerORM.__tablename__: SERVERS,
+    KennelORM.__tablename__: KENNELS,
+}
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    """
+    Get the hit/miss/eviction counters of every game cache, keyed by the table each one caches.
+
+    Returns
+    -------
+    dict[str, CacheStats]
+        The current stats of each cache.
+    """
+
+    return {table: cache.stats() for table, cache in _CACHES.items()}
+
+
+def _on_invalidation(table: str, key: Optional[Any]):
+    if table == ALL_TABLES:
+        for cache in _CACHES.values():
+            cache.clear()
+        return
+
+    cache = _CACHES.get(table)
+    if cache is None:
+        return
+    if key is None:
+        cache.clear()
+    else:
+        cache.invalidate(key)
+
+
+add_invalidation_listener(_on_invalidation)
+
+
+# Read from each cache's own counters when scraped, so lookups don't pay anything extra for metrics.
+_CACHE_LOOKUPS = counter("pimpy_cache_lookups_total", "Game cache lookups, by cache and result.", ("cache", "result"))
+_CACHE_EVICTIONS = counter("pimpy_cache_evictions_total", "Game cache entries evicted to make room.", ("cache",))
+_CACHE_ENTRIES = gauge("pimpy_cache_entries", "Entries in each game cache.", ("cache",))
+_CACHE_HIT_RATE = gauge("pimpy_cache_hit_rate", "The fraction of lookups each game cache has hit.", ("cache",))
+
+for _table, _cache in _CACHES.items():
+    _CACHE_LOOKUPS.labels(_table, "hit").set_function(lambda cache=_cache: cache.stats().hits)
+    _CACHE_LOOKUPS.labels(_table, "miss").set_function(lambda cache=_cache: cache.stats().misses)
+    _CACHE_EVICTIONS.labels(_table).set_function(lambda cache=_cache: cache.stats().evictions)
+    _CACHE_ENTRIES.labels(_table).set_function(lambda cache=_cache: len(cache))
+    _CACHE_HIT_RATE.labels(_table).set_function(lambda cache=_cache: cache.stats().hit_rate)
@@ -1,19 +1,30 @@
-import random
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
 
 from game.manage_pooches import get_pooch_by_id
 from game.manage_kennels import add_pooch_to_kennel
+from game.manage_history import get_day_summary, log_day_change
+
+from metrics import counter, histogram
+from profiling import profile_if_slow, profile_next
+from rng import Phase, derive_seed, new_world_seed, stream
+from rules import MAX_VENDOR_STOCK, MAX_VENDOR_STOCK_AGE, MIN_VENDOR_STOCK, VENDORS_PER_SERVER, death_chance
+from tracing import span, traced
 
-from .model import BirthEvent, DeathEvent, DayChangeSummary, to_pooch, to_server
+from .model import BirthEvent, DeathEvent, DayChangeSummary, PoochBatch, to_pooch, to_server
 
 from database import (
-    list_living_pooches,
+    advance_world_day,
+    list_due_events_page,
+    schedule_events,
+    clear_due_events,
+    list_pooch_rows_by_ids,
     list_pooch_pregnancies,
     delete_pregnancy,
     get_pooch_kennel,
     create_pooch,
-    decrement_pooch_breeding_cooldown,
-    age_pooch,
     remove_pooch_from_kennel,
     set_pooch_dead,
     bury_pooch,
@@ -23,27 +34,223 @@ from database import (
     create_vendor,
     list_servers_for_pooch,
     list_servers,
+    archive_pooches,
+    get_world_day,
+    get_last_world_day_change,
+    claim_server_day_change,
+    claim_vendor_restock,
+    run_as_leader,
+    enqueue_day_change_work,
+    claim_day_change_work,
+    finish_day_change_work,
+    requeue_stale_day_change_work,
+    list_undelivered_day_change_work,
+    mark_day_change_work_delivered,
+)
+from database.models import DayChangeWork
+
+# How many due events the day change loads into memory at once.
+DUE_EVENT_BATCH_SIZE = 500
+
+# How many pooches the day change archives per statement, and the most statements it runs per day change.
+# Anything left over is archived over the following days.
+ARCHIVE_BATCH_SIZE = 1000  # TODO
+ARCHIVE_MAX_BATCHES = 10  # TODO
+
+# Day changes take minutes at worst, so their buckets go well past the default latency buckets.
+TICK_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+# The name day changes are profiled under.
+DAY_CHANGE_PROFILE = "run_day_change"
+
+# The leader role of the process that runs day changes (see `lead_day_changes`).
+DAY_CHANGE_ROLE = "day_change"
+
+# A queued server day change still running after this long is given back to be claimed again,
+# since the worker running it most likely crashed.
+STALE_WORK_SECONDS = 300  # TODO
+
+# The most times a queued server day change is tried before it's given up on.
+MAX_WORK_ATTEMPTS = 3  # TODO
+
+TICK_SECONDS = histogram("pimpy_tick_seconds", "How long a whole day change took.", buckets=TICK_BUCKETS)
+TICK_PHASE_SECONDS = histogram(
+    "pimpy_tick_phase_seconds", "How long each phase of a day change took.", ("phase",), buckets=TICK_BUCKETS
+)
+SERVER_TICK_SECONDS = histogram(
+    "pimpy_server_tick_seconds", "How long a single server's own day change took.", buckets=TICK_BUCKETS
+)
+SERVER_TICK_LAG_SECONDS = histogram(
+    "pimpy_server_tick_lag_seconds",
+    "How long after its scheduled time each queued server day change was started by a worker.",
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+DAY_CHANGE_WORK = counter(
+    "pimpy_day_change_work_total",
+    "How queued server day changes ended (done, skipped, retried or failed).",
+    ("outcome",),
+)
+TICK_EVENTS = counter(
+    "pimpy_tick_events_total",
+    "What happened at day changes (births, deaths, vendors created, pooches restocked and archived).",
+    ("kind",),
 )
 
 
-def _death_roll(total_health: int, rng: random.Random) -> bool:
+def _death_roll(total_health: int, rng: np.random.Generator) -> bool:
     """Randomly determine whether a Pooch should die or not, based on its health."""
 
-    if total_health >= 5:  # TODO
+    chance = death_chance(total_health)
+    if chance <= 0:
         return False
-    deficit = 5 - max(total_health, 0)
-    chance = min(0.2 * deficit, 1.0)
-    return rng.random() < chance
+    return bool(rng.random() < chance)
+
+
+async def _complete_pregnancy(mother_id: int, fetus_id: int, births_by_server: dict[int, list[BirthEvent]]):
+    """Deliver a pregnancy that came due, putting the baby in its mother's kennel and recording the birth."""
+
+    await delete_pregnancy(mother_id, fetus_id)
+
+    mother = await get_pooch_by_id(mother_id)
+    baby = await get_pooch_by_id(fetus_id)
+
+    servers = await list_servers_for_pooch(baby.id)
+
+    kennel = await get_pooch_kennel(mother_id)
+    if kennel is None:
+        for server in servers:
+            births_by_server.setdefault(server.discord_id, []).append(
+                BirthEvent(
+                    server=to_server(server),
+                    mother=to_pooch(mother),
+                    child=to_pooch(baby),
+                    failure_message="The mother doesn't belong to a kennel. Her baby was abandoned.",
+                )
+            )
+        return
+
+    success = await add_pooch_to_kennel(kennel.id, baby.id)
+    if not success:
+        for server in servers:
+            births_by_server.setdefault(server.discord_id, []).append(
+                BirthEvent(
+                    server=to_server(server),
+                    mother=to_pooch(mother),
+                    child=to_pooch(baby),
+                    failure_message="There wasn't enough space in the mother's kennel. Her baby was crushed.",
+                )
+            )
+        return
+
+    for server in servers:
+        births_by_server.setdefault(server.discord_id, []).append(
+            BirthEvent(server=to_server(server), mother=to_pooch(mother), child=to_pooch(baby))
+        )
+
+
+async def _change_world_day(
+    world_seed: int, day: int
+) -> tuple[dict[int, list[BirthEvent]], dict[int, list[DeathEvent]]]:
+    """Complete the pregnancies and resolve the deaths that came due on the (just advanced) world day."""
+
+    births_by_server: dict[int, list[BirthEvent]] = {}
+    deaths_by_server: dict[int, list[DeathEvent]] = {}
+
+    # births (only the pregnancies that came due today)
+    with TICK_PHASE_SECONDS.labels("births").time():
+        after_pooch_id: Optional[int] = None
+        while events := await list_due_events_page("pregnancy_due", day, DUE_EVENT_BATCH_SIZE, after_pooch_id):
+            after_pooch_id = events[-1].pooch_id
+            pregnancies = await list_pooch_pregnancies([event.pooch_id for event in events])
+            for pregnancy in pregnancies:
+                await _complete_pregnancy(pregnancy.mother_id, pregnancy.fetus_id, births_by_server)
+            TICK_EVENTS.labels("birth").inc(len(pregnancies))
+        await clear_due_events("pregnancy_due", day)
+
+    # deaths (only the pooches whose health has dropped into the death risk range)
+    with TICK_PHASE_SECONDS.labels("deaths").time():
+        after_pooch_id = None
+        while events := await list_due_events_page("death_risk", day, DUE_EVENT_BATCH_SIZE, after_pooch_id):
+            after_pooch_id = events[-1].pooch_id
+            survivors: list[dict[str, int]] = []
+            pooches = PoochBatch.from_rows(await list_pooch_rows_by_ids([event.pooch_id for event in events]))
+            # the health of every living pooch at risk is worked out at once, and only the dead become `Pooch`es
+            living = pooches[pooches.alive]
+            for i, (pooch_id, health) in enumerate(zip(living.id.tolist(), living.health.tolist())):
+                if not _death_roll(health, stream(world_seed, day, Phase.DEATH, pooch_id)):
+                    survivors.append({"kind": "death_risk", "day": day + 1, "pooch_id": pooch_id})
+                    continue
+
+                pooch = living[i]
+                await set_pooch_dead(pooch_id)
+                await remove_pooch_from_kennel(pooch_id)
+                if pooch.owner_discord_id is not None:
+                    await bury_pooch(pooch.owner_discord_id, pooch_id)
+                for server in await list_servers_for_pooch(pooch_id):
+                    deaths_by_server.setdefault(server.discord_id, []).append(
+                        DeathEvent(server=to_server(server), pooch=pooch)
+                    )
+                TICK_EVENTS.labels("death").inc()
+            await schedule_events(survivors)
+        await clear_due_events("death_risk", day)
+
+    return births_by_server, deaths_by_server
 
 
+async def _restock_server(server_discord_id: int, world_seed: int, day: int):
+    """
+    Top the server up to its number of vendors, and give every vendor in it fresh stock.
+    Vendors already restocked for the day are left alone, so running it again for the same day does nothing twice.
+    """
+
+    vendors = await list_vendors(server_discord_id)
+    if len(vendors) < VENDORS_PER_SERVER:
+        rng = stream(world_seed, day, Phase.VENDOR_CREATION, server_discord_id)
+        for _ in range(VENDORS_PER_SERVER - len(vendors)):
+            vendor = await create_vendor(server_discord_id, rng_seed=derive_seed(rng))
+            vendors.append(vendor)
+            TICK_EVENTS.labels("vendor_created").inc()
+    for vendor in vendors:
+        if not await claim_vendor_restock(vendor.id, day):
+            continue
+        await clear_vendor_pooch_stock(vendor.id)
+        rng = stream(world_seed, day, Phase.VENDOR_RESTOCK, vendor.id)
+        stock_count = int(rng.integers(MIN_VENDOR_STOCK, MAX_VENDOR_STOCK + 1))
+        for _ in range(stock_count):
+            age = int(rng.integers(0, MAX_VENDOR_STOCK_AGE + 1))
+            vendor_pooch = await create_pooch(vendor_id=vendor.id, age=age, rng_seed=derive_seed(rng))
+            await add_pooch_to_vendor_stock(vendor.id, vendor_pooch.id)
+        TICK_EVENTS.labels("restock").inc(stock_count)
+
+
+async def _archive(day: int):
+    """Archive the pooches nothing live refers to anymore (dead pooches, and stock that was restocked away)."""
+
+    with TICK_PHASE_SECONDS.labels("archival").time():
+        for _ in range(ARCHIVE_MAX_BATCHES):
+            archived = await archive_pooches(day, ARCHIVE_BATCH_SIZE)
+            TICK_EVENTS.labels("archive").inc(archived)
+            if archived < ARCHIVE_BATCH_SIZE:
+                break
+
+
+@traced("tick")
+@profile_if_slow(DAY_CHANGE_PROFILE, "tick")
 async def run_day_change(rng_seed: Optional[int] = None) -> dict[int, DayChangeSummary]:
     """
-    Change the day for all servers, completing pregnancies, resolving deaths, and restocking vendors.
+    Change the day for all servers at once, completing pregnancies, resolving deaths, restocking vendors,
+    and archiving pooches nothing live refers to anymore.
+    Everything that happened is appended to the day event log.
+
+    To change the world day and each server's day at different times instead, use `run_world_day_change`
+    and `run_server_day_change`.
 
     Parameters
     ----------
     rng_seed: int, optional
-        The int to seed `random.Random` with for determining random values (like pooch deaths or vendor restocks).
+        The world seed for determining random values (like pooch deaths or vendor restocks).
+        Each pooch, server and vendor draws from its own stream (see `rng.stream`), so the same seed gives the same
+        day no matter what order they're processed in. Uses a fresh seed if not given.
 
     Returns
     -------
@@ -51,96 +258,282 @@ async def run_day_change(rng_seed: Optional[int] = None) -> dict[int, DayChangeS
         A dictionary summarizing the day's events for each server in the form `{ server_discord_id : DayChangeSummary }`.
     """
 
-    rng = random.Random(rng_seed)
-
-    births_by_server: dict[int, list[BirthEvent]] = {}
-    deaths_by_server: dict[int, list[DeathEvent]] = {}
-
-    # births
-    pregnancies = await list_pooch_pregnancies()
-    for pregnancy in pregnancies:
-        mother_id = pregnancy.mother_id
-        fetus_id = pregnancy.fetus_id
+    with TICK_SECONDS.time():
+        world_seed = rng_seed if rng_seed is not None else new_world_seed()
+        day = await advance_world_day()
+        births_by_server, deaths_by_server = await _change_world_day(world_seed, day)
 
-        await delete_pregnancy(mother_id, fetus_id)
+        servers = await list_servers()
 
-        mother = await get_pooch_by_id(mother_id)
-        baby = await get_pooch_by_id(fetus_id)
+        # vendor restock (skipping servers whose own day change already ran today)
+        with TICK_PHASE_SECONDS.labels("restock").time():
+            for server in servers:
+                if await claim_server_day_change(server.discord_id, day):
+                    await _restock_server(server.discord_id, world_seed, day)
 
-        servers = await list_servers_for_pooch(baby.id)
+        await _archive(day)
 
-        kennel = await get_pooch_kennel(mother_id)
-        if kennel is None:
+        # summaries
+        with TICK_PHASE_SECONDS.labels("summaries").time():
+            out: dict[int, DayChangeSummary] = {}
             for server in servers:
-                births_by_server.setdefault(server.discord_id, []).append(
-                    BirthEvent(
-                        server=to_server(server),
-                        mother=to_pooch(mother),
-                        child=to_pooch(baby),
-                        failure_message="The mother doesn't belong to a kennel. Her baby was abandoned.",
-                    )
+                out[server.discord_id] = DayChangeSummary(
+                    server=to_server(server),
+                    day=day,
+                    births=births_by_server.get(server.discord_id, []),
+                    deaths=deaths_by_server.get(server.discord_id, []),
                 )
-            continue
 
-        success = await add_pooch_to_kennel(kennel.id, baby.id)
-        if not success:
-            for server in servers:
-                births_by_server.setdefault(server.discord_id, []).append(
-                    BirthEvent(
-                        server=to_server(server),
-                        mother=to_pooch(mother),
-                        child=to_pooch(baby),
-                        failure_message="There wasn't enough space in the mother's kennel. Her baby was crushed.",
-                    )
-                )
-            continue
+            await log_day_change(day, out)
 
-        for server in servers:
-            births_by_server.setdefault(server.discord_id, []).append(
-                BirthEvent(server=to_server(server), mother=to_pooch(mother), child=to_pooch(baby))
-            )
+    return out
 
-    # deaths (and other updates)
-    pooches = await list_living_pooches()
-    for pooch in pooches:
-        await decrement_pooch_breeding_cooldown(pooch.id)
-        updated = await age_pooch(pooch.id)
-        if updated is None:
-            continue
 
-        total_health = max(updated.base_health - updated.health_loss_age, 0)
-        if _death_roll(total_health, rng):
-            await set_pooch_dead(pooch.id)
-            await remove_pooch_from_kennel(pooch.id)
-            if pooch.owner_discord_id is not None:
-                await bury_pooch(pooch.owner_discord_id, pooch.id)
-            for server in await list_servers_for_pooch(baby.id):
-                deaths_by_server.setdefault(server.discord_id, []).append(
-                    DeathEvent(server=to_server(server), pooch=to_pooch(pooch))
+@traced("tick")
+@profile_if_slow(DAY_CHANGE_PROFILE, "tick")
+async def run_world_day_change(
+    rng_seed: Optional[int] = None, scheduled_for: Optional[datetime] = None
+) -> Optional[int]:
+    """
+    Change the world day: complete pregnancies, resolve deaths and archive pooches nothing live refers to anymore.
+    Births and deaths are appended to the day event log. Each server's own day change (restocking its vendors
+    and summarizing its day) is left to `run_server_day_change`, at the server's local day boundary.
+
+    Parameters
+    ----------
+    rng_seed: int, optional
+        The world seed for determining random values (like pooch deaths). Uses a fresh seed if not given.
+
+    scheduled_for: datetime, optional
+        The time the day change was scheduled for. If given, a day change scheduled for the same time only ever runs
+        once, however many processes try to run it.
+
+    Returns
+    -------
+    int, optional
+        The new world day, or None if the day change scheduled for the same time already ran.
+    """
+
+    with TICK_SECONDS.time():
+        day = await advance_world_day(scheduled_for)
+        if day is None:
+            return None
+
+        world_seed = rng_seed if rng_seed is not None else new_world_seed()
+        births_by_server, deaths_by_server = await _change_world_day(world_seed, day)
+
+        await _archive(day)
+
+        with TICK_PHASE_SECONDS.labels("summaries").time():
+            out: dict[int, DayChangeSummary] = {}
+            for events in (*births_by_server.values(), *deaths_by_server.values()):
+                server = events[0].server
+                out[server.discord_id] = DayChangeSummary(
+                    server=server,
+                    day=day,
+                    births=births_by_server.get(server.discord_id, []),
+                    deaths=deaths_by_server.get(server.discord_id, []),
                 )
 
-    servers = await list_servers()
+            await log_day_change(day, out)
 
-    # vendor restock
-    for server in servers:
-        vendors = await list_vendors(server.discord_id)
-        if len(vendors) < 3:
-            for _ in range(3 - len(vendors)):  # TODO: Remove this and all magic numbers
-                vendor = await create_vendor(server.discord_id, rng_seed=rng_seed)
-                vendors.append(vendor)
-        for vendor in vendors:
-            await clear_vendor_pooch_stock(vendor.id)
-            stock_count = rng.randint(2, 5)  # TODO
-            for _ in range(stock_count):
-                vendor_pooch = await create_pooch(vendor_id=vendor.id, age=rng.randint(0, 5), rng_seed=rng_seed)  # TODO
-                await add_pooch_to_vendor_stock(vendor.id, vendor_pooch.id)
-
-    # summaries
-    out: dict[int, DayChangeSummary] = {}
-    for server in servers:
-        out[server.discord_id] = DayChangeSummary(
-            server=to_server(server),
-            births=births_by_server.get(server.discord_id, []),
-            deaths=deaths_by_server.get(server.discord_id, []),
-        )
-    return out
+    return day
+
+
+@traced("tick")
+async def run_server_day_change(server_discord_id: int, rng_seed: Optional[int] = None) -> Optional[DayChangeSummary]:
+    """
+    Change the day for a single server: restock its vendors and summarize its current world day.
+    Runs at most once per world day for each server, however many times (or from however many processes)
+    it's called.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The Discord ID of the server to change the day for.
+
+    rng_seed: int, optional
+        The world seed for determining random values (like vendor restocks). Uses a fresh seed if not given.
+
+    Returns
+    -------
+    DayChangeSummary, optional
+        The summary of the server's day, or None if its day change already ran for the current world day.
+    """
+
+    day = await get_world_day()
+    if not await claim_server_day_change(server_discord_id, day):
+        return None
+
+    with SERVER_TICK_SECONDS.time():
+        world_seed = rng_seed if rng_seed is not None else new_world_seed()
+        await _restock_server(server_discord_id, world_seed, day)
+        return await get_day_summary(server_discord_id, day)
+
+
+@traced("tick")
+async def get_world_day_schedule() -> tuple[int, Optional[datetime]]:
+    """
+    Get the current world day, and the time the last scheduled world day change was scheduled for, so a scheduler
+    taking over (like after a failover) can catch up on the day changes that came due while none was running.
+
+    Returns
+    -------
+    tuple[int, datetime | None]
+        The current world day, and the scheduled time of the last scheduled world day change (None if none has run).
+    """
+
+    return await get_world_day(), await get_last_world_day_change()
+
+
+@traced("tick")
+async def enqueue_server_day_changes(server_discord_ids: list[int], scheduled_for: Optional[datetime] = None) -> int:
+    """
+    Queue the day changes of the given servers for the current world day, to be run by whichever worker process
+    claims each of them (see `run_queued_server_day_change`). Servers already queued for the day are skipped.
+
+    Parameters
+    ----------
+    server_discord_ids: list[int]
+        The Discord IDs of the servers to queue the day changes of.
+
+    scheduled_for: datetime, optional
+        The time the day changes were scheduled for. If given, how late each one is started is measured.
+
+    Returns
+    -------
+    int
+        The world day the day changes were queued for.
+    """
+
+    day = await get_world_day()
+    await enqueue_day_change_work(day, server_discord_ids, scheduled_for)
+    return day
+
+
+async def run_queued_server_day_change(worker_id: str, rng_seed: Optional[int] = None) -> bool:
+    """
+    Claim the oldest queued server day change no other worker has, and run it. A server day change that fails is
+    given back to be tried again, up to `MAX_WORK_ATTEMPTS` times.
+
+    Parameters
+    ----------
+    worker_id: str
+        The ID of the worker (process) running the day change, unique among the running workers.
+
+    rng_seed: int, optional
+        The world seed for determining random values (like vendor restocks). Uses a fresh seed if not given.
+
+    Returns
+    -------
+    bool
+        Whether there was a day change to run. False if the queue is empty.
+    """
+
+    claimed = await claim_day_change_work(worker_id)
+    if not claimed:
+        return False
+
+    work = claimed[0]
+    if work.scheduled_for is not None:
+        SERVER_TICK_LAG_SECONDS.observe((datetime.now(timezone.utc) - work.scheduled_for).total_seconds())
+    with span("change_day.run_queued_server_day_change", "tick", server_discord_id=work.server_discord_id):
+        try:
+            # servers whose day change already ran (like from `run_day_change`) are skipped, while a retry takes back
+            # the claim an earlier attempt of the same work item made (and only restocks the vendors it didn't get to)
+            if not await claim_server_day_change(work.server_discord_id, work.day, work.id):
+                outcome = "skipped"
+            else:
+                with SERVER_TICK_SECONDS.time():
+                    world_seed = rng_seed if rng_seed is not None else new_world_seed()
+                    await _restock_server(work.server_discord_id, world_seed, work.day)
+                outcome = "done"
+        except Exception as error:
+            outcome = "pending" if work.attempts < MAX_WORK_ATTEMPTS else "failed"
+            await finish_day_change_work(work.id, worker_id, outcome, repr(error))
+            DAY_CHANGE_WORK.labels("retried" if outcome == "pending" else "failed").inc()
+            raise
+
+    await finish_day_change_work(work.id, worker_id, outcome)
+    DAY_CHANGE_WORK.labels(outcome).inc()
+    return True
+
+
+@traced("tick")
+async def requeue_stale_server_day_changes() -> int:
+    """
+    Give back the queued server day changes claimed by workers that stopped responding (running for longer than
+    `STALE_WORK_SECONDS`), to be claimed again, or give up on them after `MAX_WORK_ATTEMPTS` tries.
+
+    Returns
+    -------
+    int
+        How many day changes were given back or given up on.
+    """
+
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=STALE_WORK_SECONDS)
+    return await requeue_stale_day_change_work(stale_before, MAX_WORK_ATTEMPTS)
+
+
+@traced("tick")
+async def deliver_queued_server_day_changes(post: Callable[[dict[int, DayChangeSummary]], Awaitable[None]]) -> int:
+    """
+    Post the summaries of the queued server day changes that have finished but haven't been posted yet, whichever
+    process queued them (like a day change leader that went away before posting them), one world day at a time.
+    Each day change is marked delivered once its summary is posted, or posting it failed, so it's never posted twice.
+
+    Parameters
+    ----------
+    post: Callable[[dict[int, DayChangeSummary]], Awaitable[None]]
+        Posts the summaries of one world day, given in the form `{ server_discord_id : DayChangeSummary }`.
+        Day changes that were skipped or failed have no summary.
+
+    Returns
+    -------
+    int
+        How many finished day changes were delivered.
+    """
+
+    finished_by_day: dict[int, list[DayChangeWork]] = {}
+    for work in await list_undelivered_day_change_work():
+        if work.status not in ("pending", "running"):
+            finished_by_day.setdefault(work.day, []).append(work)
+
+    delivered = 0
+    for day, items in sorted(finished_by_day.items()):
+        summaries = {
+            work.server_discord_id: await get_day_summary(work.server_discord_id, day)
+            for work in items
+            if work.status == "done"
+        }
+        try:
+            if summaries:
+                await post(summaries)
+        finally:
+            delivered += await mark_day_change_work_delivered([work.id for work in items])
+
+    return delivered
+
+
+def profile_next_day_change():
+    """
+    Profile the next day change, however long it takes. The profile is saved like any slow day change's
+    (see `profiling`).
+    """
+
+    profile_next(DAY_CHANGE_PROFILE)
+
+
+async def lead_day_changes(run: Callable[[], Awaitable[None]]):
+    """
+    Run the day change loop in exactly one process at a time, however many processes (or shards) of the bot are
+    running: the day change leader. Every other process stands by, and one takes over within seconds if the leader
+    goes away. Never returns.
+
+    Parameters
+    ----------
+    run: Callable[[], Awaitable[None]]
+        Starts the day change loop.
+    """
+
+    await run_as_leader(DAY_CHANGE_ROLE, run)
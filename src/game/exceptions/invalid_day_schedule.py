@@ -0,0 +1,14 @@
+class InvalidDaySchedule(Exception):
+    """
+    Exception raised when a server's day schedule (its timezone and day boundary) is invalid.
+
+    Attributes
+    ----------
+    reason: str
+        What's wrong with the day schedule.
+    """
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        message = f"Invalid day schedule: {reason}"
+        super().__init__(message)
@@ -0,0 +1,14 @@
+class InvalidMutationOptions(Exception):
+    """
+    Exception raised when the advanced options of one or more mutations are invalid.
+
+    Attributes
+    ----------
+    errors: list[str]
+        A description of every problem found, each naming the mutation and option it's about.
+    """
+
+    def __init__(self, errors: list[str]):
+        self.errors = errors
+        message = f"{len(errors)} invalid mutation option(s):\n" + "\n".join(f"- {error}" for error in errors)
+        super().__init__(message)
@@ -0,0 +1,224 @@
+from typing import Any, Optional, Protocol, TypeVar
+from database import (
+    DayEventCursor,
+    log_day_events,
+    list_server_day_events,
+    list_server_day_events_page,
+    count_server_day_events,
+    list_pooch_day_events,
+    stream_day_events,
+)
+
+from tracing import traced
+from .manage_pooches import get_pooches_by_ids
+from .manage_servers import get_or_create_server
+from .model import BirthEvent, DeathEvent, DayChangeSummary, DayEvent, to_day_event
+
+
+class DayEventReadModel(Protocol):
+    def apply(self, event: DayEvent): ...
+
+
+R = TypeVar("R", bound=DayEventReadModel)
+
+
+class DayEventTotals(DayEventReadModel):
+    """
+    A read model counting the births, failed births and deaths on each day in each server.
+    """
+
+    def __init__(self):
+        self.births: dict[tuple[int, int], int] = {}
+        self.failed_births: dict[tuple[int, int], int] = {}
+        self.deaths: dict[tuple[int, int], int] = {}
+
+    def apply(self, event: DayEvent):
+        key = (event.server_discord_id, event.day)
+        if event.kind == "death":
+            totals = self.deaths
+        elif event.detail is not None:
+            totals = self.failed_births
+        else:
+            totals = self.births
+        totals[key] = totals.get(key, 0) + 1
+
+
+@traced("game")
+async def log_day_change(day: int, summaries: dict[int, DayChangeSummary]):
+    """
+    Append everything in the given day change summaries to the day event log, in a single bulk insert.
+
+    Parameters
+    ----------
+    day: int
+        The world day the summaries are for.
+
+    summaries: dict[int, DayChangeSummary]
+        The summaries of the day change, in the form `{ server_discord_id : DayChangeSummary }`.
+    """
+
+    events: list[dict[str, Any]] = []
+    for server_discord_id, summary in summaries.items():
+        for birth in summary.births:
+            events.append(
+                {
+                    "server_discord_id": server_discord_id,
+                    "kind": "birth",
+                    "pooch_id": birth.child.id,
+                    "pooch_name": birth.child.name,
+                    "other_pooch_id": birth.mother.id,
+                    "other_pooch_name": birth.mother.name,
+                    "detail": birth.failure_message,
+                }
+            )
+        for death in summary.deaths:
+            events.append(
+                {
+                    "server_discord_id": server_discord_id,
+                    "kind": "death",
+                    "pooch_id": death.pooch.id,
+                    "pooch_name": death.pooch.name,
+                    "other_pooch_id": None,
+                    "other_pooch_name": None,
+                    "detail": None,
+                }
+            )
+
+    await log_day_events(day, events)
+
+
+@traced("game")
+async def get_day_summary(server_discord_id: int, day: int) -> DayChangeSummary:
+    """
+    Rebuild the summary of what happened in the given server on the given day from the day event log.
+    Events about pooches that no longer exist are left out.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The Discord ID of the server to summarize.
+
+    day: int
+        The world day to summarize.
+
+    Returns
+    -------
+    DayChangeSummary
+        The summary of the day in the server.
+    """
+
+    server = await get_or_create_server(server_discord_id)
+    events = [to_day_event(event) for event in await list_server_day_events(server_discord_id, day)]
+
+    pooch_ids = {event.pooch_id for event in events}
+    pooch_ids.update(event.other_pooch_id for event in events if event.other_pooch_id is not None)
+    pooches = {pooch.id: pooch for pooch in await get_pooches_by_ids(list(pooch_ids))}
+
+    births: list[BirthEvent] = []
+    deaths: list[DeathEvent] = []
+    for event in events:
+        pooch = pooches.get(event.pooch_id)
+        if pooch is None:
+            continue
+
+        if event.kind == "death":
+            deaths.append(DeathEvent(server=server, pooch=pooch))
+            continue
+
+        mother = pooches.get(event.other_pooch_id) if event.other_pooch_id is not None else None
+        if mother is not None:
+            births.append(BirthEvent(server=server, mother=mother, child=pooch, failure_message=event.detail))
+
+    return DayChangeSummary(server=server, day=day, births=births, deaths=deaths)
+
+
+@traced("game")
+async def list_server_history_page(
+    server_discord_id: int, limit: int, before: Optional[DayEventCursor] = None
+) -> list[DayEvent]:
+    """
+    List one page of the events logged in the given server, newest first.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The Discord ID of the server to list the events of.
+
+    limit: int
+        The maximum number of events to list.
+
+    before: DayEventCursor, optional
+        The (day, id) of the last event on the previous page. Lists the newest events if not given.
+
+    Returns
+    -------
+    list[DayEvent]
+        At most `limit` events logged in the server, older than the cursor.
+    """
+
+    events = await list_server_day_events_page(server_discord_id, limit, before)
+    return [to_day_event(event) for event in events]
+
+
+@traced("game")
+async def count_server_history(server_discord_id: int) -> int:
+    """
+    Count the events logged in the given server.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The Discord ID of the server to count the events of.
+
+    Returns
+    -------
+    int
+        The number of events logged in the server.
+    """
+
+    return await count_server_day_events(server_discord_id)
+
+
+@traced("game")
+async def list_pooch_history(pooch_id: int) -> list[DayEvent]:
+    """
+    List every event logged about the given pooch, oldest first.
+
+    Parameters
+    ----------
+    pooch_id: int
+        The ID of the pooch to list the events of.
+
+    Returns
+    -------
+    list[DayEvent]
+        The events logged about the pooch.
+    """
+
+    events = await list_pooch_day_events(pooch_id)
+    return [to_day_event(event) for event in events]
+
+
+@traced("game")
+async def replay_day_events(read_model: R, after_day: Optional[int] = None) -> R:
+    """
+    Stream the day event log into a read model, oldest event first.
+
+    Parameters
+    ----------
+    read_model: DayEventReadModel
+        The read model to apply every event to. Usually a fresh one.
+
+    after_day: int, optional
+        Only replay events from after this world day, to catch up a read model that was built before.
+        Replays the whole log if not given.
+
+    Returns
+    -------
+    DayEventReadModel
+        The given read model, with every event applied.
+    """
+
+    async for event in stream_day_events(after_day):
+        read_model.apply(to_day_event(event))
+    return read_model
@@ -1,15 +1,30 @@
+from typing import Optional
 from database import (
+    Cursor,
     get_kennel_by_id,
     get_pooch_by_id,
     list_pooches_for_kennel,
+    list_pooches_for_kennel_page,
+    count_pooches_for_kennel,
     add_pooch_to_kennel as db_add_pooch_to_kennel,
 )
+from tracing import traced
 from .exceptions.kennel_not_found import KennelNotFound
 from .exceptions.pooch_not_found import PoochNotFound
 
-from .model import Pooch, to_pooch
+from .cache import KENNELS
+from .model import Kennel, to_kennel, Pooch, row_to_pooch
 
 
+async def _get_kennel(kennel_id: int) -> Optional[Kennel]:
+    async def load() -> Optional[Kennel]:
+        kennel = await get_kennel_by_id(kennel_id)
+        return to_kennel(kennel) if kennel is not None else None
+
+    return await KENNELS.get_or_load(kennel_id, load)
+
+
+@traced("game")
 async def list_kennel_pooches(kennel_id: int) -> list[Pooch]:
     """
     List every pooch in a given kennel.
@@ -30,14 +45,60 @@ async def list_kennel_pooches(kennel_id: int) -> list[Pooch]:
         When the kennel with the given ID isn't found in the database.
     """
 
-    kennel = await get_kennel_by_id(kennel_id)
+    kennel = await _get_kennel(kennel_id)
     if kennel is None:
         raise KennelNotFound(kennel_id)
 
     pooches = await list_pooches_for_kennel(kennel_id)
-    return [to_pooch(pooch) for pooch in pooches]
+    return [row_to_pooch(pooch) for pooch in pooches]
+
+
+@traced("game")
+async def list_kennel_pooches_page(kennel_id: int, limit: int, after: Optional[Cursor] = None) -> list[Pooch]:
+    """
+    List one page of the pooches in a given kennel.
+
+    Parameters
+    ----------
+    kennel_id: int
+        The ID of the kennel to fetch the pooches from.
+
+    limit: int
+        The maximum number of pooches to list.
+
+    after: Cursor, optional
+        The (created_at, id) of the last pooch on the previous page. Lists the first page if not given.
+
+    Returns
+    -------
+    list[Pooch]
+        At most `limit` pooches in the given kennel, following the cursor.
+    """
+
+    pooches = await list_pooches_for_kennel_page(kennel_id, limit, after)
+    return [row_to_pooch(pooch) for pooch in pooches]
+
+
+@traced("game")
+async def count_kennel_pooches(kennel_id: int) -> int:
+    """
+    Count the pooches in a given kennel.
+
+    Parameters
+    ----------
+    kennel_id: int
+        The ID of the kennel to count the pooches of.
+
+    Returns
+    -------
+    int
+        The number of pooches in the given kennel.
+    """
+
+    return await count_pooches_for_kennel(kennel_id)
 
 
+@traced("game")
 async def add_pooch_to_kennel(kennel_id: int, pooch_id: int) -> bool:
     """
     Add the pooch with the given ID to the kennel with the given ID.
@@ -65,16 +126,16 @@ async def add_pooch_to_kennel(kennel_id: int, pooch_id: int) -> bool:
         When the pooch with the given ID isn't found in the database.
     """
 
-    kennel = await get_kennel_by_id(kennel_id)
+    kennel = await _get_kennel(kennel_id)
     if kennel is None:
         raise KennelNotFound(kennel_id)
 
-    pooch = await get_pooch_by_id(kennel_id)
+    pooch = await get_pooch_by_id(pooch_id)
     if pooch is None:
         raise PoochNotFound(pooch_id)
 
-    kennel_pooches = await list_kennel_pooches(kennel_id)
-    if len(kennel_pooches) >= kennel.pooch_limit:
+    if await count_pooches_for_kennel(kennel_id) >= kennel.pooch_limit:
         return False
 
     await db_add_pooch_to_kennel(kennel_id, pooch_id)
+    return True
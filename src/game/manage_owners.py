@@ -1,23 +1,26 @@
+from typing import Optional
 from database import (
-    get_owner_by_discord_id,
-    create_owner,
-    create_kennel,
-    add_owner_to_server,
+    Cursor,
+    bootstrap_owner,
     list_kennels_for_owner,
+    list_kennels_for_owner_page,
+    count_kennels_for_owner,
     give_money_to_owner,
-    get_owner_server,
 )
-from .manage_servers import get_or_create_server
+from tracing import traced
+from .cache import OWNERS, OWNER_SERVERS
 from .exceptions.owner_not_found import OwnerNotFound
 
 from .model import Kennel, to_kennel, Owner, to_owner
 
 
+@traced("game")
 async def get_or_create_owner(server_discord_id: int, owner_discord_id: int) -> Owner:
     """
     Get an owner with the given Discord ID for the server with the given Discord ID.
     If no owner with that ID exists on that server yet, create it.
     Also creates the server if it doesn't exist yet.
+    Recently seen owners are served from a short-lived cache without touching the database.
 
     Parameters
     ----------
@@ -33,21 +36,17 @@ async def get_or_create_owner(server_discord_id: int, owner_discord_id: int) ->
         The Owner with the given Discord ID in the server with the given Discord ID.
     """
 
-    await get_or_create_server(server_discord_id)
+    owner = OWNERS.get(owner_discord_id)
+    if owner is not None and OWNER_SERVERS.get((server_discord_id, owner_discord_id)):
+        return owner
 
-    owner = await get_owner_by_discord_id(owner_discord_id)
-    if owner is None:
-        owner = await create_owner(owner_discord_id)
-        await add_owner_to_server(server_discord_id, owner_discord_id)
-        await create_kennel(owner_discord_id)
-    else:
-        owner_server = await get_owner_server(server_discord_id, owner_discord_id)
-        if owner_server is None:
-            await add_owner_to_server(server_discord_id, owner_discord_id)
-
-    return to_owner(owner)
+    owner = to_owner(await bootstrap_owner(server_discord_id, owner_discord_id))
+    OWNERS.put(owner_discord_id, owner)
+    OWNER_SERVERS.put((server_discord_id, owner_discord_id), True)
+    return owner
 
 
+@traced("game")
 async def list_owner_kennels(owner_discord_id: int) -> list[Kennel]:
     """
     Get a list of every kennel the owner with the given Discord ID owns.
@@ -67,6 +66,52 @@ async def list_owner_kennels(owner_discord_id: int) -> list[Kennel]:
     return [to_kennel(kennel) for kennel in kennels]
 
 
+@traced("game")
+async def list_owner_kennels_page(owner_discord_id: int, limit: int, after: Optional[Cursor] = None) -> list[Kennel]:
+    """
+    Get one page of the kennels the owner with the given Discord ID owns.
+
+    Parameters
+    ----------
+    owner_discord_id: int
+        The Discord ID of the owner to get the kennels for.
+
+    limit: int
+        The maximum number of kennels to get.
+
+    after: Cursor, optional
+        The (created_at, id) of the last kennel on the previous page. Gets the first page if not given.
+
+    Returns
+    -------
+    list[Kennel]
+        At most `limit` kennels the owner owns, following the cursor.
+    """
+
+    kennels = await list_kennels_for_owner_page(owner_discord_id, limit, after)
+    return [to_kennel(kennel) for kennel in kennels]
+
+
+@traced("game")
+async def count_owner_kennels(owner_discord_id: int) -> int:
+    """
+    Count the kennels the owner with the given Discord ID owns.
+
+    Parameters
+    ----------
+    owner_discord_id: int
+        The Discord ID of the owner to count the kennels of.
+
+    Returns
+    -------
+    int
+        The number of kennels the owner owns.
+    """
+
+    return await count_kennels_for_owner(owner_discord_id)
+
+
+@traced("game")
 async def add_money(server_discord_id: int, owner_discord_id: int, amount: int) -> Owner:
     """
     Add money to the owner with the given ID's account.
@@ -91,4 +136,7 @@ async def add_money(server_discord_id: int, owner_discord_id: int, amount: int)
         owner = await give_money_to_owner(owner_discord_id, amount)
         if owner is None:
             raise OwnerNotFound(owner_discord_id)
-    return to_owner(owner)
+
+    owner = to_owner(owner)
+    OWNERS.put(owner_discord_id, owner)
+    return owner
@@ -1,14 +1,20 @@
+from typing import Optional
 from database import (
+    Cursor,
     get_pooch_by_id as db_get_pooch_by_id,
     get_pooch_parents,
-    list_pooch_children,
-    list_pooch_siblings,
+    list_pooch_children_page as db_list_pooch_children_page,
+    count_pooch_children as db_count_pooch_children,
+    list_pooch_siblings_page,
+    list_pooches_by_ids,
 )
+from tracing import traced
 from .exceptions.pooch_not_found import PoochNotFound
 
-from .model import Pooch, to_pooch
+from .model import Pooch, row_to_pooch, to_pooch
 
 
+@traced("game")
 async def get_pooch_by_id(pooch_id: int) -> Pooch:
     """
     Return a pooch with the given ID.
@@ -35,15 +41,41 @@ async def get_pooch_by_id(pooch_id: int) -> Pooch:
     return to_pooch(pooch)
 
 
-async def get_pooch_family(pooch_id: int) -> dict[str, list[Pooch]]:
+@traced("game")
+async def get_pooches_by_ids(pooch_ids: list[int]) -> list[Pooch]:
+    """
+    Return the pooches with the given IDs, in the order the IDs were given, including archived ones.
+    IDs that don't correspond to a pooch are skipped.
+
+    Parameters
+    ----------
+    pooch_ids: list[int]
+        The IDs of the pooches to return.
+
+    Returns
+    -------
+    list[Pooch]
+        The pooches with the given IDs.
+    """
+
+    pooches = {pooch.id: pooch for pooch in await list_pooches_by_ids(pooch_ids, include_archived=True)}
+    return [to_pooch(pooches[pooch_id]) for pooch_id in pooch_ids if pooch_id in pooches]
+
+
+@traced("game")
+async def get_pooch_family(pooch_id: int, limit: int = 25) -> dict[str, list[Pooch]]:
     """
     Get the immediate family (parents, children, full siblings) of the pooch with the given ID.
+    Children and siblings are capped at the `limit` oldest of each.
 
     Parameters
     ----------
     pooch_id: int
         The ID of the pooch to get the family of.
 
+    limit: int, default = 25
+        The maximum number of children and of siblings to get.
+
     Returns
     -------
     dict[str, list[Pooch]]
@@ -51,16 +83,61 @@ async def get_pooch_family(pooch_id: int) -> dict[str, list[Pooch]]:
     """
 
     father, mother = await get_pooch_parents(pooch_id)
-    parents = [to_pooch(parent) for parent in (father, mother) if parent is not None]
+    parents = [row_to_pooch(parent) for parent in (father, mother) if parent is not None]
 
-    children_orm = await list_pooch_children(pooch_id)
-    children = [to_pooch(child) for child in children_orm]
+    children_rows = await db_list_pooch_children_page(pooch_id, limit)
+    children = [row_to_pooch(child) for child in children_rows]
 
-    siblings_orm = await list_pooch_siblings(pooch_id)
-    siblings = [to_pooch(sibling) for sibling in siblings_orm]
+    siblings_rows = await list_pooch_siblings_page(pooch_id, limit)
+    siblings = [row_to_pooch(sibling) for sibling in siblings_rows]
 
     return {
         "parents": parents,
         "children": children,
         "siblings": siblings,
     }
+
+
+@traced("game")
+async def list_pooch_children_page(pooch_id: int, limit: int, after: Optional[Cursor] = None) -> list[Pooch]:
+    """
+    Get one page of the children of the pooch with the given ID.
+
+    Parameters
+    ----------
+    pooch_id: int
+        The ID of the pooch to get the children of.
+
+    limit: int
+        The maximum number of children to get.
+
+    after: Cursor, optional
+        The (created_at, id) of the last child on the previous page. Gets the first page if not given.
+
+    Returns
+    -------
+    list[Pooch]
+        At most `limit` children of the pooch, following the cursor.
+    """
+
+    children = await db_list_pooch_children_page(pooch_id, limit, after)
+    return [row_to_pooch(child) for child in children]
+
+
+@traced("game")
+async def count_pooch_children(pooch_id: int) -> int:
+    """
+    Count the children of the pooch with the given ID.
+
+    Parameters
+    ----------
+    pooch_id: int
+        The ID of the pooch to count the children of.
+
+    Returns
+    -------
+    int
+        The number of children the pooch has.
+    """
+
+    return await db_count_pooch_children(pooch_id)
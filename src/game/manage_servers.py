@@ -1,16 +1,33 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
 from typing import Optional
+from zoneinfo import ZoneInfo, available_timezones
+
 from database import (
+    bootstrap_server,
+    bootstrap_servers,
     get_server_by_discord_id,
-    create_server,
     set_event_channel_discord_id,
+    set_server_day_schedule,
+    set_servers_command_tree_hash,
+    list_servers,
 )
+from tracing import traced
+from .cache import SERVERS
+from .exceptions.invalid_day_schedule import InvalidDaySchedule
 from .model import Server, to_server
 
 
+async def _load_server(server_discord_id: int) -> Optional[Server]:
+    server = await get_server_by_discord_id(server_discord_id)
+    return to_server(server) if server is not None else None
+
+
+@traced("game")
 async def get_or_create_server(server_discord_id: int) -> Server:
     """
     Get a server with the given Discord ID.
     If no server with that ID exists yet, create it.
+    Served from the server cache when possible.
 
     Parameters
     ----------
@@ -23,12 +40,56 @@ async def get_or_create_server(server_discord_id: int) -> Server:
         The Server with the given Discord ID.
     """
 
-    server = await get_server_by_discord_id(server_discord_id)
+    server = SERVERS.get(server_discord_id)
     if server is None:
-        server = await create_server(server_discord_id)
-    return to_server(server)
+        server = to_server(await bootstrap_server(server_discord_id))
+        SERVERS.put(server_discord_id, server)
+    return server
+
+
+@traced("game")
+async def get_or_create_servers(server_discord_ids: list[int]) -> list[Server]:
+    """
+    Get the servers with the given Discord IDs, creating any that don't exist yet, all at once
+    (like every server the bot is in, on startup).
+
+    Parameters
+    ----------
+    server_discord_ids: list[int]
+        The Discord IDs of the servers to get / create.
+
+    Returns
+    -------
+    list[Server]
+        The Servers with the given Discord IDs.
+    """
+
+    servers = [to_server(server) for server in await bootstrap_servers(server_discord_ids)]
+    for server in servers:
+        SERVERS.put(server.discord_id, server)
+    return servers
 
 
+@traced("game")
+async def set_command_tree_hash(server_discord_ids: list[int], command_tree_hash: str):
+    """
+    Record that the slash commands with the given hash were just synced to the servers with the given Discord IDs.
+
+    Parameters
+    ----------
+    server_discord_ids: list[int]
+        The Discord IDs of the servers the commands were synced to.
+
+    command_tree_hash: str
+        The hash of the synced commands.
+    """
+
+    await set_servers_command_tree_hash(server_discord_ids, command_tree_hash)
+    for server_discord_id in server_discord_ids:
+        SERVERS.invalidate(server_discord_id)
+
+
+@traced("game")
 async def get_event_channel(server_discord_id: int) -> Optional[int]:
     """
     Get the Discord ID of the event channel set for the given server.
@@ -45,7 +106,7 @@ async def get_event_channel(server_discord_id: int) -> Optional[int]:
         The Discord ID of the event channel set for the server, or None if not found.
     """
 
-    server = await get_server_by_discord_id(server_discord_id)
+    server = await SERVERS.get_or_load(server_discord_id, lambda: _load_server(server_discord_id))
     if server is None:
         return None
     if server.event_channel_discord_id is not None:
@@ -53,6 +114,7 @@ async def get_event_channel(server_discord_id: int) -> Optional[int]:
     return None
 
 
+@traced("game")
 async def set_event_channel(server_discord_id: int, event_channel_discord_id: int):
     """
     Set the Discord ID of the event channel for the given server.
@@ -67,3 +129,89 @@ async def set_event_channel(server_discord_id: int, event_channel_discord_id: in
     """
 
     await set_event_channel_discord_id(server_discord_id, event_channel_discord_id)
+
+
+@traced("game")
+async def set_day_schedule(server_discord_id: int, timezone: str, day_boundary_minute: int = 0) -> Server:
+    """
+    Set when the day changes for the given server: `day_boundary_minute` minutes after midnight in `timezone`.
+
+    Parameters
+    ----------
+    server_discord_id: int
+        The Discord ID of the server to set the day schedule of.
+
+    timezone: str
+        The IANA name of the server's timezone (like "Europe/Berlin").
+
+    day_boundary_minute: int, default: 0
+        How many minutes after local midnight the day changes, from 0 to 1439.
+
+    Returns
+    -------
+    Server
+        The server, with its new day schedule.
+
+    Raises
+    ------
+    InvalidDaySchedule
+        When the timezone isn't a known IANA timezone, or the day boundary isn't within a day.
+    """
+
+    if timezone not in available_timezones():
+        raise InvalidDaySchedule(f"'{timezone}' isn't a known timezone (like 'Europe/Berlin').")
+    if not 0 <= day_boundary_minute < 24 * 60:
+        raise InvalidDaySchedule(f"the day boundary must be between 00:00 and 23:59, not minute {day_boundary_minute}.")
+
+    await get_or_create_server(server_discord_id)
+    server = await set_server_day_schedule(server_discord_id, timezone, day_boundary_minute)
+    SERVERS.invalidate(server_discord_id)
+    return to_server(server)
+
+
+@traced("game")
+async def list_all_servers() -> list[Server]:
+    """
+    List every server.
+
+    Returns
+    -------
+    list[Server]
+        Every server, oldest first.
+    """
+
+    return [to_server(server) for server in await list_servers()]
+
+
+def get_next_day_change(timezone: str, day_boundary_minute: int, after: datetime) -> datetime:
+    """
+    Get when the day next changes on a day schedule (like a server's), after the given time.
+
+    Parameters
+    ----------
+    timezone: str
+        The IANA name of the timezone the day changes in.
+
+    day_boundary_minute: int
+        How many minutes after local midnight the day changes.
+
+    after: datetime
+        The (timezone aware) time to get the next day change after.
+
+    Returns
+    -------
+    datetime
+        The time of the next day change, in UTC.
+    """
+
+    zone = ZoneInfo(timezone)
+    boundary = time(day_boundary_minute // 60, day_boundary_minute % 60)
+    after = after.astimezone(dt_timezone.utc)
+
+    local_day = after.astimezone(zone).date()
+    while True:
+        # going through UTC resolves boundaries that fall in a DST gap or overlap
+        candidate = datetime.combine(local_day, boundary, tzinfo=zone).astimezone(dt_timezone.utc)
+        if candidate > after:
+            return candidate
+        local_day += timedelta(days=1)
@@ -1,18 +1,22 @@
 from typing import Optional
 from database import (
+    Cursor,
     list_vendors as db_list_vendors,
     list_vendor_pooch_stock,
+    list_vendor_pooch_stock_page,
+    count_vendor_pooch_stock,
     get_owner_by_discord_id,
     get_pooch_by_id as db_get_pooch_by_id,
-    remove_pooch_from_vendor_stock,
-    transfer_pooch_to_owner,
-    give_money_to_owner,
-    add_pooch_to_kennel,
+    purchase_pooch,
     list_kennels_for_owner,
     list_pooches_for_kennel,
 )
 
-from .model import Vendor, to_vendor, Pooch, to_pooch
+from rules import POOCH_BASE_PRICE
+
+from tracing import traced
+from .cache import OWNERS
+from .model import Vendor, to_vendor, Pooch, row_to_pooch, Owner, to_owner
 
 
 def get_pooch_price(pooch_id: int, vendor_id: Optional[int] = None) -> int:
@@ -35,9 +39,10 @@ def get_pooch_price(pooch_id: int, vendor_id: Optional[int] = None) -> int:
     """
 
     # TODO: real pricing logic
-    return 50
+    return POOCH_BASE_PRICE
 
 
+@traced("game")
 async def list_server_vendors(server_discord_id: int) -> list[Vendor]:
     """
     Get a list of every vendor on the given server.
@@ -57,6 +62,7 @@ async def list_server_vendors(server_discord_id: int) -> list[Vendor]:
     return [to_vendor(vendor) for vendor in vendors]
 
 
+@traced("game")
 async def list_vendor_pooches(vendor_id: int) -> list[Pooch]:
     """
     Get a list of the pooches being sold by the given vendor.
@@ -73,9 +79,55 @@ async def list_vendor_pooches(vendor_id: int) -> list[Pooch]:
     """
 
     pooches = await list_vendor_pooch_stock(vendor_id)
-    return [to_pooch(pooch) for pooch in pooches]
+    return [row_to_pooch(pooch) for pooch in pooches]
+
+
+@traced("game")
+async def list_vendor_pooches_page(vendor_id: int, limit: int, after: Optional[Cursor] = None) -> list[Pooch]:
+    """
+    Get one page of the pooches being sold by the given vendor.
+
+    Parameters
+    ----------
+    vendor_id: int
+        The ID of the vendor to get the pooches from.
+
+    limit: int
+        The maximum number of pooches to get.
+
+    after: Cursor, optional
+        The (created_at, id) of the last pooch on the previous page. Gets the first page if not given.
+
+    Returns
+    -------
+    list[Pooch]
+        At most `limit` pooches being sold by the given vendor, following the cursor.
+    """
+
+    pooches = await list_vendor_pooch_stock_page(vendor_id, limit, after)
+    return [row_to_pooch(pooch) for pooch in pooches]
 
 
+@traced("game")
+async def count_vendor_pooches(vendor_id: int) -> int:
+    """
+    Count the pooches being sold by the given vendor.
+
+    Parameters
+    ----------
+    vendor_id: int
+        The ID of the vendor to count the stock of.
+
+    Returns
+    -------
+    int
+        The number of pooches being sold by the given vendor.
+    """
+
+    return await count_vendor_pooch_stock(vendor_id)
+
+
+@traced("game")
 async def buy_pooch(
     owner_discord_id: int,
     vendor_id: int,
@@ -109,7 +161,11 @@ async def buy_pooch(
 
     price = get_pooch_price(pooch_id)
 
-    owner = await get_owner_by_discord_id(owner_discord_id)
+    async def load_owner() -> Optional[Owner]:
+        owner = await get_owner_by_discord_id(owner_discord_id)
+        return to_owner(owner) if owner is not None else None
+
+    owner = await OWNERS.get_or_load(owner_discord_id, load_owner)
     if owner is None:
         return (False, "You need to visit /home first to set up your account.")
     if owner.dollars < price:
@@ -130,12 +186,9 @@ async def buy_pooch(
     if target_kennel is None:
         return (False, "You don't have any kennel space available.")
 
-    removed = await remove_pooch_from_vendor_stock(vendor_id, pooch_id)
-    if removed is None:
+    owner = await purchase_pooch(owner_discord_id, vendor_id, pooch_id, target_kennel.id, price)
+    if owner is None:
         return (False, "That pooch is no longer available from this vendor.")
-
-    await give_money_to_owner(owner_discord_id, -price)
-    await transfer_pooch_to_owner(pooch_id, owner_discord_id)
-    await add_pooch_to_kennel(target_kennel.id, pooch_id)
+    OWNERS.put(owner_discord_id, to_owner(owner))
 
     return (True, f"You purchased {pooch.name} for ${price}!")
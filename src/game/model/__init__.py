@@ -1,13 +1,15 @@
 # Core models
 from .kennel import Kennel, to_kennel
 from .owner import Owner, to_owner
-from .pooch import Pooch, to_pooch
+from .pooch import Pooch, row_to_pooch, to_pooch
+from .pooch_batch import PoochBatch
 from .server import Server, to_server
 from .vendor import Vendor, to_vendor
 
 # Event models
 from .events.birth_event import BirthEvent
 from .events.day_change_summary import DayChangeSummary
+from .events.day_event import DayEvent, to_day_event
 from .events.death_event import DeathEvent
 
 __all__ = [
@@ -17,11 +19,15 @@ __all__ = [
     "to_owner",
     "Pooch",
     "to_pooch",
+    "row_to_pooch",
+    "PoochBatch",
     "Server",
     "to_server",
     "Vendor",
     "to_vendor",
     "BirthEvent",
     "DayChangeSummary",
+    "DayEvent",
+    "to_day_event",
     "DeathEvent",
 ]
@@ -5,7 +5,7 @@ from game.model.server import Server
 from game.model.pooch import Pooch
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BirthEvent:
     server: Server
     mother: Pooch
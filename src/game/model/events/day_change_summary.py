@@ -6,9 +6,10 @@ from game.model.server import Server
 from game.model.pooch import Pooch
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DayChangeSummary:
     server: Server
+    day: int
     births: list[BirthEvent]
     deaths: list[DeathEvent]
 
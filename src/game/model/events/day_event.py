@@ -0,0 +1,47 @@
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+from database.models import DayEvent as DayEventORM
+
+
+@dataclass(frozen=True, slots=True)
+class DayEvent:
+    id: int
+    day: int
+    server_discord_id: int
+    kind: str
+
+    pooch_id: int
+    pooch_name: str
+    other_pooch_id: Optional[int]
+    other_pooch_name: Optional[str]
+    detail: Optional[str]
+
+
+def to_day_event(event: DayEventORM) -> DayEvent:
+    """
+    Convert an ORM DayEvent object to a game DayEvent object.
+
+    Parameters
+    ----------
+    event: DayEvent
+        The DayEvent object to convert.
+
+    Returns
+    -------
+    DayEvent
+        The converted DayEvent dataclass object.
+    """
+
+    return DayEvent(
+        id=event.id,
+        day=event.day,
+        server_discord_id=event.server_discord_id,
+        kind=sys.intern(event.kind),
+        pooch_id=event.pooch_id,
+        pooch_name=sys.intern(event.pooch_name),
+        other_pooch_id=event.other_pooch_id,
+        other_pooch_name=sys.intern(event.other_pooch_name) if event.other_pooch_name is not None else None,
+        detail=event.detail,
+    )
@@ -4,7 +4,7 @@ from game.model.server import Server
 from game.model.pooch import Pooch
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DeathEvent:
     server: Server
     pooch: Pooch
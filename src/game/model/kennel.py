@@ -1,14 +1,17 @@
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
 
 from database.models import Kennel as KennelORM
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Kennel:
     id: int
     owner_discord_id: int
     name: str
     pooch_limit: int
+    created_at: Optional[datetime]
 
 
 def to_kennel(kennel: KennelORM) -> Kennel:
@@ -31,4 +34,5 @@ def to_kennel(kennel: KennelORM) -> Kennel:
         owner_discord_id=kennel.owner_discord_id,
         name=kennel.name,
         pooch_limit=kennel.pooch_limit,
+        created_at=kennel.created_at,
     )
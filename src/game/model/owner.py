@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from database.models import Owner as OwnerORM
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Owner:
     discord_id: int
     dollars: int
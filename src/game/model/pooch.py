@@ -1,19 +1,29 @@
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
-from database.models import Pooch as PoochORM
+from database.projections import PoochRow
+from database.models import ArchivedPooch as ArchivedPoochORM, Pooch as PoochORM
 
+# Pooches with this much total health or less are shown as unhealthy.
+UNHEALTHY_HEALTH = 3  # TODO
 
-@dataclass(frozen=True)
+# Pooches this old or older are shown as old.
+OLD_AGE = 12  # TODO
+
+
+@dataclass(frozen=True, slots=True)
 class Pooch:
     id: int
     name: str
-    age: int
     sex: str
 
+    birth_day: int
     base_health: int
-    health_loss_age: int
+    health_loss_start_day: int
+    cooldown_ready_day: int
+    as_of_day: int  # the world day when this pooch was loaded, or the day it died
     alive: bool
     owner_discord_id: Optional[int]
     created_at: Optional[datetime]
@@ -22,6 +32,18 @@ class Pooch:
     def birthday(self) -> Optional[datetime]:
         return self.created_at
 
+    @property
+    def age(self) -> int:
+        return self.as_of_day - self.birth_day
+
+    @property
+    def health_loss_age(self) -> int:
+        return max(self.as_of_day - self.health_loss_start_day, 0)
+
+    @property
+    def breeding_cooldown(self) -> int:
+        return max(self.cooldown_ready_day - self.as_of_day, 0)
+
     @property
     def health(self) -> int:
         return max(int(self.base_health) - int(self.health_loss_age), 0)
@@ -30,20 +52,20 @@ class Pooch:
     def status(self) -> str:
         if not self.alive:
             return "dead"
-        elif self.health <= 3:
+        elif self.health <= UNHEALTHY_HEALTH:
             return "unhealthy"
-        elif self.age >= 12:
+        elif self.age >= OLD_AGE:
             return "old"
         return "healthy"
 
 
-def to_pooch(pooch: PoochORM) -> Pooch:
+def to_pooch(pooch: PoochORM | ArchivedPoochORM) -> Pooch:
     """
-    Convert an ORM Pooch object to a game Pooch object.
+    Convert an ORM Pooch (or ArchivedPooch) object to a game Pooch object.
 
     Parameters
     ----------
-    pooch: Pooch
+    pooch: Pooch | ArchivedPooch
         The Pooch object to convert.
 
     Returns
@@ -54,12 +76,33 @@ def to_pooch(pooch: PoochORM) -> Pooch:
 
     return Pooch(
         id=pooch.id,
-        name=pooch.name,
-        age=pooch.age,
-        sex=pooch.sex,
+        name=sys.intern(pooch.name),
+        sex=sys.intern(pooch.sex),
+        birth_day=pooch.birth_day,
         base_health=pooch.base_health,
-        health_loss_age=pooch.health_loss_age,
+        health_loss_start_day=pooch.health_loss_start_day,
+        cooldown_ready_day=pooch.cooldown_ready_day,
+        as_of_day=pooch.as_of_day,
         alive=pooch.alive,
         owner_discord_id=pooch.owner_discord_id,
         created_at=pooch.created_at,
     )
+
+
+def row_to_pooch(row: PoochRow) -> Pooch:
+    """
+    Convert a pooch row (from a read path that selects just the columns it needs) to a game Pooch object.
+
+    Parameters
+    ----------
+    row: PoochRow
+        The row to convert. Its fields are in the same order as Pooch's.
+
+    Returns
+    -------
+    Pooch
+        The converted Pooch dataclass object.
+    """
+
+    id, name, sex, *rest = row
+    return Pooch(id, sys.intern(name), sys.intern(sex), *rest)
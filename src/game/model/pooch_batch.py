@@ -0,0 +1,163 @@
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterator, Sequence, overload
+
+import numpy as np
+
+from database.projections import PoochRow
+
+from .pooch import OLD_AGE, UNHEALTHY_HEALTH, Pooch
+
+# Stands in for a missing owner in `PoochBatch.owner_discord_id`. No Discord ID is 0.
+NO_OWNER = 0
+
+
+@dataclass(frozen=True, slots=True)
+class PoochBatch:
+    """
+    Many pooches held as one NumPy array per field (a struct of arrays, like `simulation.World`),
+    for result sets too big to hold as a list of `Pooch`. Element `i` of every array is the same pooch.
+
+    Indexing with an int gives a `Pooch`. Slicing gives a batch of views into the same arrays, so paging copies nothing.
+    Indexing with a boolean mask or an array of indices gives a batch of copies (NumPy fancy indexing always copies).
+    Derived fields (`age`, `health`, `status`, ...) are computed for the whole batch at once.
+    """
+
+    id: np.ndarray  # int64
+    name: np.ndarray  # object (interned str)
+    female: np.ndarray  # bool
+    birth_day: np.ndarray  # int32
+    base_health: np.ndarray  # int32
+    health_loss_start_day: np.ndarray  # int32
+    cooldown_ready_day: np.ndarray  # int32
+    as_of_day: np.ndarray  # int32
+    alive: np.ndarray  # bool
+    owner_discord_id: np.ndarray  # int64 (NO_OWNER if unowned)
+    created_at: np.ndarray  # datetime64[us] (UTC, NaT if unknown)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[PoochRow]) -> PoochBatch:
+        """
+        Build a batch from pooch rows, like the ones the database's pooch list functions return.
+
+        Parameters
+        ----------
+        rows: Sequence[PoochRow]
+            The rows to build the batch from, in the order they should be in the batch.
+
+        Returns
+        -------
+        PoochBatch
+            The pooches in the rows.
+        """
+
+        # transpose the rows into columns, in the order of the fields of PoochRow
+        (
+            id,
+            name,
+            sex,
+            birth_day,
+            base_health,
+            health_loss_start_day,
+            cooldown_ready_day,
+            as_of_day,
+            alive,
+            owner_discord_id,
+            created_at,
+        ) = tuple(zip(*rows)) or ((),) * len(PoochRow._fields)
+
+        return cls(
+            id=np.array(id, dtype=np.int64),
+            name=np.array([sys.intern(n) for n in name], dtype=object),
+            female=np.array([s == "female" for s in sex], dtype=bool),
+            birth_day=np.array(birth_day, dtype=np.int32),
+            base_health=np.array(base_health, dtype=np.int32),
+            health_loss_start_day=np.array(health_loss_start_day, dtype=np.int32),
+            cooldown_ready_day=np.array(cooldown_ready_day, dtype=np.int32),
+            as_of_day=np.array(as_of_day, dtype=np.int32),
+            alive=np.array(alive, dtype=bool),
+            owner_discord_id=np.array([NO_OWNER if o is None else o for o in owner_discord_id], dtype=np.int64),
+            created_at=np.array(
+                [c.astimezone(timezone.utc).replace(tzinfo=None) if c is not None else None for c in created_at],
+                dtype="datetime64[us]",
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    @overload
+    def __getitem__(self, key: int) -> Pooch: ...
+
+    @overload
+    def __getitem__(self, key: slice | np.ndarray) -> PoochBatch: ...
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self._pooch(int(key))
+
+        return PoochBatch(
+            id=self.id[key],
+            name=self.name[key],
+            female=self.female[key],
+            birth_day=self.birth_day[key],
+            base_health=self.base_health[key],
+            health_loss_start_day=self.health_loss_start_day[key],
+            cooldown_ready_day=self.cooldown_ready_day[key],
+            as_of_day=self.as_of_day[key],
+            alive=self.alive[key],
+            owner_discord_id=self.owner_discord_id[key],
+            created_at=self.created_at[key],
+        )
+
+    def __iter__(self) -> Iterator[Pooch]:
+        return (self._pooch(i) for i in range(len(self)))
+
+    def _pooch(self, i: int) -> Pooch:
+        created_at = self.created_at[i]
+        owner_discord_id = int(self.owner_discord_id[i])
+        return Pooch(
+            id=int(self.id[i]),
+            name=self.name[i],
+            sex="female" if self.female[i] else "male",
+            birth_day=int(self.birth_day[i]),
+            base_health=int(self.base_health[i]),
+            health_loss_start_day=int(self.health_loss_start_day[i]),
+            cooldown_ready_day=int(self.cooldown_ready_day[i]),
+            as_of_day=int(self.as_of_day[i]),
+            alive=bool(self.alive[i]),
+            owner_discord_id=owner_discord_id if owner_discord_id != NO_OWNER else None,
+            created_at=(None if np.isnat(created_at) else created_at.astype(datetime).replace(tzinfo=timezone.utc)),
+        )
+
+    @property
+    def age(self) -> np.ndarray:
+        return self.as_of_day - self.birth_day
+
+    @property
+    def health_loss_age(self) -> np.ndarray:
+        return np.maximum(self.as_of_day - self.health_loss_start_day, 0)
+
+    @property
+    def breeding_cooldown(self) -> np.ndarray:
+        return np.maximum(self.cooldown_ready_day - self.as_of_day, 0)
+
+    @property
+    def health(self) -> np.ndarray:
+        return np.maximum(self.base_health - self.health_loss_age, 0)
+
+    @property
+    def status(self) -> np.ndarray:
+        """The status of every pooch, like `Pooch.status`."""
+
+        return np.select(
+            [~self.alive, self.health <= UNHEALTHY_HEALTH, self.age >= OLD_AGE],
+            ["dead", "unhealthy", "old"],
+            default="healthy",
+        )
+
+    def to_pooches(self) -> list[Pooch]:
+        """Convert every pooch in the batch to a `Pooch`."""
+
+        return list(self)
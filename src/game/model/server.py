@@ -1,12 +1,18 @@
 from dataclasses import dataclass
+from typing import Optional
 
 from database.models import Server as ServerORM
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Server:
     discord_id: int
     event_channel_discord_id: int
+    timezone: str
+    day_boundary_minute: int
+    command_tree_hash: Optional[str]
+    # the world day of the last day change the server had
+    last_day_change_day: Optional[int]
 
 
 def to_server(server: ServerORM) -> Server:
@@ -27,4 +33,8 @@ def to_server(server: ServerORM) -> Server:
     return Server(
         discord_id=server.discord_id,
         event_channel_discord_id=server.event_channel_discord_id,
+        timezone=server.timezone,
+        day_boundary_minute=server.day_boundary_minute,
+        command_tree_hash=server.command_tree_hash,
+        last_day_change_day=server.last_day_change_day,
     )
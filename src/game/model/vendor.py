@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from database.models import Vendor as VendorORM
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Vendor:
     id: int
     server_discord_id: int
@@ -0,0 +1,292 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from database import add_invalidation_listener, list_mutations, ALL_TABLES
+from database.models import Mutation as MutationORM
+
+from tracing import traced
+from .exceptions.invalid_mutation_options import InvalidMutationOptions
+
+ON_DEATH_EFFECTS = ("kill", "spread", "spread_all")
+ON_DEATH_TARGETS = ("none", "all", "random")
+
+# The placeholders each message option can use (see Documentation/Advanced Mutation Impact List.md).
+_MESSAGE_PLACEHOLDERS = {"death_message": {"pooch"}, "kill_message": {"pooch", "victim"}}
+_PLACEHOLDER = re.compile(r"\[([^\[\]]*)\]")
+
+
+@dataclass(frozen=True, slots=True)
+class MutationEffects:
+    """
+    The compiled advanced options of a single mutation, with every default filled in.
+    See `Documentation/Advanced Mutation Impact List.md` for what each one does.
+    """
+
+    mutation_id: int
+    name: str
+
+    breeding_cooldown: int = 0
+
+    death_message: Optional[str] = None
+    kill_message: Optional[str] = None
+    on_death: Optional[str] = None
+    on_death_chance: float = 100.0
+    always_on_death: bool = False
+    on_death_targets: str = "none"
+
+    incompatible_mutation_ids: frozenset[int] = frozenset()
+
+    bloodskull_value_add: float = 0.0
+    bloodskull_value_mult: float = 1.0
+    dollar_value_add: float = 0.0
+    dollar_value_mult: float = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class MutationEffectTables:
+    """
+    Every mutation's compiled effects, looked up by mutation ID,
+    plus the IDs of the mutations with each kind of effect so engines can skip the rest.
+    """
+
+    by_id: dict[int, MutationEffects]
+
+    # `{ on_death effect : IDs of the mutations with it }`, for every effect in ON_DEATH_EFFECTS
+    on_death_ids: dict[str, frozenset[int]]
+    breeding_cooldown_ids: frozenset[int]
+    death_message_ids: frozenset[int]
+    incompatibility_ids: frozenset[int]
+    value_modifier_ids: frozenset[int]
+
+    def get(self, mutation_id: int) -> Optional[MutationEffects]:
+        return self.by_id.get(mutation_id)
+
+    def breeding_cooldown(self, mutation_ids: Iterable[int]) -> int:
+        """Get the total breeding cooldown change the given mutations cause."""
+
+        return sum(
+            self.by_id[mutation_id].breeding_cooldown
+            for mutation_id in mutation_ids
+            if mutation_id in self.breeding_cooldown_ids
+        )
+
+    def incompatible_mutation_ids(self, mutation_ids: Iterable[int]) -> frozenset[int]:
+        """Get the IDs of every mutation a pooch with the given mutations can't get."""
+
+        return frozenset().union(
+            *(
+                self.by_id[mutation_id].incompatible_mutation_ids
+                for mutation_id in mutation_ids
+                if mutation_id in self.incompatibility_ids
+            )
+        )
+
+    def dollar_value(self, base_value: float, mutation_ids: Iterable[int]) -> float:
+        """Apply the dollar value modifiers of the given mutations to a base value (additions, then multipliers)."""
+
+        effects = [self.by_id[mutation_id] for mutation_id in mutation_ids if mutation_id in self.value_modifier_ids]
+        value = base_value + sum(effect.dollar_value_add for effect in effects)
+        for effect in effects:
+            value *= effect.dollar_value_mult
+        return value
+
+    def bloodskull_value(self, base_value: float, mutation_ids: Iterable[int]) -> float:
+        """Apply the bloodskull value modifiers of the given mutations to a base value (additions, then multipliers)."""
+
+        effects = [self.by_id[mutation_id] for mutation_id in mutation_ids if mutation_id in self.value_modifier_ids]
+        value = base_value + sum(effect.bloodskull_value_add for effect in effects)
+        for effect in effects:
+            value *= effect.bloodskull_value_mult
+        return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _compile_options(
+    mutation: MutationORM, ids_by_name: dict[str, int], ids_by_category: dict[str, list[int]], errors: list[str]
+) -> MutationEffects:
+    """Compile the advanced options of one mutation, appending a description of every problem to `errors`."""
+
+    options = mutation.advanced_options or {}
+    fields: dict[str, Any] = {}
+
+    def error(key: str, problem: str):
+        errors.append(f"{mutation.name}: '{key}' {problem}")
+
+    if not isinstance(options, dict):
+        errors.append(f"{mutation.name}: advanced_options must be an object, not {type(options).__name__}")
+        return MutationEffects(mutation_id=mutation.id, name=mutation.name)
+
+    for key, value in options.items():
+        match key:
+            case "breeding_cooldown":
+                if isinstance(value, int) and not isinstance(value, bool):
+                    fields[key] = value
+                else:
+                    error(key, f"must be a whole number of days, not {value!r}")
+
+            case "death_message" | "kill_message":
+                if not isinstance(value, str):
+                    error(key, f"must be a string, not {value!r}")
+                    continue
+                unknown = set(_PLACEHOLDER.findall(value)) - _MESSAGE_PLACEHOLDERS[key]
+                if unknown:
+                    used = ", ".join(f"[{name}]" for name in sorted(unknown))
+                    allowed = ", ".join(f"[{name}]" for name in sorted(_MESSAGE_PLACEHOLDERS[key]))
+                    error(key, f"uses unknown placeholder(s) {used} (it can use {allowed})")
+                    continue
+                fields[key] = value
+
+            case "on_death":
+                if value in ON_DEATH_EFFECTS:
+                    fields[key] = value
+                else:
+                    error(key, f"must be one of {', '.join(ON_DEATH_EFFECTS)}, not {value!r}")
+
+            case "on_death_chance":
+                if _is_number(value) and 0 <= value <= 100:
+                    fields[key] = float(value)
+                else:
+                    error(key, f"must be a percent between 0 and 100, not {value!r}")
+
+            case "always_on_death":
+                if _is_number(value) or isinstance(value, bool):
+                    fields[key] = value != 0
+                else:
+                    error(key, f"must be 0 or 1, not {value!r}")
+
+            case "on_death_targets":
+                if value in ON_DEATH_TARGETS:
+                    fields[key] = value
+                else:
+                    error(key, f"must be one of {', '.join(ON_DEATH_TARGETS)}, not {value!r}")
+
+            case "incompatible_mutations":
+                if not isinstance(value, list) or not all(isinstance(target, str) for target in value):
+                    error(key, f"must be a list of mutation names or categories, not {value!r}")
+                    continue
+                incompatible: set[int] = set()
+                for target in value:
+                    if target in ids_by_name:
+                        incompatible.add(ids_by_name[target])
+                    elif target in ids_by_category:
+                        incompatible.update(ids_by_category[target])
+                    else:
+                        error(key, f"lists '{target}', which isn't a mutation name or category")
+                incompatible.discard(mutation.id)
+                fields["incompatible_mutation_ids"] = frozenset(incompatible)
+
+            case "bloodskull_value_add" | "dollar_value_add":
+                if _is_number(value):
+                    fields[key] = float(value)
+                else:
+                    error(key, f"must be a number, not {value!r}")
+
+            case "bloodskull_value_mult" | "dollar_value_mult":
+                if _is_number(value) and value >= 0:
+                    fields[key] = float(value)
+                else:
+                    error(key, f"must be a number of at least 0, not {value!r}")
+
+            case _:
+                error(key, "isn't a known option (see Documentation/Advanced Mutation Impact List.md)")
+
+    # options that only mean something alongside an on_death effect
+    if "on_death" not in fields and "on_death" not in options:
+        for key in ("kill_message", "on_death_chance", "always_on_death", "on_death_targets"):
+            if key in options:
+                error(key, "has no effect without an 'on_death' effect")
+    elif fields.get("on_death") not in (None, "kill") and "kill_message" in options:
+        error("kill_message", "only applies to an 'on_death' effect of 'kill'")
+
+    return MutationEffects(mutation_id=mutation.id, name=mutation.name, **fields)
+
+
+def compile_mutation_effects(mutations: list[MutationORM]) -> MutationEffectTables:
+    """
+    Validate and compile the advanced options of every mutation into lookup tables.
+
+    Parameters
+    ----------
+    mutations: list[Mutation]
+        Every mutation, as ORM objects. Incompatibilities can only name mutations (or categories) in this list.
+
+    Returns
+    -------
+    MutationEffectTables
+        The compiled effects of every mutation.
+
+    Raises
+    ------
+    InvalidMutationOptions
+        If any mutation has an unknown option, an option with a bad value, or an incompatibility with a mutation or
+        category that doesn't exist. Every problem across every mutation is reported at once.
+    """
+
+    ids_by_name = {mutation.name: mutation.id for mutation in mutations}
+    ids_by_category: dict[str, list[int]] = {}
+    for mutation in mutations:
+        ids_by_category.setdefault(mutation.category, []).append(mutation.id)
+
+    errors: list[str] = []
+    by_id = {mutation.id: _compile_options(mutation, ids_by_name, ids_by_category, errors) for mutation in mutations}
+    if errors:
+        raise InvalidMutationOptions(errors)
+
+    effects = by_id.values()
+    return MutationEffectTables(
+        by_id=by_id,
+        on_death_ids={
+            on_death: frozenset(effect.mutation_id for effect in effects if effect.on_death == on_death)
+            for on_death in ON_DEATH_EFFECTS
+        },
+        breeding_cooldown_ids=frozenset(effect.mutation_id for effect in effects if effect.breeding_cooldown),
+        death_message_ids=frozenset(effect.mutation_id for effect in effects if effect.death_message is not None),
+        incompatibility_ids=frozenset(effect.mutation_id for effect in effects if effect.incompatible_mutation_ids),
+        value_modifier_ids=frozenset(
+            effect.mutation_id
+            for effect in effects
+            if effect.bloodskull_value_add
+            or effect.bloodskull_value_mult != 1
+            or effect.dollar_value_add
+            or effect.dollar_value_mult != 1
+        ),
+    )
+
+
+_TABLES: Optional[MutationEffectTables] = None
+
+
+@traced("game")
+async def get_mutation_effects() -> MutationEffectTables:
+    """
+    Get the compiled effects of every mutation, compiling them from the database the first time
+    (and again whenever the mutations table changes).
+
+    Returns
+    -------
+    MutationEffectTables
+        The compiled effects of every mutation.
+
+    Raises
+    ------
+    InvalidMutationOptions
+        If any mutation's advanced options are invalid.
+    """
+
+    global _TABLES
+    if _TABLES is None:
+        _TABLES = compile_mutation_effects(await list_mutations())
+    return _TABLES
+
+
+def _on_invalidation(table: str, key: Optional[Any]):
+    global _TABLES
+    if table in (ALL_TABLES, MutationORM.__tablename__):
+        _TABLES = None
+
+
+add_invalidation_listener(_on_invalidation)
@@ -0,0 +1,333 @@
+# An in-process metrics registry (counters, gauges and histograms), exported in the Prometheus text format.
+#
+# Metrics are made once at import time (like loggers) and updated in place, so recording on a hot path is a dict lookup
+# for the labels and an add. Anything that's cheaper to read when scraped than to keep up to date (like pool or cache
+# stats) is read from a function instead (see `set_function`). Everything runs on the event loop, so nothing here
+# takes a lock.
+
+import asyncio
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from logger import get_logger
+
+log = get_logger("metrics")
+
+# The latency buckets (in seconds) histograms use unless they're given their own.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Where the metrics endpoint listens by default. Only on localhost, since it's meant to be scraped by a local agent.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9108
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """A metric with zero or more labels. Each distinct set of label values gets its own child holding the value."""
+
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._children: dict[tuple[str, ...], _Metric] = {}
+        self._label_values: tuple[str, ...] = ()
+
+    def labels(self, *values: str):
+        """Get the child for the given label values (in the order the labels were declared), making it if needed."""
+
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}, not {values}")
+            child = self._make_child()
+            child._label_values = tuple(str(value) for value in values)
+            self._children[values] = child
+        return child
+
+    def _make_child(self) -> _Metric:
+        raise NotImplementedError
+
+    def _samples(self) -> Iterator[tuple[str, tuple[str, ...], str, float]]:
+        """Yield (suffix, label values, extra label, value) for every sample of this child."""
+
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        children = self._children.values() if self.label_names else (self,)
+        for child in children:
+            for suffix, values, extra, value in child._samples():
+                labels = _format_labels(self.label_names, values, extra)
+                lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class _Value(_Metric):
+    """A metric with a single number per child, which can be read from a function when scraped instead."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from the given function whenever the metrics are scraped."""
+
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        return self._function() if self._function is not None else self._value
+
+    def _make_child(self) -> _Value:
+        return type(self)(self.name, self.help)
+
+    def _samples(self) -> Iterator[tuple[str, tuple[str, ...], str, float]]:
+        yield ("", self._label_values, "", self.value)
+
+
+class Counter(_Value):
+    """A number that only goes up, like the number of pooches born."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1):
+        self._value += amount
+
+
+class Gauge(_Value):
+    """A number that goes up and down, like the number of connections checked out of the pool."""
+
+    type = "gauge"
+
+    def set(self, value: float):
+        self._value = value
+
+    def inc(self, amount: float = 1):
+        self._value += amount
+
+    def dec(self, amount: float = 1):
+        self._value -= amount
+
+
+class Histogram(_Metric):
+    """The distribution of a measurement (usually a latency, in seconds) over fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # the last one is the +Inf bucket
+        self._sum = 0.0
+
+    def observe(self, value: float):
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self._sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe how long the body of a `with` block takes, in seconds (whether or not it raises)."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def _make_child(self) -> Histogram:
+        return Histogram(self.name, self.help, buckets=self.buckets)
+
+    def _samples(self) -> Iterator[tuple[str, tuple[str, ...], str, float]]:
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), self._counts):
+            cumulative += count
+            yield ("_bucket", self._label_values, f'le="{_format_value(bound)}"', cumulative)
+        yield ("_sum", self._label_values, "", self._sum)
+        yield ("_count", self._label_values, "", cumulative)
+
+
+class Registry:
+    """Every metric to export, by name."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _get_or_make(self, kind: type[_Metric], name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = kind(name, *args, **kwargs)
+        elif not isinstance(metric, kind):
+            raise ValueError(f"{name} is already a {metric.type}")
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._get_or_make(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_make(Gauge, name, help, labels)
+
+    def histogram(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_make(Histogram, name, help, labels, buckets)
+
+    def render(self) -> str:
+        """Export every metric in the Prometheus text format."""
+
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# The registry every part of the bot records its metrics in.
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+    """
+    Get (or make) a counter in the shared registry.
+
+    Parameters
+    ----------
+    name: str
+        The name of the counter. By Prometheus convention, counters end in `_total`.
+
+    help: str
+        What the counter counts.
+
+    labels: tuple[str, ...], default: ()
+        The names of the counter's labels.
+
+    Returns
+    -------
+    Counter
+        The counter with the given name.
+    """
+
+    return REGISTRY.counter(name, help, labels)
+
+
+def gauge(name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+    """
+    Get (or make) a gauge in the shared registry.
+
+    Parameters
+    ----------
+    name: str
+        The name of the gauge.
+
+    help: str
+        What the gauge measures.
+
+    labels: tuple[str, ...], default: ()
+        The names of the gauge's labels.
+
+    Returns
+    -------
+    Gauge
+        The gauge with the given name.
+    """
+
+    return REGISTRY.gauge(name, help, labels)
+
+
+def histogram(
+    name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+) -> Histogram:
+    """
+    Get (or make) a histogram in the shared registry.
+
+    Parameters
+    ----------
+    name: str
+        The name of the histogram. By Prometheus convention, it ends in the unit (like `_seconds`).
+
+    help: str
+        What the histogram measures.
+
+    labels: tuple[str, ...], default: ()
+        The names of the histogram's labels.
+
+    buckets: tuple[float, ...], default: DEFAULT_BUCKETS
+        The upper bounds of the histogram's buckets.
+
+    Returns
+    -------
+    Histogram
+        The histogram with the given name.
+    """
+
+    return REGISTRY.histogram(name, help, labels, buckets)
+
+
+async def _handle_scrape(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = await reader.readline()
+        # skip the headers, nothing in them changes the response
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+
+        parts = request_line.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] in ("/", "/metrics"):
+            status, content_type, body = "200 OK", "text/plain; version=0.0.4; charset=utf-8", REGISTRY.render()
+        else:
+            status, content_type, body = "404 Not Found", "text/plain; charset=utf-8", "Not Found\n"
+
+        payload = body.encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1") + payload
+        )
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+    """
+    Serve the shared registry in the Prometheus text format at `http://host:port/metrics`, on the running event loop.
+
+    Parameters
+    ----------
+    host: str, default: DEFAULT_HOST
+        The address to listen on.
+
+    port: int, default: DEFAULT_PORT
+        The port to listen on.
+
+    Returns
+    -------
+    asyncio.Server
+        The running server. Close it to stop serving.
+    """
+
+    server = await asyncio.start_server(_handle_scrape, host, port)
+    log.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,273 @@
+# An opt-in sampling profiler for slow interactions and day changes.
+#
+# While a profiled call runs, a background thread samples the event loop thread's stack every few milliseconds,
+# and every SQL statement sent is recorded. If the call took longer than its latency budget, both are saved to disk:
+# `<name>.folded` (collapsed stacks, for flamegraph tools) and `<name>.json` (the statements, with their durations).
+# Captures that come in under budget are thrown away.
+#
+# Concurrent calls share the sampler and the statement log, so a capture can include samples and statements from
+# whatever else was running at the same time.
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from logger import get_logger
+
+log = get_logger("profiling")
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# How often the event loop thread's stack is sampled while a call is being profiled.
+SAMPLE_INTERVAL_SECONDS = 0.005  # TODO
+
+# The most statements kept per capture, so a runaway loop can't use up all the memory.
+MAX_STATEMENTS = 5000  # TODO
+
+# Where profiles are saved unless configured otherwise.
+DEFAULT_DIRECTORY = "profiles"
+
+
+@dataclass
+class _Capture:
+    name: str
+    budget: Optional[float]
+    forced: bool
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    samples: Counter[str] = field(default_factory=Counter)
+    statements: list[dict[str, Any]] = field(default_factory=list)
+
+
+# The latency budget in seconds of each kind of call (like "interaction" or "tick"). Kinds without one are only
+# profiled when asked for with `profile_next`.
+_BUDGETS: dict[str, float] = {}
+_DIRECTORY = Path(DEFAULT_DIRECTORY)
+
+# Names of the calls to profile the next time they run, regardless of the budget.
+_REQUESTED: set[str] = set()
+
+_ACTIVE: list[_Capture] = []
+_LOCK = threading.Lock()
+# Set to stop the running sampler thread, if there is one.
+_SAMPLER_STOP: Optional[threading.Event] = None
+_LISTENING = False
+
+
+def configure(budgets: dict[str, float], directory: str = DEFAULT_DIRECTORY):
+    """
+    Set the latency budgets calls are profiled against.
+
+    Parameters
+    ----------
+    budgets: dict[str, float]
+        The latency budget in seconds of each kind of call, like `{ "interaction": 1.0 }`. Calls that take longer are
+        saved. Kinds left out are only profiled when asked for with `profile_next`.
+
+    directory: str, default: DEFAULT_DIRECTORY
+        The directory to save profiles to. Made if it doesn't exist.
+    """
+
+    global _BUDGETS, _DIRECTORY
+    _BUDGETS = dict(budgets)
+    _DIRECTORY = Path(directory)
+
+
+def configure_from_env():
+    """
+    Configure profiling from the environment: PROFILE_BUDGET_MS (interactions), PROFILE_TICK_BUDGET_MS (day changes)
+    and PROFILE_DIR. Nothing is profiled against a budget that isn't set.
+    """
+
+    budgets = {}
+    for kind, variable in (("interaction", "PROFILE_BUDGET_MS"), ("tick", "PROFILE_TICK_BUDGET_MS")):
+        if value := os.getenv(variable):
+            budgets[kind] = float(value) / 1000
+    configure(budgets, os.getenv("PROFILE_DIR", DEFAULT_DIRECTORY))
+
+
+def profile_next(name: str):
+    """
+    Profile the next call with the given name, however long it takes.
+
+    Parameters
+    ----------
+    name: str
+        The name the call is profiled under (like "run_day_change").
+    """
+
+    _REQUESTED.add(name)
+
+
+def _fold(frame) -> str:
+    """Collapse a stack into one `root;...;leaf` line, in the format flamegraph tools read."""
+
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _sample(thread_id: int, stop: threading.Event):
+    while not stop.wait(SAMPLE_INTERVAL_SECONDS):
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            continue
+        stack = _fold(frame)
+        with _LOCK:
+            for capture in _ACTIVE:
+                capture.samples[stack] += 1
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("profiling_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("profiling_started_at")
+    duration = time.perf_counter() - started.pop() if started else None
+    if not _ACTIVE:
+        return
+
+    record = {"statement": statement, "parameters": repr(parameters)[:500], "seconds": duration}
+    with _LOCK:
+        for capture in _ACTIVE:
+            if len(capture.statements) < MAX_STATEMENTS:
+                capture.statements.append(record)
+
+
+def _start(capture: _Capture):
+    global _SAMPLER_STOP, _LISTENING
+
+    if not _LISTENING:
+        # listening on the Engine class covers every engine, without making one just to listen on it
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _LISTENING = True
+
+    with _LOCK:
+        _ACTIVE.append(capture)
+        if _SAMPLER_STOP is None:
+            # sample the thread the captures are started from, which is the one running the event loop
+            _SAMPLER_STOP = threading.Event()
+            threading.Thread(
+                target=_sample, args=(threading.get_ident(), _SAMPLER_STOP), name="profiling-sampler", daemon=True
+            ).start()
+
+
+def _stop(capture: _Capture):
+    global _SAMPLER_STOP
+
+    with _LOCK:
+        _ACTIVE.remove(capture)
+        if not _ACTIVE and _SAMPLER_STOP is not None:
+            _SAMPLER_STOP.set()
+            _SAMPLER_STOP = None
+
+
+def _save(capture: _Capture, seconds: float) -> Path:
+    _DIRECTORY.mkdir(parents=True, exist_ok=True)
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in capture.name)
+    stem = _DIRECTORY / f"{capture.started_at:%Y%m%dT%H%M%S%f}_{safe_name}"
+
+    with open(stem.with_suffix(".folded"), "w") as file:
+        for stack, count in capture.samples.most_common():
+            file.write(f"{stack} {count}\n")
+
+    with open(stem.with_suffix(".json"), "w") as file:
+        json.dump(
+            {
+                "name": capture.name,
+                "started_at": capture.started_at.isoformat(),
+                "seconds": seconds,
+                "budget_seconds": capture.budget,
+                "forced": capture.forced,
+                "sample_interval_seconds": SAMPLE_INTERVAL_SECONDS,
+                "samples": sum(capture.samples.values()),
+                "statements": capture.statements,
+            },
+            file,
+            indent=2,
+        )
+
+    return stem
+
+
+@contextmanager
+def profiled(name: str, kind: str) -> Iterator[None]:
+    """
+    Profile the body of a `with` block, and save the profile if it takes longer than the budget for its kind
+    (or if it was asked for with `profile_next`). Does nothing if neither applies.
+
+    Parameters
+    ----------
+    name: str
+        The name to profile the block under, and to save its profile with.
+
+    kind: str
+        The kind of call the block is (like "interaction" or "tick"), to pick its budget by.
+    """
+
+    budget = _BUDGETS.get(kind)
+    forced = name in _REQUESTED
+    if budget is None and not forced:
+        yield
+        return
+
+    _REQUESTED.discard(name)
+    capture = _Capture(name=name, budget=budget, forced=forced)
+    _start(capture)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        _stop(capture)
+        if forced or (budget is not None and seconds > budget):
+            try:
+                stem = _save(capture, seconds)
+                log.warning(f"{name} took {seconds * 1000:.0f} ms. Saved its profile to {stem}.(folded|json)")
+            except OSError:
+                log.exception(f"Couldn't save the profile of {name}")
+
+
+def profile_if_slow(name: str, kind: str) -> Callable[[F], F]:
+    """
+    Decorate an async function so every call to it is `profiled` under the given name.
+
+    Parameters
+    ----------
+    name: str
+        The name to profile the calls under.
+
+    kind: str
+        The kind of call it is (like "interaction" or "tick"), to pick its budget by.
+
+    Returns
+    -------
+    Callable[[F], F]
+        The decorator.
+    """
+
+    def decorate(function: F) -> F:
+        @functools.wraps(function)
+        async def call(*args, **kwargs):
+            with profiled(name, kind):
+                return await function(*args, **kwargs)
+
+        return call  # type: ignore
+
+    return decorate
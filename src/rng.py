@@ -0,0 +1,78 @@
+# Deterministic random number streams shared by the database and game layers.
+#
+# Every random decision draws from its own stream, keyed by (world seed, day, phase, entity ID) instead of from one
+# shared generator. A decision about one pooch therefore never depends on how many numbers were drawn before it,
+# and the same seed gives the same world whether entities are processed serially, reordered, sharded or vectorized.
+
+from enum import IntEnum
+from typing import Optional
+
+import numpy as np
+
+
+class Phase(IntEnum):
+    """The part of the simulation a stream is for, so two phases keyed by the same entity never share numbers."""
+
+    DEATH = 1
+    VENDOR_CREATION = 2
+    VENDOR_RESTOCK = 3
+    # only drawn by the offline simulator, which stands in for players buying vendor stock
+    PURCHASE = 4
+
+
+def new_world_seed() -> int:
+    """Get a fresh, random world seed, for when a day change isn't seeded."""
+
+    return derive_seed(generator())
+
+
+def stream(world_seed: int, day: int, phase: Phase, entity_id: int = 0) -> np.random.Generator:
+    """
+    Get the random number stream for one entity in one phase of one day.
+    The same key always gives the same stream, no matter what else was drawn before it.
+
+    Parameters
+    ----------
+    world_seed: int
+        The seed of the whole day change.
+
+    day: int
+        The world day being simulated.
+
+    phase: Phase
+        The part of the simulation the stream is for.
+
+    entity_id: int, default: 0
+        The ID of the entity (pooch, vendor, server, etc.) the stream is for.
+
+    Returns
+    -------
+    np.random.Generator
+        A counter-based (Philox) generator for the key.
+    """
+
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence([world_seed, day, int(phase), entity_id])))
+
+
+def generator(seed: Optional[int] = None) -> np.random.Generator:
+    """
+    Get a counter-based (Philox) generator from a single seed, like one drawn with `derive_seed`.
+
+    Parameters
+    ----------
+    seed: int, optional
+        The seed to use. Uses fresh entropy if not given.
+
+    Returns
+    -------
+    np.random.Generator
+        The generator for the seed.
+    """
+
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence(seed)))
+
+
+def derive_seed(rng: np.random.Generator) -> int:
+    """Draw a seed for a sub-stream (like one new pooch's traits) from a stream."""
+
+    return int(rng.integers(2**63))
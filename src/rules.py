@@ -0,0 +1,67 @@
+# Game rules shared by the database and game layers (and the offline simulator).
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# The age a pooch is created at while it's still a fetus. It's born the day it turns 0.
+FETAL_AGE = -1
+
+# Pooches start losing 1 health a day once they're older than this.
+HEALTH_LOSS_START_AGE = 5  # TODO
+
+# How many days a new pooch has to wait before it can breed.
+BREEDING_COOLDOWN_DAYS = 2  # TODO
+
+# Pooches with less total health than this risk dying at every day change.
+DEATH_RISK_HEALTH = 5  # TODO
+
+# Dead pooches are moved to the archive this many days after they die.
+ARCHIVE_DEAD_AFTER_DAYS = 7  # TODO
+
+# Every point of health a pooch is below DEATH_RISK_HEALTH adds this much to its chance of dying each day change.
+DEATH_CHANCE_PER_HEALTH_DEFICIT = 0.2  # TODO
+
+# The range (inclusive) the base health of a new pooch is chosen from.
+MIN_BASE_HEALTH = 8  # TODO
+MAX_BASE_HEALTH = 12  # TODO
+
+# How many vendors every server is kept topped up to.
+VENDORS_PER_SERVER = 3  # TODO
+
+# The range (inclusive) of how many pooches a vendor restocks with at each day change, and the oldest they can be.
+MIN_VENDOR_STOCK = 2  # TODO
+MAX_VENDOR_STOCK = 5  # TODO
+MAX_VENDOR_STOCK_AGE = 5  # TODO
+
+# What every pooch is worth in dollars, before anything about it is taken into account.
+POOCH_BASE_PRICE = 50  # TODO
+
+
+def death_chance(
+    total_health: ArrayLike,
+    risk_health: int = DEATH_RISK_HEALTH,
+    chance_per_deficit: float = DEATH_CHANCE_PER_HEALTH_DEFICIT,
+) -> np.ndarray:
+    """
+    Get the chance a pooch with the given total health dies at a day change.
+    Works on a single health or on a whole array of them at once.
+
+    Parameters
+    ----------
+    total_health: ArrayLike
+        The total health of the pooch (or pooches).
+
+    risk_health: int, default: DEATH_RISK_HEALTH
+        Pooches with less total health than this risk dying.
+
+    chance_per_deficit: float, default: DEATH_CHANCE_PER_HEALTH_DEFICIT
+        How much every point of health below `risk_health` adds to the chance of dying.
+
+    Returns
+    -------
+    np.ndarray
+        The chance (between 0 and 1) of dying, shaped like `total_health`.
+    """
+
+    deficit = risk_health - np.maximum(total_health, 0)
+    return np.clip(chance_per_deficit * deficit, 0.0, 1.0)
@@ -0,0 +1,43 @@
+# An offline simulator for balancing the game rules.
+# It advances an in-memory copy of a world (snapshotted from the database or generated) by many days,
+# following the same rules as the live day change, without touching the database.
+
+from .engine import (
+    METRICS,
+    simulate_day,
+    run_trajectory,
+)
+
+from .params import (
+    SimulationParams,
+)
+
+from .runner import (
+    PERCENTILES,
+    SimulationResult,
+    simulate,
+    write_summary_csv,
+)
+
+from .world import (
+    World,
+    generate_world,
+    snapshot_world,
+)
+
+__all__ = [
+    # Params
+    "SimulationParams",
+    # World
+    "World",
+    "generate_world",
+    "snapshot_world",
+    # Simulation
+    "METRICS",
+    "PERCENTILES",
+    "SimulationResult",
+    "simulate_day",
+    "run_trajectory",
+    "simulate",
+    "write_summary_csv",
+]
@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import sys
+import time
+
+from logger import get_logger
+from rng import new_world_seed
+
+from .params import SimulationParams
+from .runner import simulate, write_summary_csv
+from .world import generate_world, snapshot_world
+
+log = get_logger("simulation")
+
+
+def _parse_override(value: str) -> tuple[str, str]:
+    name, separator, override = value.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, not {value!r}")
+    return name.strip(), override.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m simulation",
+        description="Simulate many days of a world offline, and output population, death rate and economy curves.",
+    )
+    parser.add_argument("--days", type=int, default=365, help="how many days to simulate")
+    parser.add_argument("--trajectories", type=int, default=16, help="how many seeded trajectories to simulate")
+    parser.add_argument("--workers", type=int, default=None, help="how many processes to use (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=None, help="the seed to simulate with (default: a random one)")
+    parser.add_argument("--snapshot", action="store_true", help="start from the world in the database")
+    parser.add_argument("--pooches", type=int, default=100_000, help="how many pooches to generate a world with")
+    parser.add_argument("--servers", type=int, default=100, help="how many servers to generate a world with")
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        type=_parse_override,
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="override a rule (any SimulationParams field, like death_risk_health=6)",
+    )
+    parser.add_argument("--out", default=None, help="the CSV file to write the curves to (default: stdout)")
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else new_world_seed()
+    try:
+        params = SimulationParams().with_overrides(dict(args.overrides))
+    except ValueError as e:
+        parser.error(str(e))
+
+    world = asyncio.run(snapshot_world()) if args.snapshot else generate_world(args.pooches, args.servers, seed, params)
+    log.info(f"Simulating {args.trajectories} x {args.days} days of {world.size} pooches (seed {seed}).")
+
+    start = time.perf_counter()
+    result = simulate(world, args.days, args.trajectories, seed, params, args.workers)
+    log.info(f"Simulated in {time.perf_counter() - start:.2f}s.")
+
+    if args.out is None:
+        write_summary_csv(result, sys.stdout)
+    else:
+        with open(args.out, "w", newline="") as file:
+            write_summary_csv(result, file)
+
+
+if __name__ == "__main__":
+    main()
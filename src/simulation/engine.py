@@ -0,0 +1,143 @@
+import numpy as np
+
+from rng import Phase, stream
+from rules import death_chance
+
+from .params import SimulationParams
+from .world import World
+
+# Everything recorded about each simulated day, in the order it's output.
+METRICS = (
+    "living",  # born pooches alive at the end of the day
+    "owned",
+    "for_sale",
+    "unborn",
+    "births",
+    "at_risk",  # pooches that rolled for death
+    "deaths",
+    "death_rate",  # deaths over the pooches alive at the start of the day
+    "mean_owned_health",
+    "sold",
+    "revenue",
+    "unsold",  # stock restocked away without being sold
+)
+
+
+def simulate_day(world: World, params: SimulationParams, world_seed: int) -> dict[str, float]:
+    """
+    Advance the world by one day in place, following the same rules as `run_day_change`:
+    pooches are born, pooches at risk roll for death, and vendors are topped up and restocked
+    (their unsold stock being archived, so dropped).
+
+    Randomness is drawn from one `rng.stream` per phase of the day, with every pooch drawing at once,
+    so a seed gives the same trajectory every time (but not the same one `run_day_change` would,
+    which draws a stream per pooch).
+
+    Parameters
+    ----------
+    world: World
+        The world to advance.
+
+    params: SimulationParams
+        The rules to advance it by.
+
+    world_seed: int
+        The seed of the trajectory being simulated.
+
+    Returns
+    -------
+    dict[str, float]
+        Everything in METRICS, for the day.
+    """
+
+    day = world.day + 1
+
+    # players buying stock before the day changes
+    rng = stream(world_seed, day, Phase.PURCHASE)
+    bought = world.for_sale & (rng.random(world.size) < params.purchase_chance)
+    world.owned |= bought
+    world.for_sale &= ~bought
+    sold = int(bought.sum())
+
+    world.day = day
+
+    # births (unborn pooches turning 0)
+    births = int((world.birth_day == day).sum())
+    living_before = world.size
+
+    # deaths (only the pooches whose health has dropped into the death risk range roll)
+    health = world.health(day)
+    at_risk = np.flatnonzero(health < params.death_risk_health)
+    chances = death_chance(health[at_risk], params.death_risk_health, params.death_chance_per_health_deficit)
+    rng = stream(world_seed, day, Phase.DEATH)
+    dead = at_risk[rng.random(len(at_risk)) < chances]
+    deaths = len(dead)
+    if deaths:
+        alive = np.ones(world.size, dtype=bool)
+        alive[dead] = False
+        world.keep(alive)
+
+    # vendor restock (every server is topped up with vendors, and every vendor's stock is replaced)
+    np.maximum(world.server_vendor_counts, params.vendors_per_server, out=world.server_vendor_counts)
+    unsold = int(world.for_sale.sum())
+    if unsold:
+        world.keep(~world.for_sale)
+
+    rng = stream(world_seed, day, Phase.VENDOR_RESTOCK)
+    vendor_count = int(world.server_vendor_counts.sum())
+    stock_count = int(rng.integers(params.min_vendor_stock, params.max_vendor_stock + 1, vendor_count).sum())
+    world.add_stock(
+        birth_day=day - rng.integers(0, params.max_vendor_stock_age + 1, stock_count),
+        base_health=rng.integers(params.min_base_health, params.max_base_health + 1, stock_count),
+        female=rng.random(stock_count) < 0.5,
+        params=params,
+    )
+
+    born = world.birth_day <= day
+    owned = world.owned & born
+    return {
+        "living": int(born.sum()),
+        "owned": int(owned.sum()),
+        "for_sale": int(world.for_sale.sum()),
+        "unborn": int(world.size - born.sum()),
+        "births": births,
+        "at_risk": len(at_risk),
+        "deaths": deaths,
+        "death_rate": deaths / living_before if living_before else 0.0,
+        "mean_owned_health": float(world.health(day)[owned].mean()) if owned.any() else np.nan,
+        "sold": sold,
+        "revenue": sold * params.pooch_price,
+        "unsold": unsold,
+    }
+
+
+def run_trajectory(world: World, params: SimulationParams, days: int, world_seed: int) -> np.ndarray:
+    """
+    Simulate a copy of the world for the given number of days.
+
+    Parameters
+    ----------
+    world: World
+        The world to start from. It isn't changed.
+
+    params: SimulationParams
+        The rules to simulate by.
+
+    days: int
+        How many days to simulate.
+
+    world_seed: int
+        The seed of the trajectory.
+
+    Returns
+    -------
+    np.ndarray
+        A `(days, len(METRICS))` array of every metric on every simulated day.
+    """
+
+    world = world.copy()
+    curves = np.empty((days, len(METRICS)), dtype=np.float64)
+    for i in range(days):
+        metrics = simulate_day(world, params, world_seed)
+        curves[i] = [metrics[metric] for metric in METRICS]
+    return curves
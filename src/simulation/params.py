@@ -0,0 +1,66 @@
+from dataclasses import dataclass, fields, replace
+
+from rules import (
+    DEATH_CHANCE_PER_HEALTH_DEFICIT,
+    DEATH_RISK_HEALTH,
+    HEALTH_LOSS_START_AGE,
+    MAX_BASE_HEALTH,
+    MAX_VENDOR_STOCK,
+    MAX_VENDOR_STOCK_AGE,
+    MIN_BASE_HEALTH,
+    MIN_VENDOR_STOCK,
+    POOCH_BASE_PRICE,
+    VENDORS_PER_SERVER,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationParams:
+    """
+    The rules a simulation runs by. Defaults to the live rules (see `rules.py`),
+    so a balance change can be tried out by overriding just the constants it touches.
+    """
+
+    health_loss_start_age: int = HEALTH_LOSS_START_AGE
+    death_risk_health: int = DEATH_RISK_HEALTH
+    death_chance_per_health_deficit: float = DEATH_CHANCE_PER_HEALTH_DEFICIT
+    min_base_health: int = MIN_BASE_HEALTH
+    max_base_health: int = MAX_BASE_HEALTH
+
+    vendors_per_server: int = VENDORS_PER_SERVER
+    min_vendor_stock: int = MIN_VENDOR_STOCK
+    max_vendor_stock: int = MAX_VENDOR_STOCK
+    max_vendor_stock_age: int = MAX_VENDOR_STOCK_AGE
+    pooch_price: int = POOCH_BASE_PRICE
+
+    # The chance each pooch for sale is bought by a player before the next day change.
+    # The live game has no equivalent, since players decide for themselves.
+    purchase_chance: float = 0.0
+
+    def with_overrides(self, overrides: dict[str, str]) -> SimulationParams:
+        """
+        Get a copy of these params with some of them overridden, like from the command line.
+
+        Parameters
+        ----------
+        overrides: dict[str, str]
+            The params to override, in the form `{ param name : value }`.
+            Each value is converted to the type of the param it overrides.
+
+        Returns
+        -------
+        SimulationParams
+            The overridden params.
+
+        Raises
+        ------
+        ValueError
+            If a param doesn't exist, or a value can't be converted to its type.
+        """
+
+        types = {field.name: type(getattr(self, field.name)) for field in fields(self)}
+        unknown = set(overrides) - set(types)
+        if unknown:
+            raise ValueError(f"Unknown simulation params: {', '.join(sorted(unknown))}")
+
+        return replace(self, **{name: types[name](value) for name, value in overrides.items()})
@@ -0,0 +1,107 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, TextIO
+
+import numpy as np
+
+from rng import derive_seed, generator
+
+from .engine import METRICS, run_trajectory
+from .params import SimulationParams
+from .world import World
+
+# The percentiles of every metric summarized across trajectories.
+PERCENTILES = (5, 50, 95)
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationResult:
+    """The curves of every trajectory of a simulation."""
+
+    start_day: int
+    params: SimulationParams
+    seeds: list[int]
+
+    # `(trajectories, days, len(METRICS))`
+    curves: np.ndarray
+
+    def metric(self, name: str) -> np.ndarray:
+        """Get one metric's curve in every trajectory, as a `(trajectories, days)` array."""
+
+        return self.curves[:, :, METRICS.index(name)]
+
+
+def simulate(
+    world: World,
+    days: int,
+    trajectories: int,
+    seed: int,
+    params: SimulationParams = SimulationParams(),
+    workers: Optional[int] = None,
+) -> SimulationResult:
+    """
+    Simulate many seeded trajectories of the world at once, each in its own process.
+
+    Parameters
+    ----------
+    world: World
+        The world every trajectory starts from.
+
+    days: int
+        How many days to simulate each trajectory for.
+
+    trajectories: int
+        How many trajectories to simulate.
+
+    seed: int
+        The seed the seeds of every trajectory are drawn from.
+
+    params: SimulationParams, default: SimulationParams()
+        The rules to simulate by.
+
+    workers: int, optional
+        How many processes to simulate in. Uses one per CPU if not given, and none (simulating in this process) if 1.
+
+    Returns
+    -------
+    SimulationResult
+        The curves of every trajectory.
+    """
+
+    rng = generator(seed)
+    seeds = [derive_seed(rng) for _ in range(trajectories)]
+
+    if workers == 1:
+        curves = [run_trajectory(world, params, days, world_seed) for world_seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_trajectory, world, params, days, world_seed) for world_seed in seeds]
+            curves = [future.result() for future in futures]
+
+    return SimulationResult(start_day=world.day, params=params, seeds=seeds, curves=np.stack(curves))
+
+
+def write_summary_csv(result: SimulationResult, file: TextIO):
+    """
+    Write the mean and percentiles of every metric across trajectories, on every day, as CSV.
+    Every row is one metric on one day, in the form `day, metric, mean, p5, p50, p95`.
+
+    Parameters
+    ----------
+    result: SimulationResult
+        The simulation to summarize.
+
+    file: TextIO
+        The file to write to.
+    """
+
+    means = np.nanmean(result.curves, axis=0)
+    percentiles = np.nanpercentile(result.curves, PERCENTILES, axis=0)
+
+    writer = csv.writer(file)
+    writer.writerow(["day", "metric", "mean", *(f"p{percentile}" for percentile in PERCENTILES)])
+    for i in range(result.curves.shape[1]):
+        day = result.start_day + i + 1
+        for j, metric in enumerate(METRICS):
+            writer.writerow([day, metric, f"{means[i, j]:.6g}", *(f"{value:.6g}" for value in percentiles[:, i, j])])
@@ -0,0 +1,163 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from database import get_world_day, list_living_pooches, list_servers, list_vendors
+from rng import generator
+
+from .params import SimulationParams
+
+
+@dataclass(slots=True)
+class World:
+    """
+    A whole world's worth of living pooches, held as one NumPy array per column (a struct of arrays)
+    so a day change can be applied to every pooch at once. Row `i` of every array is the same pooch.
+
+    Only what the day change reads is kept. Dead pooches and unsold stock are dropped as soon as they'd be archived.
+    """
+
+    day: int
+
+    birth_day: np.ndarray  # int32
+    base_health: np.ndarray  # int32
+    health_loss_start_day: np.ndarray  # int32
+    female: np.ndarray  # bool
+    owned: np.ndarray  # bool
+    for_sale: np.ndarray  # bool (pooches neither owned nor for sale are strays, like stock whose vendor was deleted)
+
+    # how many vendors each server has
+    server_vendor_counts: np.ndarray  # int32
+
+    @property
+    def size(self) -> int:
+        return len(self.birth_day)
+
+    def health(self, day: int) -> np.ndarray:
+        """Get the total health of every pooch on the given day, like `Pooch.health`."""
+
+        return np.maximum(self.base_health - np.maximum(day - self.health_loss_start_day, 0), 0)
+
+    def copy(self) -> World:
+        return World(
+            day=self.day,
+            birth_day=self.birth_day.copy(),
+            base_health=self.base_health.copy(),
+            health_loss_start_day=self.health_loss_start_day.copy(),
+            female=self.female.copy(),
+            owned=self.owned.copy(),
+            for_sale=self.for_sale.copy(),
+            server_vendor_counts=self.server_vendor_counts.copy(),
+        )
+
+    def keep(self, mask: np.ndarray):
+        """Drop every pooch the mask is False for."""
+
+        self.birth_day = self.birth_day[mask]
+        self.base_health = self.base_health[mask]
+        self.health_loss_start_day = self.health_loss_start_day[mask]
+        self.female = self.female[mask]
+        self.owned = self.owned[mask]
+        self.for_sale = self.for_sale[mask]
+
+    def add_stock(self, birth_day: np.ndarray, base_health: np.ndarray, female: np.ndarray, params: SimulationParams):
+        """Add new vendor stock, created today, like `create_pooch` does for a vendor."""
+
+        health_loss_start_day = np.maximum(birth_day + params.health_loss_start_age, self.day)
+        count = len(birth_day)
+
+        self.birth_day = np.concatenate((self.birth_day, birth_day.astype(np.int32)))
+        self.base_health = np.concatenate((self.base_health, base_health.astype(np.int32)))
+        self.health_loss_start_day = np.concatenate(
+            (self.health_loss_start_day, health_loss_start_day.astype(np.int32))
+        )
+        self.female = np.concatenate((self.female, female))
+        self.owned = np.concatenate((self.owned, np.zeros(count, dtype=bool)))
+        self.for_sale = np.concatenate((self.for_sale, np.ones(count, dtype=bool)))
+
+
+def generate_world(
+    pooch_count: int, server_count: int, seed: int, params: SimulationParams = SimulationParams()
+) -> World:
+    """
+    Generate a made-up world of owned pooches at every age they can live to, with fully stocked vendors.
+
+    Parameters
+    ----------
+    pooch_count: int
+        How many owned pooches to generate.
+
+    server_count: int
+        How many servers the pooches are spread across. Each gets a full set of vendors.
+
+    seed: int
+        The seed to generate the world with.
+
+    params: SimulationParams, default: SimulationParams()
+        The rules to generate the pooches by.
+
+    Returns
+    -------
+    World
+        The generated world, on day 0.
+    """
+
+    rng = generator(seed)
+
+    # old enough to have lost all their health, so the world starts with pooches in every stage of life
+    max_age = params.health_loss_start_age + params.max_base_health
+    age = rng.integers(0, max_age + 1, pooch_count)
+    birth_day = -age
+
+    world = World(
+        day=0,
+        birth_day=birth_day.astype(np.int32),
+        base_health=rng.integers(params.min_base_health, params.max_base_health + 1, pooch_count).astype(np.int32),
+        # born into a kennel, so they started losing health at exactly the health loss start age
+        health_loss_start_day=(birth_day + params.health_loss_start_age).astype(np.int32),
+        female=rng.random(pooch_count) < 0.5,
+        owned=np.ones(pooch_count, dtype=bool),
+        for_sale=np.zeros(pooch_count, dtype=bool),
+        server_vendor_counts=np.full(server_count, params.vendors_per_server, dtype=np.int32),
+    )
+
+    stock_count = int(
+        rng.integers(params.min_vendor_stock, params.max_vendor_stock + 1, int(world.server_vendor_counts.sum())).sum()
+    )
+    world.add_stock(
+        birth_day=-rng.integers(0, params.max_vendor_stock_age + 1, stock_count),
+        base_health=rng.integers(params.min_base_health, params.max_base_health + 1, stock_count),
+        female=rng.random(stock_count) < 0.5,
+        params=params,
+    )
+    return world
+
+
+async def snapshot_world() -> World:
+    """
+    Load every living pooch (including unborn ones) and the vendor count of every server from the database.
+
+    Returns
+    -------
+    World
+        The world as it is in the database, on the current world day.
+    """
+
+    day = await get_world_day()
+    pooches = await list_living_pooches()
+    servers = await list_servers()
+
+    return World(
+        day=day,
+        birth_day=np.array([pooch.birth_day for pooch in pooches], dtype=np.int32),
+        base_health=np.array([pooch.base_health for pooch in pooches], dtype=np.int32),
+        health_loss_start_day=np.array([pooch.health_loss_start_day for pooch in pooches], dtype=np.int32),
+        female=np.array([pooch.sex == "female" for pooch in pooches], dtype=bool),
+        owned=np.array([pooch.owner_discord_id is not None for pooch in pooches], dtype=bool),
+        for_sale=np.array(
+            [pooch.owner_discord_id is None and pooch.vendor_id is not None for pooch in pooches], dtype=bool
+        ),
+        server_vendor_counts=np.array(
+            [len(await list_vendors(server.discord_id)) for server in servers], dtype=np.int32
+        ),
+    )
@@ -0,0 +1,375 @@
+# Lightweight span tracing, from a Discord interaction down to the SQL statements it sends.
+#
+# The current span is kept in a context variable, so spans opened inside it (in the same task, or in tasks it starts)
+# become its children without being passed around. The spans of a trace are kept in memory until its root span ends,
+# and the whole trace is then either exported or dropped: traces are kept at random (the sample rate), and always if
+# the root took longer than the slow threshold, so the slowest flows are never sampled away.
+#
+# Nothing is recorded until an exporter is configured, so untraced calls cost one global lookup.
+
+import asyncio
+import functools
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from logger import get_logger
+
+log = get_logger("tracing")
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# The share of traces kept at random, when not configured otherwise.
+DEFAULT_SAMPLE_RATE = 0.01  # TODO
+
+# The most spans kept per trace, so a runaway loop can't use up all the memory.
+MAX_SPANS_PER_TRACE = 2000  # TODO
+
+# The most spans waiting to be sent to an OTLP collector. Any more are dropped while the collector is unreachable.
+MAX_PENDING_SPANS = 10000  # TODO
+
+# How much of a SQL statement is kept on its span.
+MAX_STATEMENT_LENGTH = 500
+
+
+@dataclass(slots=True)
+class _Trace:
+    id: str
+    sampled: bool
+    spans: list[Span] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed operation in a trace, like an interaction, a game function or a SQL statement."""
+
+    trace: _Trace
+    id: str
+    parent_id: Optional[str]
+    name: str
+    kind: str
+    start_unix_nano: int
+    attributes: dict[str, Any]
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace.id,
+            "span_id": self.id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_unix_nano": self.start_unix_nano,
+            "duration_ms": round(self.duration_seconds * 1000, 3),
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class JsonlExporter:
+    """Append every kept span to a local file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def export(self, spans: list[Span]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as file:
+            for span in spans:
+                file.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+class OtlpHttpExporter:
+    """
+    Send kept spans to an OpenTelemetry collector (or anything that speaks OTLP/HTTP JSON), in the background on the
+    running event loop.
+    """
+
+    def __init__(self, endpoint: str, service_name: str = "pimpy"):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self._pending: list[Span] = []
+        self._flushing: Optional[asyncio.Task] = None
+
+    def export(self, spans: list[Span]):
+        if len(self._pending) + len(spans) > MAX_PENDING_SPANS:
+            log.warning(f"Dropped a trace of {len(spans)} spans, since {self.url} isn't keeping up")
+            return
+
+        self._pending.extend(spans)
+        if self._flushing is None or self._flushing.done():
+            try:
+                self._flushing = asyncio.get_running_loop().create_task(self._flush())
+            except RuntimeError:
+                pass  # no event loop, so the spans wait for the next trace that ends on one
+
+    async def _flush(self):
+        import aiohttp
+
+        async with aiohttp.ClientSession() as session:
+            while self._pending:
+                spans, self._pending = self._pending, []
+                try:
+                    async with session.post(self.url, json=self._payload(spans)) as response:
+                        if response.status >= 400:
+                            log.warning(f"{self.url} rejected {len(spans)} spans with status {response.status}")
+                except aiohttp.ClientError as error:
+                    log.warning(f"Couldn't send {len(spans)} spans to {self.url}: {error}")
+                    return
+
+    def _payload(self, spans: list[Span]) -> dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "pimpy.tracing"},
+                            "spans": [
+                                {
+                                    "traceId": span.trace.id,
+                                    "spanId": span.id,
+                                    "parentSpanId": span.parent_id or "",
+                                    "name": span.name,
+                                    "kind": 1,  # internal
+                                    "startTimeUnixNano": str(span.start_unix_nano),
+                                    "endTimeUnixNano": str(span.start_unix_nano + int(span.duration_seconds * 1e9)),
+                                    "attributes": [_otlp_attribute("kind", span.kind)]
+                                    + [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+                                    "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                                }
+                                for span in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+_EXPORTER: Optional[JsonlExporter | OtlpHttpExporter] = None
+_SAMPLE_RATE = DEFAULT_SAMPLE_RATE
+# Traces whose root span takes longer than this are always kept.
+_SLOW_SECONDS: Optional[float] = None
+_LISTENING = False
+
+_CURRENT: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def configure(
+    exporter: Optional[JsonlExporter | OtlpHttpExporter],
+    sample_rate: float = DEFAULT_SAMPLE_RATE,
+    slow_seconds: Optional[float] = None,
+):
+    """
+    Start (or stop) tracing.
+
+    Parameters
+    ----------
+    exporter: Optional[JsonlExporter | OtlpHttpExporter]
+        Where to send kept traces. `None` stops tracing.
+
+    sample_rate: float, default: DEFAULT_SAMPLE_RATE
+        The share of traces to keep at random, from 0 to 1.
+
+    slow_seconds: Optional[float], default: None
+        Always keep traces that take longer than this, whether or not they were sampled.
+    """
+
+    global _EXPORTER, _SAMPLE_RATE, _SLOW_SECONDS, _LISTENING
+    _EXPORTER = exporter
+    _SAMPLE_RATE = sample_rate
+    _SLOW_SECONDS = slow_seconds
+
+    if exporter is not None and not _LISTENING:
+        # listening on the Engine class covers every engine, without making one just to listen on it
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _LISTENING = True
+
+
+def configure_from_env():
+    """
+    Configure tracing from the environment: TRACE_FILE (a JSONL file to write traces to) or TRACE_OTLP_ENDPOINT
+    (an OTLP/HTTP collector to send them to), TRACE_SAMPLE_RATE and TRACE_SLOW_MS. Nothing is traced if neither
+    TRACE_FILE nor TRACE_OTLP_ENDPOINT is set.
+    """
+
+    exporter = None
+    if endpoint := os.getenv("TRACE_OTLP_ENDPOINT"):
+        exporter = OtlpHttpExporter(endpoint)
+    elif path := os.getenv("TRACE_FILE"):
+        exporter = JsonlExporter(path)
+
+    slow_ms = os.getenv("TRACE_SLOW_MS")
+    configure(
+        exporter,
+        float(os.getenv("TRACE_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)),
+        float(slow_ms) / 1000 if slow_ms else None,
+    )
+
+
+def current_span() -> Optional[Span]:
+    """Get the span currently open in this context, if there is one."""
+
+    return _CURRENT.get()
+
+
+def _new_id(length: int) -> str:
+    return os.urandom(length).hex()
+
+
+def _record(span: Span):
+    if len(span.trace.spans) < MAX_SPANS_PER_TRACE:
+        span.trace.spans.append(span)
+
+
+def _finish(root: Span):
+    exporter = _EXPORTER
+    if exporter is None:
+        return
+
+    slow = _SLOW_SECONDS is not None and root.duration_seconds > _SLOW_SECONDS
+    if not (root.trace.sampled or slow):
+        return
+
+    try:
+        exporter.export(root.trace.spans)
+    except OSError:
+        log.exception(f"Couldn't export the trace of {root.name}")
+
+
+@contextmanager
+def span(name: str, kind: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time the body of a `with` block as a span, a child of the span open around it (or the root of a new trace).
+    Does nothing while tracing isn't configured.
+
+    Parameters
+    ----------
+    name: str
+        The name of the span. Keep it bounded (like a function or command name, not an ID), so spans group well.
+
+    kind: str
+        The layer the span is in (like "interaction", "game", "transaction", "sql" or "discord").
+
+    **attributes: Any
+        Anything else to record on the span, like the IDs involved.
+
+    Returns
+    -------
+    Iterator[Optional[Span]]
+        The span (to add attributes to), or `None` while tracing isn't configured.
+    """
+
+    if _EXPORTER is None:
+        yield None
+        return
+
+    parent = _CURRENT.get()
+    trace = parent.trace if parent is not None else _Trace(id=_new_id(16), sampled=random.random() < _SAMPLE_RATE)
+    current = Span(
+        trace=trace,
+        id=_new_id(8),
+        parent_id=parent.id if parent is not None else None,
+        name=name,
+        kind=kind,
+        start_unix_nano=time.time_ns(),
+        attributes=attributes,
+    )
+
+    token = _CURRENT.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as error:
+        current.error = type(error).__name__
+        raise
+    finally:
+        current.duration_seconds = time.perf_counter() - start
+        _CURRENT.reset(token)
+        _record(current)
+        if parent is None:
+            _finish(current)
+
+
+def traced(kind: str) -> Callable[[F], F]:
+    """
+    Decorate an async function so every call to it is a span, named after its module and itself
+    (like `manage_kennels.list_kennel_pooches`).
+
+    Parameters
+    ----------
+    kind: str
+        The layer the function is in (like "game").
+
+    Returns
+    -------
+    Callable[[F], F]
+        The decorator.
+    """
+
+    def decorate(function: F) -> F:
+        name = f"{function.__module__.rsplit('.', 1)[-1]}.{function.__name__}"
+
+        @functools.wraps(function)
+        async def call(*args, **kwargs):
+            if _EXPORTER is None:
+                return await function(*args, **kwargs)
+            with span(name, kind):
+                return await function(*args, **kwargs)
+
+        return call  # type: ignore
+
+    return decorate
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # cursor events run behind SQLAlchemy's greenlet bridge, where the caller's context isn't reliably visible,
+    # so the span statements belong to is handed over on the connection instead (see `database.session.session_scope`)
+    if conn.info.get("trace_span") is not None:
+        conn.info.setdefault("trace_started_at", []).append((time.time_ns(), time.perf_counter()))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent: Optional[Span] = conn.info.get("trace_span")
+    started = conn.info.get("trace_started_at")
+    if parent is None or not started:
+        return
+
+    start_unix_nano, start = started.pop()
+    _record(
+        Span(
+            trace=parent.trace,
+            id=_new_id(8),
+            parent_id=parent.id,
+            name="sql",
+            kind="sql",
+            start_unix_nano=start_unix_nano,
+            attributes={"statement": statement[:MAX_STATEMENT_LENGTH], "executemany": executemany},
+            duration_seconds=time.perf_counter() - start,
+        )
+    )